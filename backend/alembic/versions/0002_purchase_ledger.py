@@ -0,0 +1,41 @@
+"""
+purchase ledger and idempotency keys
+
+Revision ID: 0002_purchase_ledger
+Revises: 0001_add_performance_indexes
+Create Date: 2026-10-19 10:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002_purchase_ledger'
+down_revision = '0001_add_performance_indexes'
+depends_on = None
+branch_labels = None
+
+def upgrade():
+    op.create_table(
+        'ledger_entries',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('player_id', sa.Integer(), sa.ForeignKey('players.id'), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('balance_after', sa.Float(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('reference_type', sa.String(), nullable=True),
+        sa.Column('reference_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_ledger_entries_id', 'ledger_entries', ['id'], unique=False)
+    op.create_index('ix_ledger_entries_player_id', 'ledger_entries', ['player_id'], unique=False)
+    with op.batch_alter_table('purchases') as batch_op:
+        batch_op.add_column(sa.Column('idempotency_key', sa.String(length=64), nullable=True))
+        batch_op.create_unique_constraint('uix_purchase_idempotency', ['player_id', 'idempotency_key'])
+
+def downgrade():
+    with op.batch_alter_table('purchases') as batch_op:
+        batch_op.drop_constraint('uix_purchase_idempotency', type_='unique')
+        batch_op.drop_column('idempotency_key')
+    op.drop_index('ix_ledger_entries_player_id', table_name='ledger_entries')
+    op.drop_index('ix_ledger_entries_id', table_name='ledger_entries')
+    op.drop_table('ledger_entries')
@@ -0,0 +1,25 @@
+"""
+input effects applied marker
+
+Revision ID: 0003_input_effects_marker
+Revises: 0002_purchase_ledger
+Create Date: 2026-10-19 12:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003_input_effects_marker'
+down_revision = '0002_purchase_ledger'
+depends_on = None
+branch_labels = None
+
+def upgrade():
+    with op.batch_alter_table('inputs') as batch_op:
+        batch_op.add_column(sa.Column('effects_applied_at', sa.DateTime(), nullable=True))
+    # Insumos existentes já tiveram os efeitos aplicados na criação
+    op.execute("UPDATE inputs SET effects_applied_at = applied_at WHERE effects_applied_at IS NULL")
+
+def downgrade():
+    with op.batch_alter_table('inputs') as batch_op:
+        batch_op.drop_column('effects_applied_at')
@@ -0,0 +1,36 @@
+"""
+soil parameter time series
+
+Revision ID: 0004_soil_series
+Revises: 0003_input_effects_marker
+Create Date: 2026-10-19 14:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004_soil_series'
+down_revision = '0003_input_effects_marker'
+depends_on = None
+branch_labels = None
+
+def upgrade():
+    op.create_table(
+        'soil_series',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('terrain_id', sa.Integer(), sa.ForeignKey('terrains.id'), nullable=False),
+        sa.Column('quadrant_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('resolution', sa.String(length=8), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('soil_moisture', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('fertility', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('organic_matter', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('biodiversity', sa.Float(), nullable=False, server_default='0'),
+        sa.UniqueConstraint('terrain_id', 'quadrant_id', 'resolution', 'bucket_start', name='uix_soil_series_bucket'),
+    )
+    op.create_index('ix_soil_series_id', 'soil_series', ['id'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_soil_series_id', table_name='soil_series')
+    op.drop_table('soil_series')
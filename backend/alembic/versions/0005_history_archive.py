@@ -0,0 +1,64 @@
+"""
+history indexes and archive
+
+Revision ID: 0005_history_archive
+Revises: 0004_soil_series
+Create Date: 2026-10-19 16:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005_history_archive'
+down_revision = '0004_soil_series'
+depends_on = None
+branch_labels = None
+
+def upgrade():
+    op.create_index('ix_actions_name_player_timestamp', 'actions', ['action_name', 'player_id', 'timestamp'], unique=False)
+    op.create_index('ix_plant_state_logs_planting_timestamp', 'plant_state_logs', ['planting_id', 'timestamp'], unique=False)
+    op.create_index('ix_plant_state_logs_timestamp', 'plant_state_logs', ['timestamp'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Particionamento nativo por mês; as partições são criadas pelo arquivador
+        op.execute("""
+            CREATE TABLE history_archive (
+                id SERIAL,
+                source VARCHAR(32) NOT NULL,
+                period_start TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                first_id INTEGER NOT NULL,
+                last_id INTEGER NOT NULL,
+                row_count INTEGER NOT NULL,
+                min_timestamp TIMESTAMP WITHOUT TIME ZONE,
+                max_timestamp TIMESTAMP WITHOUT TIME ZONE,
+                payload BYTEA NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+                PRIMARY KEY (id, period_start)
+            ) PARTITION BY RANGE (period_start)
+        """)
+    else:
+        op.create_table(
+            'history_archive',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('source', sa.String(length=32), nullable=False),
+            sa.Column('period_start', sa.DateTime(), nullable=False),
+            sa.Column('first_id', sa.Integer(), nullable=False),
+            sa.Column('last_id', sa.Integer(), nullable=False),
+            sa.Column('row_count', sa.Integer(), nullable=False),
+            sa.Column('min_timestamp', sa.DateTime(), nullable=True),
+            sa.Column('max_timestamp', sa.DateTime(), nullable=True),
+            sa.Column('payload', sa.LargeBinary(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index('ix_history_archive_id', 'history_archive', ['id'], unique=False)
+    op.create_index('ix_history_archive_source_period', 'history_archive', ['source', 'period_start'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_history_archive_source_period', table_name='history_archive')
+    if op.get_bind().dialect.name != 'postgresql':
+        op.drop_index('ix_history_archive_id', table_name='history_archive')
+    # No Postgres, as partições são removidas junto com a tabela
+    op.execute("DROP TABLE history_archive CASCADE" if op.get_bind().dialect.name == 'postgresql' else "DROP TABLE history_archive")
+    op.drop_index('ix_plant_state_logs_timestamp', table_name='plant_state_logs')
+    op.drop_index('ix_plant_state_logs_planting_timestamp', table_name='plant_state_logs')
+    op.drop_index('ix_actions_name_player_timestamp', table_name='actions')
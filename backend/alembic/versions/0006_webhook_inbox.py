@@ -0,0 +1,38 @@
+"""
+webhook inbox
+
+Revision ID: 0006_webhook_inbox
+Revises: 0005_history_archive
+Create Date: 2026-10-19 18:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006_webhook_inbox'
+down_revision = '0005_history_archive'
+depends_on = None
+branch_labels = None
+
+def upgrade():
+    op.create_table(
+        'webhook_inbox',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('provider_message_id', sa.String(length=128), nullable=False),
+        sa.Column('phone_number', sa.String(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('reply', sa.String(), nullable=True),
+        sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('provider_message_id'),
+    )
+    op.create_index('ix_webhook_inbox_id', 'webhook_inbox', ['id'], unique=False)
+    op.create_index('ix_webhook_inbox_status_id', 'webhook_inbox', ['status', 'id'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_webhook_inbox_status_id', table_name='webhook_inbox')
+    op.drop_index('ix_webhook_inbox_id', table_name='webhook_inbox')
+    op.drop_table('webhook_inbox')
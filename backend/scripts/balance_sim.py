@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Simulador de balanceamento offline (services.balancing).
+
+Simula populações sintéticas de terrenos e jogadores por meses de jogo com as regras reais,
+varrendo parâmetros em paralelo (um processo por núcleo), e grava runs, species e summary
+em CSV (ou Parquet, com pyarrow instalado). Uso:
+
+    python scripts/balance_sim.py --set deterioration.soil_moisture=2,2.5,3 \\
+        --set climate.seca.probability=0.1,0.2 --replicates 4 --out balance_out
+    python scripts/balance_sim.py --grid sweep.yml --workers 8 --format parquet
+
+O arquivo de --grid é um mapeamento YAML parâmetro -> valor ou lista de valores. As chaves
+aceitas estão na docstring de src/services/balancing.py.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+# Adiciona o diretório raiz do backend ao sys.path para poder importar os módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.services.balancing import parse_value, run_sweep, sweep_grid, write_results  # noqa: E402
+
+
+def parse_grid(args) -> dict:
+    grid = {}
+    if args.grid:
+        with open(args.grid, "r", encoding="utf-8") as f:
+            for key, values in (yaml.safe_load(f) or {}).items():
+                grid[key] = values if isinstance(values, list) else [values]
+    for item in args.set:
+        key, sep, values = item.partition("=")
+        if not sep or not key:
+            raise ValueError(f"Use chave=valor[,valor...]: {item}")
+        grid[key.strip()] = [parse_value(value) for value in values.split(",")]
+    return grid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--set", action="append", default=[], metavar="CHAVE=V1,V2",
+                        help="parâmetro e valores da varredura (repetível)")
+    parser.add_argument("--grid", help="arquivo YAML com a varredura")
+    parser.add_argument("--replicates", type=int, default=3, help="execuções por combinação")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos da máquina)")
+    parser.add_argument("--out", default="balance_out", help="diretório de saída")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv")
+    args = parser.parse_args()
+
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("Saída Parquet requer o pacote pyarrow")
+    try:
+        grid = parse_grid(args)
+        combinations = sweep_grid(grid)
+        started = time.perf_counter()
+        runs, species = run_sweep(combinations, args.replicates, args.seed, args.workers)
+        paths = write_results(runs, species, list(grid), args.out, args.format)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - started
+    print(f"{len(combinations)} combinações x {args.replicates} réplicas = {len(runs)} execuções em {elapsed:.1f}s")
+    for path in paths:
+        print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark do parser de comandos do WhatsApp (services.command_parser).
+
+Mede mensagens por segundo para comandos exatos, com erro de digitação (cache LRU frio e
+quente) e inválidos. Uso:
+
+    python scripts/bench_command_parser.py [--messages 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz do backend ao sys.path para poder importar os módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.services import command_parser  # noqa: E402
+from src.services.command_parser import closest, parse_command  # noqa: E402
+
+SCENARIOS = {
+    "exato": ["regar 2", "plantar no terreno 3 com a pá", "colher t1", "irrigar 4 regador"],
+    "digitacao": ["plnatar 1 facao", "rgear 2", "colehr 3 foice", "irigar 4 regadr"],
+    "invalido": ["invalido 3", "regar", "podar 1", "regar 2 xyzzy"],
+}
+
+
+def bench(messages, total: int) -> float:
+    started = time.perf_counter()
+    for i in range(total):
+        parse_command(messages[i % len(messages)])
+    return total / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100_000)
+    args = parser.parse_args()
+
+    command_parser.reset()
+    started = time.perf_counter()
+    command_parser.grammar()
+    print(f"compilação da gramática: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    # Cache frio: cada erro de digitação calculado pela primeira vez
+    started = time.perf_counter()
+    for message in SCENARIOS["digitacao"]:
+        parse_command(message)
+    cold = (time.perf_counter() - started) / len(SCENARIOS["digitacao"])
+    print(f"{'digitacao (cache frio)':<24} {cold * 1e6:10.1f} µs/mensagem")
+
+    for name, messages in SCENARIOS.items():
+        rate = bench(messages, args.messages)
+        print(f"{name:<24} {rate:12,.0f} mensagens/s  ({1e6 / rate:.2f} µs/mensagem)")
+    print(f"cache LRU: {closest.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
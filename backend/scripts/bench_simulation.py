@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark do núcleo de simulação (services.simulation).
+
+Monta um mundo sintético (terrenos 4x4 quadrantes, plantios com as espécies de species.yml) e
+mede plantios·dia e quadrantes·dia por segundo de `World.step`. Uso:
+
+    python scripts/bench_simulation.py [--terrains 200] [--plantings 20] [--days 30] [--seed 1]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz do backend ao sys.path para poder importar os módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.services.current_season import species_params  # noqa: E402
+from src.services.simulation import World  # noqa: E402
+
+LABELS = [f"{col}{row}" for row in range(1, 5) for col in "ABCD"]
+SOIL = {"soil_moisture": 60.0, "fertility": 50, "organic_matter": 40, "biodiversity": 30, "soil_ph": 6.5}
+
+
+def build_world(terrains: int, plantings_per_terrain: int, seed: int) -> World:
+    species = species_params()
+    keys = sorted(species)
+    world = World(seed=seed, species=species)
+    planting_id = 0
+    for terrain_id in range(1, terrains + 1):
+        world.add_terrain(terrain_id, terrain_id, SOIL)
+        for i, label in enumerate(LABELS):
+            world.add_quadrant(terrain_id * 100 + i, terrain_id, label, SOIL)
+        for i in range(plantings_per_terrain):
+            planting_id += 1
+            world.add_planting(planting_id, terrain_id, terrain_id * 100 + i % len(LABELS), keys[planting_id % len(keys)])
+        world.water_probability[terrain_id] = 0.8
+    return world
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--terrains", type=int, default=200)
+    parser.add_argument("--plantings", type=int, default=20, help="plantios por terreno")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    world = build_world(args.terrains, args.plantings, args.seed)
+    for climate in ("random", "expected"):
+        run = world.copy(seed=args.seed)
+        started = time.perf_counter()
+        run.step(args.days, climate=climate)
+        elapsed = time.perf_counter() - started
+        print(f"{climate:>9}: {args.days} dias em {elapsed:.3f}s | "
+              f"{len(run.plantings) * args.days / elapsed:>12,.0f} plantios·dia/s | "
+              f"{len(run.quadrants) * args.days / elapsed:>12,.0f} quadrantes·dia/s | {run.state_counts()}")
+
+
+if __name__ == "__main__":
+    main()
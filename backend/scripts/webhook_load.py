@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Gerador de carga para o webhook do WhatsApp (POST /whatsapp/webhook).
+
+Dispara mensagens em paralelo, com uma fração de reentregas (mesmo message_id), e mede a
+latência da confirmação. Sem --url, roda no próprio processo contra services.webhook_inbox e
+um banco SQLite temporário; com --url, envia HTTP para uma instância em execução.
+
+    python scripts/webhook_load.py [--messages 5000] [--concurrency 32] [--duplicates 0.1]
+    python scripts/webhook_load.py --url http://localhost:8000/whatsapp/webhook
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Adiciona o diretório raiz do backend ao sys.path para poder importar os módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+COMMANDS = ["regar 1", "plantar 2 pa", "colher 1", "irrigar 3", "rgear 2", "podar 1"]
+
+
+def http_sender(url: str):
+    def send(message_id: str, body: dict) -> str:
+        data = json.dumps({"message_id": message_id, **body}).encode()
+        request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read())["status"]
+    return send
+
+
+def local_sender():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from src.db import Base
+    from src import models  # noqa: F401
+    from src.models.character import Character  # noqa: F401
+    from src.models.input import Input  # noqa: F401
+    from src.services.webhook_inbox import WebhookInbox
+
+    path = os.path.join(tempfile.mkdtemp(), "webhook_load.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    inbox = WebhookInbox(sessionmaker(bind=engine))
+    print(f"Banco temporário: {path}")
+
+    def send(message_id: str, body: dict) -> str:
+        phone = body.pop("phone_number", None)
+        return inbox.append(message_id, body, phone)
+    send.inbox = inbox
+    return send
+
+
+def percentile(values, fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga no webhook do WhatsApp")
+    parser.add_argument("--url", help="Endpoint HTTP; sem ele, roda no próprio processo")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Fração de reentregas")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    send = http_sender(args.url) if args.url else local_sender()
+    sent_ids = []
+    plan = []
+    for i in range(args.messages):
+        if sent_ids and rng.random() < args.duplicates:
+            message_id = rng.choice(sent_ids)
+        else:
+            message_id = uuid.uuid4().hex
+            sent_ids.append(message_id)
+        plan.append((message_id, {"phone_number": f"+55219{i % 1000:08d}", "message": rng.choice(COMMANDS)}))
+
+    latencies = []
+    statuses = {}
+    errors = 0
+    lock = threading.Lock()
+
+    def fire(item):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            status = send(*item)
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(fire, plan))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"{args.messages} mensagens em {elapsed:.2f}s ({args.messages / elapsed:,.0f}/s), "
+          f"{args.concurrency} em paralelo")
+    print(f"status: {statuses}  erros: {errors}")
+    print(f"confirmação (ms): p50={percentile(latencies, 0.5):.2f} p95={percentile(latencies, 0.95):.2f} "
+          f"p99={percentile(latencies, 0.99):.2f} max={latencies[-1] if latencies else 0:.2f}")
+    inbox = getattr(send, "inbox", None)
+    if inbox is not None:
+        print(f"grupos de commit: {inbox.metrics()['groups']} (média {inbox.metrics()['avg_group_size']} mensagens)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,40 @@
+from typing import List
 from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
-from sqlalchemy.orm import Session
-from ..db import get_db_override
-from ..schemas.tool_use import ToolUse
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import get_async_db
+from ..repositories import actions, terrains
+from ..schemas.tool_use import ActionBatchCreate, ActionBatchResult, ToolUse
 from ..services.terrain_service import update_terrain
-from ..crud.terrain import get_terrain
 
 router = APIRouter(prefix="/actions", tags=["actions"])
 
 
 @router.post("/", response_model=dict)
-def perform_action(payload: ToolUse, background_tasks: BackgroundTasks, db: Session = Depends(get_db_override)):
+async def perform_action(payload: ToolUse, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_async_db)):
     # valida terreno
-    terrain = get_terrain(db, payload.terrain_id)
+    terrain = await terrains.get_terrain(db, payload.terrain_id)
     if not terrain:
         raise HTTPException(status_code=404, detail="Terrain not found")
     # enfileira a ação com ferramenta (se houver)
     background_tasks.add_task(
         update_terrain,
-        db,
         payload.action_name,
         payload.terrain_id,
         payload.tool_key
     )
-    return {"status": "ok", "message": "Ação agendada"}
\ No newline at end of file
+    return {"status": "ok", "message": "Ação agendada"}
+
+
+@router.post("/batch", response_model=List[ActionBatchResult], summary="Run many actions at once")
+async def perform_actions_batch(batch: ActionBatchCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Run a batch of queued actions in a single transaction.
+
+    The actions of each terrain are folded, in order, into one net delta applied with a single
+    UPDATE; balance credits (harvest) are aggregated per player and the `actions` rows are
+    written with one bulk insert. Only actions with a pure delta (plantar, regar, colher) are accepted.
+    """
+    try:
+        return await actions.run_actions_batch(db, batch.actions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
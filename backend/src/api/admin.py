@@ -1,5 +1,10 @@
 from fastapi import APIRouter
+from ..db import get_pool_metrics
+from ..db_replicas import replica_router
+from ..services import forecast
 from ..services.plant_lifecycle import tick_day
+from ..services.terrain_service import action_executor
+from ..services.webhook_inbox import webhook_inbox
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -8,3 +13,28 @@ def run_tick():
     """Executa manualmente o tick de plantas."""
     tick_day()
     return {"status": "ok"}
+
+@router.get("/db-pool", summary="Métricas dos pools de conexão do banco")
+def db_pool():
+    """Retorna uso, overflow e tempo de espera no checkout dos pools síncrono e assíncrono."""
+    return get_pool_metrics()
+
+@router.get("/db-replicas", summary="Estado das réplicas de leitura")
+def db_replicas():
+    """Retorna atraso medido, leituras atendidas e pool de cada réplica, além dos fallbacks ao primário."""
+    return replica_router.status()
+
+@router.get("/action-executor", summary="Métricas do executor de ações")
+def action_executor_metrics():
+    """Retorna tentativas, novas tentativas agendadas, falhas e as últimas tentativas de cada ação."""
+    return action_executor.metrics()
+
+@router.get("/webhook-inbox", summary="Métricas da caixa de entrada do WhatsApp")
+def webhook_inbox_metrics():
+    """Retorna mensagens gravadas, reentregas, tamanho médio dos grupos de commit, latência da confirmação e resultado do consumo."""
+    return webhook_inbox.metrics()
+
+@router.get("/forecast-cache", summary="Métricas do cache de previsões")
+def forecast_cache_metrics():
+    """Retorna acertos, faltas, previsões truncadas pelo orçamento de CPU e entradas do cache de previsões."""
+    return forecast.stats()
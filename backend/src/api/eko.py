@@ -1,11 +1,15 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List
 import os
 import httpx
 import sentry_sdk
 import redis.asyncio as redis
-from fastapi import APIRouter, HTTPException
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from ..db import SessionLocal
+from ..services.player_digest import cached_player_digest, load_player_digest
+from ..services.llm_gate import LLMAdmissionController, LLMOverloadedError
 
 router = APIRouter(prefix="/eko", tags=["eko"])
 
@@ -18,6 +22,8 @@ class ChatRequest(BaseModel):
     model: str = os.getenv("LLM_MODEL", "llama3.1:8b")
     messages: List[ChatMessage]
     conversation_id: Optional[str] = None
+    # Jogador dono da conversa; quando informado, o digest do estado de jogo é enviado como contexto
+    player_id: Optional[int] = None
     stream: bool = False
 
 class ChatChoice(BaseModel):
@@ -30,6 +36,21 @@ class ChatResponse(BaseModel):
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost")
 redis_client = None
 
+# Controle de admissão: limita chamadas simultâneas ao host do LLM
+LLM_TIMEOUT = float(os.getenv("EKO_LLM_TIMEOUT", "10.0"))
+llm_gate = LLMAdmissionController(
+    max_in_flight=int(os.getenv("EKO_MAX_IN_FLIGHT", "4")),
+    timeout=LLM_TIMEOUT,
+    max_queue=int(os.getenv("EKO_MAX_QUEUE", "100")),
+)
+
+# Fábrica de sessões para reconstruir o digest (create_app passa a do app); None usa SessionLocal.
+# A sessão só é aberta quando o digest não está em cache.
+session_factory: Optional[Callable[[], Session]] = None
+_DIGEST_MISS = object()
+
+FALLBACK_RESPONSE = {"choices": [{"message": {"role": "eko", "content": "Serviço LLM indisponível. Tente novamente mais tarde."}}]}
+
 @router.post("/", response_model=ChatResponse,
              summary="Proxy de chat Eko",
              description="""Recebe mensagens, adiciona contexto de conversa via Redis e encaminha para o LLM.
@@ -42,7 +63,7 @@ Exemplo de resposta:
 { "choices": [{ "message": { "role": "eko", "content": "Hello" } }] }
 ```""")
 async def chat_proxy(request: ChatRequest):
-    """Endpoint que processa chat Eko incluindo contexto Redis."""
+    """Endpoint que processa chat Eko incluindo contexto Redis e digest do jogador."""
     # Prepare conversation context using Redis
     global redis_client
     if request.conversation_id:
@@ -60,38 +81,59 @@ async def chat_proxy(request: ChatRequest):
     else:
         messages_to_send = request.messages
 
+    # Contexto de jogo pré-computado; só consulta o banco se o estado do jogador mudou
+    if request.player_id is not None:
+        digest = cached_player_digest(request.player_id, _DIGEST_MISS)
+        if digest is _DIGEST_MISS:
+            digest = await run_in_threadpool(load_player_digest, session_factory or SessionLocal, request.player_id)
+        if digest:
+            messages_to_send = [ChatMessage(role="system", content=digest)] + list(messages_to_send)
+
     # Build request payload with context
-    req = request.dict()
+    req = request.dict(exclude={"player_id"})
     req["messages"] = [m.dict() for m in messages_to_send]
     ollama_url = os.getenv("OLLAMA_URL", "http://127.0.0.1:11434")
+    # Fila justa por jogador (ou conversa, na falta de player_id)
+    queue_key = str(request.player_id or request.conversation_id or "anon")
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(f"{ollama_url}/v1/chat/completions", json=req)
-            resp.raise_for_status()
-            data = resp.json()
-            # Log prompt and response
-            sentry_sdk.capture_message(f"Prompt: {request.messages}; Response: {data}")
-            # Update Redis store with this interaction
-            if request.conversation_id:
-                key = f"eko:conv:{request.conversation_id}"
-                # Append user messages
-                for m in request.messages:
-                    await redis_client.rpush(key, m.json())
-                # Append assistant response
-                assistant_msg = ChatMessage(
-                    role=data["choices"][0]["message"]["role"],
-                    content=data["choices"][0]["message"]["content"],
-                )
-                await redis_client.rpush(key, assistant_msg.json())
-            return data
+        async with llm_gate.slot(queue_key):
+            async with httpx.AsyncClient(timeout=LLM_TIMEOUT) as client:
+                resp = await client.post(f"{ollama_url}/v1/chat/completions", json=req)
+                resp.raise_for_status()
+                data = resp.json()
+        # Log prompt and response
+        sentry_sdk.capture_message(f"Prompt: {request.messages}; Response: {data}")
+        # Update Redis store with this interaction
+        if request.conversation_id:
+            key = f"eko:conv:{request.conversation_id}"
+            # Append user messages
+            for m in request.messages:
+                await redis_client.rpush(key, m.json())
+            # Append assistant response
+            assistant_msg = ChatMessage(
+                role=data["choices"][0]["message"]["role"],
+                content=data["choices"][0]["message"]["content"],
+            )
+            await redis_client.rpush(key, assistant_msg.json())
+        return data
+    except LLMOverloadedError:
+        # Rejeição antecipada: a espera estimada já passaria do timeout
+        return FALLBACK_RESPONSE
     except httpx.TimeoutException as e:
         sentry_sdk.capture_exception(e)
         # Fallback response on timeout
-        return {"choices": [{"message": {"role": "eko", "content": "Serviço LLM indisponível. Tente novamente mais tarde."}}]}
+        return FALLBACK_RESPONSE
     except httpx.HTTPError as e:
         sentry_sdk.capture_exception(e)
         raise HTTPException(status_code=502, detail=str(e))
 
+@router.get("/metrics",
+            summary="Métricas da fila do Eko",
+            description="Retorna o estado do controle de admissão do LLM: chamadas em andamento, tamanho da fila, tempos de espera e contadores de rejeição.")
+async def eko_metrics():
+    """Snapshot das métricas da fila de acesso ao LLM."""
+    return llm_gate.metrics()
+
 @router.delete("/{conversation_id}",
                summary="Limpar contexto de conversa",
                description="Deleta todo o histórico de conversa no Redis para o conversation_id especificado.\n\nExemplo de uso:\nDELETE /eko/conv1\nResposta:\n{ \"status\": \"cleared\" }")
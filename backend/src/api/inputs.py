@@ -1,17 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from ..db import get_db
-from ..schemas.input import InputCreate, InputOut, InputWithEffectsOut
-from ..crud.input import create_input, get_input, get_inputs, get_all_inputs, delete_input
-from ..services.input_effects import apply_input_effects
+from ..db import get_async_db
+from ..schemas.input import InputBatchCreate, InputCreate, InputOut, InputWithEffectsOut
+from ..repositories import inputs
 
 router = APIRouter()
 
 
 @router.post("/", response_model=InputWithEffectsOut, summary="Apply an input/resource to a planting")
-def create_input_endpoint(input_in: InputCreate, db: Session = Depends(get_db)):
+async def create_input_endpoint(input_in: InputCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Apply an agricultural input/resource (water, fertilizer, compost, etc.) to a planting.
     
@@ -22,39 +21,32 @@ def create_input_endpoint(input_in: InputCreate, db: Session = Depends(get_db)):
     Returns complete details about the input and its effects on soil parameters and plant attributes.
     """
     try:
-        # Criar o registro do insumo
-        input_record = create_input(db, input_in)
-        
-        # Buscar efeitos aplicados para detalhar na resposta
-        effects_info = apply_input_effects(db, input_record)
-        
-        # Construir resposta enriquecida com detalhes dos efeitos
-        response = InputWithEffectsOut(
-            **input_record.__dict__,
-            effects=[
-                {
-                    "parameter": effect["parameter"],
-                    "before": effect["before"],
-                    "after": effect["after"],
-                    "change": effect["change"]
-                } for effect in effects_info.get("effects", [])
-            ],
-            terrain_id=effects_info.get("terrain_id"),
-            quadrant_id=effects_info.get("quadrant_id"),
-            plant_effects=effects_info.get("plant_effects")
-        )
-        
-        return response
+        # Criar o insumo e aplicar os efeitos (uma vez), com o relatório já montado
+        return InputWithEffectsOut(**await inputs.create_input_with_effects(db, input_in))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/batch", response_model=List[InputWithEffectsOut], summary="Apply many inputs at once")
+async def create_inputs_batch_endpoint(batch: InputBatchCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Apply a batch of inputs (e.g. water on 50 plantings) in a single transaction.
+    
+    Effects are summed per terrain and clamped once, neighbor propagation is aggregated
+    per quadrant, and the response has the effects of each input, in the order received.
+    """
+    try:
+        return await inputs.create_inputs_batch(db, batch.inputs)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/", response_model=List[InputOut], summary="Get inputs for a planting")
-def get_inputs_endpoint(
+async def get_inputs_endpoint(
     planting_id: int = Query(None, description="Filter inputs by planting ID"),
     skip: int = 0, 
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Retrieve a list of inputs applied to plantings.
@@ -63,27 +55,27 @@ def get_inputs_endpoint(
     - Otherwise, returns all inputs
     """
     if planting_id is not None:
-        return get_inputs(db, planting_id=planting_id, skip=skip, limit=limit)
-    return get_all_inputs(db, skip=skip, limit=limit)
+        return await inputs.list_planting_inputs(db, planting_id, skip, limit)
+    return await inputs.list_inputs(db, skip, limit)
 
 
 @router.get("/{input_id}", response_model=InputOut, summary="Get a specific input")
-def get_input_endpoint(input_id: int, db: Session = Depends(get_db)):
+async def get_input_endpoint(input_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve details of a specific input by its ID.
     """
-    input_record = get_input(db, input_id)
+    input_record = await inputs.get_input(db, input_id)
     if not input_record:
         raise HTTPException(status_code=404, detail="Input not found")
     return input_record
 
 
 @router.delete("/{input_id}", summary="Delete an input")
-def delete_input_endpoint(input_id: int, db: Session = Depends(get_db)):
+async def delete_input_endpoint(input_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete an input by its ID.
     """
-    success = delete_input(db, input_id)
+    success = await inputs.delete_input(db, input_id)
     if not success:
         raise HTTPException(status_code=404, detail="Input not found")
     return {"message": "Input deleted successfully"}
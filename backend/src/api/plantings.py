@@ -1,51 +1,74 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from ..db import get_db, SessionLocal
-from ..models.planting import Planting
-from ..schemas.planting import PlantingSchema, PlantingCreate, PlantingUpdate
-from ..crud.planting import create_planting, get_planting, get_plantings_by_player, get_plantings_by_quadrant, update_planting, delete_planting
+from ..db import get_async_db
+from ..repositories import plantings
+from ..schemas.planting import PlantingSchema, PlantingCreate, PlantingUpdate, BulkPlantingCreate, BulkPlantingOut, QuadrantFreeSlotsOut, TerrainFreeSlotsOut, PlayerSurvivalOut
+from ..services.survival import SURVIVAL_HORIZON_DAYS, SURVIVAL_RUNS
 
 router = APIRouter(prefix="/plantings", tags=["plantings"])
 
 @router.get("/", response_model=List[PlantingSchema], summary="List Plantings")
-def list_plantings(
+async def list_plantings(
     player_id: Optional[int] = None, 
     quadrant_id: Optional[int] = None, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List plantings with optional filters for player or quadrant"""
     if player_id is not None and quadrant_id is not None:
         # Filter by both player and quadrant
-        return db.query(Planting).filter(
-            Planting.player_id == player_id,
-            Planting.quadrant_id == quadrant_id
-        ).all()
+        return await plantings.list_plantings(db, player_id, quadrant_id)
     elif player_id is not None:
         # Filter by player only
-        return get_plantings_by_player(db, player_id)
+        return await plantings.list_player_plantings(db, player_id)
     elif quadrant_id is not None:
         # Filter by quadrant only
-        return get_plantings_by_quadrant(db, quadrant_id)
+        return await plantings.list_quadrant_plantings(db, quadrant_id)
     else:
         # No filters, return all
-        return db.query(Planting).all()
+        return await plantings.list_plantings(db)
+
+@router.get("/free-slots/quadrant/{quadrant_id}", response_model=QuadrantFreeSlotsOut, summary="Quadrant Free Slots",
+            description="Free slots of a quadrant, answered from the in-memory occupancy index. `finished_slots` still hold a dead or harvested planting and are freed by deleting it.")
+async def quadrant_free_slots_endpoint(quadrant_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Free slots of a quadrant"""
+    report = await plantings.get_free_slots(db, quadrant_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Quadrant not found")
+    return report
+
+@router.get("/free-slots/terrain/{terrain_id}", response_model=TerrainFreeSlotsOut, summary="Terrain Free Slots",
+            description="First `limit` free slots across the quadrants of a terrain, in quadrant order.")
+async def terrain_free_slots_endpoint(terrain_id: int, limit: int = Query(10, ge=1, le=500), db: AsyncSession = Depends(get_async_db)):
+    """First free slots of a terrain"""
+    slots = await plantings.get_first_free_slots(db, terrain_id, limit)
+    return {"terrain_id": terrain_id, "slots": [{"quadrant_id": q, "slot_index": s} for q, s in slots]}
+
+@router.get("/survival/player/{player_id}", response_model=PlayerSurvivalOut, summary="Planting Survival Estimate",
+            description="Monte Carlo estimate, for all active plantings of a player at once, of the probability of reaching maturity (COLHIVEL) within `horizon_days`, with watering drawn from the player's historical cadence. Cached until the next tick or player action.")
+async def planting_survival_endpoint(player_id: int, runs: int = Query(SURVIVAL_RUNS, ge=1),
+                               horizon_days: int = Query(SURVIVAL_HORIZON_DAYS, ge=1), db: AsyncSession = Depends(get_async_db)):
+    """Survival estimate of a player's plantings"""
+    try:
+        return await plantings.get_player_survival(db, player_id, runs, horizon_days)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{planting_id}", response_model=PlantingSchema, summary="Get Planting")
-def get_planting_endpoint(planting_id: int, db: Session = Depends(get_db)):
+async def get_planting_endpoint(planting_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a planting by ID"""
-    planting = get_planting(db, planting_id)
+    planting = await plantings.get_planting(db, planting_id)
     if not planting:
         raise HTTPException(status_code=404, detail="Planting not found")
     return planting
 
 @router.post("/", response_model=PlantingSchema, summary="Create Planting",
              description="Create a new planting in a specific slot within a quadrant.\n\nExample request:\n```json\n{ \"player_id\": 1, \"quadrant_id\": 3, \"slot_index\": 5, \"species_id\": 2 }\n```")
-def create_planting_endpoint(planting: PlantingCreate, db: Session = Depends(get_db)):
+async def create_planting_endpoint(planting: PlantingCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new planting in a specific slot within a quadrant"""
     try:
-        return create_planting(db, planting)
+        return await plantings.create_planting(db, planting)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except IntegrityError:
@@ -54,19 +77,28 @@ def create_planting_endpoint(planting: PlantingCreate, db: Session = Depends(get
             detail=f"Slot {planting.slot_index} in quadrant {planting.quadrant_id} is already occupied"
         )
 
+@router.post("/bulk", response_model=BulkPlantingOut, summary="Bulk Create Plantings",
+             description="Plants many slots in one transaction. Entries without `slot_index` and `auto_fill` requests take the first free slots of the quadrant; occupied slots are reported per item as `conflict`.\n\nExample request:\n```json\n{ \"player_id\": 1, \"entries\": [{ \"quadrant_id\": 3, \"slot_index\": 5, \"species_id\": 2 }], \"auto_fill\": [{ \"quadrant_id\": 4, \"species_id\": 2, \"count\": 10 }] }\n```")
+async def create_plantings_bulk_endpoint(request: BulkPlantingCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create many plantings at once, returning the result of each one"""
+    try:
+        return await plantings.create_plantings_bulk(db, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.put("/{planting_id}", response_model=PlantingSchema, summary="Update Planting")
-def update_planting_endpoint(planting_id: int, planting_data: PlantingUpdate, db: Session = Depends(get_db)):
+async def update_planting_endpoint(planting_id: int, planting_data: PlantingUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update an existing planting"""
-    updated_planting = update_planting(db, planting_id, planting_data)
+    updated_planting = await plantings.update_planting(db, planting_id, planting_data)
     if not updated_planting:
         raise HTTPException(status_code=404, detail="Planting not found")
     return updated_planting
 
 @router.delete("/{planting_id}", status_code=204, summary="Delete Planting")
-def delete_planting_endpoint(planting_id: int, db: Session = Depends(get_db)):
+async def delete_planting_endpoint(planting_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a planting"""
-    planting = get_planting(db, planting_id)
+    planting = await plantings.get_planting(db, planting_id)
     if not planting:
         raise HTTPException(status_code=404, detail="Planting not found")
-    delete_planting(db, planting_id)
+    await plantings.delete_planting(db, planting_id)
     return None
@@ -1,15 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db import get_db
-from ..crud.player import get_player
-from ..crud.player_profile import (
-    get_player_profile_by_user_id,
-    create_player_profile,
-    update_player_profile
-)
+from ..db import get_async_db
+from ..models.player_profile import PlayerProfile
+from ..repositories import profiles
 from ..schemas.player_profile import PlayerProfileCreate, PlayerProfileUpdate, PlayerProfileOut
 
 router = APIRouter(tags=["player_profiles"])
@@ -19,15 +13,13 @@ router = APIRouter(tags=["player_profiles"])
 async def create_profile_endpoint(
     user_id: str,
     profile_in: PlayerProfileCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new profile for a user.
     """
     # Check if profile already exists
-    existing_profile = await run_in_threadpool(
-        get_player_profile_by_user_id, db, user_id
-    )
+    existing_profile = await profiles.get_by_user_id(db, PlayerProfile, user_id)
     
     if existing_profile:
         raise HTTPException(
@@ -40,22 +32,18 @@ async def create_profile_endpoint(
         profile_in.user_id = user_id
         
     # Create the profile
-    return await run_in_threadpool(
-        create_player_profile, db, profile_in
-    )
+    return await profiles.create_record(db, PlayerProfile, profile_in)
 
 
 @router.get("/players/{user_id}/profile", response_model=PlayerProfileOut)
 async def get_profile_endpoint(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a user's profile.
     """
-    profile = await run_in_threadpool(
-        get_player_profile_by_user_id, db, user_id
-    )
+    profile = await profiles.get_by_user_id(db, PlayerProfile, user_id)
     
     if not profile:
         raise HTTPException(
@@ -70,14 +58,12 @@ async def get_profile_endpoint(
 async def update_profile_endpoint(
     user_id: str,
     profile_update: PlayerProfileUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a user's profile.
     """
-    profile = await run_in_threadpool(
-        get_player_profile_by_user_id, db, user_id
-    )
+    profile = await profiles.get_by_user_id(db, PlayerProfile, user_id)
     
     if not profile:
         raise HTTPException(
@@ -85,8 +71,6 @@ async def update_profile_endpoint(
             detail="Profile not found"
         )
     
-    updated_profile = await run_in_threadpool(
-        update_player_profile, db, user_id, profile_update
-    )
+    updated_profile = await profiles.update_record(db, PlayerProfile, user_id, profile_update)
     
     return updated_profile
@@ -1,14 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db import get_db
-from ..crud.player_progress import (
-    get_player_progress_by_user_id,
-    create_player_progress,
-    update_player_progress
-)
+from ..db import get_async_db
+from ..models.player_progress import PlayerProgress
+from ..repositories import profiles
 from ..schemas.player_progress import PlayerProgressCreate, PlayerProgressUpdate, PlayerProgressOut
 
 router = APIRouter(tags=["player_progress"])
@@ -18,15 +13,13 @@ router = APIRouter(tags=["player_progress"])
 async def create_progress_endpoint(
     user_id: str,
     progress_in: PlayerProgressCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new progress record for a user.
     """
     # Check if progress record already exists
-    existing_progress = await run_in_threadpool(
-        get_player_progress_by_user_id, db, user_id
-    )
+    existing_progress = await profiles.get_by_user_id(db, PlayerProgress, user_id)
     
     if existing_progress:
         raise HTTPException(
@@ -39,22 +32,18 @@ async def create_progress_endpoint(
         progress_in.user_id = user_id
         
     # Create the progress record
-    return await run_in_threadpool(
-        create_player_progress, db, progress_in
-    )
+    return await profiles.create_record(db, PlayerProgress, progress_in)
 
 
 @router.get("/players/{user_id}/progress", response_model=PlayerProgressOut)
 async def get_progress_endpoint(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a user's progress.
     """
-    progress = await run_in_threadpool(
-        get_player_progress_by_user_id, db, user_id
-    )
+    progress = await profiles.get_by_user_id(db, PlayerProgress, user_id)
     
     if not progress:
         raise HTTPException(
@@ -69,14 +58,12 @@ async def get_progress_endpoint(
 async def update_progress_endpoint(
     user_id: str,
     progress_update: PlayerProgressUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a user's progress.
     """
-    progress = await run_in_threadpool(
-        get_player_progress_by_user_id, db, user_id
-    )
+    progress = await profiles.get_by_user_id(db, PlayerProgress, user_id)
     
     if not progress:
         raise HTTPException(
@@ -84,8 +71,6 @@ async def update_progress_endpoint(
             detail="Progress record not found"
         )
     
-    updated_progress = await run_in_threadpool(
-        update_player_progress, db, user_id, progress_update
-    )
+    updated_progress = await profiles.update_record(db, PlayerProgress, user_id, progress_update)
     
     return updated_progress
@@ -1,14 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db import get_db
-from ..crud.player_settings import (
-    get_player_settings_by_user_id,
-    create_player_settings,
-    update_player_settings
-)
+from ..db import get_async_db
+from ..models.player_settings import PlayerSettings
+from ..repositories import profiles
 from ..schemas.player_settings import PlayerSettingsCreate, PlayerSettingsUpdate, PlayerSettingsOut
 
 router = APIRouter(tags=["player_settings"])
@@ -18,15 +13,13 @@ router = APIRouter(tags=["player_settings"])
 async def create_settings_endpoint(
     user_id: str,
     settings_in: PlayerSettingsCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create new settings for a user.
     """
     # Check if settings already exist
-    existing_settings = await run_in_threadpool(
-        get_player_settings_by_user_id, db, user_id
-    )
+    existing_settings = await profiles.get_by_user_id(db, PlayerSettings, user_id)
     
     if existing_settings:
         raise HTTPException(
@@ -39,22 +32,18 @@ async def create_settings_endpoint(
         settings_in.user_id = user_id
         
     # Create the settings
-    return await run_in_threadpool(
-        create_player_settings, db, settings_in
-    )
+    return await profiles.create_record(db, PlayerSettings, settings_in)
 
 
 @router.get("/players/{user_id}/settings", response_model=PlayerSettingsOut)
 async def get_settings_endpoint(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a user's settings.
     """
-    settings = await run_in_threadpool(
-        get_player_settings_by_user_id, db, user_id
-    )
+    settings = await profiles.get_by_user_id(db, PlayerSettings, user_id)
     
     if not settings:
         raise HTTPException(
@@ -69,14 +58,12 @@ async def get_settings_endpoint(
 async def update_settings_endpoint(
     user_id: str,
     settings_update: PlayerSettingsUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a user's settings.
     """
-    settings = await run_in_threadpool(
-        get_player_settings_by_user_id, db, user_id
-    )
+    settings = await profiles.get_by_user_id(db, PlayerSettings, user_id)
     
     if not settings:
         raise HTTPException(
@@ -84,8 +71,6 @@ async def update_settings_endpoint(
             detail="Settings not found"
         )
     
-    updated_settings = await run_in_threadpool(
-        update_player_settings, db, user_id, settings_update
-    )
+    updated_settings = await profiles.update_record(db, PlayerSettings, user_id, settings_update)
     
     return updated_settings
@@ -1,35 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from starlette.concurrency import run_in_threadpool
-from ..db import get_db
-from ..crud.purchase import create_purchase, get_purchases, get_purchase
-from ..schemas.purchase import PurchaseCreate, PurchaseOut
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import get_async_db
+from ..repositories import purchases
+from ..schemas.purchase import CartCheckout, CheckoutOut, PurchaseCreate, PurchaseOut
 
 router = APIRouter(prefix="/purchases", tags=["purchases"])
 
 @router.post("/", response_model=PurchaseOut,
              summary="Create Purchase",
              description="Creates a new purchase and debits player balance.\n\nExample request:\n```json\n{ \"player_id\": 1, \"item_id\": 2, \"quantity\": 3 }\n```\nExample response:\n```json\n{ \"id\": 1, \"player_id\": 1, \"item_id\": 2, \"quantity\": 3, \"total_price\": 30.0 }\n```")
-async def create_purchase_endpoint(purchase: PurchaseCreate, db: Session = Depends(get_db)):
+async def create_purchase_endpoint(
+    purchase: PurchaseCreate,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=64),
+):
     """Creates a purchase if player has sufficient balance, else raises HTTPException."""
     try:
-        return await run_in_threadpool(create_purchase, db, purchase)
+        return await purchases.create_purchase(db, purchase, idempotency_key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/checkout", response_model=CheckoutOut,
+             summary="Checkout Cart",
+             description="Buys every item in the cart in a single transaction: one price lookup, one balance debit, bulk inserts of purchases, granted items and ledger entries.\n\nExample request:\n```json\n{ \"player_id\": 1, \"items\": [{ \"shop_item_id\": 2, \"quantity\": 3 }, { \"shop_item_id\": 5, \"quantity\": 1 }] }\n```")
+async def checkout_endpoint(
+    cart: CartCheckout,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=60),
+):
+    """Checks out the whole cart atomically, else raises HTTPException."""
+    try:
+        return await purchases.checkout_cart(db, cart, idempotency_key)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", response_model=list[PurchaseOut],
             summary="List Purchases",
             description="Retrieves a list of purchases with pagination.\n\nExample response:\n```json\n[{ \"id\": 1, \"player_id\": 1, \"item_id\": 2, \"quantity\": 3, \"total_price\": 30.0 }]\n```")
-async def list_purchases(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def list_purchases(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
     """Returns a list of purchases."""
-    return await run_in_threadpool(get_purchases, db, skip, limit)
+    return await purchases.list_purchases(db, skip, limit)
 
 @router.get("/{purchase_id}", response_model=PurchaseOut,
             summary="Get Purchase",
             description="Retrieves a single purchase by its ID.\n\nExample path: `/purchases/1`\nExample response:\n```json\n{ \"id\": 1, \"player_id\": 1, \"item_id\": 2, \"quantity\": 3, \"total_price\": 30.0 }\n```")
-async def get_purchase_endpoint(purchase_id: int, db: Session = Depends(get_db)):
+async def get_purchase_endpoint(purchase_id: int, db: AsyncSession = Depends(get_async_db)):
     """Fetches a purchase by ID, raises if not found."""
-    p = await run_in_threadpool(get_purchase, db, purchase_id)
+    p = await purchases.get_purchase(db, purchase_id)
     if not p:
         raise HTTPException(status_code=404, detail="Purchase not found")
     return p
@@ -1,11 +1,12 @@
 from typing import Dict
-from fastapi import APIRouter
-from ..services.plant_lifecycle import load_species_params
+from fastapi import APIRouter, Request
+from ..services import catalog_cache
 from ..schemas.species import SpeciesSchema
 
 router = APIRouter(prefix="/species", tags=["species"])
 
 @router.get("/", response_model=Dict[str, SpeciesSchema], summary="List Species", description="Retorna todos os parâmetros das espécies configuradas em species.yml")
-def list_species():
-    """Lista parâmetros de todas as espécies."""
-    return load_species_params("src/data/species.yml")
+def list_species(request: Request):
+    """Lista parâmetros de todas as espécies (cache recarregado quando species.yml muda)."""
+    catalog = catalog_cache.species_catalog()
+    return catalog_cache.cached_response(request, catalog, catalog.data)
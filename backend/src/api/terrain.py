@@ -1,36 +1,39 @@
-from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException
-from starlette.concurrency import run_in_threadpool
-from sqlalchemy.orm import Session
-from ..db import get_db
-from ..crud.terrain import create_terrain, get_terrain, get_terrains, update_terrain_crud, delete_terrain
-from ..crud.terrain_parameters import get_terrain_parameters, get_terrain_health_report
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import get_async_db
+from ..repositories import terrains
 from ..schemas.terrain import TerrainCreate, TerrainUpdate, TerrainOut
 from ..schemas.soil_health import SoilHealthReport
 from ..schemas.terrain_parameters import TerrainParametersWithHealthOut
+from ..schemas.soil_series import SoilSeriesOut
+from ..schemas.forecast import ForecastOut, ForecastRequest
+from ..services.forecast import forecast_terrain_async
+from ..services.soil_series import MAX_POINTS, query_series_async
 
 router = APIRouter(prefix="/terrains", tags=["terrains"])
 
 @router.post("/", response_model=TerrainOut,
              summary="Create Terrain",
              description="Creates a new terrain for a player.\n\nExample request:\n```json\n{ \"player_id\": 1, \"name\": \"Forest\", \"x_coordinate\": 1.0, \"y_coordinate\": 2.0, \"access_type\": \"pub\" }\n```")
-async def create_terrain_endpoint(terrain: TerrainCreate, db: Session = Depends(get_db)):
+async def create_terrain_endpoint(terrain: TerrainCreate, db: AsyncSession = Depends(get_async_db)):
     """Creates a new terrain record."""
-    return await run_in_threadpool(create_terrain, db, terrain)
+    return await terrains.create_terrain(db, terrain)
 
 @router.get("/", response_model=List[TerrainOut],
             summary="List Terrains",
             description="Retrieves a list of terrains with pagination.")
-async def list_terrains(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def list_terrains(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
     """Returns a list of terrains."""
-    return await run_in_threadpool(get_terrains, db, skip, limit)
+    return await terrains.list_terrains(db, skip, limit)
 
 @router.get("/{terrain_id}", response_model=TerrainOut,
             summary="Get Terrain",
             description="Retrieves a terrain by its ID.")
-async def get_terrain_endpoint(terrain_id: int, db: Session = Depends(get_db)):
+async def get_terrain_endpoint(terrain_id: int, db: AsyncSession = Depends(get_async_db)):
     """Fetches a terrain by ID."""
-    db_terrain = await run_in_threadpool(get_terrain, db, terrain_id)
+    db_terrain = await terrains.get_terrain(db, terrain_id)
     if not db_terrain:
         raise HTTPException(status_code=404, detail="Terrain not found")
     return db_terrain
@@ -38,9 +41,9 @@ async def get_terrain_endpoint(terrain_id: int, db: Session = Depends(get_db)):
 @router.put("/{terrain_id}", response_model=TerrainOut,
             summary="Update Terrain",
             description="Updates terrain fields.\n\nExample request:\n```json\n{ \"name\": \"NewForest\" }\n```")
-async def update_terrain_endpoint(terrain_id: int, terrain_update: TerrainUpdate, db: Session = Depends(get_db)):
+async def update_terrain_endpoint(terrain_id: int, terrain_update: TerrainUpdate, db: AsyncSession = Depends(get_async_db)):
     """Updates an existing terrain."""
-    db_terrain = await run_in_threadpool(update_terrain_crud, db, terrain_id, terrain_update)
+    db_terrain = await terrains.update_terrain(db, terrain_id, terrain_update)
     if not db_terrain:
         raise HTTPException(status_code=404, detail="Terrain not found")
     return db_terrain
@@ -48,45 +51,78 @@ async def update_terrain_endpoint(terrain_id: int, terrain_update: TerrainUpdate
 @router.delete("/{terrain_id}", status_code=204,
                summary="Delete Terrain",
                description="Deletes a terrain by its ID.")
-async def delete_terrain_endpoint(terrain_id: int, db: Session = Depends(get_db)):
+async def delete_terrain_endpoint(terrain_id: int, db: AsyncSession = Depends(get_async_db)):
     """Deletes a terrain record."""
-    await run_in_threadpool(delete_terrain, db, terrain_id)
+    await terrains.delete_terrain(db, terrain_id)
     return None
 
 @router.get("/{terrain_id}/soil-health", response_model=SoilHealthReport,
             summary="Soil Health Index",
             description="Retorna um relatório de saúde do solo para o terreno, incluindo índice de saúde, categoria e alertas.")
-async def get_soil_health_endpoint(terrain_id: int, db: Session = Depends(get_db)):
+async def get_soil_health_endpoint(terrain_id: int, db: AsyncSession = Depends(get_async_db)):
     """Retorna o índice de saúde do solo para um terreno."""
     # Verificar se o terreno existe
-    db_terrain = await run_in_threadpool(get_terrain, db, terrain_id)
+    db_terrain = await terrains.get_terrain(db, terrain_id)
     if not db_terrain:
         raise HTTPException(status_code=404, detail="Terreno não encontrado")
     
     # Obter o relatório de saúde do solo
-    health_report = await run_in_threadpool(get_terrain_health_report, db, terrain_id)
+    health_report = await terrains.get_terrain_health_report(db, terrain_id)
     return health_report
 
 @router.get("/{terrain_id}/parameters-with-health", response_model=TerrainParametersWithHealthOut,
             summary="Terrain Parameters with Health Report",
             description="Retorna os parâmetros do terreno junto com o relatório de saúde do solo.")
-async def get_terrain_params_with_health(terrain_id: int, db: Session = Depends(get_db)):
+async def get_terrain_params_with_health(terrain_id: int, db: AsyncSession = Depends(get_async_db)):
     """Retorna os parâmetros do terreno junto com relatório de saúde."""
     # Verificar se o terreno existe
-    db_terrain = await run_in_threadpool(get_terrain, db, terrain_id)
+    db_terrain = await terrains.get_terrain(db, terrain_id)
     if not db_terrain:
         raise HTTPException(status_code=404, detail="Terreno não encontrado")
     
     # Obter os parâmetros do terreno
-    terrain_params = await run_in_threadpool(get_terrain_parameters, db, terrain_id)
+    terrain_params = await terrains.get_terrain_parameters(db, terrain_id)
     if not terrain_params:
         raise HTTPException(status_code=404, detail="Parâmetros do terreno não encontrados")
     
     # Obter o relatório de saúde do solo
-    health_report = await run_in_threadpool(get_terrain_health_report, db, terrain_id)
+    health_report = await terrains.get_terrain_health_report(db, terrain_id)
     
     # Converter para o schema de saída e adicionar o relatório de saúde
     result = TerrainParametersWithHealthOut.from_orm(terrain_params)
     result.health_report = health_report
     
     return result
+
+@router.get("/{terrain_id}/soil-series", response_model=SoilSeriesOut,
+            summary="Soil Parameter Time Series",
+            description="Retorna a série histórica dos parâmetros do solo do terreno (ou de um quadrante), reamostrada por hora, dia ou semana.")
+async def get_soil_series_endpoint(
+    terrain_id: int,
+    start: Optional[datetime] = Query(None, description="Início do intervalo (padrão: 7 dias atrás)"),
+    end: Optional[datetime] = Query(None, description="Fim do intervalo (padrão: agora)"),
+    quadrant_id: Optional[int] = Query(None, description="Série de um quadrante em vez do terreno inteiro"),
+    resolution: Optional[str] = Query(None, description="hour, day ou week (padrão: pelo tamanho do intervalo)"),
+    max_points: int = Query(MAX_POINTS, ge=1, le=MAX_POINTS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Retorna a série temporal dos parâmetros do solo."""
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=7)
+    try:
+        return await query_series_async(db, terrain_id, start, end, quadrant_id, resolution, max_points)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{terrain_id}/forecast", response_model=ForecastOut,
+             summary="Terrain Forecast",
+             description="Projeta os próximos dias do terreno (deterioração sazonal, clima esperado ou percentis Monte Carlo e estados dos plantios) com insumos hipotéticos, sem alterar o banco.\n\nExample request:\n```json\n{ \"days\": 14, \"mode\": \"monte_carlo\", \"runs\": 50, \"inputs\": [{ \"planting_id\": 1, \"type\": \"água\", \"quantity\": 5 }] }\n```")
+async def forecast_terrain_endpoint(terrain_id: int, request: ForecastRequest, db: AsyncSession = Depends(get_async_db)):
+    """Simula o terreno em memória a partir do estado atual."""
+    db_terrain = await terrains.get_terrain(db, terrain_id)
+    if not db_terrain:
+        raise HTTPException(status_code=404, detail="Terreno não encontrado")
+    try:
+        return await forecast_terrain_async(db, terrain_id, db_terrain.player_id, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
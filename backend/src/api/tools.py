@@ -1,43 +1,45 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from starlette.concurrency import run_in_threadpool
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db import get_db
-from ..crud.tool import create_tool, get_tool, get_tools, update_tool, delete_tool, get_tool_by_key
+from ..db import get_async_db
+from ..repositories import tools
 from ..schemas.tool import ToolCreate, ToolOut
+from ..services import catalog_cache
 
 router = APIRouter(prefix="/tools", tags=["tools"])
 
 
 @router.post("/", response_model=ToolOut)
-async def create_tool_endpoint(tool_in: ToolCreate, db: Session = Depends(get_db)):
+async def create_tool_endpoint(tool_in: ToolCreate, db: AsyncSession = Depends(get_async_db)):
     """Cria uma nova ferramenta."""
-    return await run_in_threadpool(create_tool, db, tool_in)
+    return await tools.create_tool(db, tool_in)
 
 @router.get("/", response_model=List[ToolOut])
-async def list_tools(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista ferramentas, com paginação."""
-    return await run_in_threadpool(get_tools, db, skip, limit)
+async def list_tools(request: Request, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    """Lista ferramentas, com paginação, a partir do cache do catálogo (com ETag)."""
+    catalog = await catalog_cache.ensure_loaded(db, catalog_cache.TOOLS)
+    return catalog_cache.page_response(request, catalog, skip, limit)
 
 @router.get("/{tool_id}", response_model=ToolOut)
-async def get_tool_endpoint(tool_id: int, db: Session = Depends(get_db)):
-    """Retorna uma ferramenta por ID."""
-    tool = await run_in_threadpool(get_tool, db, tool_id)
+async def get_tool_endpoint(request: Request, tool_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Retorna uma ferramenta por ID a partir do cache do catálogo."""
+    catalog = await catalog_cache.ensure_loaded(db, catalog_cache.TOOLS)
+    tool = catalog.by_id.get(tool_id)
     if not tool:
         raise HTTPException(status_code=404, detail="Tool not found")
-    return tool
+    return catalog_cache.item_response(request, catalog, tool)
 
 @router.put("/{tool_id}", response_model=ToolOut)
-async def update_tool_endpoint(tool_id: int, tool_in: ToolCreate, db: Session = Depends(get_db)):
+async def update_tool_endpoint(tool_id: int, tool_in: ToolCreate, db: AsyncSession = Depends(get_async_db)):
     """Atualiza uma ferramenta existente."""
-    tool = await run_in_threadpool(update_tool, db, tool_id, tool_in)
+    tool = await tools.update_tool(db, tool_id, tool_in)
     if not tool:
         raise HTTPException(status_code=404, detail="Tool not found")
     return tool
 
 @router.delete("/{tool_id}", status_code=204)
-async def delete_tool_endpoint(tool_id: int, db: Session = Depends(get_db)):
+async def delete_tool_endpoint(tool_id: int, db: AsyncSession = Depends(get_async_db)):
     """Remove uma ferramenta."""
-    await run_in_threadpool(delete_tool, db, tool_id)
+    await tools.delete_tool(db, tool_id)
     return None
\ No newline at end of file
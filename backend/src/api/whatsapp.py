@@ -1,31 +1,22 @@
 from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
-from ..schemas.whatsapp import WhatsappMessageIn, WhatsappMessageOut
+from ..schemas.whatsapp import WhatsappMessageIn, WhatsappMessageOut, WhatsappWebhookAck, WhatsappWebhookIn
 from ..services.terrain_service import update_terrain
-from ..services.action_registry import registry
-import os
-from datetime import datetime, timedelta
-from ..db import get_db_override
+from ..services.command_parser import parse_command
+from ..services.webhook_inbox import LIMIT_REPLY, consume_action_quota, webhook_inbox
+from datetime import datetime
+from ..db import SessionLocal
 from ..crud.terrain import get_terrain
 
-PLAYER_ACTION_LIMIT = int(os.getenv("PLAYER_ACTION_LIMIT", "10"))
-
 router = APIRouter(prefix="/whatsapp", tags=["whatsapp"])
 
 @router.post("/message", response_model=WhatsappMessageOut)
 def whatsapp_message_endpoint(payload: WhatsappMessageIn, background_tasks: BackgroundTasks):
     """Endpoint WhatsApp: registra ação ou ferramenta."""
-    # Extrai comando, terreno e ferramenta
-    action_name = payload.command
-    terrain_id = payload.terrain_id
-    tool_key = payload.tool_key
-
-    # Se não vier command explícito, parseia da message
-    if not action_name or not terrain_id:
-        text = payload.message or ""
-        tokens = text.lower().strip().split()
-        action_name = tokens[0] if tokens else ""
-        terrain_id = int(tokens[1]) if len(tokens) > 1 and tokens[1].isdigit() else 1
-        tool_key = tokens[2] if len(tokens) > 2 else tool_key
+    # Interpreta e valida o comando antes de qualquer acesso ao banco
+    parsed = parse_command(payload.message, payload.command, payload.terrain_id, payload.tool_key)
+    if not parsed.ok:
+        return WhatsappMessageOut(reply=parsed.error)
+    action_name, terrain_id, tool_key = parsed.action, parsed.terrain_id, parsed.tool_key
 
     # Ciclo de 6h e limite de ações
     db = SessionLocal()
@@ -34,20 +25,32 @@ def whatsapp_message_endpoint(payload: WhatsappMessageIn, background_tasks: Back
         if not terrain_obj:
             raise HTTPException(status_code=404, detail="Terrain not found")
 
-        player = terrain_obj.player
-        now = datetime.now()
-        if player.cycle_start + timedelta(hours=6) <= now:
-            player.cycle_start = now
-            player.actions_count = 0
-
-        if player.actions_count >= PLAYER_ACTION_LIMIT:
-            raise HTTPException(status_code=429, detail="Limite de ações deste ciclo atingido")
-
-        player.actions_count += 1
+        if not consume_action_quota(terrain_obj.player, datetime.now()):
+            raise HTTPException(status_code=429, detail=LIMIT_REPLY)
         db.commit()
     finally:
         db.close()
 
     # Enfileira a execução, passando tool_key
     background_tasks.add_task(update_terrain, action_name, terrain_id, tool_key)
-    return WhatsappMessageOut(reply="Ação registrada com sucesso!")
\ No newline at end of file
+    reply = "Ação registrada com sucesso!"
+    if parsed.corrected:
+        reply += f" (entendido: {action_name} {terrain_id}{' ' + tool_key if tool_key else ''})"
+    return WhatsappMessageOut(reply=reply)
+
+
+@router.post("/webhook", response_model=WhatsappWebhookAck)
+def whatsapp_webhook_endpoint(payload: WhatsappWebhookIn):
+    """
+    Webhook do provedor: grava a mensagem na caixa de entrada e confirma na hora.
+
+    Reentregas do mesmo `message_id` são confirmadas como `duplicate` sem nova gravação.
+    Interpretação, limite de ações e execução acontecem depois, em lote (services.webhook_inbox).
+    """
+    body = payload.dict(exclude={"message_id", "phone_number"}, exclude_none=True)
+    try:
+        status = webhook_inbox.append(payload.message_id, body, payload.phone_number)
+    except RuntimeError as e:
+        # Sem confirmação o provedor reenvia
+        raise HTTPException(status_code=503, detail=str(e))
+    return WhatsappWebhookAck(status=status)
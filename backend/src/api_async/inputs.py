@@ -3,9 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from ..db import get_async_db
-from ..schemas.input import InputCreate, InputOut, InputWithEffectsOut
-from ..crud_async.input import create_input, get_input, get_inputs, get_all_inputs, delete_input
-from ..services.input_effects import apply_input_effects_async
+from ..schemas.input import InputBatchCreate, InputCreate, InputOut, InputWithEffectsOut
+from ..crud_async.input import create_input_with_effects, create_inputs_batch, get_input, get_inputs, get_all_inputs, delete_input
 
 router = APIRouter()
 
@@ -22,29 +21,22 @@ async def create_input_endpoint(input_in: InputCreate, db: AsyncSession = Depend
     Returns complete details about the input and its effects on soil parameters and plant attributes.
     """
     try:
-        # Criar o registro do insumo
-        input_record = await create_input(db, input_in)
-        
-        # Buscar efeitos aplicados para detalhar na resposta
-        effects_info = await apply_input_effects_async(db, input_record)
-        
-        # Construir resposta enriquecida com detalhes dos efeitos
-        response = InputWithEffectsOut(
-            **input_record.__dict__,
-            effects=[
-                {
-                    "parameter": effect["parameter"],
-                    "before": effect["before"],
-                    "after": effect["after"],
-                    "change": effect["change"]
-                } for effect in effects_info.get("effects", [])
-            ],
-            terrain_id=effects_info.get("terrain_id"),
-            quadrant_id=effects_info.get("quadrant_id"),
-            plant_effects=effects_info.get("plant_effects")
-        )
-        
-        return response
+        # Criar o insumo e aplicar os efeitos (uma vez), com o relatório já montado
+        return InputWithEffectsOut(**await create_input_with_effects(db, input_in))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/batch", response_model=List[InputWithEffectsOut], summary="Apply many inputs at once")
+async def create_inputs_batch_endpoint(batch: InputBatchCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Apply a batch of inputs (e.g. water on 50 plantings) in a single transaction.
+    
+    Effects are summed per terrain and clamped once, neighbor propagation is aggregated
+    per quadrant, and the response has the effects of each input, in the order received.
+    """
+    try:
+        return await create_inputs_batch(db, batch.inputs)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -5,10 +5,14 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy import select
 
 from ..db import get_async_db
+from ..db_replicas import get_async_read_db
 from ..models.planting import Planting
-from ..schemas.planting import PlantingSchema, PlantingCreate, PlantingUpdate
+from ..schemas.planting import PlantingSchema, PlantingCreate, PlantingUpdate, BulkPlantingCreate, BulkPlantingOut, QuadrantFreeSlotsOut, TerrainFreeSlotsOut
 from ..crud_async.planting import (
     create_planting_async,
+    create_plantings_bulk_async,
+    get_free_slots_async,
+    get_first_free_slots_async,
     get_planting_async,
     get_plantings_by_player_async,
     get_plantings_by_quadrant_async,
@@ -22,7 +26,7 @@ router = APIRouter(prefix="/async/plantings", tags=["plantings"])
 async def list_plantings_async(
     player_id: Optional[int] = None,
     quadrant_id: Optional[int] = None,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """List plantings with optional filters for player or quadrant (async)"""
     if player_id is not None and quadrant_id is not None:
@@ -45,9 +49,29 @@ async def list_plantings_async(
         result = await db.execute(select(Planting))
         return result.scalars().all()
 
+@router.get("/free-slots/quadrant/{quadrant_id}", response_model=QuadrantFreeSlotsOut)
+async def quadrant_free_slots_async_endpoint(
+    quadrant_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    """Free slots of a quadrant, from the occupancy index (async)"""
+    report = await get_free_slots_async(db, quadrant_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Quadrant not found")
+    return report
+
+@router.get("/free-slots/terrain/{terrain_id}", response_model=TerrainFreeSlotsOut)
+async def terrain_free_slots_async_endpoint(
+    terrain_id: int,
+    limit: int = Query(10, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """First free slots across the quadrants of a terrain (async)"""
+    slots = await get_first_free_slots_async(db, terrain_id, limit)
+    return {"terrain_id": terrain_id, "slots": [{"quadrant_id": q, "slot_index": s} for q, s in slots]}
+
 @router.get("/{planting_id}", response_model=PlantingSchema)
 async def get_planting_async_endpoint(
-    planting_id: int, db: AsyncSession = Depends(get_async_db)
+    planting_id: int, db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get a planting by ID (async)"""
     planting = await get_planting_async(db, planting_id)
@@ -70,6 +94,16 @@ async def create_planting_async_endpoint(
             detail=f"Slot {planting.slot_index} in quadrant {planting.quadrant_id} is already occupied"
         )
 
+@router.post("/bulk", response_model=BulkPlantingOut)
+async def create_plantings_bulk_async_endpoint(
+    request: BulkPlantingCreate, db: AsyncSession = Depends(get_async_db)
+):
+    """Create many plantings at once, returning the result of each one (async)"""
+    try:
+        return await create_plantings_bulk_async(db, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.put("/{planting_id}", response_model=PlantingSchema)
 async def update_planting_async_endpoint(
     planting_id: int,
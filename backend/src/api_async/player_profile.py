@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db import get_db
+from ..db import get_async_db
 from ..crud_async.player_profile import (
     get_player_profile_by_user_id,
     create_player_profile,
@@ -17,7 +16,7 @@ router = APIRouter(tags=["player_profiles"])
 async def create_profile_endpoint(
     user_id: str,
     profile_in: PlayerProfileCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new profile for a user.
@@ -42,7 +41,7 @@ async def create_profile_endpoint(
 @router.get("/players/{user_id}/profile", response_model=PlayerProfileOut)
 async def get_profile_endpoint(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a user's profile.
@@ -62,7 +61,7 @@ async def get_profile_endpoint(
 async def update_profile_endpoint(
     user_id: str,
     profile_update: PlayerProfileUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a user's profile.
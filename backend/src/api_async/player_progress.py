@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db import get_db
+from ..db import get_async_db
 from ..crud_async.player_progress import (
     get_player_progress_by_user_id,
     create_player_progress,
@@ -17,7 +16,7 @@ router = APIRouter(tags=["player_progress"])
 async def create_progress_endpoint(
     user_id: str,
     progress_in: PlayerProgressCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new progress record for a user.
@@ -42,7 +41,7 @@ async def create_progress_endpoint(
 @router.get("/players/{user_id}/progress", response_model=PlayerProgressOut)
 async def get_progress_endpoint(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a user's progress.
@@ -62,7 +61,7 @@ async def get_progress_endpoint(
 async def update_progress_endpoint(
     user_id: str,
     progress_update: PlayerProgressUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a user's progress.
@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db import get_db
+from ..db import get_async_db
 from ..crud_async.player_settings import (
     get_player_settings_by_user_id,
     create_player_settings,
@@ -17,7 +16,7 @@ router = APIRouter(tags=["player_settings"])
 async def create_settings_endpoint(
     user_id: str,
     settings_in: PlayerSettingsCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create new settings for a user.
@@ -42,7 +41,7 @@ async def create_settings_endpoint(
 @router.get("/players/{user_id}/settings", response_model=PlayerSettingsOut)
 async def get_settings_endpoint(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a user's settings.
@@ -62,7 +61,7 @@ async def get_settings_endpoint(
 async def update_settings_endpoint(
     user_id: str,
     settings_update: PlayerSettingsUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a user's settings.
@@ -1,15 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..db import get_async_db
-from ..crud_async.purchase import create_purchase_async, get_purchases_async, get_purchase_async
-from ..schemas.purchase import PurchaseCreate, PurchaseOut
+from ..crud_async.purchase import checkout_cart_async, create_purchase_async, get_purchases_async, get_purchase_async
+from ..schemas.purchase import CartCheckout, CheckoutOut, PurchaseCreate, PurchaseOut
 
 router = APIRouter(prefix="/async/purchases", tags=["purchases"])
 
 @router.post("/", response_model=PurchaseOut)
-async def create_purchase_async_endpoint(purchase: PurchaseCreate, db: AsyncSession = Depends(get_async_db)):
+async def create_purchase_async_endpoint(
+    purchase: PurchaseCreate,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=64),
+):
     try:
-        return await create_purchase_async(db, purchase)
+        return await create_purchase_async(db, purchase, idempotency_key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/checkout", response_model=CheckoutOut)
+async def checkout_async_endpoint(
+    cart: CartCheckout,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=60),
+):
+    try:
+        return await checkout_cart_async(db, cart, idempotency_key)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -2,6 +2,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..db import get_async_db
+from ..db_replicas import get_async_read_db
 from ..crud_async.quadrant import (
     create_quadrant_async,
     get_quadrant_async,
@@ -27,14 +28,14 @@ async def list_quadrants_async(
     terrain_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Returns a list of quadrants for a terrain."""
     return await get_quadrants_async(db, terrain_id, skip, limit)
 
 @router.get("/{quadrant_id}", response_model=QuadrantOut)
 async def get_quadrant_async_endpoint(
-    quadrant_id: int, db: AsyncSession = Depends(get_async_db)
+    quadrant_id: int, db: AsyncSession = Depends(get_async_read_db)
 ):
     """Fetches a quadrant by ID."""
     quadrant = await get_quadrant_async(db, quadrant_id)
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..db import get_async_db
-from ..crud_async.shop_item import create_shop_item_async, get_shop_items_async, get_shop_item_async
+from ..crud_async.shop_item import create_shop_item_async
 from ..schemas.shop_item import ShopItemCreate, ShopItemOut
+from ..services import catalog_cache
 
 router = APIRouter(prefix="/async/shop-items", tags=["shop_items"])
 
@@ -11,12 +12,14 @@ async def create_shop_item_async_endpoint(item: ShopItemCreate, db: AsyncSession
     return await create_shop_item_async(db, item)
 
 @router.get("/", response_model=list[ShopItemOut])
-async def list_shop_items_async(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
-    return await get_shop_items_async(db, skip, limit)
+async def list_shop_items_async(request: Request, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    catalog = await catalog_cache.ensure_loaded(db, catalog_cache.SHOP_ITEMS)
+    return catalog_cache.page_response(request, catalog, skip, limit)
 
 @router.get("/{item_id}", response_model=ShopItemOut)
-async def get_shop_item_async_endpoint(item_id: int, db: AsyncSession = Depends(get_async_db)):
-    item = await get_shop_item_async(db, item_id)
+async def get_shop_item_async_endpoint(request: Request, item_id: int, db: AsyncSession = Depends(get_async_db)):
+    catalog = await catalog_cache.ensure_loaded(db, catalog_cache.SHOP_ITEMS)
+    item = catalog.by_id.get(item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    return item
+    return catalog_cache.item_response(request, catalog, item)
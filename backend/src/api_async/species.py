@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from ..db import get_async_db
+from ..db_replicas import get_async_read_db
 from ..models.species import Species
 from ..schemas.species import SpeciesSchema, SpeciesCreate, SpeciesUpdate
 
@@ -25,7 +26,7 @@ async def create_species(
 async def list_species(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """List all species asynchronously with pagination."""
     result = await db.execute(select(Species).offset(skip).limit(limit))
@@ -34,7 +35,7 @@ async def list_species(
 @router.get("/{species_id}", response_model=SpeciesSchema)
 async def get_species(
     species_id: int,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get a species by ID asynchronously."""
     result = await db.execute(select(Species).where(Species.id == species_id))
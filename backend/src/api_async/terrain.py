@@ -1,7 +1,9 @@
+from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..db import get_async_db
+from ..db_replicas import get_async_read_db
 from ..crud_async.terrain import (
     create_terrain_async,
     get_terrains_async,
@@ -16,6 +18,8 @@ from ..crud_async.terrain_parameters import (
 from ..schemas.terrain import TerrainCreate, TerrainUpdate, TerrainOut
 from ..schemas.soil_health import SoilHealthReport
 from ..schemas.terrain_parameters import TerrainParametersWithHealthOut
+from ..schemas.soil_series import SoilSeriesOut
+from ..services.soil_series import MAX_POINTS, query_series_async
 
 router = APIRouter(prefix="/async/terrains", tags=["terrains"])
 
@@ -27,13 +31,13 @@ async def create_terrain_async_endpoint(
 
 @router.get("/", response_model=List[TerrainOut])
 async def list_terrains_async(
-    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)
+    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_read_db)
 ):
     return await get_terrains_async(db, skip, limit)
 
 @router.get("/{terrain_id}", response_model=TerrainOut)
 async def get_terrain_async_endpoint(
-    terrain_id: int, db: AsyncSession = Depends(get_async_db)
+    terrain_id: int, db: AsyncSession = Depends(get_async_read_db)
 ):
     terrain = await get_terrain_async(db, terrain_id)
     if not terrain:
@@ -62,7 +66,7 @@ async def delete_terrain_async_endpoint(
             summary="Soil Health Index",
             description="Retorna um relatório de saúde do solo para o terreno, incluindo índice de saúde, categoria e alertas.")
 async def get_soil_health_async_endpoint(
-    terrain_id: int, db: AsyncSession = Depends(get_async_db)
+    terrain_id: int, db: AsyncSession = Depends(get_async_read_db)
 ):
     """Retorna o índice de saúde do solo para um terreno."""
     # Verificar se o terreno existe
@@ -78,7 +82,7 @@ async def get_soil_health_async_endpoint(
             summary="Terrain Parameters with Health Report",
             description="Retorna os parâmetros do terreno junto com o relatório de saúde do solo.")
 async def get_terrain_params_with_health_async(
-    terrain_id: int, db: AsyncSession = Depends(get_async_db)
+    terrain_id: int, db: AsyncSession = Depends(get_async_read_db)
 ):
     """Retorna os parâmetros do terreno junto com relatório de saúde."""
     # Verificar se o terreno existe
@@ -99,3 +103,23 @@ async def get_terrain_params_with_health_async(
     result.health_report = health_report
     
     return result
+
+@router.get("/{terrain_id}/soil-series", response_model=SoilSeriesOut,
+            summary="Soil Parameter Time Series",
+            description="Retorna a série histórica dos parâmetros do solo do terreno (ou de um quadrante), reamostrada por hora, dia ou semana.")
+async def get_soil_series_async_endpoint(
+    terrain_id: int,
+    start: Optional[datetime] = Query(None, description="Início do intervalo (padrão: 7 dias atrás)"),
+    end: Optional[datetime] = Query(None, description="Fim do intervalo (padrão: agora)"),
+    quadrant_id: Optional[int] = Query(None, description="Série de um quadrante em vez do terreno inteiro"),
+    resolution: Optional[str] = Query(None, description="hour, day ou week (padrão: pelo tamanho do intervalo)"),
+    max_points: int = Query(MAX_POINTS, ge=1, le=MAX_POINTS),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Retorna a série temporal dos parâmetros do solo."""
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=7)
+    try:
+        return await query_series_async(db, terrain_id, start, end, quadrant_id, resolution, max_points)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,9 +1,50 @@
 import os
 
+
+def _optional_int(name: str):
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
+
+def _optional_bool(name: str):
+    value = os.getenv(name)
+    if value in (None, ""):
+        return None
+    return value.lower() in ("1", "true", "yes", "on")
+
+
 class Settings:
     ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
-    DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
+    # Sem DATABASE_URL, apenas development/test caem no SQLite local (ver engine_config.resolve_database_url)
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    DEFAULT_DATABASE_URL = "sqlite:///./test.db"
     TIME_SCALE_FACTOR = float(os.getenv("TIME_SCALE_FACTOR", "1.0"))
     PLAYER_ACTION_LIMIT = int(os.getenv("PLAYER_ACTION_LIMIT", "10"))
 
+    # Pool de conexões (None = usa o padrão do dialeto em engine_config)
+    DB_POOL_SIZE = _optional_int("DB_POOL_SIZE")
+    DB_MAX_OVERFLOW = _optional_int("DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT = _optional_int("DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE = _optional_int("DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING = _optional_bool("DB_POOL_PRE_PING")
+
+    # Pragmas do SQLite aplicados a cada nova conexão
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(64 * 1024 * 1024)))
+
+    # Caches de prepared statements do asyncpg
+    ASYNCPG_STATEMENT_CACHE_SIZE = int(os.getenv("ASYNCPG_STATEMENT_CACHE_SIZE", "256"))
+    ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE", "256"))
+
+    # Réplicas de leitura (URLs separadas por vírgula); vazio = tudo no primário
+    DATABASE_REPLICA_URLS = [
+        url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5.0"))
+    REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "2.0"))
+    # Janela em que as leituras de um jogador ficam presas ao primário após uma escrita dele
+    READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5.0"))
+
 settings = Settings()
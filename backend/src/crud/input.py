@@ -1,36 +1,33 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ..models.input import Input
-from ..models.planting import Planting
-from ..schemas.input import InputCreate, InputUpdate
-from ..services.input_effects import apply_input_effects
+from ..schemas.input import InputCreate
+from ..repositories.inputs import record_input
+from ..services.input_batch import apply_inputs_batch
 
 
 def create_input(db: Session, input_in: InputCreate) -> Input:
     """
-    Create a new input/resource applied to a planting.
-    Validates that the planting exists before creating the input.
+    Create a new input/resource applied to a planting and apply its effects
+    (see `repositories.inputs.record_input`).
     """
-    # Validate that the planting exists
-    planting = db.query(Planting).filter(Planting.id == input_in.planting_id).first()
-    if not planting:
-        raise ValueError(f"Planting with id {input_in.planting_id} not found")
-    
-    # Create the input
-    db_input = Input(
-        planting_id=input_in.planting_id,
-        type=input_in.type,
-        quantity=input_in.quantity
-    )
-    
-    db.add(db_input)
-    db.commit()
-    db.refresh(db_input)
-    
-    # Aplicar efeitos do insumo no solo e planta
-    applied_effects = apply_input_effects(db, db_input)
-    
-    return db_input
+    return record_input(db, input_in)[0]
+
+
+def create_input_with_effects(db: Session, input_in: InputCreate) -> dict:
+    """
+    Create a new input and return its fields together with the effects report
+    (the payload of InputWithEffectsOut), without re-querying.
+    """
+    return record_input(db, input_in)[1]
+
+
+def create_inputs_batch(db: Session, inputs: List[InputCreate]) -> List[dict]:
+    """
+    Create and apply many inputs in a single transaction.
+    Returns one effects report per input, in the order received.
+    """
+    return apply_inputs_batch(db, inputs)
 
 
 def get_input(db: Session, input_id: int) -> Optional[Input]:
@@ -1,23 +1,31 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from ..models.planting import Planting
-from ..schemas.planting import PlantingCreate, PlantingUpdate
+from ..schemas.planting import BulkPlantingCreate, BulkPlantingOut, PlantingCreate, PlantingUpdate
+from ..services.planting_engine import bulk_plant
+from ..services.slot_occupancy import (
+    SLOTS_PER_QUADRANT,
+    ensure_quadrants,
+    ensure_terrain,
+    occupancy,
+    quadrant_report,
+    slot_in_range,
+)
+from ..services.player_digest import bump_player_state_version
 
 
 def create_planting(db: Session, planting: PlantingCreate) -> Planting:
     """
     Create a new planting.
-    Validates that there is no other planting with the same quadrant_id and slot_index.
+    The slot is checked against the quadrant occupancy index (no scan of `plantings`);
+    the `uix_quadrant_slot` constraint still rejects concurrent plantings in the same slot.
     """
-    # Check if the slot is already occupied
-    existing = db.query(Planting).filter(
-        Planting.quadrant_id == planting.quadrant_id,
-        Planting.slot_index == planting.slot_index
-    ).first()
-    
-    if existing:
+    if not slot_in_range(planting.slot_index):
+        raise ValueError(f"Slot {planting.slot_index} is out of range 0-{SLOTS_PER_QUADRANT - 1}")
+    ensure_quadrants(db, [planting.quadrant_id])
+    if occupancy.is_occupied(planting.quadrant_id, planting.slot_index):
         raise ValueError(f"Slot {planting.slot_index} in quadrant {planting.quadrant_id} is already occupied")
     
     # Create the planting
@@ -26,12 +34,23 @@ def create_planting(db: Session, planting: PlantingCreate) -> Planting:
     try:
         db.commit()
         db.refresh(db_obj)
+        occupancy.mark_planted(db_obj.quadrant_id, db_obj.slot_index)
+        bump_player_state_version(db_obj.player_id)
         return db_obj
     except IntegrityError:
         db.rollback()
+        occupancy.invalidate(planting.quadrant_id)
         raise ValueError(f"Unable to create planting in slot {planting.slot_index} of quadrant {planting.quadrant_id}. The slot may be occupied.")
 
 
+def create_plantings_bulk(db: Session, request: BulkPlantingCreate) -> BulkPlantingOut:
+    """
+    Create many plantings in one transaction.
+    Slots are allocated from the quadrant occupancy bitmap; conflicts are reported per item.
+    """
+    return bulk_plant(db, request)
+
+
 def get_planting(db: Session, planting_id: int) -> Optional[Planting]:
     """Get a planting by ID."""
     return db.query(Planting).filter(Planting.id == planting_id).first()
@@ -55,6 +74,8 @@ def update_planting(db: Session, planting_id: int, planting_data: PlantingUpdate
             setattr(db_obj, field, value)
         db.commit()
         db.refresh(db_obj)
+        occupancy.mark_state(db_obj.quadrant_id, db_obj.slot_index, db_obj.current_state)
+        bump_player_state_version(db_obj.player_id)
     return db_obj
 
 
@@ -62,8 +83,12 @@ def delete_planting(db: Session, planting_id: int) -> None:
     """Delete a planting."""
     db_obj = get_planting(db, planting_id)
     if db_obj:
+        player_id = db_obj.player_id
+        quadrant_id, slot_index = db_obj.quadrant_id, db_obj.slot_index
         db.delete(db_obj)
         db.commit()
+        occupancy.release(quadrant_id, slot_index)
+        bump_player_state_version(player_id)
 
 
 def is_slot_available(db: Session, quadrant_id: int, slot_index: int) -> bool:
@@ -71,9 +96,17 @@ def is_slot_available(db: Session, quadrant_id: int, slot_index: int) -> bool:
     Check if a slot is available in a quadrant.
     Returns True if the slot is available, False otherwise.
     """
-    existing = db.query(Planting).filter(
-        Planting.quadrant_id == quadrant_id,
-        Planting.slot_index == slot_index
-    ).first()
-    
-    return existing is None
+    ensure_quadrants(db, [quadrant_id])
+    return not occupancy.is_occupied(quadrant_id, slot_index)
+
+
+def get_free_slots(db: Session, quadrant_id: int) -> Optional[dict]:
+    """Free and finished (dead/harvested) slots of a quadrant; None if it does not exist."""
+    ensure_quadrants(db, [quadrant_id])
+    return quadrant_report(quadrant_id)
+
+
+def get_first_free_slots(db: Session, terrain_id: int, limit: int = 10) -> List[Tuple[int, int]]:
+    """First `limit` free (quadrant_id, slot_index) pairs of a terrain, in quadrant order."""
+    ensure_terrain(db, terrain_id)
+    return occupancy.first_free_in_terrain(terrain_id, limit)
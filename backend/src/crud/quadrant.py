@@ -3,6 +3,7 @@ from typing import List, Optional
 
 from ..models.quadrant import Quadrant
 from ..schemas.quadrant import QuadrantCreate, QuadrantUpdate
+from ..services.slot_occupancy import occupancy
 
 
 def create_quadrant(db: Session, quadrant: QuadrantCreate) -> Quadrant:
@@ -11,6 +12,7 @@ def create_quadrant(db: Session, quadrant: QuadrantCreate) -> Quadrant:
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    occupancy.forget_terrain(db_obj.terrain_id)
     return db_obj
 
 
@@ -39,8 +41,10 @@ def delete_quadrant(db: Session, quadrant_id: int) -> None:
     """Delete a quadrant."""
     db_obj = get_quadrant(db, quadrant_id)
     if db_obj:
+        terrain_id = db_obj.terrain_id
         db.delete(db_obj)
         db.commit()
+        occupancy.forget_terrain(terrain_id)
 
 
 def generate_quadrants_for_terrain(db: Session, terrain_id: int) -> List[Quadrant]:
@@ -2,6 +2,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from ..models.shop_item import ShopItem
 from ..schemas.shop_item import ShopItemCreate
+from ..services import catalog_cache
 
 
 def create_shop_item(db: Session, item: ShopItemCreate) -> ShopItem:
@@ -9,6 +10,7 @@ def create_shop_item(db: Session, item: ShopItemCreate) -> ShopItem:
     db.add(db_item)
     db.commit()
     db.refresh(db_item)
+    catalog_cache.invalidate(catalog_cache.SHOP_ITEMS)
     return db_item
 
 
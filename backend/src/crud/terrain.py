@@ -6,6 +6,7 @@ from typing import List, Optional
 from ..models.terrain import Terrain
 from ..schemas.terrain import TerrainCreate, TerrainUpdate
 from ..crud.quadrant import generate_quadrants_for_terrain
+from ..services.slot_occupancy import occupancy
 
 
 # Versão síncrona para endpoints síncronos
@@ -60,3 +61,4 @@ def delete_terrain(db: Session, terrain_id: int) -> None:
     if db_obj:
         db.delete(db_obj)
         db.commit()
+        occupancy.forget_terrain(terrain_id)
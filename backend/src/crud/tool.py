@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from ..models.tool import Tool
 from ..schemas.tool import ToolCreate
+from ..services import catalog_cache
 
 # Funções Síncronas
 def create_tool(db: Session, tool_in: ToolCreate) -> Tool:
@@ -10,6 +11,7 @@ def create_tool(db: Session, tool_in: ToolCreate) -> Tool:
     db.add(tool)
     db.commit()
     db.refresh(tool)
+    catalog_cache.invalidate(catalog_cache.TOOLS)
     return tool
 
 def get_tool(db: Session, tool_id: int) -> Tool:
@@ -24,11 +26,13 @@ def update_tool(db: Session, tool_id: int, tool_in: ToolCreate) -> Tool:
         setattr(tool, key, value)
     db.commit()
     db.refresh(tool)
+    catalog_cache.invalidate(catalog_cache.TOOLS)
     return tool
 
 def delete_tool(db: Session, tool_id: int) -> None:
     db.query(Tool).filter(Tool.id == tool_id).delete()
     db.commit()
+    catalog_cache.invalidate(catalog_cache.TOOLS)
 
 def get_tool_by_key(db: Session, key: str) -> Tool:
     return db.query(Tool).filter(Tool.key == key).first()
@@ -40,6 +44,7 @@ async def delete_tool_async(db: AsyncSession, tool_id: int) -> None:
     tool = result.scalar_one()
     await db.delete(tool)
     await db.commit()
+    catalog_cache.invalidate(catalog_cache.TOOLS)
 
 async def get_tool_by_key_async(db: AsyncSession, key: str) -> Tool:
     stmt = select(Tool).where(Tool.key == key)
@@ -4,12 +4,14 @@ from typing import List, Optional
 
 from ..models.climate_condition import ClimateCondition
 from ..schemas.climate_condition import ClimateConditionCreate, ClimateConditionOut
+from ..services import current_weather
 
 async def create_climate_condition_async(db: AsyncSession, cc: ClimateConditionCreate) -> ClimateCondition:
     db_cc = ClimateCondition(**cc.dict())
     db.add(db_cc)
     await db.commit()
     await db.refresh(db_cc)
+    current_weather.set_current(db_cc)
     return db_cc
 
 async def get_climate_conditions_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ClimateCondition]:
@@ -2,27 +2,25 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker as async_sessionmaker
-import os
 
-Base = declarative_base()
+from .engine_config import (
+    engine_options,
+    instrument_engine,
+    pool_status,
+    resolve_database_url,
+    to_async_url,
+)
 
-# Get database URL from environment
-_db_url = os.getenv("DATABASE_URL")
+Base = declarative_base()
 
-# Sync engine and session factory for sync endpoints
-if not _db_url:
-    DATABASE_URL = "sqlite:///./test.db"
-elif _db_url.startswith("postgresql"):
-    # For PostgreSQL, use psycopg2 for sync
-    DATABASE_URL = _db_url
-else:
-    DATABASE_URL = _db_url
+# URL do banco (em produção/staging DATABASE_URL é obrigatória)
+DATABASE_URL = resolve_database_url()
 
-# Create sync engine with appropriate connection args
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(DATABASE_URL)
+# Engine síncrono: jobs do scheduler, executor de ações, caixa de entrada do WhatsApp e as rotas
+# que ainda não passam por `repositories` (auth, badges, clima, personagens). As demais rotas usam
+# o engine assíncrono abaixo.
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, name="sync"))
+instrument_engine(engine, "sync")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -34,35 +32,13 @@ def get_db():
     finally:
         db.close()
 
-# Async engine and session factory
-if not _db_url:
-    ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
-elif _db_url == "sqlite:///:memory:":
-    # Special case for in-memory SQLite
-    ASYNC_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
-elif _db_url.startswith("sqlite://"):
-    # For SQLite, use aiosqlite
-    ASYNC_DATABASE_URL = _db_url.replace("sqlite://", "sqlite+aiosqlite://")
-elif _db_url.startswith("postgresql"):
-    # For PostgreSQL, use asyncpg
-    ASYNC_DATABASE_URL = _db_url.replace("postgresql://", "postgresql+asyncpg://")
-else:
-    ASYNC_DATABASE_URL = _db_url
-
-# Create async engine with appropriate connection args
-if ASYNC_DATABASE_URL.startswith("sqlite+aiosqlite"):
-    if ":memory:" in ASYNC_DATABASE_URL:
-        # In-memory SQLite needs no connect_args
-        async_engine = create_async_engine(ASYNC_DATABASE_URL)
-    else:
-        # File-based SQLite needs check_same_thread False
-        async_engine = create_async_engine(ASYNC_DATABASE_URL, connect_args={"check_same_thread": False})
-elif ASYNC_DATABASE_URL.startswith("postgresql+asyncpg"):
-    # PostgreSQL with asyncpg doesn't need special connect_args
-    async_engine = create_async_engine(ASYNC_DATABASE_URL)
-else:
-    # Fallback for other drivers
-    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+# Async engine and session factory (sqlite -> aiosqlite, postgresql -> asyncpg)
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, name="async", is_async=True)
+)
+instrument_engine(async_engine.sync_engine, "async")
 
 AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -74,6 +50,13 @@ async def get_async_db():
         finally:
             await session.close()
 
+def get_pool_metrics():
+    """Estado dos pools síncrono e assíncrono (uso, overflow e espera no checkout)."""
+    return {
+        "sync": pool_status(engine, "sync"),
+        "async": pool_status(async_engine.sync_engine, "async"),
+    }
+
 def build_engine(url, poolclass=None):
     kwargs = {"connect_args": {"check_same_thread": False}}
     if poolclass:
@@ -83,6 +66,17 @@ def build_engine(url, poolclass=None):
 def build_session(engine):
     return sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def get_async_db_override(sync_engine):
+    """Dependency get_async_db apontando para o mesmo banco de um engine síncrono (usado em testes)."""
+    url = to_async_url(sync_engine.url.render_as_string(hide_password=False))
+    override_engine = create_async_engine(url, **engine_options(url, name="override", is_async=True))
+    OverrideSessionLocal = async_sessionmaker(bind=override_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def _get_async_db():
+        async with OverrideSessionLocal() as session:
+            yield session
+    return _get_async_db
+
 def get_db_override(SessionLocal):
     def _get_db():
         db = SessionLocal()
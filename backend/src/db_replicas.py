@@ -0,0 +1,206 @@
+"""
+Roteamento de leituras para réplicas do banco.
+
+Endpoints GET de leitura usam `get_async_read_db`, que entrega uma sessão de uma réplica
+(em rodízio) quando:
+- há réplicas configuradas em DATABASE_REPLICA_URLS;
+- a réplica escolhida está com atraso de replicação abaixo de REPLICA_MAX_LAG_SECONDS
+  (medido no máximo a cada REPLICA_LAG_CHECK_INTERVAL segundos);
+- o jogador da requisição não escreveu nada nos últimos READ_YOUR_WRITES_SECONDS
+  (read-your-writes: logo após a própria escrita, o jogador lê do primário).
+
+Em qualquer outro caso a leitura cai no primário (a sessão de `get_async_db`).
+"""
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker as async_sessionmaker
+
+from .config import settings
+from .db import get_async_db
+from .engine_config import engine_options, instrument_engine, pool_status, to_async_url
+
+logger = logging.getLogger(__name__)
+
+PLAYER_HEADER = "X-Player-Id"
+_READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Atraso de replicação em segundos; fora de recuperação (primário promovido) o atraso é zero
+_PG_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "ELSE 0 END"
+)
+
+
+class Replica:
+    """Uma réplica de leitura com o último atraso medido."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = to_async_url(url)
+        self.engine = create_async_engine(
+            self.url, **engine_options(self.url, name=name, is_async=True)
+        )
+        instrument_engine(self.engine.sync_engine, name)
+        self.sessionmaker = async_sessionmaker(
+            bind=self.engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.lag: Optional[float] = None
+        self.checked_at = float("-inf")
+        self.reads = 0
+
+    async def measure_lag(self) -> Optional[float]:
+        """Consulta o atraso de replicação; None se a réplica não responder."""
+        if self.engine.dialect.name != "postgresql":
+            # SQLite não replica: a "réplica" local é tratada como sempre em dia
+            return 0.0
+        try:
+            async with self.engine.connect() as conn:
+                return float((await conn.execute(_PG_LAG_QUERY)).scalar() or 0.0)
+        except Exception as exc:
+            logger.warning("Falha ao medir atraso da réplica %s: %s", self.name, exc)
+            return None
+
+
+class ReplicaRouter:
+    """
+    Escolhe a sessão de leitura (réplica ou primário) de cada requisição.
+
+    Args:
+        urls (List[str]): URLs das réplicas
+        max_lag (float): Atraso máximo aceito (s) antes de cair no primário
+        check_interval (float): Validade (s) da última medição de atraso de cada réplica
+        sticky_seconds (float): Janela de read-your-writes após uma escrita do jogador
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        max_lag: float = settings.REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = settings.REPLICA_LAG_CHECK_INTERVAL,
+        sticky_seconds: float = settings.READ_YOUR_WRITES_SECONDS,
+    ):
+        self.replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls)]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky_seconds = sticky_seconds
+        self._next = 0
+        self._sticky_until: Dict[int, float] = {}
+        self.primary_reads = 0
+        self.sticky_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def mark_write(self, player_id: int) -> None:
+        """Prende as leituras do jogador ao primário pela janela de read-your-writes."""
+        if not self.enabled or self.sticky_seconds <= 0:
+            return
+        now = time.monotonic()
+        if len(self._sticky_until) > 10000:
+            self._sticky_until = {pid: until for pid, until in self._sticky_until.items() if until > now}
+        self._sticky_until[player_id] = now + self.sticky_seconds
+
+    def is_sticky(self, player_id: Optional[int]) -> bool:
+        if player_id is None:
+            return False
+        until = self._sticky_until.get(player_id)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._sticky_until.pop(player_id, None)
+            return False
+        return True
+
+    async def _is_fresh(self, replica: Replica) -> bool:
+        now = time.monotonic()
+        if now - replica.checked_at >= self.check_interval:
+            replica.lag = await replica.measure_lag()
+            replica.checked_at = now
+        return replica.lag is not None and replica.lag <= self.max_lag
+
+    async def pick(self, player_id: Optional[int] = None) -> Optional[Replica]:
+        """Retorna a próxima réplica em dia, ou None se a leitura deve ir ao primário."""
+        if not self.enabled:
+            return None
+        if self.is_sticky(player_id):
+            self.sticky_reads += 1
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+            if await self._is_fresh(replica):
+                replica.reads += 1
+                return replica
+        self.primary_reads += 1
+        return None
+
+    @asynccontextmanager
+    async def read_session(self, primary: AsyncSession, player_id: Optional[int] = None):
+        """Abre uma sessão na réplica escolhida ou reaproveita a sessão do primário."""
+        replica = await self.pick(player_id)
+        if replica is None:
+            yield primary
+            return
+        async with replica.sessionmaker() as session:
+            yield session
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_lag_s": self.max_lag,
+            "primary_fallback_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+            "sticky_players": len(self._sticky_until),
+            "replicas": [
+                {
+                    "lag_s": replica.lag,
+                    "reads": replica.reads,
+                    **pool_status(replica.engine.sync_engine, replica.name),
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
+
+def request_player_id(request: Request) -> Optional[int]:
+    """Identifica o jogador da requisição: header X-Player-Id, path ou query `player_id`."""
+    raw = (
+        request.headers.get(PLAYER_HEADER)
+        or request.path_params.get("player_id")
+        or request.query_params.get("player_id")
+    )
+    try:
+        return int(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+async def get_async_read_db(request: Request, primary: AsyncSession = Depends(get_async_db)):
+    """Dependency para endpoints somente leitura (réplica quando possível, senão primário)."""
+    async with replica_router.read_session(primary, request_player_id(request)) as session:
+        yield session
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """Após uma escrita bem-sucedida, marca o jogador para ler do primário por alguns segundos."""
+    response = await call_next(request)
+    if (
+        replica_router.enabled
+        and request.method not in _READ_METHODS
+        and response.status_code < 400
+    ):
+        player_id = request_player_id(request)
+        if player_id is not None:
+            replica_router.mark_write(player_id)
+    return response
@@ -0,0 +1,263 @@
+"""
+Configuração dos engines do SQLAlchemy (síncrono e assíncrono).
+
+Centraliza, a partir de `settings`:
+- a resolução da DATABASE_URL (sem fallback silencioso para SQLite em produção/staging);
+- o ajuste de pool por dialeto (pool_size, max_overflow, pool_pre_ping, pool_recycle);
+- os pragmas do SQLite (WAL, synchronous, busy_timeout, mmap_size) aplicados via evento `connect`;
+- o tamanho dos caches de statements do asyncpg;
+- métricas de pool (conexões em uso, overflow, tempo de espera no checkout).
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Padrões de pool por dialeto; variáveis DB_POOL_* sobrescrevem
+POOL_DEFAULTS = {
+    "sqlite": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+    },
+    "postgresql": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    },
+}
+
+_SETTING_BY_OPTION = {
+    "pool_size": "DB_POOL_SIZE",
+    "max_overflow": "DB_MAX_OVERFLOW",
+    "pool_timeout": "DB_POOL_TIMEOUT",
+    "pool_recycle": "DB_POOL_RECYCLE",
+    "pool_pre_ping": "DB_POOL_PRE_PING",
+}
+
+
+def resolve_database_url() -> str:
+    """
+    Retorna a URL do banco configurada.
+
+    Sem DATABASE_URL, apenas os ambientes de desenvolvimento e teste usam o SQLite local;
+    em produção e staging a ausência da variável é um erro de configuração.
+    """
+    if settings.DATABASE_URL:
+        return settings.DATABASE_URL
+    if settings.ENVIRONMENT in ("production", "staging"):
+        raise RuntimeError(
+            f"DATABASE_URL não definida para o ambiente '{settings.ENVIRONMENT}'"
+        )
+    return settings.DEFAULT_DATABASE_URL
+
+
+def to_async_url(url: str) -> str:
+    """Converte uma URL síncrona para o driver assíncrono equivalente."""
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+class PoolMetrics:
+    """Contadores de checkout de um pool, seguros para uso entre threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connects = 0
+        self.invalidations = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def incr(self, counter: str, amount: int = 1) -> None:
+        """Incrementa `counter` ("connects", "invalidations", ...) sob o lock."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "avg_wait_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.wait_max * 1000, 3),
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+
+
+# Métricas por nome lógico do pool ("sync", "async", ...). Ficam fora da instância
+# porque Pool.recreate() cria um novo objeto da mesma classe.
+_pool_metrics: Dict[str, PoolMetrics] = {}
+_pool_metrics_lock = threading.Lock()
+
+
+def get_metrics(name: str) -> PoolMetrics:
+    with _pool_metrics_lock:
+        if name not in _pool_metrics:
+            _pool_metrics[name] = PoolMetrics()
+        return _pool_metrics[name]
+
+
+class _InstrumentedPoolMixin:
+    """Mede o tempo gasto esperando por uma conexão livre no checkout."""
+
+    # Nome lógico das métricas; fixado por `pool_class_for` em uma subclasse por nome
+    metrics_name = "default"
+
+    def _do_get(self):
+        metrics = get_metrics(self.metrics_name)
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        metrics.record_wait(time.perf_counter() - started)
+        return conn
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_pool_classes: Dict[tuple, type] = {}
+
+
+def pool_class_for(base: type, name: str) -> type:
+    """
+    Subclasse de `base` com `metrics_name = name`.
+
+    O nome vai na classe, e não na instância, para sobreviver ao Pool.recreate()
+    (engine.dispose() recria o pool com a mesma classe).
+    """
+    with _pool_metrics_lock:
+        key = (base, name)
+        if key not in _pool_classes:
+            _pool_classes[key] = type(base.__name__, (base,), {"metrics_name": name})
+        return _pool_classes[key]
+
+
+def pool_options(url: str) -> Dict[str, Any]:
+    """Parâmetros de pool para o dialeto da URL, com as sobrescritas de `settings`."""
+    backend = make_url(url).get_backend_name()
+    options = dict(POOL_DEFAULTS.get(backend, POOL_DEFAULTS["postgresql"]))
+    for option, setting_name in _SETTING_BY_OPTION.items():
+        value = getattr(settings, setting_name)
+        if value is not None:
+            options[option] = value
+    return options
+
+
+def engine_options(url: str, name: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Monta os kwargs de create_engine/create_async_engine para a URL.
+
+    Args:
+        url (str): URL do banco (já com o driver correto)
+        name (str): Nome lógico do pool, usado nas métricas
+        is_async (bool): Se o engine será criado com create_async_engine
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+
+    if _is_memory_sqlite(parsed):
+        # Banco em memória: o pool padrão (uma conexão por thread/estático) é obrigatório
+        return {} if is_async else {"connect_args": {"check_same_thread": False}}
+
+    options: Dict[str, Any] = pool_options(url)
+    base = InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool
+    options["poolclass"] = pool_class_for(base, name)
+    options["pool_logging_name"] = name
+
+    if backend == "sqlite":
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    elif parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": settings.ASYNCPG_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+def install_sqlite_pragmas(engine: Engine, memory: bool = False) -> None:
+    """Aplica os pragmas do SQLite em cada conexão nova do engine (sync_engine no caso async)."""
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if not memory:
+                cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+                if settings.SQLITE_MMAP_SIZE:
+                    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        finally:
+            cursor.close()
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Registra os listeners de métricas (conexões novas e invalidadas) e os pragmas do SQLite."""
+    metrics = get_metrics(name)
+
+    @event.listens_for(engine, "connect")
+    def _count_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def _count_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    if engine.dialect.name == "sqlite":
+        install_sqlite_pragmas(engine, memory=_is_memory_sqlite(engine.url))
+
+
+def pool_status(engine: Engine, name: str) -> Dict[str, Any]:
+    """Snapshot do pool de um engine: tamanho, conexões em uso, overflow e métricas de espera."""
+    pool = engine.pool
+    status: Dict[str, Any] = {"name": name, "pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    status.update(get_metrics(name).snapshot())
+    return status
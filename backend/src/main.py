@@ -4,7 +4,8 @@ from dotenv import load_dotenv
 # Load .env file before other modules that might depend on environment variables
 load_dotenv()
 
-from src.db import get_db, build_engine, build_session, AsyncSessionLocal, async_engine, Base
+from src.db import get_db, get_async_db, get_async_db_override, build_engine, build_session, SessionLocal, AsyncSessionLocal, async_engine, Base
+from src.db_replicas import read_your_writes_middleware
 from fastapi.middleware.cors import CORSMiddleware
 from src import models  # registra todos os modelos para criação de tabelas
 import os
@@ -12,6 +13,9 @@ import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
 from src.services.scheduler import start_scheduler, shutdown_scheduler
+from src.services.action_executor import ACTION_RETRY_MAX_SECONDS
+from src.services.terrain_service import action_executor
+from src.services.webhook_inbox import webhook_inbox
 
 def create_app(session_local=None, engine=None):
     dsn = os.getenv("SENTRY_DSN")
@@ -66,6 +70,7 @@ def create_app(session_local=None, engine=None):
     from .api_async.badge import router as badge_async_router
     from .api_async.auth import router as auth_async_router
     from .api.eko import router as eko_router
+    from .api import eko as eko_api
     from .api.plantings import router as plantings_router
     from .api.species import router as species_router
     from .api.admin import router as admin_router
@@ -128,6 +133,15 @@ def create_app(session_local=None, engine=None):
             finally:
                 db.close()
         app.dependency_overrides[get_db] = override_get_db
+        # As rotas síncronas delegam para a camada async: aponta get_async_db para o mesmo banco
+        app.dependency_overrides[get_async_db] = get_async_db_override(session_local.kw["bind"])
+
+    # O executor de ações, a caixa de entrada do WhatsApp e o digest do Eko abrem sessões fora
+    # das requisições: usam a mesma fábrica de sessões do app
+    app_session_local = session_local or SessionLocal
+    action_executor.session_factory = app_session_local
+    webhook_inbox.session_factory = app_session_local
+    eko_api.session_factory = app_session_local
     app.include_router(whatsapp_router, prefix="/api/v1", tags=["whatsapp"])
     app.include_router(player_router, prefix="/api/v1/players", tags=["players"])
     app.include_router(terrain_router, prefix="/api/v1/terrains", tags=["terrains"])
@@ -185,6 +199,9 @@ def create_app(session_local=None, engine=None):
         expose_headers=["Content-Length", "X-Total-Count"],
     )
 
+    # Read-your-writes: após escrever, o jogador lê do primário em vez das réplicas
+    app.middleware("http")(read_your_writes_middleware)
+
     # Rota para exportar o esquema OpenAPI
     @app.get("/openapi.json", include_in_schema=False)
     async def get_open_api_endpoint():
@@ -216,6 +233,14 @@ def create_app(session_local=None, engine=None):
         async with async_engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
+        # Carrega em memória os catálogos estáticos (loja, ferramentas, espécies)
+        from .services import catalog_cache
+        async with AsyncSessionLocal() as catalog_session:
+            await catalog_cache.warm_up(catalog_session)
+
+        # Consumidor da caixa de entrada dos webhooks do WhatsApp
+        webhook_inbox.start(app_session_local)
+
         # Verifica se deve iniciar o scheduler após as migrações
         scheduler_after_migrations = os.getenv("SCHEDULER_START_AFTER_MIGRATIONS", "false").lower() == "true"
         
@@ -236,6 +261,10 @@ def create_app(session_local=None, engine=None):
 
     @app.on_event("shutdown")
     def shutdown():
+        # Para o consumidor da caixa de entrada do WhatsApp (o que ficou pendente segue gravado)
+        webhook_inbox.stop()
+        # Conclui as ações pendentes (e suas novas tentativas) antes de encerrar o scheduler
+        action_executor.shutdown(timeout=ACTION_RETRY_MAX_SECONDS)
         # Encerra scheduler
         shutdown_scheduler()
 
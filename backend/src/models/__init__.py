@@ -3,13 +3,17 @@
 from .action import Action
 from .badge import Badge
 from .climate_condition import ClimateCondition
+from .history_archive import HistoryArchive
 from .item import Item
+from .ledger_entry import LedgerEntry
 from .plant_state_log import PlantStateLog
 from .planting import Planting
 from .player import Player
 from .purchase import Purchase
 from .shop_item import ShopItem
+from .soil_sample import SoilSample
 from .species import Species
 from .terrain_parameters import TerrainParameters
 from .terrain import Terrain
-from .tool import Tool
\ No newline at end of file
+from .tool import Tool
+from .webhook_message import WebhookMessage
\ No newline at end of file
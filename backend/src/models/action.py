@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..db import Base
@@ -16,3 +16,8 @@ class Action(Base):
 
     player = relationship("Player", back_populates="actions")
     terrain = relationship("Terrain", back_populates="actions")
+
+    __table_args__ = (
+        # Consulta quente do tick diário: ação X do jogador Y desde T (cobre o filtro inteiro)
+        Index("ix_actions_name_player_timestamp", "action_name", "player_id", "timestamp"),
+    )
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, String
+from sqlalchemy.sql import func
+from ..db import Base
+
+
+class HistoryArchive(Base):
+    """
+    Bloco de histórico arquivado (armazenamento frio).
+
+    Cada linha guarda um lote de linhas antigas de `actions` ou `plant_state_logs` de um
+    mesmo mês, serializado em JSON e comprimido com zlib. No Postgres a tabela é
+    particionada por mês (`period_start`, ver migração 0005).
+    """
+    __tablename__ = "history_archive"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(32), nullable=False)  # actions, plant_state_logs
+    period_start = Column(DateTime, nullable=False)  # primeiro dia do mês
+    first_id = Column(Integer, nullable=False)
+    last_id = Column(Integer, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    min_timestamp = Column(DateTime, nullable=True)
+    max_timestamp = Column(DateTime, nullable=True)
+    payload = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_history_archive_source_period", "source", "period_start"),
+    )
@@ -10,12 +10,16 @@ class Input(Base):
     These can be water, fertilizer, compost, etc.
     """
     __tablename__ = "inputs"
+    # Busca applied_at no próprio INSERT (RETURNING), sem SELECT extra após o flush
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     planting_id = Column(Integer, ForeignKey("plantings.id"), nullable=False, index=True)
     type = Column(String, nullable=False)  # água, fertilizante, composto, etc.
     quantity = Column(Float, nullable=False)
     applied_at = Column(DateTime, default=func.now(), nullable=False)
+    # Marcador de aplicação única dos efeitos (preenchido por services.input_effects)
+    effects_applied_at = Column(DateTime, nullable=True)
 
     # Relationship back to the planting
     planting = relationship("Planting", back_populates="inputs")
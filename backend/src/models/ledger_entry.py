@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, event
+from sqlalchemy.sql import func
+from ..db import Base
+
+
+class LedgerEntry(Base):
+    """
+    Lançamento do livro-razão de saldo dos jogadores (somente inserção).
+
+    Cada movimentação de saldo gera um lançamento com o valor (negativo para débitos),
+    o saldo resultante e a referência da operação de origem.
+    """
+    __tablename__ = "ledger_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
+    amount = Column(Float, nullable=False)
+    balance_after = Column(Float, nullable=False)
+    kind = Column(String, nullable=False)
+    reference_type = Column(String, nullable=True)
+    reference_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+@event.listens_for(LedgerEntry, "before_update")
+@event.listens_for(LedgerEntry, "before_delete")
+def _ledger_is_append_only(mapper, connection, target):
+    raise ValueError("Lançamentos do livro-razão não podem ser alterados nem removidos")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..db import Base
@@ -15,3 +15,9 @@ class PlantStateLog(Base):
 
     # Relationship to planting
     planting = relationship('Planting', back_populates='logs')
+
+    __table_args__ = (
+        Index('ix_plant_state_logs_planting_timestamp', 'planting_id', 'timestamp'),
+        # Varredura do arquivador (services.history_archive)
+        Index('ix_plant_state_logs_timestamp', 'timestamp'),
+    )
@@ -1,16 +1,21 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..db import Base
 
 class Purchase(Base):
     __tablename__ = "purchases"
+    __table_args__ = (
+        # Uma chave de idempotência identifica uma única compra por jogador
+        UniqueConstraint("player_id", "idempotency_key", name="uix_purchase_idempotency"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
     shop_item_id = Column(Integer, ForeignKey("shop_items.id"), nullable=False)
     quantity = Column(Integer, default=1)
     total_price = Column(Float, nullable=False)
+    idempotency_key = Column(String(64), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     player = relationship("Player", back_populates="purchases")
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, UniqueConstraint
+from ..db import Base
+
+
+class SoilSample(Base):
+    """
+    Ponto da série temporal dos parâmetros do solo (somente inserção e consolidação).
+
+    Cada linha é um balde de tempo (hora, dia ou semana) de um terreno inteiro
+    (quadrant_id = 0) ou de um quadrante, com a média dos valores registrados no balde
+    e o número de amostras que a compõem.
+    """
+    __tablename__ = "soil_series"
+
+    id = Column(Integer, primary_key=True, index=True)
+    terrain_id = Column(Integer, ForeignKey("terrains.id"), nullable=False)
+    quadrant_id = Column(Integer, nullable=False, default=0)  # 0 = terreno inteiro
+    resolution = Column(String(8), nullable=False)  # hour, day, week
+    bucket_start = Column(DateTime, nullable=False)
+    samples = Column(Integer, nullable=False, default=1)
+    soil_moisture = Column(Float, nullable=False, default=0)
+    fertility = Column(Float, nullable=False, default=0)
+    organic_matter = Column(Float, nullable=False, default=0)
+    biodiversity = Column(Float, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("terrain_id", "quadrant_id", "resolution", "bucket_start", name="uix_soil_series_bucket"),
+    )
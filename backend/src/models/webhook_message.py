@@ -0,0 +1,30 @@
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
+from sqlalchemy.sql import func
+from ..db import Base
+
+
+class WebhookMessage(Base):
+    """
+    Mensagem recebida por webhook (WhatsApp), gravada antes da confirmação ao provedor.
+
+    `provider_message_id` é único: reentregas do provedor não geram uma segunda linha.
+    O consumidor (services.webhook_inbox) processa as linhas `pending` em lotes e grava
+    a resposta e o resultado.
+    """
+    __tablename__ = "webhook_inbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    provider_message_id = Column(String(128), nullable=False, unique=True)
+    phone_number = Column(String, nullable=True)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(16), nullable=False, default="pending")  # pending, processing, done, rejected, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    reply = Column(String, nullable=True)
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
+    claimed_at = Column(DateTime, nullable=True)
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Fila do consumidor: pendentes em ordem de chegada
+        Index("ix_webhook_inbox_status_id", "status", "id"),
+    )
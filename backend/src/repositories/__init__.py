@@ -0,0 +1,7 @@
+"""
+Camada única de acesso a dados (assíncrona).
+
+As rotas `api/*` e `api_async/*` delegam para estes módulos via `get_async_db`, de modo
+que a aplicação usa um só pool de conexões e nenhuma chamada passa pelo threadpool.
+Os módulos `crud_async/*` correspondentes são apenas aliases para compatibilidade.
+"""
@@ -0,0 +1,11 @@
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..schemas.tool_use import ToolUse
+from ..services.action_batch import run_action_batch
+
+
+async def run_actions_batch(db: AsyncSession, actions: List[ToolUse]) -> List[dict]:
+    """Executa o lote de ações (services.action_batch) na conexão da sessão assíncrona, via `run_sync`."""
+    return await db.run_sync(run_action_batch, actions)
@@ -0,0 +1,102 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from ..models.input import Input
+from ..schemas.input import InputCreate
+from ..services.input_batch import apply_inputs_batch_async, load_input_context
+from ..services.input_effects import apply_input_effects
+from ..services.player_digest import bump_player_state_version
+
+
+def record_input(db: Session, input_in: InputCreate) -> Tuple[Input, dict]:
+    """
+    Cria o insumo e aplica seus efeitos com um único COMMIT; devolve o registro e o relatório
+    (payload de InputWithEffectsOut). Síncrona: as funções assíncronas abaixo a chamam via
+    `run_sync` e o registry de ações (`crud.input`) diretamente, na própria sessão.
+
+    Raises:
+        ValueError: plantio inexistente
+    """
+    # Contexto (plantio, quadrante, parâmetros, vizinhança) em um SELECT, reaproveitado pelos efeitos
+    ctx = load_input_context(db, input_in.planting_id)
+    planting = ctx.plantings.get(input_in.planting_id)
+    if not planting:
+        raise ValueError(f"Planting with id {input_in.planting_id} not found")
+
+    db_input = Input(
+        planting_id=input_in.planting_id,
+        type=input_in.type,
+        quantity=input_in.quantity
+    )
+    db.add(db_input)
+    db.flush()
+
+    # Aplicar efeitos do insumo no solo e planta (mesma transação, um único COMMIT)
+    effects_info = apply_input_effects(db, db_input, context=ctx, commit=False)
+    result = {
+        "id": db_input.id,
+        "planting_id": db_input.planting_id,
+        "type": db_input.type,
+        "quantity": db_input.quantity,
+        "applied_at": db_input.applied_at,
+        "effects": effects_info.get("effects", []),
+        "terrain_id": effects_info.get("terrain_id"),
+        "quadrant_id": effects_info.get("quadrant_id"),
+        "plant_effects": effects_info.get("plant_effects"),
+    }
+    player_id = planting.player_id
+    db.commit()
+    bump_player_state_version(player_id)
+    return db_input, result
+
+
+async def create_input(db: AsyncSession, input_in: InputCreate) -> Input:
+    """Cria o insumo e aplica seus efeitos (o plantio precisa existir)."""
+    return (await db.run_sync(record_input, input_in))[0]
+
+
+async def create_input_with_effects(db: AsyncSession, input_in: InputCreate) -> dict:
+    """Cria o insumo e devolve seus campos com o relatório de efeitos (InputWithEffectsOut), sem reconsultar."""
+    return (await db.run_sync(record_input, input_in))[1]
+
+
+async def create_inputs_batch(db: AsyncSession, inputs: List[InputCreate]) -> List[dict]:
+    """Cria e aplica vários insumos em uma transação; um relatório por insumo, na ordem recebida."""
+    return await apply_inputs_batch_async(db, inputs)
+
+
+async def get_input(db: AsyncSession, input_id: int) -> Optional[Input]:
+    return await db.get(Input, input_id)
+
+
+async def list_planting_inputs(db: AsyncSession, planting_id: int, skip: int = 0, limit: int = 100) -> List[Input]:
+    result = await db.execute(
+        select(Input)
+        .where(Input.planting_id == planting_id)
+        .order_by(Input.applied_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def list_inputs(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Input]:
+    result = await db.execute(
+        select(Input)
+        .order_by(Input.applied_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def delete_input(db: AsyncSession, input_id: int) -> bool:
+    db_input = await get_input(db, input_id)
+    if not db_input:
+        return False
+    await db.delete(db_input)
+    await db.commit()
+    return True
@@ -0,0 +1,125 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models.planting import Planting
+from ..schemas.planting import BulkPlantingCreate, BulkPlantingOut, PlantingCreate, PlantingUpdate
+from ..services.planting_engine import bulk_plant_async
+from ..services.player_digest import bump_player_state_version
+from ..services.slot_occupancy import (
+    SLOTS_PER_QUADRANT,
+    ensure_quadrants_async,
+    ensure_terrain_async,
+    occupancy,
+    quadrant_report,
+    slot_in_range,
+)
+from ..services.survival import SURVIVAL_HORIZON_DAYS, SURVIVAL_RUNS, player_survival_async
+
+
+async def create_planting(db: AsyncSession, planting: PlantingCreate) -> Planting:
+    """
+    Planta no slot pedido. O slot é conferido no índice de ocupação (sem varrer `plantings`);
+    a constraint `uix_quadrant_slot` ainda rejeita plantios concorrentes no mesmo slot.
+    """
+    if not slot_in_range(planting.slot_index):
+        raise ValueError(f"Slot {planting.slot_index} is out of range 0-{SLOTS_PER_QUADRANT - 1}")
+    await ensure_quadrants_async(db, [planting.quadrant_id])
+    if occupancy.is_occupied(planting.quadrant_id, planting.slot_index):
+        raise ValueError(f"Slot {planting.slot_index} in quadrant {planting.quadrant_id} is already occupied")
+
+    db_obj = Planting(**planting.dict())
+    db.add(db_obj)
+    try:
+        await db.commit()
+        await db.refresh(db_obj)
+        occupancy.mark_planted(db_obj.quadrant_id, db_obj.slot_index)
+        bump_player_state_version(db_obj.player_id)
+        return db_obj
+    except IntegrityError:
+        await db.rollback()
+        occupancy.invalidate(planting.quadrant_id)
+        raise ValueError(f"Unable to create planting in slot {planting.slot_index} of quadrant {planting.quadrant_id}. The slot may be occupied.")
+
+
+async def create_plantings_bulk(db: AsyncSession, request: BulkPlantingCreate) -> BulkPlantingOut:
+    """Vários plantios em uma transação; slots pelo bitmap de ocupação e conflitos por item."""
+    return await bulk_plant_async(db, request)
+
+
+async def get_planting(db: AsyncSession, planting_id: int) -> Optional[Planting]:
+    return await db.get(Planting, planting_id)
+
+
+async def list_plantings(db: AsyncSession, player_id: Optional[int] = None,
+                         quadrant_id: Optional[int] = None) -> List[Planting]:
+    """Plantios filtrados por jogador e/ou quadrante, sem paginação."""
+    stmt = select(Planting)
+    if player_id is not None:
+        stmt = stmt.where(Planting.player_id == player_id)
+    if quadrant_id is not None:
+        stmt = stmt.where(Planting.quadrant_id == quadrant_id)
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+async def list_player_plantings(db: AsyncSession, player_id: int, skip: int = 0, limit: int = 100) -> List[Planting]:
+    result = await db.execute(
+        select(Planting).where(Planting.player_id == player_id).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def list_quadrant_plantings(db: AsyncSession, quadrant_id: int, skip: int = 0, limit: int = 100) -> List[Planting]:
+    result = await db.execute(
+        select(Planting).where(Planting.quadrant_id == quadrant_id).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def update_planting(db: AsyncSession, planting_id: int, planting_data: PlantingUpdate) -> Optional[Planting]:
+    db_obj = await get_planting(db, planting_id)
+    if db_obj:
+        for field, value in planting_data.dict(exclude_unset=True).items():
+            setattr(db_obj, field, value)
+        await db.commit()
+        await db.refresh(db_obj)
+        occupancy.mark_state(db_obj.quadrant_id, db_obj.slot_index, db_obj.current_state)
+        bump_player_state_version(db_obj.player_id)
+    return db_obj
+
+
+async def delete_planting(db: AsyncSession, planting_id: int) -> None:
+    db_obj = await get_planting(db, planting_id)
+    if db_obj:
+        player_id = db_obj.player_id
+        quadrant_id, slot_index = db_obj.quadrant_id, db_obj.slot_index
+        await db.delete(db_obj)
+        await db.commit()
+        occupancy.release(quadrant_id, slot_index)
+        bump_player_state_version(player_id)
+
+
+async def is_slot_available(db: AsyncSession, quadrant_id: int, slot_index: int) -> bool:
+    await ensure_quadrants_async(db, [quadrant_id])
+    return not occupancy.is_occupied(quadrant_id, slot_index)
+
+
+async def get_free_slots(db: AsyncSession, quadrant_id: int) -> Optional[dict]:
+    """Slots livres e finalizados (mortos/colhidos) do quadrante; None se ele não existe."""
+    await ensure_quadrants_async(db, [quadrant_id])
+    return quadrant_report(quadrant_id)
+
+
+async def get_first_free_slots(db: AsyncSession, terrain_id: int, limit: int = 10) -> List[Tuple[int, int]]:
+    """Primeiros `limit` pares (quadrant_id, slot_index) livres do terreno, na ordem dos quadrantes."""
+    await ensure_terrain_async(db, terrain_id)
+    return occupancy.first_free_in_terrain(terrain_id, limit)
+
+
+async def get_player_survival(db: AsyncSession, player_id: int, runs: int = SURVIVAL_RUNS,
+                              horizon_days: int = SURVIVAL_HORIZON_DAYS) -> Dict[str, Any]:
+    """Estimativa de sobrevivência dos plantios do jogador (ver services.survival)."""
+    return await player_survival_async(db, player_id, runs, horizon_days)
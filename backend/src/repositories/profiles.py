@@ -0,0 +1,51 @@
+"""Perfil, progresso e configurações do jogador: um registro por `user_id` em cada tabela."""
+from typing import List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models.player_profile import PlayerProfile
+from ..models.player_progress import PlayerProgress
+from ..models.player_settings import PlayerSettings
+
+Record = TypeVar("Record", PlayerProfile, PlayerProgress, PlayerSettings)
+
+
+async def get_by_user_id(db: AsyncSession, model: Type[Record], user_id: str) -> Optional[Record]:
+    result = await db.execute(select(model).where(model.user_id == user_id))
+    return result.scalars().first()
+
+
+async def list_records(db: AsyncSession, model: Type[Record], skip: int = 0, limit: int = 100) -> List[Record]:
+    result = await db.execute(select(model).offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+async def create_record(db: AsyncSession, model: Type[Record], record_in: BaseModel) -> Record:
+    record = model(**record_in.dict())
+    db.add(record)
+    await db.commit()
+    await db.refresh(record)
+    return record
+
+
+async def update_record(db: AsyncSession, model: Type[Record], user_id: str,
+                        record_update: BaseModel) -> Optional[Record]:
+    record = await get_by_user_id(db, model, user_id)
+    if not record:
+        return None
+    for field, value in record_update.dict(exclude_unset=True).items():
+        setattr(record, field, value)
+    await db.commit()
+    await db.refresh(record)
+    return record
+
+
+async def delete_record(db: AsyncSession, model: Type[Record], record_id: int) -> bool:
+    record = await db.get(model, record_id)
+    if not record:
+        return False
+    await db.delete(record)
+    await db.commit()
+    return True
@@ -0,0 +1,34 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models.purchase import Purchase
+from ..schemas.purchase import CartCheckout, PurchaseCreate
+from ..services.purchase_engine import execute_checkout_async, execute_purchase_async
+
+
+async def create_purchase(db: AsyncSession, purchase: PurchaseCreate,
+                          idempotency_key: Optional[str] = None) -> Purchase:
+    """
+    Debita o saldo do jogador e registra a compra e o lançamento no livro-razão atomicamente.
+
+    Raises:
+        ValueError: se o jogador ou o item não existir, ou se o saldo for insuficiente
+    """
+    return await execute_purchase_async(db, purchase, idempotency_key)
+
+
+async def checkout_cart(db: AsyncSession, cart: CartCheckout,
+                        idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    """Compra todos os itens do carrinho em uma única transação (ver services.purchase_engine)."""
+    return await execute_checkout_async(db, cart, idempotency_key)
+
+
+async def get_purchase(db: AsyncSession, purchase_id: int) -> Optional[Purchase]:
+    return await db.get(Purchase, purchase_id)
+
+
+async def list_purchases(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Purchase]:
+    result = await db.execute(select(Purchase).offset(skip).limit(limit))
+    return result.scalars().all()
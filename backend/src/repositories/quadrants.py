@@ -0,0 +1,74 @@
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models.quadrant import Quadrant
+from ..schemas.quadrant import QuadrantCreate, QuadrantUpdate
+from ..services.slot_occupancy import occupancy
+
+# Grade 5x3 gerada para todo terreno novo
+QUADRANT_ROWS = ["A", "B", "C"]
+QUADRANT_COLS = ["1", "2", "3", "4", "5"]
+
+
+async def create_quadrant(db: AsyncSession, quadrant_in: QuadrantCreate, terrain_id: Optional[int] = None) -> Quadrant:
+    """Cria um quadrante; `terrain_id` (vindo do path) tem precedência sobre o do corpo."""
+    data = quadrant_in.dict()
+    if terrain_id is not None:
+        data["terrain_id"] = terrain_id
+    db_obj = Quadrant(**data)
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    occupancy.forget_terrain(db_obj.terrain_id)
+    return db_obj
+
+
+async def get_quadrant(db: AsyncSession, quadrant_id: int) -> Optional[Quadrant]:
+    return await db.get(Quadrant, quadrant_id)
+
+
+async def list_quadrants(db: AsyncSession, terrain_id: int, skip: int = 0, limit: int = 100) -> List[Quadrant]:
+    result = await db.execute(
+        select(Quadrant)
+        .where(Quadrant.terrain_id == terrain_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def update_quadrant(db: AsyncSession, quadrant_id: int, quadrant_in: QuadrantUpdate) -> Optional[Quadrant]:
+    quadrant = await get_quadrant(db, quadrant_id)
+    if quadrant:
+        for field, value in quadrant_in.dict(exclude_unset=True).items():
+            setattr(quadrant, field, value)
+        await db.commit()
+        await db.refresh(quadrant)
+    return quadrant
+
+
+async def delete_quadrant(db: AsyncSession, quadrant_id: int) -> None:
+    quadrant = await get_quadrant(db, quadrant_id)
+    if quadrant:
+        terrain_id = quadrant.terrain_id
+        await db.delete(quadrant)
+        await db.commit()
+        occupancy.forget_terrain(terrain_id)
+
+
+async def generate_quadrants_for_terrain(db: AsyncSession, terrain_id: int, commit: bool = True) -> List[Quadrant]:
+    """Gera os 15 quadrantes (grade 5x3) de um terreno em um único flush/commit."""
+    quadrants = [
+        Quadrant(terrain_id=terrain_id, label=f"{r}{c}")
+        for r in QUADRANT_ROWS
+        for c in QUADRANT_COLS
+    ]
+    db.add_all(quadrants)
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+    occupancy.forget_terrain(terrain_id)
+    return quadrants
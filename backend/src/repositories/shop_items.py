@@ -0,0 +1,26 @@
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models.shop_item import ShopItem
+from ..schemas.shop_item import ShopItemCreate
+from ..services import catalog_cache
+
+
+async def create_shop_item(db: AsyncSession, item: ShopItemCreate) -> ShopItem:
+    db_item = ShopItem(**item.dict())
+    db.add(db_item)
+    await db.commit()
+    await db.refresh(db_item)
+    catalog_cache.invalidate(catalog_cache.SHOP_ITEMS)
+    return db_item
+
+
+async def get_shop_item(db: AsyncSession, item_id: int) -> Optional[ShopItem]:
+    return await db.get(ShopItem, item_id)
+
+
+async def list_shop_items(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ShopItem]:
+    result = await db.execute(select(ShopItem).offset(skip).limit(limit))
+    return result.scalars().all()
@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models.terrain import Terrain
+from ..models.terrain_parameters import TerrainParameters
+from ..schemas.terrain import TerrainCreate, TerrainUpdate
+from ..services.slot_occupancy import occupancy
+from ..services.soil_health import analyze_soil_health
+from .quadrants import generate_quadrants_for_terrain
+
+
+async def create_terrain(db: AsyncSession, terrain_in: TerrainCreate) -> Terrain:
+    """Cria o terreno e seus 15 quadrantes na mesma transação."""
+    db_terrain = Terrain(**terrain_in.dict())
+    db.add(db_terrain)
+    await db.flush()
+    await generate_quadrants_for_terrain(db, db_terrain.id, commit=False)
+    await db.commit()
+    await db.refresh(db_terrain)
+    return db_terrain
+
+
+async def get_terrain(db: AsyncSession, terrain_id: int) -> Optional[Terrain]:
+    return await db.get(Terrain, terrain_id)
+
+
+async def list_terrains(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Terrain]:
+    result = await db.execute(select(Terrain).offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+async def update_terrain(db: AsyncSession, terrain_id: int, terrain_in: TerrainUpdate) -> Optional[Terrain]:
+    terrain = await get_terrain(db, terrain_id)
+    if terrain:
+        for field, value in terrain_in.dict(exclude_unset=True).items():
+            setattr(terrain, field, value)
+        await db.commit()
+        await db.refresh(terrain)
+    return terrain
+
+
+async def delete_terrain(db: AsyncSession, terrain_id: int) -> None:
+    terrain = await get_terrain(db, terrain_id)
+    if terrain:
+        await db.delete(terrain)
+        await db.commit()
+        occupancy.forget_terrain(terrain_id)
+
+
+async def get_terrain_parameters(db: AsyncSession, terrain_id: int) -> Optional[TerrainParameters]:
+    result = await db.execute(
+        select(TerrainParameters).where(TerrainParameters.terrain_id == terrain_id)
+    )
+    return result.scalars().first()
+
+
+async def get_terrain_health_report(db: AsyncSession, terrain_id: int) -> Dict[str, Any]:
+    """Relatório de saúde do solo do terreno (ver services.soil_health)."""
+    terrain_params = await get_terrain_parameters(db, terrain_id)
+    if not terrain_params:
+        return {
+            "health_index": 0,
+            "health_category": "Desconhecido",
+            "alerts": [],
+            "recommendations": ["Parâmetros do terreno não encontrados"]
+        }
+    return analyze_soil_health(terrain_params)
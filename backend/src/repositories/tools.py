@@ -0,0 +1,50 @@
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models.tool import Tool
+from ..schemas.tool import ToolCreate
+from ..services import catalog_cache
+
+
+async def create_tool(db: AsyncSession, tool_in: ToolCreate) -> Tool:
+    db_tool = Tool(**tool_in.dict())
+    db.add(db_tool)
+    await db.commit()
+    await db.refresh(db_tool)
+    catalog_cache.invalidate(catalog_cache.TOOLS)
+    return db_tool
+
+
+async def get_tool(db: AsyncSession, tool_id: int) -> Optional[Tool]:
+    return await db.get(Tool, tool_id)
+
+
+async def get_tool_by_key(db: AsyncSession, key: str) -> Optional[Tool]:
+    result = await db.execute(select(Tool).where(Tool.key == key))
+    return result.scalars().first()
+
+
+async def list_tools(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Tool]:
+    result = await db.execute(select(Tool).offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+async def update_tool(db: AsyncSession, tool_id: int, tool_in: ToolCreate) -> Optional[Tool]:
+    tool = await get_tool(db, tool_id)
+    if tool:
+        for field, value in tool_in.dict(exclude_unset=True).items():
+            setattr(tool, field, value)
+        await db.commit()
+        await db.refresh(tool)
+        catalog_cache.invalidate(catalog_cache.TOOLS)
+    return tool
+
+
+async def delete_tool(db: AsyncSession, tool_id: int) -> None:
+    tool = await get_tool(db, tool_id)
+    if tool:
+        await db.delete(tool)
+        await db.commit()
+        catalog_cache.invalidate(catalog_cache.TOOLS)
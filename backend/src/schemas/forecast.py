@@ -0,0 +1,56 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .input import InputCreate
+
+
+class ForecastRequest(BaseModel):
+    """Parâmetros da previsão de um terreno."""
+    days: int = Field(14, ge=1, description="Dias simulados")
+    inputs: List[InputCreate] = Field(default_factory=list, description="Insumos hipotéticos aplicados no dia 0")
+    mode: str = Field("expected", description="expected (clima em valor esperado) ou monte_carlo")
+    runs: int = Field(50, ge=1, description="Execuções do modo monte_carlo")
+    seed: int = Field(0, description="Semente das regas e do clima sorteado")
+    water_probability: Optional[float] = Field(
+        None, ge=0, le=1, description="Chance de rega por dia (padrão: cadência histórica do jogador)")
+
+
+class SoilForecastPoint(BaseModel):
+    """Parâmetros do terreno no fim de um dia (mediana e percentis 10/90 no modo monte_carlo)."""
+    day: int
+    values: Dict[str, float]
+    p10: Optional[Dict[str, float]] = None
+    p90: Optional[Dict[str, float]] = None
+
+
+class PlantingTransition(BaseModel):
+    day: int
+    from_state: str
+    to_state: str
+
+
+class PlantingForecast(BaseModel):
+    planting_id: int
+    species: str
+    current_state: str
+    final_state: str
+    probabilities: Dict[str, float]
+    transitions: Optional[List[PlantingTransition]] = None
+
+
+class ForecastOut(BaseModel):
+    terrain_id: int
+    mode: str
+    days_requested: int
+    days: int
+    runs_requested: int
+    runs: int
+    truncated: bool
+    cpu_ms: float
+    cached: bool = False
+    season: Optional[str] = None
+    final_season: Optional[str] = None
+    water_probability: float
+    soil: List[SoilForecastPoint]
+    plantings: List[PlantingForecast]
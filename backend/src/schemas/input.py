@@ -50,3 +50,8 @@ class InputWithEffectsOut(InputOut):
         None, 
         description="Efeitos do insumo na planta (por exemplo, days_sem_rega)"
     )
+
+
+class InputBatchCreate(BaseModel):
+    """Schema for applying many inputs in a single request."""
+    inputs: List[InputCreate] = Field(..., description="Insumos a aplicar (até 200)")
@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class PlantingBase(BaseModel):
     """Base schema for plantings"""
@@ -30,3 +30,75 @@ class PlantingSchema(PlantingBase):
 
     class Config:
         orm_mode = True
+
+
+class BulkPlantingEntry(BaseModel):
+    """Um plantio do lote; sem slot_index, o primeiro slot livre do quadrante é usado"""
+    quadrant_id: int
+    species_id: int
+    slot_index: Optional[int] = None
+
+class BulkAutoFill(BaseModel):
+    """Preenche os primeiros `count` slots livres do quadrante com a espécie"""
+    quadrant_id: int
+    species_id: int
+    count: int
+
+class BulkPlantingCreate(BaseModel):
+    """Schema for planting many slots in one request"""
+    player_id: int
+    entries: List[BulkPlantingEntry] = []
+    auto_fill: List[BulkAutoFill] = []
+
+class BulkPlantingResult(BaseModel):
+    """Resultado de cada plantio pedido: created, conflict ou invalid"""
+    quadrant_id: int
+    species_id: int
+    slot_index: Optional[int] = None
+    status: str
+    planting_id: Optional[int] = None
+    detail: Optional[str] = None
+
+class BulkPlantingOut(BaseModel):
+    player_id: int
+    created: int
+    conflicts: int
+    results: List[BulkPlantingResult]
+
+class FreeSlot(BaseModel):
+    quadrant_id: int
+    slot_index: int
+
+class QuadrantFreeSlotsOut(BaseModel):
+    """Slots livres e finalizados (plantio morto/colhido, ainda ocupando o slot) do quadrante"""
+    quadrant_id: int
+    terrain_id: int
+    slots_per_quadrant: int
+    free_slots: List[int]
+    finished_slots: List[int]
+
+class TerrainFreeSlotsOut(BaseModel):
+    terrain_id: int
+    slots: List[FreeSlot]
+
+
+class PlantingSurvival(BaseModel):
+    """Estimativa Monte Carlo de um plantio até a maturidade (COLHIVEL) no horizonte."""
+    planting_id: int
+    species: str
+    current_state: str
+    survival_probability: float
+    death_probability: float
+    growing_probability: float
+    stderr: float
+    expected_days_to_maturity: Optional[float] = None
+
+
+class PlayerSurvivalOut(BaseModel):
+    player_id: int
+    runs: int
+    horizon_days: int
+    water_probability: float
+    season: Optional[str] = None
+    cached: bool
+    plantings: List[PlantingSurvival]
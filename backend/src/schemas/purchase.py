@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -17,3 +17,20 @@ class PurchaseOut(PurchaseBase):
 
     class Config:
         orm_mode = True
+
+
+class CartItem(BaseModel):
+    shop_item_id: int
+    quantity: int = 1
+
+
+class CartCheckout(BaseModel):
+    player_id: int
+    items: List[CartItem]
+
+
+class CheckoutOut(BaseModel):
+    player_id: int
+    total_price: float
+    balance: float
+    purchases: List[PurchaseOut]
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SoilSeriesPoint(BaseModel):
+    """Ponto reamostrado da série do solo (média do balde)."""
+    t: datetime
+    samples: int
+    soil_moisture: float
+    fertility: float
+    organic_matter: float
+    biodiversity: float
+
+
+class SoilSeriesOut(BaseModel):
+    terrain_id: int
+    quadrant_id: Optional[int] = None
+    resolution: str
+    start: datetime
+    end: datetime
+    points: List[SoilSeriesPoint]
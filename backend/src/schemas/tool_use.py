@@ -1,7 +1,7 @@
 # backend/src/schemas/tool_use.py
 
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
 class ToolUse(BaseModel):
     """
@@ -10,4 +10,17 @@ class ToolUse(BaseModel):
     """
     action_name: str
     terrain_id: int
-    tool_key: Optional[str] = None
\ No newline at end of file
+    tool_key: Optional[str] = None
+
+class ActionBatchCreate(BaseModel):
+    """Schema para executar várias ações em uma única transação."""
+    actions: List[ToolUse] = Field(..., description="Ações a executar, na ordem (até 500)")
+
+
+class ActionBatchResult(BaseModel):
+    """Resultado de uma ação do lote: valores finais dos campos alterados e crédito ao jogador."""
+    action_name: str
+    terrain_id: int
+    tool_key: Optional[str] = None
+    changes: Dict[str, float]
+    credited: float = 0.0
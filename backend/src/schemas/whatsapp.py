@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 class WhatsappMessageIn(BaseModel):
@@ -10,3 +10,10 @@ class WhatsappMessageIn(BaseModel):
 
 class WhatsappMessageOut(BaseModel):
     reply: str
+
+class WhatsappWebhookIn(WhatsappMessageIn):
+    """Mensagem entregue pelo provedor; `message_id` é o id da mensagem no provedor (deduplicação)."""
+    message_id: str = Field(..., min_length=1, max_length=128)
+
+class WhatsappWebhookAck(BaseModel):
+    status: str  # queued ou duplicate
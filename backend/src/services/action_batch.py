@@ -0,0 +1,176 @@
+"""
+Execução de ações em lote.
+
+Em vez de uma transação (ou mais) por ação, o lote:
+1. carrega terrenos (dono) e parâmetros de todos os terrenos envolvidos com um único SELECT;
+2. dobra, por terreno e na ordem recebida, o clima atual, a ferramenta e o delta puro de cada
+   ação (services.action_registry) em um único TerrainDelta líquido; os créditos ao jogador
+   (ex.: colher) são somados no mesmo delta;
+3. aplica cada delta líquido com um UPDATE (incrementos como `coluna + n`, atribuições como
+   valores) e os créditos com um UPDATE por jogador;
+4. insere todas as linhas de `actions` com um INSERT em lote;
+5. registra os valores resultantes na série do solo e faz um único COMMIT.
+
+Só ações com delta podem ir em lote; as demais (ex.: aplicar_insumo) continuam pelo
+`registry.handle`.
+"""
+import logging
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+from typing import Dict, List
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..models.action import Action
+from ..models.player import Player
+from ..models.terrain import Terrain
+from ..models.terrain_parameters import TerrainParameters
+from ..schemas.tool_use import ToolUse
+from .action_registry import TerrainDelta, registry
+from .current_weather import current_weather
+from .player_digest import bump_player_state_version
+from .soil_series import PARAMS, record
+from .terrain_service import DEFAULT_PARAMETERS, climate_delta
+from .tool_effects import tool_changes, tool_table
+
+logger = logging.getLogger(__name__)
+
+# Limite de ações por lote
+MAX_BATCH_ACTIONS = 500
+
+_params_table = TerrainParameters.__table__
+
+
+def _validate(actions: List[ToolUse]) -> None:
+    if not actions:
+        raise ValueError("Nenhuma ação informada")
+    if len(actions) > MAX_BATCH_ACTIONS:
+        raise ValueError(f"Lote com mais de {MAX_BATCH_ACTIONS} ações")
+    unsupported = sorted({a.action_name for a in actions if registry.delta(a.action_name) is None})
+    if unsupported:
+        raise ValueError(f"Ações sem suporte em lote: {', '.join(unsupported)}")
+
+
+def _load_states(db: Session, terrain_ids) -> Dict[int, tuple]:
+    """(dono, estado dos parâmetros) por terreno; cria os parâmetros que faltarem."""
+    rows = db.execute(
+        select(Terrain.id, Terrain.player_id, TerrainParameters)
+        .outerjoin(TerrainParameters, TerrainParameters.terrain_id == Terrain.id)
+        .where(Terrain.id.in_(terrain_ids))
+    ).all()
+    missing = sorted(set(terrain_ids) - {row[0] for row in rows})
+    if missing:
+        raise ValueError(f"Terrenos não encontrados: {', '.join(map(str, missing))}")
+    states = {}
+    new_rows = []
+    for terrain_id, player_id, params in rows:
+        if params is None:
+            state = {"terrain_id": terrain_id, **DEFAULT_PARAMETERS}
+            new_rows.append(state)
+        else:
+            state = {column.key: getattr(params, column.key) for column in _params_table.columns}
+        states.setdefault(terrain_id, (player_id, state))
+    if new_rows:
+        db.execute(insert(_params_table), new_rows)
+    return states
+
+
+def fold_actions(db: Session, state: dict, actions: List[ToolUse], weather, tool_uses: Counter):
+    """
+    Dobra as ações de um terreno em um único delta, na ordem recebida.
+
+    Returns:
+        tuple: (delta líquido, estado final, relatório por ação)
+    """
+    net = TerrainDelta()
+    reports = []
+    for action in actions:
+        step = climate_delta(state, weather)
+        changes = tool_changes(db, step.apply(state), action.tool_key, tool_uses[action.tool_key])
+        if changes is not None:
+            step = step.then(TerrainDelta(adds=changes))
+            tool_uses[action.tool_key] += 1
+        step = step.then(registry.delta(action.action_name)(step.apply(state)))
+        new_state = step.apply(state)
+        reports.append({
+            "action_name": action.action_name,
+            "terrain_id": action.terrain_id,
+            "tool_key": action.tool_key,
+            "changes": {field: new_state[field] for field in sorted(step.fields())},
+            "credited": step.balance,
+        })
+        state, net = new_state, net.then(step)
+    return net, state, reports
+
+
+def _update_statement(terrain_id: int, delta: TerrainDelta):
+    values = dict(delta.sets)
+    for field, value in delta.adds.items():
+        values[field] = _params_table.c[field] + value
+    return update(_params_table).where(_params_table.c.terrain_id == terrain_id).values(**values)
+
+
+def run_action_batch(db: Session, actions: List[ToolUse]) -> List[dict]:
+    """
+    Executa uma lista de ações (de um ou vários terrenos) em uma única transação.
+
+    Returns:
+        List[dict]: Relatório por ação, na ordem recebida (valores finais dos campos alterados
+        e crédito ao jogador)
+
+    Raises:
+        ValueError: lote vazio ou grande demais, ação sem delta ou terreno inexistente
+    """
+    _validate(actions)
+    by_terrain: Dict[int, List[int]] = defaultdict(list)
+    for i, action in enumerate(actions):
+        by_terrain[action.terrain_id].append(i)
+
+    try:
+        states = _load_states(db, list(by_terrain))
+        weather = current_weather(db)
+        tool_uses: Counter = Counter()
+        reports: List[dict] = [None] * len(actions)
+        credits: Dict[int, float] = defaultdict(float)
+        final_states = []
+        for terrain_id, indexes in by_terrain.items():
+            player_id, state = states[terrain_id]
+            net, final, terrain_reports = fold_actions(db, state, [actions[i] for i in indexes], weather, tool_uses)
+            for i, report in zip(indexes, terrain_reports):
+                reports[i] = report
+            if net.sets or net.adds:
+                db.execute(_update_statement(terrain_id, net))
+            if net.balance:
+                credits[player_id] += net.balance
+            if net.fields() & set(PARAMS):
+                final_states.append(SimpleNamespace(**final))
+
+        if credits:
+            db.execute(
+                update(Player.__table__)
+                .where(Player.__table__.c.id == bindparam("player"))
+                .values(balance=func.coalesce(Player.__table__.c.balance, 0) + bindparam("amount")),
+                [{"player": player_id, "amount": amount} for player_id, amount in credits.items()],
+            )
+        db.execute(insert(Action.__table__), [
+            {
+                "player_id": states[action.terrain_id][0],
+                "terrain_id": action.terrain_id,
+                "action_name": action.action_name,
+                "sub_action": action.tool_key,
+            }
+            for action in actions
+        ])
+        record(db, final_states, ())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for tool_key, uses in tool_uses.items():
+        tool_table.wear(tool_key, uses)
+    for player_id in {player_id for player_id, _ in states.values()}:
+        bump_player_state_version(player_id)
+    logger.info(f"Lote de {len(actions)} ações aplicado em {len(by_terrain)} terrenos")
+    return reports
@@ -0,0 +1,234 @@
+"""
+Executor das ações sobre o terreno, com novas tentativas sem bloqueio.
+
+Cada tentativa abre a própria sessão, executa e fecha a sessão antes de qualquer espera:
+uma tentativa que falha devolve a conexão ao pool e é reagendada para daqui a
+`backoff(n)` segundos (exponencial com jitter completo, até ACTION_RETRY_MAX_SECONDS).
+Os reagendamentos ficam em um heap atendido por uma única thread de despacho, que entrega
+as tentativas vencidas a um pool de ACTION_WORKERS threads; nenhuma thread de trabalho
+dorme entre tentativas.
+
+Toda tentativa gera uma métrica estruturada (ação, terreno, tentativa, resultado, duração,
+erro), registrada no log e nas últimas ACTION_METRICS_HISTORY tentativas de `metrics()`.
+"""
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+ACTION_MAX_ATTEMPTS = int(os.getenv("ACTION_MAX_ATTEMPTS", "3"))
+ACTION_RETRY_BASE_SECONDS = float(os.getenv("ACTION_RETRY_BASE_SECONDS", "0.5"))
+ACTION_RETRY_MAX_SECONDS = float(os.getenv("ACTION_RETRY_MAX_SECONDS", "10"))
+ACTION_WORKERS = int(os.getenv("ACTION_WORKERS", "4"))
+ACTION_METRICS_HISTORY = int(os.getenv("ACTION_METRICS_HISTORY", "200"))
+
+OK = "ok"
+RETRY = "retry"
+FAILED = "failed"
+
+
+class ActionJob:
+    __slots__ = ("id", "action_name", "terrain_id", "tool_key", "attempt", "submitted_at")
+
+    def __init__(self, job_id: int, action_name: str, terrain_id: int, tool_key: Optional[str]):
+        self.id = job_id
+        self.action_name = action_name
+        self.terrain_id = terrain_id
+        self.tool_key = tool_key
+        self.attempt = 0
+        self.submitted_at = time.monotonic()
+
+
+class ActionExecutor:
+    """
+    Executa `run(db, action_name, terrain_id, tool_key)` com novas tentativas agendadas.
+
+    Args:
+        run: Uma tentativa da ação (lança exceção para pedir nova tentativa)
+        session_factory: Fábrica de sessões (create_app passa a do app); None usa `src.db.SessionLocal`
+    """
+
+    def __init__(self, run: Callable[[Session, str, int, Optional[str]], None],
+                 session_factory: Optional[Callable[[], Session]] = None,
+                 max_attempts: int = ACTION_MAX_ATTEMPTS, base_delay: float = ACTION_RETRY_BASE_SECONDS,
+                 max_delay: float = ACTION_RETRY_MAX_SECONDS, workers: int = ACTION_WORKERS,
+                 rng: Callable[[], float] = random.random):
+        self._run = run
+        self.session_factory = session_factory
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.workers = workers
+        self._rng = rng
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._heap = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._pending = 0
+        self._stopped = False
+        self._counters = {"submitted": 0, "attempts": 0, "succeeded": 0, "retried": 0, "failed": 0}
+        self._attempt_total = 0.0
+        self._attempt_max = 0.0
+        self._recent = deque(maxlen=ACTION_METRICS_HISTORY)
+
+    def backoff(self, attempt: int) -> float:
+        """Espera antes da tentativa `attempt + 1`: jitter completo sobre o exponencial."""
+        return self._rng() * min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            from ..db import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    def _new_job(self, action_name: str, terrain_id: int, tool_key: Optional[str]) -> ActionJob:
+        with self._cond:
+            self._counters["submitted"] += 1
+            self._pending += 1
+        return ActionJob(next(self._ids), action_name, terrain_id, tool_key)
+
+    def execute(self, action_name: str, terrain_id: int, tool_key: Optional[str] = None) -> bool:
+        """
+        Faz a primeira tentativa na thread de quem chama; se falhar, as próximas são agendadas
+        e a chamada retorna sem esperar.
+
+        Returns:
+            bool: True se a primeira tentativa concluiu a ação
+        """
+        return self._attempt(self._new_job(action_name, terrain_id, tool_key))
+
+    def submit(self, action_name: str, terrain_id: int, tool_key: Optional[str] = None) -> int:
+        """Agenda a ação para execução imediata no pool e retorna o id do job."""
+        job = self._new_job(action_name, terrain_id, tool_key)
+        self._schedule(job, 0.0)
+        return job.id
+
+    def _attempt(self, job: ActionJob) -> bool:
+        job.attempt += 1
+        started = time.perf_counter()
+        error = None
+        db = self._session()
+        try:
+            self._run(db, job.action_name, job.terrain_id, job.tool_key)
+        except Exception as e:
+            error = e
+        finally:
+            # A conexão volta ao pool antes de qualquer espera
+            db.close()
+        duration = time.perf_counter() - started
+
+        if error is None:
+            outcome = OK
+        elif job.attempt < self.max_attempts:
+            outcome = RETRY
+        else:
+            outcome = FAILED
+        delay = self.backoff(job.attempt) if outcome == RETRY else None
+        self._record(job, outcome, duration, error, delay)
+        if outcome == RETRY:
+            self._schedule(job, delay)
+        else:
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify_all()
+        return error is None
+
+    def _record(self, job: ActionJob, outcome: str, duration: float, error: Optional[Exception],
+                delay: Optional[float]) -> None:
+        metric = {
+            "job_id": job.id,
+            "action": job.action_name,
+            "terrain_id": job.terrain_id,
+            "tool_key": job.tool_key,
+            "attempt": job.attempt,
+            "outcome": outcome,
+            "duration_ms": round(duration * 1000, 3),
+            "error": repr(error) if error is not None else None,
+            "retry_in_s": round(delay, 3) if delay is not None else None,
+        }
+        with self._cond:
+            self._counters["attempts"] += 1
+            self._counters[{OK: "succeeded", RETRY: "retried", FAILED: "failed"}[outcome]] += 1
+            self._attempt_total += duration
+            self._attempt_max = max(self._attempt_max, duration)
+            self._recent.append(metric)
+        level = logging.ERROR if outcome == FAILED else logging.WARNING if outcome == RETRY else logging.INFO
+        logger.log(level, "action_attempt %s", " ".join(f"{k}={v}" for k, v in metric.items()),
+                   extra={"action_attempt": metric})
+
+    def _schedule(self, job: ActionJob, delay: float) -> None:
+        with self._cond:
+            if self._stopped:
+                self._pending -= 1
+                self._cond.notify_all()
+                logger.error(f"Executor parado: ação '{job.action_name}' (job {job.id}) descartada")
+                return
+            self._ensure_started()
+            heapq.heappush(self._heap, (time.monotonic() + delay, job.id, job))
+            self._cond.notify_all()
+
+    def _ensure_started(self) -> None:
+        if self._dispatcher is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="action-worker")
+            self._dispatcher = threading.Thread(target=self._dispatch, name="action-dispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+            self._pool.submit(self._attempt, job)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Espera até não haver ações pendentes (testes e encerramento). True se esvaziou."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Espera as ações pendentes (até `timeout`) e encerra as threads."""
+        self.drain(timeout)
+        with self._cond:
+            self._stopped = True
+            dropped = len(self._heap)
+            self._pending -= dropped
+            self._heap.clear()
+            self._cond.notify_all()
+        if dropped:
+            logger.error(f"Executor encerrado com {dropped} ações agendadas descartadas")
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    def metrics(self) -> dict:
+        """Snapshot dos contadores e das últimas tentativas."""
+        with self._cond:
+            attempts = self._counters["attempts"]
+            return {
+                "pending": self._pending,
+                "scheduled": len(self._heap),
+                "avg_attempt_ms": round(self._attempt_total / attempts * 1000, 3) if attempts else 0.0,
+                "max_attempt_ms": round(self._attempt_max * 1000, 3),
+                **self._counters,
+                "recent": list(self._recent),
+            }
@@ -1,33 +1,155 @@
-from typing import Callable, Dict
+"""
+Registro das ações sobre o terreno.
+
+Há dois tipos de ação:
+- com delta (`register_delta`): uma função pura `estado -> TerrainDelta` sobre os parâmetros do
+  terreno (atribuições, incrementos e crédito ao jogador). Não acessa o banco nem faz COMMIT,
+  então uma lista de ações pode ser dobrada em um único delta líquido (services.action_batch);
+- com handler (`register`): executa a ação por conta própria (ex.: aplicar_insumo, que cria
+  o insumo).
+
+`handle` executa uma ação isolada dos dois tipos, com os efeitos da ferramenta, em um COMMIT.
+"""
+import logging
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
-from ..crud.terrain_parameters import update_terrain_parameters
-from ..crud.player import update_player_balance
-from ..crud.terrain import get_terrain
-from ..schemas.terrain_parameters import TerrainParametersUpdate
+
+from ..models.player import Player
+from ..models.terrain import Terrain
 from ..schemas.input import InputCreate
 from ..crud.input import create_input
-from ..services.input_effects import apply_input_effects
+from ..services.tool_effects import apply_tool, tool_table
+
+logger = logging.getLogger(__name__)
+
+
+class TerrainDelta:
+    """Variação dos parâmetros de um terreno: atribuições (`sets`), incrementos (`adds`) e crédito ao jogador."""
+
+    __slots__ = ("sets", "adds", "balance")
+
+    def __init__(self, sets: Optional[Dict[str, float]] = None, adds: Optional[Dict[str, float]] = None,
+                 balance: float = 0.0):
+        self.sets = dict(sets or {})
+        self.adds = dict(adds or {})
+        self.balance = balance
+
+    def then(self, other: "TerrainDelta") -> "TerrainDelta":
+        """Delta equivalente a aplicar `self` e depois `other`."""
+        sets = dict(self.sets)
+        adds = dict(self.adds)
+        for field, value in other.sets.items():
+            sets[field] = value
+            adds.pop(field, None)
+        for field, value in other.adds.items():
+            if field in sets:
+                sets[field] = (sets[field] or 0) + value
+            else:
+                adds[field] = adds.get(field, 0) + value
+        return TerrainDelta(sets, adds, self.balance + other.balance)
+
+    def apply(self, state: Dict[str, float]) -> Dict[str, float]:
+        """Novo estado depois do delta (o estado recebido não é alterado)."""
+        new_state = dict(state)
+        new_state.update(self.sets)
+        for field, value in self.adds.items():
+            new_state[field] = (new_state.get(field) or 0) + value
+        return new_state
+
+    def fields(self):
+        return set(self.sets) | set(self.adds)
+
+    def __bool__(self) -> bool:
+        return bool(self.sets or self.adds or self.balance)
+
+    def __repr__(self) -> str:
+        return f"TerrainDelta(sets={self.sets}, adds={self.adds}, balance={self.balance})"
+
+
+def credit_player_statement(terrain_id: int, amount: float):
+    """UPDATE que credita `amount` ao dono do terreno, sem carregar o jogador."""
+    owner = select(Terrain.player_id).where(Terrain.id == terrain_id).scalar_subquery()
+    return (
+        update(Player)
+        .where(Player.id == owner)
+        .values(balance=func.coalesce(Player.balance, 0) + amount)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def state_of(params) -> Dict[str, float]:
+    """Estado (dict) de um objeto TerrainParameters já carregado."""
+    return {column.key: getattr(params, column.key) for column in params.__table__.columns}
+
 
 class ActionRegistry:
     def __init__(self):
         self._handlers: Dict[str, Callable[[Session, int, any], None]] = {}
+        self._deltas: Dict[str, Callable[[Dict[str, float]], TerrainDelta]] = {}
+        # Incrementado a cada registro (caches derivados, ex.: services.command_parser)
+        self.version = 0
 
     def register(self, name: str):
         def decorator(fn: Callable[[Session, int, any], None]):
             self._handlers[name.lower()] = fn
+            self.version += 1
+            return fn
+        return decorator
+
+    def register_delta(self, name: str):
+        """Registra a função pura `estado -> TerrainDelta` da ação `name`."""
+        def decorator(fn: Callable[[Dict[str, float]], TerrainDelta]):
+            self._deltas[name.lower()] = fn
+            self.version += 1
             return fn
         return decorator
 
     def has(self, action_name: str) -> bool:
         """Retorna True se existir handler registrado para `action_name`"""
-        return action_name.lower() in self._handlers
+        name = action_name.lower()
+        return name in self._deltas or name in self._handlers
+
+    def delta(self, action_name: str) -> Optional[Callable[[Dict[str, float]], TerrainDelta]]:
+        """Função de delta da ação, ou None se a ação não puder ser processada em lote."""
+        return self._deltas.get(action_name.lower())
+
+    def names(self):
+        """Nomes de todas as ações registradas."""
+        return sorted(set(self._deltas) | set(self._handlers))
 
-    def handle(self, action_name: str, db: Session, terrain_id: int, params: any):
+    def handle(self, action_name: str, db: Session, terrain_id: int, params: any, tool_key: Optional[str] = None):
+        """
+        Executa a ação. Os efeitos da ferramenta (`tool_key`) são somados aos parâmetros antes
+        da ação e gravados no mesmo COMMIT; se a ação falhar, a sessão volta ao estado anterior
+        e nada da ferramenta é aplicado nem desgastado.
+        """
+        delta_fn = self.delta(action_name)
         handler = self._handlers.get(action_name.lower())
-        if handler:
-            handler(db, terrain_id, params)
-        else:
-            print(f"[action_registry] Handler não encontrado para ação '{action_name}'")
+        if delta_fn is None and handler is None:
+            logger.warning(f"Handler não encontrado para ação '{action_name}'")
+            return
+        try:
+            tool_delta = apply_tool(db, params, tool_key)
+            if delta_fn is not None:
+                state = state_of(params)
+                delta = delta_fn(state)
+                new_state = delta.apply(state)
+                for field in delta.fields():
+                    setattr(params, field, new_state[field])
+                if delta.balance:
+                    db.execute(credit_player_statement(terrain_id, delta.balance))
+                db.commit()
+                logger.info(f"{action_name} no terreno {terrain_id}: {delta}")
+            else:
+                handler(db, terrain_id, params)
+        except Exception:
+            db.rollback()
+            raise
+        if tool_delta is not None:
+            tool_table.wear(tool_key)
+            logger.info(f"ferramenta {tool_key}: {tool_delta}")
 
 # Instância global do registry
 registry = ActionRegistry()
@@ -35,39 +157,21 @@ registry = ActionRegistry()
 # preço fixo por unidade de cobertura
 PRICE_PER_UNIT = 1.0
 
-# Handlers padrão
-@registry.register("plantar")
-def handle_plantar(db: Session, terrain_id: int, params: any):
-    new_coverage = (params.coverage or 0) + 10
-    new_cycles = (params.regeneration_cycles or 0) + 1
-    update_in = TerrainParametersUpdate(
-        coverage=new_coverage,
-        regeneration_cycles=new_cycles,
-    )
-    update_terrain_parameters(db, terrain_id, update_in)
-    print(f"[action_registry] plantar: coverage {new_coverage}, cycles {new_cycles}")
-
-@registry.register("regar")
-@registry.register("water")
-def handle_regar(db: Session, terrain_id: int, params: any):
-    new_cycles = (params.regeneration_cycles or 0) + 1
-    update_in = TerrainParametersUpdate(regeneration_cycles=new_cycles)
-    update_terrain_parameters(db, terrain_id, update_in)
-    print(f"[action_registry] regar: cycles {new_cycles}")
-
-@registry.register("colher")
-@registry.register("harvest")
-def handle_colher(db: Session, terrain_id: int, params: any):
-    # calcula receita e atualiza saldo do jogador
-    terrain = get_terrain(db, terrain_id)
-    amount = (params.coverage or 0) * PRICE_PER_UNIT
-    if terrain:
-        update_player_balance(db, terrain.player_id, amount)
-    # reseta cobertura após colheita
-    new_coverage = 0
-    update_in = TerrainParametersUpdate(coverage=new_coverage)
-    update_terrain_parameters(db, terrain_id, update_in)
-    print(f"[action_registry] colher: coverage {new_coverage}")
+# Ações padrão (deltas puros)
+@registry.register_delta("plantar")
+def delta_plantar(state: Dict[str, float]) -> TerrainDelta:
+    return TerrainDelta(adds={"coverage": 10, "regeneration_cycles": 1})
+
+@registry.register_delta("regar")
+@registry.register_delta("water")
+def delta_regar(state: Dict[str, float]) -> TerrainDelta:
+    return TerrainDelta(adds={"regeneration_cycles": 1})
+
+@registry.register_delta("colher")
+@registry.register_delta("harvest")
+def delta_colher(state: Dict[str, float]) -> TerrainDelta:
+    # receita pela cobertura atual e reset da cobertura após a colheita
+    return TerrainDelta(sets={"coverage": 0}, balance=(state.get("coverage") or 0) * PRICE_PER_UNIT)
 
 @registry.register("aplicar_insumo")
 @registry.register("apply_input")
@@ -94,7 +198,9 @@ def handle_aplicar_insumo(db: Session, terrain_id: int, params: any):
         # mas podemos aplicá-los explicitamente se necessário
         # applied_effects = apply_input_effects(db, input_record)
         
-        print(f"[action_registry] aplicar_insumo: tipo={params.type}, quantidade={params.quantity}, plantio={params.planting_id}")
+        logger.info(f"aplicar_insumo: tipo={params.type}, quantidade={params.quantity}, plantio={params.planting_id}")
     except Exception as e:
-        print(f"[action_registry] Erro ao aplicar insumo: {e}")
+        logger.error(f"Erro ao aplicar insumo: {e}")
+        # Propaga para o registry desfazer a sessão e não desgastar a ferramenta
+        raise
 
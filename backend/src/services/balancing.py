@@ -0,0 +1,385 @@
+"""
+Simulador de balanceamento offline.
+
+Roda populações sintéticas de terrenos e jogadores por meses de jogo no núcleo de simulação
+(services.simulation), com as regras reais e parâmetros sobrescritos por cenário, e agrega o
+resultado de cada execução:
+- sobrevivência dos plantios (colhidos × mortos), no total e por espécie;
+- distribuição da saúde do solo dos quadrantes no fim (services.soil_health) e médias dos
+  parâmetros;
+- fluxos da economia: gasto com insumos, receita das colheitas (ações `plantar`/`colher` do
+  registro de ações) e unidades colhidas (`rendimento_unid` de species.yml).
+
+Uma varredura é o produto cartesiano dos valores de cada parâmetro × réplicas com sementes
+diferentes; as execuções são independentes e rodam em um ProcessPoolExecutor.
+
+Chaves de parâmetro (`apply_overrides`):
+    chaves de DEFAULT_SCENARIO                                     (população e jogadores)
+    deterioration.<parâmetro>, min_values.<parâmetro>              (soil_constants)
+    season.<estação>.<fator>, season_duration_days                 (seasonality)
+    climate.<condição>.probability, climate.<condição>.<parâmetro>,
+    climate_event_probability                                      (climate_effects)
+    input.<insumo>.<parâmetro>.<base_effect|quantity_factor>       (input_effects.yml)
+    species.<espécie>.<campo>                                      (species.yml)
+    propagation_factor                                             (quadrant_neighbors)
+"""
+import copy
+import csv
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import yaml
+
+from .simulation import (COLHIDA, COLHIVEL, FINISHED, MORTA, SEMENTE, SimulationRules, World, default_rules,
+                         percentile)
+
+# População e comportamento dos jogadores de uma execução
+DEFAULT_SCENARIO = {
+    "days": 120,
+    "terrains": 50,                # um jogador por terreno
+    "plantings_per_terrain": 9,
+    "water_probability": 0.8,      # cadência média de rega (chance por dia), ±0.1 por jogador
+    "water_quantity": 2,           # água aplicada em cada plantio nos dias de rega
+    "compost_every": 7,            # dias entre aplicações de composto (0 = nunca)
+    "compost_quantity": 3,
+    "input_price": 1.0,            # preço por unidade de insumo
+    "replant": True,               # replantar os slots colhidos ou mortos
+    "climate": "random",           # random | expected | none
+}
+
+# Quadrantes de cada terreno sintético (grade 3x3)
+LABELS = tuple(f"{col}{row}" for row in range(1, 4) for col in "ABC")
+# Faixas do solo inicial dos terrenos sintéticos
+INITIAL_SOIL = {
+    "soil_moisture": (40.0, 70.0),
+    "fertility": (30, 70),
+    "organic_matter": (30, 60),
+    "biodiversity": (30, 60),
+    "compaction": (0, 30),
+    "soil_ph": (5.5, 7.0),
+}
+SOIL_METRICS = ("soil_moisture", "fertility", "organic_matter", "biodiversity")
+PERCENTILES = (10, 50, 90)
+
+
+def parse_value(text: str) -> Any:
+    """Valor de um parâmetro na linha de comando (número, booleano ou texto, via YAML)."""
+    return yaml.safe_load(text)
+
+
+def sweep_grid(values: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Produto cartesiano dos valores de cada parâmetro, na ordem das chaves."""
+    keys = list(values)
+    return [dict(zip(keys, combination)) for combination in itertools.product(*(values[key] for key in keys))]
+
+
+def _set_path(target: dict, path: Sequence[str], value: Any, key: str) -> None:
+    for part in path[:-1]:
+        if not isinstance(target.get(part), dict):
+            raise ValueError(f"Parâmetro desconhecido: {key}")
+        target = target[part]
+    if path[-1] not in target:
+        raise ValueError(f"Parâmetro desconhecido: {key}")
+    target[path[-1]] = value
+
+
+def apply_overrides(overrides: Mapping[str, Any], rules: Optional[SimulationRules] = None,
+                    species: Optional[Mapping[str, dict]] = None, effects: Optional[dict] = None
+                    ) -> Tuple[Dict[str, Any], SimulationRules, Dict[str, dict], dict]:
+    """
+    Aplica os parâmetros de um cenário sobre as regras, espécies e efeitos dos insumos atuais.
+
+    Returns:
+        Tuple: (cenário, regras, espécies, dados de input_effects.yml), todos cópias
+    """
+    from ..data.input_effects import load_effects_file
+
+    scenario = dict(DEFAULT_SCENARIO)
+    rules = rules or default_rules()
+    species = copy.deepcopy(dict(species if species is not None else _species()))
+    effects = copy.deepcopy(effects if effects is not None else load_effects_file())
+    changes: Dict[str, Any] = {}
+    deterioration = dict(rules.deterioration)
+    min_values = dict(rules.min_values)
+    seasons = {name: dict(config) for name, config in rules.seasons}
+    climate = copy.deepcopy(rules.climate_conditions)
+    time_scale = float(os.getenv("TIME_SCALE_FACTOR", "1"))
+
+    for key, value in overrides.items():
+        head, _, rest = key.partition(".")
+        path = rest.split(".") if rest else []
+        if not rest and head in scenario:
+            scenario[head] = value
+        elif not rest and head in ("season_duration_days", "climate_event_probability", "propagation_factor"):
+            changes[head] = value
+        elif head == "deterioration" and len(path) == 1:
+            _set_path(deterioration, path, float(value), key)
+        elif head == "min_values" and len(path) == 1:
+            _set_path(min_values, path, value, key)
+        elif head == "season" and len(path) == 2:
+            _set_path(seasons, path, float(value), key)
+        elif head == "climate" and len(path) == 2:
+            condition = climate.get(path[0])
+            if condition is None:
+                raise ValueError(f"Parâmetro desconhecido: {key}")
+            if path[1] == "probability":
+                condition["probability"] = float(value)
+            else:
+                _set_path(condition["effects"], [path[1], "change"], float(value), key)
+        elif head == "input" and len(path) == 3:
+            _set_path(effects["effects"], path, float(value), key)
+        elif head == "species" and len(path) == 2:
+            _set_path(species, path, value, key)
+            if path[1] in ("germinacao_dias", "maturidade_dias"):
+                species[path[0]][f"{path[1]}_scaled"] = float(value) / time_scale
+        else:
+            raise ValueError(f"Parâmetro desconhecido: {key}")
+
+    if scenario["climate"] not in ("random", "expected", "none"):
+        raise ValueError(f"Clima inválido: {scenario['climate']}")
+    rules = rules.replace(deterioration=deterioration, min_values=min_values,
+                          seasons=[(name, seasons[name]) for name, _ in rules.seasons],
+                          climate_conditions=climate, **changes)
+    return scenario, rules, species, effects
+
+
+_species_cache: Dict[str, dict] = {}
+
+
+def _species() -> Dict[str, dict]:
+    """species.yml com os dias escalados (uma leitura por processo)."""
+    if not _species_cache:
+        from .plant_lifecycle import load_species_params
+
+        _species_cache.update(load_species_params())
+    return _species_cache
+
+
+class _Population:
+    """Ações diárias dos jogadores sintéticos (`World.step(on_day=...)`) e contadores da economia."""
+
+    def __init__(self, world: World, scenario: Mapping[str, Any], table, species: Mapping[str, dict]):
+        from .action_registry import registry
+
+        self.world = world
+        self.scenario = scenario
+        self.table = table
+        self.plantar = registry.delta("plantar")
+        self.colher = registry.delta("colher")
+        self.yields = [float(species.get(key, {}).get("rendimento_unid") or 0) for key in world.species.keys]
+        self.terrain_rows = {world.terrains.owners[i]: i for i in range(len(world.terrains))}
+        self.quadrant_owner = {world.quadrants.ids[i]: world.quadrants.owners[i] for i in range(len(world.quadrants))}
+        self.started = [0] * len(world.species.keys)
+        self.harvested = [0] * len(world.species.keys)
+        self.died = [0] * len(world.species.keys)
+        self.input_spend = 0.0
+        self.revenue = 0.0
+        self.units = 0.0
+
+    def _terrain_delta(self, terrain_id: int, delta_fn) -> float:
+        soil = self.world.terrains
+        i = self.terrain_rows[terrain_id]
+        state = soil.row(i)
+        delta = delta_fn(state)
+        new_state = delta.apply(state)
+        for field in delta.fields():
+            if field in soil.values:
+                soil.values[field][i] = float(new_state[field])
+        return delta.balance
+
+    def plant(self, i: int) -> None:
+        p = self.world.plantings
+        p.state[i], p.days[i], p.dry[i] = SEMENTE, 0, 0
+        self.started[p.species[i]] += 1
+        self._terrain_delta(self.quadrant_owner[p.quadrants[i]], self.plantar)
+
+    def __call__(self, world: World, watered) -> None:
+        p = world.plantings
+        scenario = self.scenario
+        # Colheita: uma ação `colher` por terreno com plantios colhíveis
+        ready: Dict[int, List[int]] = {}
+        for i in range(len(p)):
+            if p.state[i] == COLHIVEL:
+                ready.setdefault(self.quadrant_owner[p.quadrants[i]], []).append(i)
+        for terrain_id, rows in ready.items():
+            self.revenue += self._terrain_delta(terrain_id, self.colher)
+            for i in rows:
+                p.state[i] = COLHIDA
+                self.harvested[p.species[i]] += 1
+                self.units += self.yields[p.species[i]]
+        if scenario["replant"]:
+            for i in range(len(p)):
+                if p.state[i] in FINISHED:
+                    self.plant(i)
+
+        compost = scenario["compost_every"] and world.day % scenario["compost_every"] == 0
+        entries = []
+        for i in range(len(p)):
+            if p.state[i] in FINISHED:
+                continue
+            if p.players[i] in watered and scenario["water_quantity"]:
+                entries.append((p.ids[i], "água", scenario["water_quantity"]))
+            if compost and scenario["compost_quantity"]:
+                entries.append((p.ids[i], "composto", scenario["compost_quantity"]))
+        if entries:
+            world.apply_inputs(entries, self.table)
+            self.input_spend += sum(quantity for _, _, quantity in entries) * scenario["input_price"]
+
+
+def build_world(scenario: Mapping[str, Any], rules: SimulationRules, species: Mapping[str, dict], seed: int) -> World:
+    """População sintética: terrenos 3x3 com solo inicial sorteado, plantios e cadência de rega por jogador."""
+    rng = random.Random(seed)
+    world = World(rules, seed, species)
+    keys = sorted(species)
+    planting_id = 0
+    for terrain_id in range(1, scenario["terrains"] + 1):
+        soil = {param: rng.uniform(low, high) for param, (low, high) in INITIAL_SOIL.items()}
+        soil.update({param: round(soil[param]) for param in ("fertility", "organic_matter", "biodiversity", "compaction")})
+        world.add_terrain(terrain_id, terrain_id, soil)
+        for q, label in enumerate(LABELS):
+            world.add_quadrant(terrain_id * len(LABELS) + q, terrain_id, label, soil)
+        for slot in range(scenario["plantings_per_terrain"]):
+            planting_id += 1
+            quadrant_id = terrain_id * len(LABELS) + slot % len(LABELS)
+            world.add_planting(planting_id, terrain_id, quadrant_id, rng.choice(keys))
+        chance = scenario["water_probability"] + rng.uniform(-0.1, 0.1)
+        world.water_probability[terrain_id] = min(1.0, max(0.0, chance))
+    world.advance_season()
+    return world
+
+
+def run_scenario(task: Tuple[int, Mapping[str, Any], int]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Uma execução: (índice do cenário, parâmetros, semente).
+
+    Returns:
+        Tuple: linha de resumo da execução e linhas por espécie
+    """
+    from .effect_table import EffectTable
+    from .soil_health import calculate_health_index
+
+    index, overrides, seed = task
+    scenario, rules, species, effects = apply_overrides(overrides)
+    world = build_world(scenario, rules, species, seed)
+    population = _Population(world, scenario, EffectTable(effects), species)
+    for i in range(len(world.plantings)):
+        population.plant(i)
+    world.step(scenario["days"], climate=scenario["climate"], on_day=population)
+    for planting_id, _, new in world.transitions:
+        if new == MORTA:
+            population.died[world.plantings.species[world.plantings.index[planting_id]]] += 1
+
+    harvested, died = sum(population.harvested), sum(population.died)
+    row: Dict[str, Any] = {"scenario": index, "seed": seed, **overrides}
+    row.update({
+        "plantings_started": sum(population.started),
+        "harvested": harvested,
+        "died": died,
+        "survival_rate": harvested / (harvested + died) if harvested + died else None,
+        "active_at_end": sum(1 for state in world.plantings.state if state not in FINISHED),
+        "climate_events": len(world.climate_log),
+        "final_season": world.season.name,
+    })
+    soil = world.quadrants
+    health = [calculate_health_index(soil.row(i)) for i in range(len(soil))]
+    for q in PERCENTILES:
+        row[f"soil_health_p{q}"] = percentile(health, q)
+    row["soil_health_mean"] = sum(health) / len(health) if health else 0.0
+    for param in SOIL_METRICS:
+        values = soil.values[param]
+        row[f"{param}_mean"] = sum(values) / len(values) if values else 0.0
+    players = scenario["terrains"] or 1
+    row.update({
+        "input_spend": population.input_spend,
+        "harvest_revenue": population.revenue,
+        "net_flow": population.revenue - population.input_spend,
+        "net_flow_per_player": (population.revenue - population.input_spend) / players,
+        "harvest_units": population.units,
+    })
+
+    species_rows = []
+    for s, key in enumerate(world.species.keys):
+        done = population.harvested[s] + population.died[s]
+        species_rows.append({
+            "scenario": index, "seed": seed, **overrides, "species": key,
+            "plantings_started": population.started[s],
+            "harvested": population.harvested[s],
+            "died": population.died[s],
+            "survival_rate": population.harvested[s] / done if done else None,
+        })
+    return row, species_rows
+
+
+def run_sweep(combinations: Sequence[Mapping[str, Any]], replicates: int = 1, seed: int = 0,
+              workers: Optional[int] = None) -> Tuple[List[dict], List[dict]]:
+    """
+    Executa cada combinação `replicates` vezes (sementes seed, seed+1, ...).
+
+    Args:
+        workers: Processos do pool (None = núcleos da máquina; 1 = no próprio processo)
+
+    Returns:
+        Tuple: linhas por execução e linhas por execução × espécie, na ordem das tarefas
+    """
+    tasks = [(index, dict(overrides), seed + replicate)
+             for index, overrides in enumerate(combinations) for replicate in range(replicates)]
+    # Valida os parâmetros antes de distribuir as tarefas
+    for overrides in combinations:
+        apply_overrides(overrides)
+    if workers == 1 or len(tasks) <= 1:
+        results = [run_scenario(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_scenario, tasks))
+    runs = [row for row, _ in results]
+    species = [row for _, rows in results for row in rows]
+    return runs, species
+
+
+def summarize(runs: Sequence[Mapping[str, Any]], keys: Sequence[str]) -> List[Dict[str, Any]]:
+    """Média e percentis 10/90 das métricas por combinação de parâmetros (entre réplicas)."""
+    metrics = [name for name, value in runs[0].items()
+               if name not in keys and name not in ("scenario", "seed", "final_season")
+               and (isinstance(value, (int, float)) or value is None)] if runs else []
+    groups: Dict[int, List[Mapping[str, Any]]] = {}
+    for row in runs:
+        groups.setdefault(row["scenario"], []).append(row)
+    summary = []
+    for index, rows in groups.items():
+        out: Dict[str, Any] = {"scenario": index, **{key: rows[0].get(key) for key in keys}, "replicates": len(rows)}
+        for metric in metrics:
+            values = [row[metric] for row in rows if row[metric] is not None]
+            out[f"{metric}_mean"] = sum(values) / len(values) if values else None
+            out[f"{metric}_p10"] = percentile(values, 10) if values else None
+            out[f"{metric}_p90"] = percentile(values, 90) if values else None
+        summary.append(out)
+    return summary
+
+
+def write_table(rows: Sequence[Mapping[str, Any]], path: str) -> str:
+    """Grava as linhas em CSV ou, com extensão .parquet, em Parquet (requer pyarrow)."""
+    columns = list(dict.fromkeys(column for row in rows for column in row))
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Saída Parquet requer o pacote pyarrow")
+        pq.write_table(pa.Table.from_pylist([{column: row.get(column) for column in columns} for row in rows]), path)
+        return path
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def write_results(runs: Sequence[dict], species: Sequence[dict], keys: Iterable[str], out_dir: str,
+                  fmt: str = "csv") -> List[str]:
+    """Grava runs, species e summary em `out_dir` (um arquivo por tabela)."""
+    os.makedirs(out_dir, exist_ok=True)
+    tables = {"runs": runs, "species": species, "summary": summarize(runs, list(keys))}
+    return [write_table(rows, os.path.join(out_dir, f"{name}.{fmt}")) for name, rows in tables.items()]
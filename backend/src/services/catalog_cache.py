@@ -0,0 +1,191 @@
+"""
+Cache em processo do catálogo estático (itens da loja, ferramentas e espécies).
+
+Os catálogos mudam raramente e são lidos o tempo todo (listagens, preços das compras).
+Cada catálogo fica em memória já serializado, com uma versão e um ETag forte derivado do
+conteúdo. As listagens respondem com `ETag` e `Cache-Control`, e um `If-None-Match` igual
+devolve 304 sem corpo.
+
+Invalidação:
+- itens da loja e ferramentas: os escritores do CRUD chamam `invalidate(...)`, e a próxima
+  leitura recarrega do banco; CATALOG_TTL_SECONDS limita a defasagem entre processos;
+- espécies: recarregadas quando o mtime de species.yml muda (mantém o hot-reload).
+Caches derivados (ex.: a tabela compilada de services.tool_effects) se inscrevem com
+`on_invalidate` e são invalidados junto.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.shop_item import ShopItem
+from ..models.tool import Tool
+from ..schemas.shop_item import ShopItemOut
+from ..schemas.species import SpeciesSchema
+from ..schemas.tool import ToolOut
+from .plant_lifecycle import _data_path as SPECIES_FILE, load_species_params
+
+logger = logging.getLogger(__name__)
+
+CATALOG_TTL_SECONDS = float(os.getenv("CATALOG_TTL_SECONDS", "300"))
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", "60"))
+
+SHOP_ITEMS = "shop_items"
+TOOLS = "tools"
+SPECIES = "species"
+
+
+def _etag(payload: bytes) -> str:
+    return '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+
+class Catalog:
+    """Snapshot serializado de um catálogo e seu ETag."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.version = 0
+        self.data: Any = None
+        self.by_id: Dict[int, dict] = {}
+        self.etag: Optional[str] = None
+        self.loaded_at = float("-inf")
+        self.stale = True
+        self.source_mtime: Optional[float] = None
+        self.loads = 0
+
+    def fresh(self) -> bool:
+        return (
+            not self.stale
+            and self.data is not None
+            and time.monotonic() - self.loaded_at < CATALOG_TTL_SECONDS
+        )
+
+    def store(self, data: Any) -> None:
+        data = jsonable_encoder(data)
+        self.data = data
+        self.by_id = {row["id"]: row for row in data} if isinstance(data, list) else {}
+        self.etag = _etag(json.dumps(data, sort_keys=True, separators=(",", ":")).encode())
+        self.version += 1
+        self.loaded_at = time.monotonic()
+        self.stale = False
+        self.loads += 1
+
+
+_lock = threading.Lock()
+_catalogs: Dict[str, Catalog] = {name: Catalog(name) for name in (SHOP_ITEMS, TOOLS, SPECIES)}
+_listeners: Dict[str, List[Callable[[], None]]] = {}
+
+# Consulta e serialização de cada catálogo vindo do banco
+_DB_SOURCES: Dict[str, tuple] = {
+    SHOP_ITEMS: (ShopItem, ShopItemOut),
+    TOOLS: (Tool, ToolOut),
+}
+
+
+def get_catalog(name: str) -> Catalog:
+    return _catalogs[name]
+
+
+def invalidate(name: str) -> None:
+    """Marca o catálogo para recarga na próxima leitura (chamado pelos escritores do CRUD)."""
+    with _lock:
+        _catalogs[name].stale = True
+    for listener in _listeners.get(name, ()):
+        listener()
+    logger.info("Catálogo %s invalidado", name)
+
+
+def on_invalidate(name: str, listener: Callable[[], None]) -> None:
+    """Registra uma função chamada sempre que o catálogo `name` for invalidado."""
+    _listeners.setdefault(name, []).append(listener)
+
+
+def clear() -> None:
+    with _lock:
+        for name in list(_catalogs):
+            _catalogs[name] = Catalog(name)
+
+
+async def _load_from_db(db: AsyncSession, name: str) -> None:
+    model, schema = _DB_SOURCES[name]
+    rows = (await db.execute(select(model).order_by(model.id))).scalars().all()
+    get_catalog(name).store([schema.from_orm(row) for row in rows])
+
+
+async def ensure_loaded(db: AsyncSession, name: str) -> Catalog:
+    """Retorna o catálogo, recarregando do banco se estiver invalidado ou expirado."""
+    catalog = get_catalog(name)
+    if not catalog.fresh():
+        await _load_from_db(db, name)
+    return catalog
+
+
+def species_catalog() -> Catalog:
+    """Catálogo de espécies (species.yml), recarregado quando o arquivo muda."""
+    catalog = get_catalog(SPECIES)
+    try:
+        mtime = os.path.getmtime(SPECIES_FILE)
+    except OSError:
+        mtime = None
+    if catalog.data is None or catalog.stale or mtime != catalog.source_mtime:
+        species = load_species_params(SPECIES_FILE)
+        catalog.store({key: SpeciesSchema(**params) for key, params in species.items()})
+        catalog.source_mtime = mtime
+    return catalog
+
+
+async def warm_up(db: AsyncSession) -> None:
+    """Carrega todos os catálogos (startup da aplicação)."""
+    for name in _DB_SOURCES:
+        await _load_from_db(db, name)
+    species_catalog()
+    logger.info("Catálogos carregados: %s", ", ".join(_catalogs))
+
+
+def shop_item(item_id: int) -> Optional[dict]:
+    """Item da loja vindo do cache, ou None se o cache não estiver válido (quem chama consulta o banco)."""
+    catalog = get_catalog(SHOP_ITEMS)
+    if not catalog.fresh():
+        return None
+    return catalog.by_id.get(item_id)
+
+
+def shop_items(item_ids) -> Optional[Dict[int, dict]]:
+    """Itens da loja pedidos, se o cache estiver válido e contiver todos; senão None."""
+    catalog = get_catalog(SHOP_ITEMS)
+    if not catalog.fresh():
+        return None
+    found = {item_id: catalog.by_id[item_id] for item_id in item_ids if item_id in catalog.by_id}
+    return found if len(found) == len(set(item_ids)) else None
+
+
+def cached_response(request: Request, catalog: Catalog, content: Any, variant: str = "") -> Response:
+    """
+    Resposta JSON com ETag forte e Cache-Control; 304 sem corpo se o cliente já tem a versão.
+
+    Args:
+        variant (str): Distingue representações do mesmo snapshot (página, item)
+    """
+    etag = catalog.etag if not variant else catalog.etag[:-1] + "-" + variant + '"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={CATALOG_MAX_AGE}, must-revalidate"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    body = json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode()
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def page_response(request: Request, catalog: Catalog, skip: int, limit: int) -> Response:
+    return cached_response(request, catalog, catalog.data[skip:skip + limit], variant=f"{skip}.{limit}")
+
+
+def item_response(request: Request, catalog: Catalog, item: dict) -> Response:
+    return cached_response(request, catalog, item, variant=f"id{item['id']}")
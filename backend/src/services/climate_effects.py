@@ -8,12 +8,16 @@ from sqlalchemy.orm import Session
 from typing import Dict, List, Optional, Tuple
 
 from ..models.climate_condition import ClimateCondition
-from ..models.terrain_parameters import TerrainParameters
-from ..models.quadrant import Quadrant
 from ..schemas.climate_condition import ClimateConditionCreate
+from . import current_weather
+from .simulation import World, draw_climate_event
+from .simulation_io import load_soil, write_back
 
 logger = logging.getLogger(__name__)
 
+# Chance de algum evento climático ocorrer em um ciclo
+CLIMATE_EVENT_PROBABILITY = 0.6
+
 # Tipos de condições climáticas
 CLIMATE_CONDITIONS = {
     "chuva_leve": {
@@ -70,22 +74,8 @@ def generate_random_climate_event() -> Optional[str]:
     Returns:
         Optional[str]: Nome do evento gerado ou None se nenhum evento ocorrer
     """
-    # Verificar se algum evento ocorre
-    event_occurs = random.random() < 0.6  # 60% de chance de algum evento
-    
-    if not event_occurs:
-        return None
-    
-    # Eventos e suas probabilidades
-    events = list(CLIMATE_CONDITIONS.keys())
-    probabilities = [CLIMATE_CONDITIONS[e]["probability"] for e in events]
-    
-    # Normaliza as probabilidades para somarem 1
-    total_prob = sum(probabilities)
-    normalized_probs = [p/total_prob for p in probabilities]
-    
-    # Seleciona um evento com base nas probabilidades
-    return random.choices(events, weights=normalized_probs, k=1)[0]
+    # Mesmo sorteio do núcleo de simulação, com o gerador global do módulo random
+    return draw_climate_event(random, CLIMATE_CONDITIONS, CLIMATE_EVENT_PROBABILITY)
 
 def register_climate_condition(db: Session, condition_name: str) -> ClimateCondition:
     """
@@ -111,6 +101,7 @@ def register_climate_condition(db: Session, condition_name: str) -> ClimateCondi
     db.add(db_condition)
     db.commit()
     db.refresh(db_condition)
+    current_weather.set_current(db_condition)
     
     return db_condition
 
@@ -129,60 +120,13 @@ def apply_climate_effects(db: Session, condition_name: str) -> Dict[str, int]:
         logger.error(f"Condição climática desconhecida: {condition_name}")
         return {"terrains_updated": 0, "quadrants_updated": 0}
     
-    effects = CLIMATE_CONDITIONS[condition_name]["effects"]
     logger.info(f"Aplicando efeitos de '{condition_name}' aos terrenos e quadrantes")
     
-    # Contadores para logging
-    counters = {
-        "terrains_updated": 0,
-        "quadrants_updated": 0
-    }
-    
-    # 1. Atualizar parâmetros dos terrenos
-    terrains_params = db.query(TerrainParameters).all()
-    for terrain_param in terrains_params:
-        # Aplicar efeitos em cada parâmetro
-        updated = False
-        
-        for param_name, effect in effects.items():
-            if hasattr(terrain_param, param_name):
-                change = effect["change"]
-                current_value = getattr(terrain_param, param_name)
-                
-                if effect["type"] == "increase":
-                    new_value = current_value + change
-                else:  # decrease
-                    new_value = max(current_value - change, 0)
-                
-                setattr(terrain_param, param_name, new_value)
-                updated = True
-        
-        if updated:
-            counters["terrains_updated"] += 1
-    
-    # 2. Atualizar parâmetros dos quadrantes
-    quadrants = db.query(Quadrant).all()
-    for quadrant in quadrants:
-        # Aplicar efeitos em cada parâmetro
-        updated = False
-        
-        for param_name, effect in effects.items():
-            if hasattr(quadrant, param_name):
-                change = effect["change"]
-                current_value = getattr(quadrant, param_name)
-                
-                if effect["type"] == "increase":
-                    new_value = current_value + change
-                else:  # decrease
-                    new_value = max(current_value - change, 0)
-                
-                setattr(quadrant, param_name, new_value)
-                updated = True
-        
-        if updated:
-            counters["quadrants_updated"] += 1
-    
-    # Commit das alterações
+    # Regras em memória (services.simulation): carrega, aplica e grava só o que mudou
+    world = load_soil(db, World())
+    baseline = world.copy()
+    counters = world.apply_climate(condition_name)
+    write_back(db, world.diff(baseline))
     db.commit()
     
     logger.info(f"Efeitos de '{condition_name}' aplicados: {counters['terrains_updated']} terrenos e {counters['quadrants_updated']} quadrantes atualizados")
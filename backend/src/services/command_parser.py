@@ -0,0 +1,237 @@
+"""
+Interpretação dos comandos de texto (WhatsApp).
+
+A gramática é compilada uma vez (e de novo só quando o registry de ações muda):
+- verbos: nomes do registry, sinônimos em português (SYNONYMS) e as ações de
+  src/data/acoes_rpg_agrofloresta.csv; verbos sem ação registrada em lote (ex.: podar) são
+  reconhecidos, mas respondidos como indisponíveis;
+- ferramentas: chaves e nomes de tools.yml (e as chaves já compiladas em services.tool_effects);
+  nomes de várias palavras são indexados unidos por "_" ("Enxada manual" -> enxada_manual).
+
+O texto é normalizado (minúsculas, sem acentos nem pontuação) e dividido em tokens por uma
+expressão regular pré-compilada: o primeiro token é o verbo, o primeiro número é o terreno e a
+ferramenta começa na primeira palavra restante que não seja de ligação ("no", "terreno", "com",
+...); vale o n-grama mais longo de palavras seguidas que nomeia uma ferramenta.
+Palavras fora do vocabulário passam por um casamento aproximado (difflib) com cache LRU, então
+o mesmo erro de digitação só é calculado uma vez.
+
+Tudo é validado antes de qualquer acesso ao banco: comandos inválidos recebem a resposta
+imediatamente.
+"""
+import csv
+import difflib
+import logging
+import os
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from .action_registry import registry
+from .tool_effects import load_tools_file, tool_table
+
+logger = logging.getLogger(__name__)
+
+COMMAND_FUZZY_CUTOFF = float(os.getenv("COMMAND_FUZZY_CUTOFF", "0.75"))
+COMMAND_FUZZY_CACHE_SIZE = int(os.getenv("COMMAND_FUZZY_CACHE_SIZE", "4096"))
+
+# Planilha de ações do jogo (empacotada em src/data, junto de tools.yml)
+ACTIONS_CSV = os.getenv(
+    "COMMAND_ACTIONS_CSV",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "data", "acoes_rpg_agrofloresta.csv")),
+)
+
+# Sinônimos em português -> ação do registry
+SYNONYMS = {
+    "irrigar": "regar",
+    "molhar": "regar",
+    "aguar": "regar",
+    "rega": "regar",
+    "semear": "plantar",
+    "plantio": "plantar",
+    "colheita": "colher",
+    "colhe": "colher",
+    "insumo": "aplicar_insumo",
+}
+
+# Palavras de ligação ignoradas entre o verbo, o terreno e a ferramenta
+STOP_WORDS = frozenset({"no", "na", "em", "o", "a", "os", "as", "de", "do", "da", "terreno", "lote",
+                        "com", "usando", "t"})
+
+_TOKEN = re.compile(r"[a-z_]+|\d+")
+_NOT_WORD = re.compile(r"[^a-z0-9_\s]")
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sem acentos e sem pontuação."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NOT_WORD.sub(" ", text)
+
+
+@lru_cache(maxsize=COMMAND_FUZZY_CACHE_SIZE)
+def closest(word: str, vocabulary: Tuple[str, ...]) -> Optional[str]:
+    """Palavra do vocabulário mais parecida com `word`, ou None (resultado em cache LRU)."""
+    if len(word) < 3:
+        return None
+    matches = difflib.get_close_matches(word, vocabulary, n=1, cutoff=COMMAND_FUZZY_CUTOFF)
+    return matches[0] if matches else None
+
+
+def load_csv_actions(path: str = ACTIONS_CSV) -> FrozenSet[str]:
+    """Verbos da coluna 'Ação' da planilha (vazio se o arquivo não existir)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return frozenset(normalize(row["Ação"]).strip() for row in csv.DictReader(f) if row.get("Ação"))
+    except (OSError, KeyError) as e:
+        logger.warning(f"Planilha de ações indisponível ({path}): {e}")
+        return frozenset()
+
+
+class ParsedCommand:
+    __slots__ = ("action", "terrain_id", "tool_key", "error", "corrected")
+
+    def __init__(self, action: Optional[str] = None, terrain_id: Optional[int] = None,
+                 tool_key: Optional[str] = None, error: Optional[str] = None, corrected: bool = False):
+        self.action = action
+        self.terrain_id = terrain_id
+        self.tool_key = tool_key
+        self.error = error
+        self.corrected = corrected
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class CommandGrammar:
+    """Vocabulário compilado: verbo -> ação, ferramenta -> chave."""
+
+    def __init__(self, actions: Dict[str, str], unsupported: FrozenSet[str], tools: Dict[str, str],
+                 version: int = 0):
+        self.actions = actions
+        self.unsupported = unsupported - set(actions)
+        self.tools = tools
+        self.verbs: Tuple[str, ...] = tuple(sorted(set(actions) | self.unsupported))
+        self.tool_words: Tuple[str, ...] = tuple(sorted(tools))
+        self.max_tool_words = max((word.count("_") + 1 for word in tools), default=1)
+        self.version = version
+
+    def verb(self, word: str) -> Tuple[Optional[str], bool]:
+        """(verbo do vocabulário, se foi corrigido)."""
+        if word in self.actions or word in self.unsupported:
+            return word, False
+        match = closest(word, self.verbs)
+        return match, match is not None
+
+    def tool(self, words: Sequence[str]) -> Tuple[Optional[str], bool]:
+        """
+        (chave da ferramenta, se foi corrigida) para o n-grama mais longo do início de `words`;
+        casamentos exatos têm precedência sobre os aproximados.
+        """
+        phrases = ["_".join(words[:n]) for n in range(len(words), 0, -1) if words[n - 1] not in STOP_WORDS]
+        for phrase in phrases:
+            if phrase in self.tools:
+                return self.tools[phrase], False
+            if phrase in tool_table.keys():
+                return phrase, False
+        for phrase in phrases:
+            match = closest(phrase, self.tool_words)
+            if match:
+                return self.tools[match], True
+        return None, False
+
+    def _tool_words(self, tokens: List[str], start: int) -> List[str]:
+        """Palavras seguidas (sem números) a partir de `start`, até o maior nome de ferramenta."""
+        words = []
+        for token in tokens[start:start + self.max_tool_words]:
+            if token.isdigit():
+                break
+            words.append(token)
+        return words
+
+    def parse(self, text: str, terrain_id: Optional[int] = None, tool_key: Optional[str] = None) -> ParsedCommand:
+        """
+        Interpreta `text`. `terrain_id` e `tool_key` (campos explícitos da mensagem) valem
+        quando o texto não os informa.
+        """
+        tokens = _TOKEN.findall(normalize(text or ""))
+        if not tokens:
+            return ParsedCommand(error="Envie um comando, por exemplo: regar 2")
+        word, rest = tokens[0], tokens[1:]
+        verb, corrected = self.verb(word)
+        if verb is None:
+            return ParsedCommand(error=f"Comando '{word}' não reconhecido")
+        if verb in self.unsupported:
+            return ParsedCommand(error=f"Ação '{verb}' ainda não disponível pelo WhatsApp")
+        action = self.actions[verb]
+
+        terrain, tool_words = None, None
+        for i, token in enumerate(rest):
+            if token.isdigit():
+                terrain = terrain if terrain is not None else int(token)
+            elif token not in STOP_WORDS and tool_words is None:
+                tool_words = self._tool_words(rest, i)
+        if tool_words is not None:
+            tool_key, tool_corrected = self.tool(tool_words)
+            if tool_key is None:
+                return ParsedCommand(error=f"Ferramenta '{tool_words[0]}' não reconhecida")
+            corrected = corrected or tool_corrected
+        elif tool_key:
+            tool_key = self.tool(_TOKEN.findall(normalize(tool_key)))[0] or tool_key
+        terrain = terrain if terrain is not None else terrain_id
+        if not terrain:
+            return ParsedCommand(error=f"Informe o número do terreno, por exemplo: {action} 2")
+        return ParsedCommand(action, terrain, tool_key, corrected=corrected)
+
+
+def build_grammar(csv_path: str = ACTIONS_CSV) -> CommandGrammar:
+    """Compila o vocabulário a partir do registry, dos sinônimos, da planilha e de tools.yml."""
+    # Só ações com delta são executadas pelo WhatsApp; as demais (ex.: aplicar_insumo) precisam
+    # de campos que a mensagem não tem
+    names = registry.names()
+    actions = {name: name for name in names if registry.delta(name)}
+    actions.update({word: name for word, name in SYNONYMS.items() if name in actions})
+    unsupported = load_csv_actions(csv_path) | set(names) | set(SYNONYMS)
+    tools: Dict[str, str] = {}
+    try:
+        for key, entry in load_tools_file().items():
+            tools[key] = key
+            if entry.get("common_name"):
+                tools["_".join(normalize(entry["common_name"]).split())] = key
+    except Exception as e:
+        logger.error(f"Falha ao carregar tools.yml para o parser: {e}")
+    return CommandGrammar(actions, frozenset(unsupported), tools, registry.version)
+
+
+_lock = threading.Lock()
+_grammar: Optional[CommandGrammar] = None
+
+
+def grammar() -> CommandGrammar:
+    """Gramática compilada, recompilada quando o registry de ações muda."""
+    global _grammar
+    current = _grammar
+    if current is not None and current.version == registry.version:
+        return current
+    with _lock:
+        if _grammar is None or _grammar.version != registry.version:
+            _grammar = build_grammar()
+            closest.cache_clear()
+            logger.info(f"Gramática de comandos compilada: {len(_grammar.verbs)} verbos, {len(_grammar.tool_words)} ferramentas")
+        return _grammar
+
+
+def parse_command(text: Optional[str], command: Optional[str] = None, terrain_id: Optional[int] = None,
+                  tool_key: Optional[str] = None) -> ParsedCommand:
+    """Interpreta uma mensagem; `command` explícito tem precedência sobre o texto livre."""
+    return grammar().parse(command or text or "", terrain_id, tool_key)
+
+
+def reset() -> None:
+    """Descarta a gramática compilada e o cache de casamento aproximado (testes)."""
+    global _grammar
+    with _lock:
+        _grammar = None
+    closest.cache_clear()
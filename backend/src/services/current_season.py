@@ -0,0 +1,146 @@
+"""
+Estação atual em memória.
+
+A estação vigente (`seasons ORDER BY start_date DESC LIMIT 1`) é lida uma vez e guardada aqui
+junto com o que deriva dela:
+- os fatores de deterioração diária do solo já multiplicados pelos fatores da estação;
+- os limiares de germinação e maturação de cada espécie: dias escalados de species.yml
+  (TIME_SCALE_FACTOR) × `germination_factor` / `maturation_factor` da estação.
+
+`check_and_update_season` atualiza o cache ao criar a nova estação; SEASON_CACHE_TTL_SECONDS
+limita a defasagem entre processos. Os limiares são recalculados só quando a estação, o
+species.yml (mtime) ou TIME_SCALE_FACTOR mudam, então o tick diário aplica o crescimento
+sazonal sem nenhuma consulta a mais.
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.season import Season
+from .soil_constants import DAILY_DETERIORATION_FACTORS
+
+SEASON_CACHE_TTL_SECONDS = float(os.getenv("SEASON_CACHE_TTL_SECONDS", "3600"))
+
+# Parâmetro do solo -> fator da estação que multiplica sua deterioração diária
+DETERIORATION_FACTORS = {
+    "soil_moisture": "soil_moisture_factor",
+    "organic_matter": "organic_matter_factor",
+    "biodiversity": "biodiversity_factor",
+}
+
+SEASON_FACTORS = ("soil_moisture_factor", "organic_matter_factor", "biodiversity_factor",
+                  "fertility_factor", "germination_factor", "maturation_factor")
+
+# (dias até germinar, dias até amadurecer) já ajustados pela estação
+Thresholds = Tuple[Optional[float], Optional[float]]
+
+
+class SeasonSnapshot:
+    __slots__ = ("id", "name", "start_date", "factors", "germination_factor", "maturation_factor", "deterioration")
+
+    def __init__(self, season: Season):
+        self.id = season.id
+        self.name = season.name
+        self.start_date = season.start_date
+        self.factors = {column: getattr(season, column) for column in SEASON_FACTORS}
+        self.germination_factor = season.germination_factor if season.germination_factor is not None else 1.0
+        self.maturation_factor = season.maturation_factor if season.maturation_factor is not None else 1.0
+        self.deterioration = {
+            param: DAILY_DETERIORATION_FACTORS[param] * getattr(season, column)
+            for param, column in DETERIORATION_FACTORS.items()
+        }
+
+
+_lock = threading.Lock()
+_current: Optional[SeasonSnapshot] = None
+_loaded_at = float("-inf")
+_species: Dict[str, dict] = {}
+_species_key = None
+_thresholds: Dict[str, Thresholds] = {}
+_thresholds_key = None
+
+
+def latest_statement():
+    return select(Season).order_by(Season.start_date.desc(), Season.id.desc()).limit(1)
+
+
+def set_current(season: Season) -> SeasonSnapshot:
+    """Atualiza o cache com a estação recém-criada (transição)."""
+    global _current, _loaded_at
+    snapshot = SeasonSnapshot(season)
+    with _lock:
+        _current = snapshot
+        _loaded_at = time.monotonic()
+    return snapshot
+
+
+def current_season(db: Session) -> Optional[SeasonSnapshot]:
+    """Estação vigente, do cache ou de uma consulta (quando o TTL vence)."""
+    global _current, _loaded_at
+    if time.monotonic() - _loaded_at < SEASON_CACHE_TTL_SECONDS:
+        return _current
+    season = db.execute(latest_statement()).scalars().first()
+    with _lock:
+        _current = SeasonSnapshot(season) if season is not None else None
+        _loaded_at = time.monotonic()
+    return _current
+
+
+def deterioration_factors(db: Session) -> Dict[str, float]:
+    """Fatores de deterioração diária ajustados pela estação (padrão sem estação)."""
+    season = current_season(db)
+    if season is None:
+        return DAILY_DETERIORATION_FACTORS.copy()
+    return dict(season.deterioration)
+
+
+def species_params() -> Dict[str, dict]:
+    """Parâmetros de species.yml, recarregados quando o arquivo ou TIME_SCALE_FACTOR mudam."""
+    global _species, _species_key
+    from .plant_lifecycle import _data_path, load_species_params
+
+    try:
+        mtime = os.path.getmtime(_data_path)
+    except OSError:
+        mtime = None
+    key = (mtime, os.getenv("TIME_SCALE_FACTOR", "1"))
+    if key != _species_key:
+        loaded = load_species_params(_data_path)
+        with _lock:
+            # Em caso de falha de leitura mantém a versão anterior e tenta de novo na próxima chamada
+            if loaded or not _species:
+                _species, _species_key = loaded, key
+    return _species
+
+
+def growth_thresholds(db: Session) -> Dict[str, Thresholds]:
+    """Limiares de germinação e maturação por espécie, ajustados pela estação vigente."""
+    global _thresholds, _thresholds_key
+    season = current_season(db)
+    species = species_params()
+    key = (season.id if season else None, _species_key)
+    if key == _thresholds_key:
+        return _thresholds
+    germination = season.germination_factor if season else 1.0
+    maturation = season.maturation_factor if season else 1.0
+    thresholds = {}
+    for species_key, params in species.items():
+        gd = params.get("germinacao_dias_scaled", params.get("germinacao_dias"))
+        md = params.get("maturidade_dias_scaled", params.get("maturidade_dias"))
+        thresholds[species_key] = (gd * germination if gd else None, md * maturation if md else None)
+    with _lock:
+        _thresholds, _thresholds_key = thresholds, key
+    return thresholds
+
+
+def clear() -> None:
+    global _current, _loaded_at, _species, _species_key, _thresholds, _thresholds_key
+    with _lock:
+        _current = None
+        _loaded_at = float("-inf")
+        _species, _species_key = {}, None
+        _thresholds, _thresholds_key = {}, None
@@ -0,0 +1,68 @@
+"""
+Clima atual em memória.
+
+A condição climática mais recente é lida com `ORDER BY timestamp DESC LIMIT 1` (índice em
+`climate_conditions.timestamp`) e guardada aqui. O job de clima e o CRUD atualizam o cache ao
+registrar uma condição; CLIMATE_CACHE_TTL_SECONDS limita a defasagem entre processos.
+"""
+import os
+import threading
+import time
+from collections import namedtuple
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.climate_condition import ClimateCondition
+
+CLIMATE_CACHE_TTL_SECONDS = float(os.getenv("CLIMATE_CACHE_TTL_SECONDS", "60"))
+
+Weather = namedtuple("Weather", ["id", "name", "timestamp"])
+
+_lock = threading.Lock()
+_current: Optional[Weather] = None
+_loaded_at = float("-inf")
+
+
+def latest_statement():
+    return (
+        select(ClimateCondition.id, ClimateCondition.name, ClimateCondition.timestamp)
+        .order_by(ClimateCondition.timestamp.desc(), ClimateCondition.id.desc())
+        .limit(1)
+    )
+
+
+def _key(weather: Weather):
+    ts = weather.timestamp
+    return (ts.replace(tzinfo=None) if ts is not None else None, weather.id)
+
+
+def set_current(condition) -> None:
+    """Atualiza o cache com uma condição recém-registrada (se for mais recente que a atual)."""
+    global _current, _loaded_at
+    weather = Weather(condition.id, condition.name, condition.timestamp)
+    with _lock:
+        if _current is None or _current.timestamp is None or weather.timestamp is None \
+                or _key(weather) >= _key(_current):
+            _current = weather
+        _loaded_at = time.monotonic()
+
+
+def current_weather(db: Session) -> Optional[Weather]:
+    """Condição climática mais recente, do cache ou de uma consulta indexada."""
+    global _current, _loaded_at
+    if time.monotonic() - _loaded_at < CLIMATE_CACHE_TTL_SECONDS:
+        return _current
+    row = db.execute(latest_statement()).first()
+    with _lock:
+        _current = Weather(*row) if row else None
+        _loaded_at = time.monotonic()
+    return _current
+
+
+def clear() -> None:
+    global _current, _loaded_at
+    with _lock:
+        _current = None
+        _loaded_at = float("-inf")
@@ -0,0 +1,141 @@
+"""
+Tabela compilada dos efeitos dos insumos.
+
+input_effects.yml é compilado uma vez (e de novo só quando o arquivo muda) em uma matriz
+densa tipo de insumo × parâmetro do solo:
+- `base[t][p]` e `factor[t][p]`: coeficientes de `efeito = base + factor * quantidade`;
+- `mask[t]`: colunas que o tipo afeta, na ordem do arquivo (ordem do relatório);
+- `lower[p]` / `upper[p]`: vetores de limites da seção `limits` (±inf sem limite);
+- `resets[t]`: atributos do plantio zerados pelo tipo (ex.: days_sem_rega da água).
+
+Um lote de pares (tipo, quantidade) vira uma única passada sobre as linhas da matriz
+(`changes` / `totals`), sem percorrer dicionários aninhados nem casos especiais por tipo.
+A mesma tabela é usada pela API e pelo registro de ações (via services.input_batch e
+services.input_effects) e pelas ferramentas de simulação e previsão.
+"""
+import logging
+import math
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..data.input_effects import EFFECTS_FILE, load_effects_file
+
+logger = logging.getLogger(__name__)
+
+Vector = List[float]
+
+
+class EffectTable:
+    """Matriz de coeficientes (tipo × parâmetro) e vetores de limites."""
+
+    def __init__(self, data: dict, source_mtime: Optional[float] = None, version: int = 1):
+        effects: Dict[str, dict] = data.get("effects") or {}
+        limits: Dict[str, Sequence[float]] = data.get("limits") or {}
+        resets: Dict[str, Sequence[str]] = data.get("plant_resets") or {}
+
+        params: List[str] = list(limits)
+        for param_effects in effects.values():
+            params.extend(p for p in param_effects if p not in params)
+        self.params: Tuple[str, ...] = tuple(params)
+        self.index: Dict[str, int] = {param: i for i, param in enumerate(self.params)}
+        self.types: Tuple[str, ...] = tuple(dict.fromkeys([*effects, *resets]))
+        self.rows: Dict[str, int] = {input_type: i for i, input_type in enumerate(self.types)}
+
+        width = len(self.params)
+        self.base: List[Vector] = [[0.0] * width for _ in self.types]
+        self.factor: List[Vector] = [[0.0] * width for _ in self.types]
+        self.mask: List[Tuple[int, ...]] = []
+        self.resets: List[Tuple[str, ...]] = []
+        for t, input_type in enumerate(self.types):
+            columns = []
+            for param, config in (effects.get(input_type) or {}).items():
+                p = self.index[param]
+                self.base[t][p] = float(config.get("base_effect", 0))
+                self.factor[t][p] = float(config.get("quantity_factor", 0))
+                columns.append(p)
+            self.mask.append(tuple(columns))
+            self.resets.append(tuple(resets.get(input_type) or ()))
+
+        self.lower: Vector = [float(limits[p][0]) if p in limits else -math.inf for p in self.params]
+        self.upper: Vector = [float(limits[p][1]) if p in limits else math.inf for p in self.params]
+        self.source_mtime = source_mtime
+        self.version = version
+
+    def row(self, input_type: str) -> Optional[int]:
+        """Linha do tipo de insumo, ou None se o tipo não tiver efeitos."""
+        return self.rows.get(input_type)
+
+    def changes(self, entries: Iterable[Tuple[str, float]]) -> List[Optional[Vector]]:
+        """Vetor de efeitos de cada (tipo, quantidade); None para tipos desconhecidos."""
+        out: List[Optional[Vector]] = []
+        for input_type, quantity in entries:
+            t = self.rows.get(input_type)
+            if t is None:
+                out.append(None)
+                continue
+            out.append([b + f * quantity for b, f in zip(self.base[t], self.factor[t])])
+        return out
+
+    def totals(self, entries: Iterable[Tuple[str, float]]) -> Vector:
+        """Soma dos efeitos do lote por parâmetro (tipos desconhecidos não contribuem)."""
+        total = [0.0] * len(self.params)
+        for vector in self.changes(entries):
+            if vector is not None:
+                total = [a + b for a, b in zip(total, vector)]
+        return total
+
+    def clamp(self, p: int, value: float) -> float:
+        return max(self.lower[p], min(value, self.upper[p]))
+
+    def clamp_vector(self, values: Sequence[float]) -> Vector:
+        return [max(lo, min(v, hi)) for v, lo, hi in zip(values, self.lower, self.upper)]
+
+    def clamp_param(self, param: str, value: float) -> float:
+        p = self.index.get(param)
+        return value if p is None else self.clamp(p, value)
+
+    def effects_of(self, input_type: str, quantity: float) -> Dict[str, float]:
+        """Efeito de um insumo por parâmetro afetado (formato dos relatórios)."""
+        t = self.rows.get(input_type)
+        if t is None:
+            return {}
+        return {self.params[p]: self.base[t][p] + self.factor[t][p] * quantity for p in self.mask[t]}
+
+
+_lock = threading.Lock()
+_table: Optional[EffectTable] = None
+
+
+def effect_table(path: str = EFFECTS_FILE) -> EffectTable:
+    """Tabela compilada, recompilada quando o mtime de input_effects.yml muda."""
+    global _table
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    table = _table
+    if table is not None and table.source_mtime == mtime:
+        return table
+    with _lock:
+        if _table is not None and _table.source_mtime == mtime:
+            return _table
+        try:
+            compiled = EffectTable(load_effects_file(path), mtime, (_table.version + 1) if _table else 1)
+        except Exception as e:
+            logger.error(f"Falha ao recarregar input_effects.yml: {e}")
+            if _table is None:
+                _table = EffectTable({}, mtime)
+            # Mantém a tabela anterior até o arquivo mudar de novo
+            _table.source_mtime = mtime
+            return _table
+        _table = compiled
+        logger.info(f"input_effects.yml compilado: {len(compiled.types)} insumos x {len(compiled.params)} parâmetros")
+        return compiled
+
+
+def reset() -> None:
+    """Descarta a tabela compilada (testes)."""
+    global _table
+    with _lock:
+        _table = None
@@ -0,0 +1,242 @@
+"""
+Previsão do estado de um terreno (POST /terrains/{id}/forecast).
+
+O estado atual do terreno (parâmetros, quadrantes, plantios ativos e estação vigente) é
+copiado para um mundo do núcleo de simulação (services.simulation). Os insumos hipotéticos
+são aplicados no dia 0 como no lote de services.input_batch e o mundo avança N dias pela agenda
+do scheduler: deterioração sazonal, clima e transições dos plantios. As regas seguem a cadência
+histórica do jogador (simulation_io.watering_cadence), salvo `water_probability`.
+
+Modos:
+- "expected": uma execução com a variação climática esperada em cada ciclo;
+- "monte_carlo": N execuções com eventos sorteados (sementes seed, seed+1, ...), resumidas em
+  mediana e percentis 10/90 por dia e na probabilidade do estado final de cada plantio.
+
+Cada requisição tem um orçamento de CPU (FORECAST_CPU_BUDGET_MS, tempo de CPU da thread): a
+simulação para no primeiro dia que o estoura e a resposta sai com `truncated=true` e só as
+execuções completas (ou os dias simulados, se nenhuma execução terminou). As respostas ficam
+em um cache LRU com chave (terreno, versão de estado do dono em services.player_digest,
+parâmetros e insumos); FORECAST_CACHE_TTL_SECONDS limita a defasagem para escritas que não
+incrementam a versão.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..schemas.forecast import ForecastRequest
+from . import current_season
+from .player_digest import get_state_version
+from .simulation import STATES, TERRAIN_COLUMNS, World, percentile
+from .simulation_io import load_plantings, load_soil, season_world, watering_cadence
+
+FORECAST_MAX_DAYS = int(os.getenv("FORECAST_MAX_DAYS", "90"))
+FORECAST_MAX_RUNS = int(os.getenv("FORECAST_MAX_RUNS", "200"))
+FORECAST_CPU_BUDGET_MS = float(os.getenv("FORECAST_CPU_BUDGET_MS", "250"))
+FORECAST_CACHE_SIZE = int(os.getenv("FORECAST_CACHE_SIZE", "256"))
+FORECAST_CACHE_TTL_SECONDS = float(os.getenv("FORECAST_CACHE_TTL_SECONDS", "300"))
+
+MODES = ("expected", "monte_carlo")
+
+_lock = threading.Lock()
+# chave -> (momento da gravação, resposta)
+_cache: "OrderedDict[tuple, Tuple[float, dict]]" = OrderedDict()
+_counters = {"hits": 0, "misses": 0, "truncated": 0}
+
+
+def cache_key(terrain_id: int, version: Tuple[int, int], request: ForecastRequest) -> tuple:
+    inputs = tuple((i.planting_id, i.type, float(i.quantity)) for i in request.inputs)
+    return (terrain_id, version, request.days, request.mode, request.runs if request.mode == "monte_carlo" else 1,
+            request.seed, request.water_probability, inputs)
+
+
+def cached(key: tuple) -> Optional[dict]:
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None or time.monotonic() - entry[0] >= FORECAST_CACHE_TTL_SECONDS:
+            _counters["misses"] += 1
+            return None
+        _cache.move_to_end(key)
+        _counters["hits"] += 1
+        return entry[1]
+
+
+def store(key: tuple, result: dict) -> None:
+    with _lock:
+        _cache[key] = (time.monotonic(), result)
+        _cache.move_to_end(key)
+        while len(_cache) > FORECAST_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def stats() -> Dict[str, int]:
+    with _lock:
+        return {**_counters, "entries": len(_cache)}
+
+
+def clear() -> None:
+    with _lock:
+        _cache.clear()
+        for name in _counters:
+            _counters[name] = 0
+
+
+def load_world(db: Session, terrain_id: int) -> World:
+    """Estado atual do terreno no núcleo de simulação, com a cadência de rega dos jogadores."""
+    world = season_world(db, species=current_season.species_params())
+    load_soil(db, world, [terrain_id])
+    load_plantings(db, world, [terrain_id])
+    world.water_probability = watering_cadence(db, set(world.plantings.players))
+    return world
+
+
+def _validate(world: World, request: ForecastRequest) -> None:
+    from .effect_table import effect_table
+
+    if request.mode not in MODES:
+        raise ValueError(f"Modo inválido: {request.mode}. Use expected ou monte_carlo")
+    if request.days > FORECAST_MAX_DAYS:
+        raise ValueError(f"Máximo de {FORECAST_MAX_DAYS} dias por previsão")
+    if request.mode == "monte_carlo" and request.runs > FORECAST_MAX_RUNS:
+        raise ValueError(f"Máximo de {FORECAST_MAX_RUNS} execuções por previsão")
+    table = effect_table()
+    for item in request.inputs:
+        if item.planting_id not in world.plantings.index:
+            raise ValueError(f"Plantio {item.planting_id} não está ativo neste terreno")
+        if table.row(item.type) is None:
+            raise ValueError(f"Tipo de insumo sem efeitos: {item.type}")
+        if item.quantity <= 0:
+            raise ValueError("A quantidade do insumo deve ser positiva")
+
+
+def _terrain_values(world: World) -> Dict[str, float]:
+    if len(world.terrains):
+        return world.terrains.row(0)
+    # Terreno sem parâmetros: média dos quadrantes
+    soil = world.quadrants
+    return {column: sum(soil.values[column]) / len(soil) if len(soil) else 0.0 for column in soil.columns}
+
+
+def run_forecast(world: World, request: ForecastRequest, owner_id: int,
+                 budget_ms: float = FORECAST_CPU_BUDGET_MS) -> Dict[str, Any]:
+    """
+    Previsão sobre `world` (não alterado). Roda na thread que chama; o orçamento é o tempo de
+    CPU dessa thread.
+
+    Raises:
+        ValueError: modo, limites ou insumos inválidos
+    """
+    _validate(world, request)
+    started = time.thread_time()
+    deadline = started + budget_ms / 1000
+    base = world.copy(seed=request.seed)
+    if request.water_probability is not None:
+        base.water_probability = {player: request.water_probability for player in base.water_probability}
+    if request.inputs:
+        base.apply_inputs([(i.planting_id, i.type, i.quantity) for i in request.inputs])
+
+    monte_carlo = request.mode == "monte_carlo"
+    runs = request.runs if monte_carlo else 1
+    trajectories: List[List[Dict[str, float]]] = []
+    finals: List[World] = []
+    truncated = False
+    partial: Optional[Tuple[List[Dict[str, float]], World]] = None
+    transitions: Dict[int, List[dict]] = {}
+    for run in range(runs):
+        current = base.copy(seed=request.seed + run)
+        trajectory = [_terrain_values(current)]
+        for day in range(1, request.days + 1):
+            before = len(current.transitions)
+            current.step(1, climate="random" if monte_carlo else "expected")
+            trajectory.append(_terrain_values(current))
+            if not monte_carlo:
+                for planting_id, old, new in current.transitions[before:]:
+                    transitions.setdefault(planting_id, []).append(
+                        {"day": day, "from_state": STATES[old], "to_state": STATES[new]})
+            if time.thread_time() > deadline and (day < request.days or run < runs - 1):
+                truncated = True
+                if day < request.days:
+                    partial = (trajectory, current)
+                break
+        if partial is None:
+            trajectories.append(trajectory)
+            finals.append(current)
+        if truncated:
+            break
+    if not finals and partial is not None:
+        trajectories.append(partial[0])
+        finals.append(partial[1])
+    if truncated:
+        with _lock:
+            _counters["truncated"] += 1
+
+    days = len(trajectories[0]) - 1
+    soil = []
+    for day in range(days + 1):
+        samples = [trajectory[day] for trajectory in trajectories]
+        if monte_carlo:
+            soil.append({
+                "day": day,
+                "values": {c: percentile([s[c] for s in samples], 50) for c in TERRAIN_COLUMNS},
+                "p10": {c: percentile([s[c] for s in samples], 10) for c in TERRAIN_COLUMNS},
+                "p90": {c: percentile([s[c] for s in samples], 90) for c in TERRAIN_COLUMNS},
+            })
+        else:
+            soil.append({"day": day, "values": samples[0]})
+
+    plantings = []
+    p = world.plantings
+    for i in range(len(p)):
+        counts: Dict[str, int] = {}
+        for final in finals:
+            state = STATES[final.plantings.state[i]]
+            counts[state] = counts.get(state, 0) + 1
+        probabilities = {state: count / len(finals) for state, count in counts.items()}
+        plantings.append({
+            "planting_id": p.ids[i],
+            "species": world.species.keys[p.species[i]],
+            "current_state": STATES[p.state[i]],
+            "final_state": max(probabilities, key=lambda state: (probabilities[state], STATES.index(state))),
+            "probabilities": probabilities,
+            "transitions": None if monte_carlo else transitions.get(p.ids[i], []),
+        })
+
+    return {
+        "mode": request.mode,
+        "days_requested": request.days,
+        "days": days,
+        "runs_requested": runs,
+        "runs": len(finals),
+        "truncated": truncated,
+        "cpu_ms": round((time.thread_time() - started) * 1000, 3),
+        "season": world.season.name,
+        "final_season": finals[0].season.name,
+        "water_probability": base.water_probability.get(owner_id, request.water_probability or 0.0),
+        "soil": soil,
+        "plantings": plantings,
+    }
+
+
+async def forecast_terrain_async(db: AsyncSession, terrain_id: int, owner_id: int,
+                                 request: ForecastRequest) -> Dict[str, Any]:
+    """
+    Previsão com cache: carrega o estado pela sessão assíncrona e simula em uma thread do pool,
+    sem bloquear o event loop.
+
+    Raises:
+        ValueError: modo, limites ou insumos inválidos
+    """
+    key = cache_key(terrain_id, get_state_version(owner_id), request)
+    hit = cached(key)
+    if hit is not None:
+        return {**hit, "cached": True}
+    world = await db.run_sync(load_world, terrain_id)
+    result = await run_in_threadpool(run_forecast, world, request, owner_id)
+    result["terrain_id"] = terrain_id
+    store(key, result)
+    return {**result, "cached": False}
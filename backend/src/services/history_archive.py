@@ -0,0 +1,180 @@
+"""
+Arquivamento do histórico de `actions` e `plant_state_logs`.
+
+As tabelas quentes guardam só os últimos HISTORY_HOT_DAYS dias; é o que as consultas do
+jogo (tick diário, listagens) leem, com o índice composto
+(action_name, player_id, timestamp). O arquivador roda em segundo plano e, em lotes de
+HISTORY_ARCHIVE_BATCH linhas em ordem de id:
+1. lê as linhas mais antigas que o corte;
+2. agrupa por mês e grava cada grupo como um bloco JSON comprimido (zlib) em
+   `history_archive` — no Postgres, na partição mensal (criada sob demanda);
+3. remove as linhas arquivadas da tabela quente, na mesma transação.
+
+Com HISTORY_ARCHIVE_RETENTION_DAYS > 0, os blocos mais antigos que isso são descartados
+(no Postgres, a partição inteira é removida). `iter_archived` devolve as linhas arquivadas
+de um intervalo, para exportação e auditoria.
+"""
+import json
+import logging
+import os
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import Session
+
+from ..models.action import Action
+from ..models.history_archive import HistoryArchive
+from ..models.plant_state_log import PlantStateLog
+
+logger = logging.getLogger(__name__)
+
+HOT_DAYS = int(os.getenv("HISTORY_HOT_DAYS", "90"))
+ARCHIVE_BATCH = int(os.getenv("HISTORY_ARCHIVE_BATCH", "5000"))
+# 0 = manter os blocos arquivados indefinidamente
+ARCHIVE_RETENTION_DAYS = int(os.getenv("HISTORY_ARCHIVE_RETENTION_DAYS", "0"))
+
+SOURCES = {
+    "actions": Action.__table__,
+    "plant_state_logs": PlantStateLog.__table__,
+}
+
+_archive = HistoryArchive.__table__
+
+
+def month_start(ts: datetime) -> datetime:
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def _next_month(start: datetime) -> datetime:
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def _encode(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def compress_rows(rows) -> bytes:
+    return zlib.compress(json.dumps([{k: _encode(v) for k, v in row.items()} for row in rows]).encode(), 6)
+
+
+def decompress_rows(payload: bytes) -> list:
+    return json.loads(zlib.decompress(payload).decode())
+
+
+def _partitioned(db: Session) -> bool:
+    """True se `history_archive` é uma tabela particionada nativa do Postgres."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'history_archive'"
+    )).first())
+
+
+def _partition_name(period: datetime) -> str:
+    return f"history_archive_{period:%Y_%m}"
+
+
+def _ensure_partition(db: Session, period: datetime) -> None:
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {_partition_name(period)} PARTITION OF history_archive "
+        f"FOR VALUES FROM ('{period:%Y-%m-%d}') TO ('{_next_month(period):%Y-%m-%d}')"
+    ))
+
+
+def _archive_batch(db: Session, source: str, cutoff: datetime, partitioned: bool) -> int:
+    table = SOURCES[source]
+    rows = db.execute(
+        select(table).where(table.c.timestamp < cutoff).order_by(table.c.id).limit(ARCHIVE_BATCH)
+    ).mappings().all()
+    if not rows:
+        return 0
+
+    by_month: Dict[datetime, list] = {}
+    for row in rows:
+        by_month.setdefault(month_start(row["timestamp"]), []).append(row)
+    blocks = []
+    for period, group in sorted(by_month.items()):
+        if partitioned:
+            _ensure_partition(db, period)
+        timestamps = [row["timestamp"].replace(tzinfo=None) for row in group]
+        blocks.append({
+            "source": source,
+            "period_start": period,
+            "first_id": group[0]["id"],
+            "last_id": group[-1]["id"],
+            "row_count": len(group),
+            "min_timestamp": min(timestamps),
+            "max_timestamp": max(timestamps),
+            "payload": compress_rows(group),
+        })
+    db.execute(insert(_archive), blocks)
+    # As linhas lidas são exatamente as de id <= último com timestamp antes do corte
+    db.execute(delete(table).where(table.c.id.between(rows[0]["id"], rows[-1]["id"]),
+                                   table.c.timestamp < cutoff))
+    db.commit()
+    return len(rows)
+
+
+def archive_history(db: Session, now: Optional[datetime] = None, max_batches: Optional[int] = None) -> Dict[str, int]:
+    """
+    Move para o arquivo frio as linhas mais antigas que HISTORY_HOT_DAYS.
+
+    Cada lote é uma transação: uma interrupção no meio deixa o que já foi arquivado
+    consistente e o restante para a próxima execução.
+
+    Returns:
+        Dict[str, int]: Linhas arquivadas por tabela
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=HOT_DAYS)
+    partitioned = _partitioned(db)
+    counters = {source: 0 for source in SOURCES}
+    for source in SOURCES:
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            moved = _archive_batch(db, source, cutoff, partitioned)
+            if not moved:
+                break
+            counters[source] += moved
+            batches += 1
+    if ARCHIVE_RETENTION_DAYS > 0:
+        counters["pruned_blocks"] = prune_archive(db, now - timedelta(days=ARCHIVE_RETENTION_DAYS))
+    logger.info(f"Histórico arquivado: {counters}")
+    return counters
+
+
+def prune_archive(db: Session, before: datetime) -> int:
+    """Descarta os blocos de meses inteiramente anteriores a `before`."""
+    limit = month_start(before)
+    if _partitioned(db):
+        old = db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = 'history_archive'"
+        )).scalars().all()
+        dropped = [name for name in old if name < _partition_name(limit)]
+        for name in dropped:
+            db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        db.commit()
+        return len(dropped)
+    result = db.execute(delete(_archive).where(_archive.c.period_start < limit))
+    db.commit()
+    return result.rowcount or 0
+
+
+def iter_archived(db: Session, source: str, start: datetime, end: datetime) -> Iterator[dict]:
+    """Linhas arquivadas de `source` com timestamp em [start, end), em ordem de id."""
+    blocks = db.execute(
+        select(_archive.c.payload)
+        .where(_archive.c.source == source,
+               _archive.c.period_start >= month_start(start), _archive.c.period_start < end,
+               _archive.c.max_timestamp >= start, _archive.c.min_timestamp < end)
+        .order_by(_archive.c.first_id)
+    ).scalars()
+    for payload in blocks:
+        for row in decompress_rows(payload):
+            ts = datetime.fromisoformat(row["timestamp"]).replace(tzinfo=None)
+            if start <= ts < end:
+                yield row
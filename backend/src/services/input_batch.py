@@ -0,0 +1,274 @@
+"""
+Aplicação de insumos em lote.
+
+Em vez de um `create_input` + `apply_input_effects` por insumo (quatro SELECTs, dois commits
+e a propagação para os vizinhos a cada chamada), o lote:
+1. carrega plantios, quadrantes e parâmetros dos terrenos com um único SELECT ... IN (JOIN);
+2. carrega os quadrantes dos terrenos envolvidos (vizinhança) com outro SELECT ... IN;
+3. insere todos os insumos com um INSERT em lote, já marcados como aplicados
+   (`effects_applied_at`, ver services.input_effects);
+4. avalia os efeitos de todos os insumos de uma vez na tabela compilada
+   (services.effect_table), soma por terreno e aplica os limites uma única vez sobre o
+   total; os quadrantes alvo recebem os valores finais do terreno;
+5. agrega os deltas propagados por quadrante vizinho e os aplica uma vez em cada um;
+6. registra os valores resultantes na série do solo (services.soil_series, um UPSERT);
+7. faz um único COMMIT.
+
+Cada insumo recebe o relatório no mesmo formato de `apply_input_effects` (efeitos com
+before/after/change, terreno, quadrante e efeitos na planta). Como o limite é aplicado
+sobre o acumulado, before/after de cada insumo são os valores do terreno (já limitados)
+antes e depois da soma dele.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from ..models.input import Input
+from ..models.planting import Planting
+from ..models.quadrant import Quadrant
+from ..models.terrain_parameters import TerrainParameters
+from ..schemas.input import InputCreate
+from .effect_table import effect_table
+from .player_digest import bump_player_state_version
+from .soil_series import record, record_async
+from .quadrant_neighbors import PROPAGATION_FACTOR, get_neighbor_coordinates, parse_quadrant_coordinates
+
+logger = logging.getLogger(__name__)
+
+# Limite de insumos por lote
+MAX_BATCH_INPUTS = 200
+
+_input_table = Input.__table__
+
+
+def _validate(inputs: List[InputCreate]) -> None:
+    if not inputs:
+        raise ValueError("Nenhum insumo informado")
+    if len(inputs) > MAX_BATCH_INPUTS:
+        raise ValueError(f"Lote com mais de {MAX_BATCH_INPUTS} insumos")
+
+
+def _context_statement(planting_ids):
+    return (
+        select(Planting, Quadrant, TerrainParameters)
+        .join(Quadrant, Quadrant.id == Planting.quadrant_id)
+        .outerjoin(TerrainParameters, TerrainParameters.terrain_id == Quadrant.terrain_id)
+        .where(Planting.id.in_(planting_ids))
+    )
+
+
+def _input_context_statement(planting_id: int):
+    # Os quadrantes do mesmo terreno (vizinhança) vêm como colunas extras de cada linha
+    terrain_quadrant = aliased(Quadrant)
+    return (
+        _context_statement([planting_id])
+        .add_columns(terrain_quadrant)
+        .join(terrain_quadrant, terrain_quadrant.terrain_id == Quadrant.terrain_id)
+    )
+
+
+def _terrain_quadrants_statement(terrain_ids):
+    return select(Quadrant).where(Quadrant.terrain_id.in_(terrain_ids))
+
+
+def _insert_statement():
+    return insert(_input_table).values(effects_applied_at=func.now()).returning(*_input_table.c)
+
+
+class BatchContext:
+    """Linhas carregadas para o lote, indexadas por id."""
+
+    def __init__(self):
+        self.plantings: Dict[int, Planting] = {}
+        self.quadrants: Dict[int, Quadrant] = {}
+        self.params: Dict[int, TerrainParameters] = {}
+
+    def add_rows(self, rows) -> None:
+        for planting, quadrant, terrain_params, *terrain_quadrants in rows:
+            self.plantings[planting.id] = planting
+            self.quadrants[quadrant.id] = quadrant
+            if terrain_params is not None:
+                self.params.setdefault(quadrant.terrain_id, terrain_params)
+            self.add_quadrants(terrain_quadrants)
+
+    def add_quadrants(self, quadrants) -> None:
+        for quadrant in quadrants:
+            self.quadrants.setdefault(quadrant.id, quadrant)
+
+    @property
+    def terrain_ids(self):
+        return {self.quadrants[p.quadrant_id].terrain_id for p in self.plantings.values()}
+
+    def check(self, inputs: List[InputCreate]) -> None:
+        missing = sorted({i.planting_id for i in inputs} - set(self.plantings))
+        if missing:
+            raise ValueError(f"Plantios não encontrados: {', '.join(map(str, missing))}")
+
+
+def load_input_context(db: Session, planting_id: int) -> BatchContext:
+    """Contexto completo de um único plantio (com a vizinhança) em um SELECT."""
+    ctx = BatchContext()
+    ctx.add_rows(db.execute(_input_context_statement(planting_id)).all())
+    return ctx
+
+
+async def load_input_context_async(db: AsyncSession, planting_id: int) -> BatchContext:
+    ctx = BatchContext()
+    ctx.add_rows((await db.execute(_input_context_statement(planting_id))).all())
+    return ctx
+
+
+def apply_batch_effects(input_rows: List[dict], ctx: BatchContext) -> List[dict]:
+    """
+    Calcula e aplica (nos objetos carregados) os efeitos de todos os insumos.
+
+    Returns:
+        List[dict]: Relatório por insumo, na ordem recebida
+    """
+    table = effect_table()
+    changes = table.changes((row["type"], row["quantity"]) for row in input_rows)
+    initial: Dict[int, Dict[str, float]] = defaultdict(dict)
+    totals: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    quadrant_deltas: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    reports = []
+
+    for row, change_vector in zip(input_rows, changes):
+        report = {"effects": [], "terrain_id": None, "quadrant_id": None, "plant_effects": None}
+        reports.append(report)
+        planting = ctx.plantings[row["planting_id"]]
+        quadrant = ctx.quadrants[planting.quadrant_id]
+        terrain_id = quadrant.terrain_id
+        terrain_params = ctx.params.get(terrain_id)
+        if terrain_params is None or change_vector is None:
+            logger.warning(f"Insumo {row['id']} sem efeitos aplicáveis (tipo {row['type']})")
+            continue
+
+        t = table.row(row["type"])
+        report["terrain_id"], report["quadrant_id"] = terrain_id, quadrant.id
+        plant_effects = {}
+        for attr in table.resets[t]:
+            old_value = getattr(planting, attr, None)
+            setattr(planting, attr, 0)
+            plant_effects[attr] = {"before": old_value, "after": 0, "change": -(old_value or 0)}
+
+        for p in table.mask[t]:
+            param_name, change = table.params[p], change_vector[p]
+            start = initial[terrain_id].setdefault(param_name, getattr(terrain_params, param_name, 0) or 0)
+            before = table.clamp(p, start + totals[terrain_id][param_name])
+            totals[terrain_id][param_name] += change
+            after = table.clamp(p, start + totals[terrain_id][param_name])
+            report["effects"].append({"parameter": param_name, "before": before, "after": after, "change": change})
+            quadrant_deltas[quadrant.id][param_name] += after - before
+        report["plant_effects"] = plant_effects or None
+
+    # Parâmetros do terreno: limite aplicado uma vez sobre o acumulado
+    final: Dict[int, Dict[str, float]] = {}
+    for terrain_id, param_totals in totals.items():
+        final[terrain_id] = {
+            param: table.clamp_param(param, initial[terrain_id][param] + total)
+            for param, total in param_totals.items()
+        }
+        for param, value in final[terrain_id].items():
+            setattr(ctx.params[terrain_id], param, value)
+
+    # Quadrantes alvo espelham os valores finais do terreno (como em apply_input_effects)
+    for quadrant_id, deltas in quadrant_deltas.items():
+        quadrant = ctx.quadrants[quadrant_id]
+        for param in deltas:
+            if hasattr(quadrant, param):
+                setattr(quadrant, param, final[quadrant.terrain_id][param])
+
+    _propagate(ctx, quadrant_deltas)
+    return reports
+
+
+def _propagate(ctx: BatchContext, quadrant_deltas: Dict[int, Dict[str, float]]) -> None:
+    """Soma os deltas que cada vizinho recebe de todos os quadrantes alvo e aplica uma vez."""
+    by_label = {(q.terrain_id, q.label): q for q in ctx.quadrants.values()}
+    received: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for quadrant_id, deltas in quadrant_deltas.items():
+        quadrant = ctx.quadrants[quadrant_id]
+        coords = parse_quadrant_coordinates(quadrant.label)
+        if not coords:
+            continue
+        for col, row in get_neighbor_coordinates(*coords):
+            neighbor = by_label.get((quadrant.terrain_id, f"{col}{row}"))
+            if neighbor is None:
+                continue
+            for param, delta in deltas.items():
+                if delta:
+                    received[neighbor.id][param] += delta
+
+    for neighbor_id, deltas in received.items():
+        neighbor = ctx.quadrants[neighbor_id]
+        for param, value in deltas.items():
+            if not hasattr(neighbor, param):
+                continue
+            current = getattr(neighbor, param) or 0
+            propagated = value * PROPAGATION_FACTOR
+            setattr(neighbor, param, current + propagated if value >= 0 else max(0, current + propagated))
+    if received:
+        logger.info(f"Efeitos do lote propagados para {len(received)} quadrantes vizinhos")
+
+
+def _input_rows(inputs: List[InputCreate]) -> List[dict]:
+    return [{"planting_id": i.planting_id, "type": i.type, "quantity": i.quantity} for i in inputs]
+
+
+def _with_reports(inserted, reports: List[dict]) -> List[dict]:
+    return [{**row, **report} for row, report in zip(inserted, reports)]
+
+
+def _inserted_rows(result) -> List[dict]:
+    # RETURNING de um INSERT em lote: ids crescentes na ordem dos insumos
+    return sorted((dict(row._mapping) for row in result), key=lambda row: row["id"])
+
+
+def _bump_players(player_ids) -> None:
+    for player_id in player_ids:
+        bump_player_state_version(player_id)
+
+
+def apply_inputs_batch(db: Session, inputs: List[InputCreate]) -> List[dict]:
+    """
+    Registra e aplica um lote de insumos em uma única transação (versão síncrona).
+
+    Raises:
+        ValueError: lote vazio ou grande demais, ou plantio inexistente
+    """
+    _validate(inputs)
+    ctx = BatchContext()
+    ctx.add_rows(db.execute(_context_statement({i.planting_id for i in inputs})).all())
+    ctx.check(inputs)
+    ctx.add_quadrants(db.execute(_terrain_quadrants_statement(ctx.terrain_ids)).scalars().all())
+
+    inserted = _inserted_rows(db.execute(_insert_statement(), _input_rows(inputs)))
+    reports = apply_batch_effects(inserted, ctx)
+    record(db, ctx.params.values(), ctx.quadrants.values())
+    # Lido antes do COMMIT, que expira os objetos carregados
+    player_ids = {planting.player_id for planting in ctx.plantings.values()}
+    db.commit()
+    _bump_players(player_ids)
+    return _with_reports(inserted, reports)
+
+
+async def apply_inputs_batch_async(db: AsyncSession, inputs: List[InputCreate]) -> List[dict]:
+    """Registra e aplica um lote de insumos em uma única transação (versão assíncrona)."""
+    _validate(inputs)
+    ctx = BatchContext()
+    ctx.add_rows((await db.execute(_context_statement({i.planting_id for i in inputs}))).all())
+    ctx.check(inputs)
+    ctx.add_quadrants((await db.execute(_terrain_quadrants_statement(ctx.terrain_ids))).scalars().all())
+
+    inserted = _inserted_rows(await db.execute(_insert_statement(), _input_rows(inputs)))
+    reports = apply_batch_effects(inserted, ctx)
+    await record_async(db, ctx.params.values(), ctx.quadrants.values())
+    # Lido antes do COMMIT, que expira os objetos carregados
+    player_ids = {planting.player_id for planting in ctx.plantings.values()}
+    await db.commit()
+    _bump_players(player_ids)
+    return _with_reports(inserted, reports)
@@ -0,0 +1,194 @@
+"""
+Controle de admissão para o backend de LLM usado pelo Eko.
+
+O host do Ollama tem capacidade fixa: disparar requisições em paralelo sem limite só
+faz todas estourarem o timeout. Este módulo limita o número de chamadas simultâneas,
+enfileira as demais em filas por jogador atendidas em rodízio (round-robin) e rejeita
+logo de início quando a espera estimada já ultrapassa o timeout.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Peso da última medição na média móvel exponencial do tempo de serviço
+SERVICE_TIME_ALPHA = 0.2
+
+
+class LLMOverloadedError(Exception):
+    """A requisição não pôde ser admitida a tempo (fila cheia, espera estimada ou prazo esgotado)."""
+
+
+class _Waiter:
+    __slots__ = ("key", "future", "enqueued_at")
+
+    def __init__(self, key: str, future: asyncio.Future, enqueued_at: float):
+        self.key = key
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+class LLMAdmissionController:
+    """
+    Limita as chamadas simultâneas ao LLM com filas justas por jogador.
+
+    Args:
+        max_in_flight (int): Número máximo de chamadas simultâneas ao LLM
+        timeout (float): Prazo máximo (s) de espera na fila; também usado como limite da espera estimada
+        max_queue (int): Número máximo de requisições aguardando na fila
+        initial_service_time (float): Estimativa inicial do tempo de uma chamada ao LLM
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        timeout: float,
+        max_queue: int = 100,
+        initial_service_time: Optional[float] = None,
+    ):
+        self.max_in_flight = max(1, max_in_flight)
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self._in_flight = 0
+        self._queued = 0
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._avg_service_time = initial_service_time if initial_service_time is not None else timeout / 4
+        self._counters: Dict[str, int] = {
+            "admitted": 0,
+            "rejected": 0,
+            "expired": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._max_queue_depth = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def estimated_wait(self) -> float:
+        """Estima quanto tempo (s) uma nova requisição esperaria na fila."""
+        if self._in_flight < self.max_in_flight and self._queued == 0:
+            return 0.0
+        # Cada leva de `max_in_flight` chamadas libera vagas em ~um tempo médio de serviço
+        return (self._queued + 1) / self.max_in_flight * self._avg_service_time
+
+    async def acquire(self, key: str) -> None:
+        """
+        Aguarda uma vaga para chamar o LLM.
+
+        Raises:
+            LLMOverloadedError: se a fila estiver cheia, se a espera estimada passar do
+                timeout ou se o prazo expirar antes de a vaga ser liberada
+        """
+        if self._in_flight < self.max_in_flight and self._queued == 0:
+            self._in_flight += 1
+            self._counters["admitted"] += 1
+            return
+
+        if self._queued >= self.max_queue or self.estimated_wait() > self.timeout:
+            self._counters["rejected"] += 1
+            raise LLMOverloadedError("Fila do LLM saturada")
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(key, loop.create_future(), time.monotonic())
+        self._queues.setdefault(key, deque()).append(waiter)
+        self._queued += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            granted = waiter.future.done() and not waiter.future.cancelled()
+            if not granted:
+                self._remove_waiter(waiter)
+                waiter.future.cancel()
+                if isinstance(exc, asyncio.CancelledError):
+                    raise
+                self._counters["expired"] += 1
+                raise LLMOverloadedError("Prazo de espera pelo LLM esgotado") from exc
+            if isinstance(exc, asyncio.CancelledError):
+                # A vaga chegou junto com o cancelamento: devolve para o próximo da fila
+                self.release()
+                raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        self._counters["admitted"] += 1
+
+    def release(self, service_time: Optional[float] = None) -> None:
+        """Libera uma vaga e, se houver, entrega-a ao próximo jogador da fila."""
+        self._in_flight = max(0, self._in_flight - 1)
+        if service_time is not None:
+            self._avg_service_time += SERVICE_TIME_ALPHA * (service_time - self._avg_service_time)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, key: str):
+        """Context manager que ocupa uma vaga durante a chamada ao LLM."""
+        await self.acquire(key)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self._counters["failed"] += 1
+            raise
+        else:
+            self._counters["completed"] += 1
+        finally:
+            self.release(time.monotonic() - started)
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self.max_in_flight and self._queues:
+            # Rodízio entre jogadores: atende a cabeça da fila do primeiro jogador e
+            # manda o jogador para o fim da rotação
+            key, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if waiter.future.done():
+                continue
+            self._in_flight += 1
+            waiter.future.set_result(True)
+
+    def _remove_waiter(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.key)
+        if not queue:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        self._queued -= 1
+        if not queue:
+            del self._queues[waiter.key]
+
+    def metrics(self) -> dict:
+        """Retorna um snapshot das métricas da fila."""
+        admitted = self._counters["admitted"]
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "queued_players": len(self._queues),
+            "max_queue_depth": self._max_queue_depth,
+            "estimated_wait_s": round(self.estimated_wait(), 3),
+            "avg_service_time_s": round(self._avg_service_time, 3),
+            "avg_wait_s": round(self._total_wait / admitted, 3) if admitted else 0.0,
+            "max_wait_s": round(self._max_wait, 3),
+            **self._counters,
+        }
@@ -8,7 +8,11 @@ from datetime import datetime, timedelta
 
 from sqlalchemy.orm import Session
 
-from ..models import Planting, PlantStateLog, Action
+from ..models import Action
+from . import current_season
+from .simulation import MORTA
+from .simulation_io import load_plantings, log_transitions, season_world, write_back
+from .slot_occupancy import occupancy
 
 logger = logging.getLogger(__name__)
 
@@ -41,61 +45,39 @@ TOLERANCE_LIMITS = {'alta': 7, 'media': 4, 'baixa': 2}
 def tick_day(db: Session):
     """
     Executa um tick diário: incrementa dias, checa rega, faz transições de estado e grava logs.
+
+    As regras ficam no núcleo de simulação (services.simulation). Os limiares de germinação e
+    maturação vêm ajustados pela estação vigente (services.current_season), sem consultas a mais;
+    os plantios alterados são gravados com um UPDATE em lote e os logs com um INSERT em lote.
     """
     try:
-        # Hot-reload de species.yml antes do ciclo
-        species_params = load_species_params("src/data/species.yml")
-
-        # Plantios não finalizados
-        ativos = db.query(Planting).filter(
-            ~Planting.current_state.in_(['COLHIDA', 'MORTA'])
-        ).all()
+        # species.yml (recarregado quando o arquivo muda) e estação vigente, em memória
+        world = season_world(db, species=current_season.species_params())
+        # Plantios não finalizados, com a chave da espécie na mesma consulta
+        slots = load_plantings(db, world)
 
-        now = datetime.now()
-        cutoff = now - timedelta(days=1)
+        cutoff = datetime.now() - timedelta(days=1)
 
-        for p in ativos:
-            # Incrementa dias desde plantio
-            p.days_since_planting = (p.days_since_planting or 0) + 1
-            # Verifica ações de rega nas últimas 24h
-            cnt = db.query(Action).filter(
+        # Jogadores que regaram nas últimas 24h: uma consulta coberta pelo índice
+        # (action_name, player_id, timestamp) em vez de uma contagem por plantio
+        player_ids = set(world.plantings.players)
+        regaram = {
+            player_id for (player_id,) in db.query(Action.player_id).filter(
                 Action.action_name == 'water',
-                Action.player_id == p.player_id,
+                Action.player_id.in_(player_ids),
                 Action.timestamp >= cutoff
-            ).count()
-            p.days_sem_rega = 0 if cnt > 0 else (p.days_sem_rega or 0) + 1
-
-            # Limite de tolerância de seca
-            params = species_params.get(p.species.key, {})
-            tol = params.get('tolerancia_seca')
-            limit = TOLERANCE_LIMITS.get(tol, 0)
-            if p.days_sem_rega > limit:
-                old = p.current_state
-                p.current_state = 'MORTA'
-                db.add(PlantStateLog(planting_id=p.id, from_state=old, to_state='MORTA'))
-                continue
-
-            # Transições baseadas em dias desde plantio
-            if p.current_state == 'SEMENTE':
-                gd = params.get('germinacao_dias_scaled', params.get('germinacao_dias'))
-                if gd and p.days_since_planting >= gd:
-                    old = p.current_state
-                    p.current_state = 'MUDINHA'
-                    db.add(PlantStateLog(planting_id=p.id, from_state=old, to_state='MUDINHA'))
-            elif p.current_state == 'MUDINHA':
-                md = params.get('maturidade_dias_scaled', params.get('maturidade_dias'))
-                if md and p.days_since_planting >= md:
-                    old = p.current_state
-                    p.current_state = 'MADURA'
-                    db.add(PlantStateLog(planting_id=p.id, from_state=old, to_state='MADURA'))
-
-            # MADURA → COLHÍVEL
-            if p.current_state == 'MADURA':
-                old = p.current_state
-                p.current_state = 'COLHIVEL'
-                db.add(PlantStateLog(planting_id=p.id, from_state=old, to_state='COLHIVEL'))
+            ).distinct()
+        } if player_ids else set()
 
+        baseline = world.copy()
+        transitions = world.tick(regaram)
+        write_back(db, world.diff(baseline))
+        log_transitions(db, transitions)
         db.commit()
+        # Plantios mortos continuam no slot, mas deixam de contar como ativos no índice
+        for planting_id, _, new_state in transitions:
+            if new_state == MORTA:
+                occupancy.mark_state(*slots[planting_id], 'MORTA')
     except Exception as e:
         db.rollback()
         logger.error(f"Erro em tick_day: {e}")
@@ -0,0 +1,219 @@
+"""
+Plantio em lote com alocação de slots por bitmap.
+
+Um lote (várias entradas quadrante/slot/espécie e/ou "preencher N mudas no quadrante Q")
+é resolvido em uma única transação:
+1. os bitmaps de ocupação dos quadrantes pedidos vêm do índice em memória
+   (services.slot_occupancy); só os quadrantes fora dele são lidos do banco, em um SELECT;
+2. um SELECT ... IN das espécies pedidas;
+3. a alocação em memória: slots explícitos são conferidos no bitmap e os automáticos
+   pegam o menor bit livre;
+4. um INSERT em lote `ON CONFLICT (quadrant_id, slot_index) DO NOTHING` com RETURNING:
+   a constraint `uix_quadrant_slot` continua sendo a garantia final contra plantios
+   concorrentes, e as linhas que ela descarta voltam como conflito;
+5. um único COMMIT, seguido da atualização do índice.
+
+O resultado traz o status de cada plantio pedido (created, conflict ou invalid).
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.planting import Planting
+from ..models.player import Player
+from ..models.species import Species
+from ..schemas.planting import BulkPlantingCreate, BulkPlantingOut, BulkPlantingResult
+from .player_digest import bump_player_state_version
+from .slot_occupancy import (
+    SLOTS_PER_QUADRANT,
+    ensure_quadrants,
+    ensure_quadrants_async,
+    occupancy,
+    slot_in_range,
+)
+
+logger = logging.getLogger(__name__)
+
+# Limite de plantios por lote
+MAX_BULK_PLANTINGS = 500
+
+CREATED = "created"
+CONFLICT = "conflict"
+INVALID = "invalid"
+
+_planting_table = Planting.__table__
+
+
+def lowest_free_slot(mask: int) -> Optional[int]:
+    """Menor slot livre do bitmap, ou None se o quadrante estiver cheio."""
+    free = ~mask & ((1 << SLOTS_PER_QUADRANT) - 1)
+    if not free:
+        return None
+    return (free & -free).bit_length() - 1
+
+
+def _bitmaps(quadrant_ids: Set[int]) -> Dict[int, int]:
+    """Cópia dos bitmaps `occupied` dos quadrantes existentes (a alocação os altera)."""
+    bitmaps = {}
+    for quadrant_id in quadrant_ids:
+        entry = occupancy.quadrant(quadrant_id)
+        if entry is not None:
+            bitmaps[quadrant_id] = entry.occupied
+    return bitmaps
+
+
+def _species_statement(species_ids: Set[int]):
+    return select(Species.id).where(Species.id.in_(species_ids))
+
+
+def _validate(request: BulkPlantingCreate) -> None:
+    total = len(request.entries) + sum(max(fill.count, 0) for fill in request.auto_fill)
+    if total == 0:
+        raise ValueError("Nenhum plantio informado")
+    if total > MAX_BULK_PLANTINGS:
+        raise ValueError(f"Lote com mais de {MAX_BULK_PLANTINGS} plantios")
+    for fill in request.auto_fill:
+        if fill.count < 1:
+            raise ValueError("Quantidade inválida para preenchimento automático")
+
+
+def _requested_ids(request: BulkPlantingCreate) -> Tuple[Set[int], Set[int]]:
+    wanted = list(request.entries) + list(request.auto_fill)
+    return {item.quadrant_id for item in wanted}, {item.species_id for item in wanted}
+
+
+def allocate(request: BulkPlantingCreate, bitmaps: Dict[int, int],
+             species_ids: Set[int]) -> Tuple[List[BulkPlantingResult], List[dict]]:
+    """
+    Distribui os plantios pedidos nos slots livres, atualizando os bitmaps.
+
+    Returns:
+        Tuple: resultados na ordem do pedido e as linhas a inserir (na mesma ordem dos
+        resultados com status created)
+    """
+    results: List[BulkPlantingResult] = []
+    rows: List[dict] = []
+
+    def place(quadrant_id: int, species_id: int, slot_index: Optional[int]) -> None:
+        result = BulkPlantingResult(quadrant_id=quadrant_id, species_id=species_id,
+                                    slot_index=slot_index, status=INVALID)
+        results.append(result)
+        if quadrant_id not in bitmaps:
+            result.detail = "Quadrante não encontrado"
+            return
+        if species_id not in species_ids:
+            result.detail = "Espécie não encontrada"
+            return
+        mask = bitmaps[quadrant_id]
+        if slot_index is None:
+            slot_index = lowest_free_slot(mask)
+            if slot_index is None:
+                result.status, result.detail = CONFLICT, "Quadrante sem slots livres"
+                return
+        elif not slot_in_range(slot_index):
+            result.detail = f"Slot fora do intervalo 0-{SLOTS_PER_QUADRANT - 1}"
+            return
+        elif mask & (1 << slot_index):
+            result.status, result.detail = CONFLICT, "Slot já ocupado"
+            return
+        bitmaps[quadrant_id] = mask | (1 << slot_index)
+        result.slot_index, result.status = slot_index, CREATED
+        rows.append({
+            "player_id": request.player_id,
+            "quadrant_id": quadrant_id,
+            "slot_index": slot_index,
+            "species_id": species_id,
+        })
+
+    for entry in request.entries:
+        place(entry.quadrant_id, entry.species_id, entry.slot_index)
+    for fill in request.auto_fill:
+        for _ in range(fill.count):
+            place(fill.quadrant_id, fill.species_id, None)
+    return results, rows
+
+
+def _insert_statement(dialect_name: str):
+    """INSERT em lote que ignora (e não retorna) as linhas barradas por uix_quadrant_slot."""
+    if dialect_name == "postgresql":
+        stmt = pg_insert(_planting_table).on_conflict_do_nothing(
+            index_elements=["quadrant_id", "slot_index"]
+        )
+    elif dialect_name == "sqlite":
+        stmt = sqlite_insert(_planting_table).on_conflict_do_nothing(
+            index_elements=["quadrant_id", "slot_index"]
+        )
+    else:
+        stmt = insert(_planting_table)
+    return stmt.returning(
+        _planting_table.c.id, _planting_table.c.quadrant_id, _planting_table.c.slot_index
+    )
+
+
+def _finish(request: BulkPlantingCreate, results: List[BulkPlantingResult],
+            inserted: Iterable[Tuple[int, int, int]]) -> BulkPlantingOut:
+    ids = {(quadrant_id, slot_index): planting_id for planting_id, quadrant_id, slot_index in inserted}
+    for result in results:
+        if result.status != CREATED:
+            continue
+        result.planting_id = ids.get((result.quadrant_id, result.slot_index))
+        if result.planting_id is None:
+            # Outro plantio (outro processo) ocupou o slot: o índice deste quadrante está defasado
+            result.status, result.detail = CONFLICT, "Slot já ocupado"
+            occupancy.invalidate(result.quadrant_id)
+        else:
+            occupancy.mark_planted(result.quadrant_id, result.slot_index)
+    created = sum(1 for result in results if result.status == CREATED)
+    conflicts = sum(1 for result in results if result.status == CONFLICT)
+    logger.info("Plantio em lote do jogador %s: %s criados, %s conflitos",
+                request.player_id, created, conflicts)
+    return BulkPlantingOut(player_id=request.player_id, created=created,
+                           conflicts=conflicts, results=results)
+
+
+def bulk_plant(db: Session, request: BulkPlantingCreate) -> BulkPlantingOut:
+    """
+    Planta um lote em uma única transação (versão síncrona).
+
+    Raises:
+        ValueError: lote vazio ou grande demais, ou jogador inexistente
+    """
+    _validate(request)
+    if db.get(Player, request.player_id) is None:
+        raise ValueError("Jogador não encontrado")
+    quadrant_ids, species_ids = _requested_ids(request)
+    ensure_quadrants(db, quadrant_ids)
+    bitmaps = _bitmaps(quadrant_ids)
+    known_species = set(db.execute(_species_statement(species_ids)).scalars().all())
+
+    results, rows = allocate(request, bitmaps, known_species)
+    inserted = []
+    if rows:
+        inserted = db.execute(_insert_statement(db.get_bind().dialect.name), rows).all()
+        db.commit()
+        bump_player_state_version(request.player_id)
+    return _finish(request, results, inserted)
+
+
+async def bulk_plant_async(db: AsyncSession, request: BulkPlantingCreate) -> BulkPlantingOut:
+    """Planta um lote em uma única transação (versão assíncrona). Ver `bulk_plant`."""
+    _validate(request)
+    if await db.get(Player, request.player_id) is None:
+        raise ValueError("Jogador não encontrado")
+    quadrant_ids, species_ids = _requested_ids(request)
+    await ensure_quadrants_async(db, quadrant_ids)
+    bitmaps = _bitmaps(quadrant_ids)
+    known_species = set((await db.execute(_species_statement(species_ids))).scalars().all())
+
+    results, rows = allocate(request, bitmaps, known_species)
+    inserted = []
+    if rows:
+        inserted = (await db.execute(_insert_statement(db.get_bind().dialect.name), rows)).all()
+        await db.commit()
+        bump_player_state_version(request.player_id)
+    return _finish(request, results, inserted)
@@ -0,0 +1,201 @@
+"""
+Serviço que gera um resumo compacto ("digest") do estado de jogo de um jogador.
+
+O digest é usado como mensagem de sistema no proxy do Eko, para que as respostas
+considerem os terrenos, a saúde do solo, os plantios e as ações recentes do jogador
+sem que ele precise descrever a fazenda no chat.
+
+O texto é pré-computado e mantido em cache em memória. Cada jogador tem um número de
+versão de estado que é incrementado pelos escritores (plantios, insumos, ações,
+compras); os jobs do scheduler incrementam uma versão global. O digest só é
+reconstruído quando alguma dessas versões muda.
+"""
+import logging
+import os
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.action import Action
+from ..models.planting import Planting
+from ..models.player import Player
+from ..models.terrain import Terrain
+from ..models.terrain_parameters import TerrainParameters
+from .soil_health import analyze_soil_health
+
+logger = logging.getLogger(__name__)
+
+# Tamanho máximo do digest (em caracteres) para não inflar o prompt
+DIGEST_MAX_CHARS = int(os.getenv("EKO_DIGEST_MAX_CHARS", "600"))
+# Quantidade de ações recentes incluídas no digest
+DIGEST_RECENT_ACTIONS = int(os.getenv("EKO_DIGEST_RECENT_ACTIONS", "5"))
+
+# Estados de plantio que não contam mais como ativos
+_FINISHED_STATES = ("COLHIDA", "MORTA")
+
+_lock = threading.Lock()
+_global_version = 0
+_player_versions: Dict[int, int] = {}
+# player_id -> ((versão global, versão do jogador), digest)
+_digest_cache: Dict[int, Tuple[Tuple[int, int], Optional[str]]] = {}
+
+
+def bump_player_state_version(player_id: Optional[int]) -> None:
+    """Marca o estado de um jogador como alterado, invalidando o digest em cache."""
+    if player_id is None:
+        return
+    with _lock:
+        _player_versions[player_id] = _player_versions.get(player_id, 0) + 1
+
+
+def bump_global_state_version() -> None:
+    """Marca o estado de todos os jogadores como alterado (ticks, clima, estações)."""
+    global _global_version
+    with _lock:
+        _global_version += 1
+
+
+def get_state_version(player_id: int) -> Tuple[int, int]:
+    """Retorna a versão de estado atual de um jogador (global, jogador)."""
+    with _lock:
+        return _global_version, _player_versions.get(player_id, 0)
+
+
+def clear_digest_cache() -> None:
+    """Descarta todos os digests em cache."""
+    with _lock:
+        _digest_cache.clear()
+
+
+def _format_number(value) -> str:
+    return f"{float(value or 0):.0f}"
+
+
+def build_player_digest(db: Session, player_id: int) -> Optional[str]:
+    """
+    Monta o digest do jogador a partir do banco de dados.
+
+    Args:
+        db (Session): Sessão do banco de dados
+        player_id (int): ID do jogador
+
+    Returns:
+        Optional[str]: Texto do digest ou None se o jogador não existir
+    """
+    player = db.query(Player).filter(Player.id == player_id).first()
+    if not player:
+        return None
+
+    terrains = db.query(Terrain).filter(Terrain.player_id == player_id).all()
+    terrain_ids = [t.id for t in terrains]
+    params_by_terrain: Dict[int, TerrainParameters] = {}
+    if terrain_ids:
+        for params in db.query(TerrainParameters).filter(
+            TerrainParameters.terrain_id.in_(terrain_ids)
+        ).all():
+            params_by_terrain.setdefault(params.terrain_id, params)
+
+    state_counts = dict(
+        db.query(Planting.current_state, func.count(Planting.id))
+        .filter(
+            Planting.player_id == player_id,
+            ~Planting.current_state.in_(_FINISHED_STATES),
+        )
+        .group_by(Planting.current_state)
+        .all()
+    )
+
+    recent_actions = (
+        db.query(Action.action_name)
+        .filter(Action.player_id == player_id)
+        .order_by(Action.timestamp.desc(), Action.id.desc())
+        .limit(DIGEST_RECENT_ACTIONS)
+        .all()
+    )
+
+    parts: List[str] = [
+        f"Contexto do jogador {player.name} (saldo {player.balance or 0:.1f})."
+    ]
+
+    for terrain in terrains:
+        label = terrain.name or f"#{terrain.id}"
+        params = params_by_terrain.get(terrain.id)
+        if not params:
+            parts.append(f"Terreno {label}: sem parâmetros de solo.")
+            continue
+        report = analyze_soil_health(params)
+        line = (
+            f"Terreno {label}: solo {report['health_category']} ({report['health_index']}), "
+            f"umidade {_format_number(params.soil_moisture)}, "
+            f"fertilidade {_format_number(params.fertility)}, "
+            f"matéria orgânica {_format_number(params.organic_matter)}"
+        )
+        alerts = [a["display_name"] for a in report["alerts"]]
+        if alerts:
+            line += f"; alertas: {', '.join(alerts)}"
+        parts.append(line + ".")
+
+    if state_counts:
+        states = ", ".join(f"{count} {state}" for state, count in sorted(state_counts.items()))
+        parts.append(f"Plantios ativos: {states}.")
+    else:
+        parts.append("Nenhum plantio ativo.")
+
+    if recent_actions:
+        counts = Counter(name for (name,) in recent_actions)
+        actions = ", ".join(f"{name} x{n}" if n > 1 else name for name, n in counts.items())
+        parts.append(f"Ações recentes: {actions}.")
+
+    digest = " ".join(parts)
+    if len(digest) > DIGEST_MAX_CHARS:
+        digest = digest[: DIGEST_MAX_CHARS - 1].rstrip() + "…"
+    return digest
+
+
+def cached_player_digest(player_id: int, default: Any = None) -> Optional[str]:
+    """
+    Retorna o digest em cache se ele ainda corresponde à versão de estado atual, ou `default`
+    se não há entrada válida. Jogador inexistente fica em cache como None, então `default`
+    distingue "não está em cache" de "jogador não existe". Não acessa o banco de dados.
+    """
+    with _lock:
+        version = (_global_version, _player_versions.get(player_id, 0))
+        entry = _digest_cache.get(player_id)
+    if entry and entry[0] == version:
+        return entry[1]
+    return default
+
+
+def get_player_digest(db: Session, player_id: int) -> Optional[str]:
+    """
+    Retorna o digest do jogador, reconstruindo-o apenas se a versão de estado mudou.
+
+    Args:
+        db (Session): Sessão do banco de dados
+        player_id (int): ID do jogador
+
+    Returns:
+        Optional[str]: Texto do digest ou None se o jogador não existir
+    """
+    version = get_state_version(player_id)
+    with _lock:
+        entry = _digest_cache.get(player_id)
+    if entry and entry[0] == version:
+        return entry[1]
+
+    digest = build_player_digest(db, player_id)
+    with _lock:
+        # Guarda com a versão lida antes da construção: se houve escrita no meio,
+        # a próxima chamada reconstrói.
+        _digest_cache[player_id] = (version, digest)
+    logger.debug(f"Digest do jogador {player_id} reconstruído (versão {version})")
+    return digest
+
+
+def load_player_digest(session_factory: Callable[[], Session], player_id: int) -> Optional[str]:
+    """`get_player_digest` em uma sessão própria, aberta só para esta chamada."""
+    with session_factory() as db:
+        return get_player_digest(db, player_id)
@@ -0,0 +1,388 @@
+"""
+Motor de compras atômico e idempotente.
+
+Uma compra é uma única transação:
+1. preço do item (1 SELECT);
+2. débito condicional `UPDATE players SET balance = balance - :p WHERE id = :id AND balance >= :p`
+   com RETURNING do novo saldo: duas compras concorrentes nunca gastam o mesmo saldo;
+3. INSERT da compra e do lançamento no livro-razão (`ledger_entries`);
+4. um único COMMIT.
+
+Os preços vêm do cache do catálogo (services.catalog_cache) quando ele está válido; só
+caem no SELECT quando o cache foi invalidado ou expirou.
+
+Com uma chave de idempotência (header `Idempotency-Key`), a repetição da mesma requisição
+devolve a compra já registrada em vez de debitar de novo.
+
+O checkout de carrinho segue o mesmo roteiro para N itens: preços com um único SELECT ... IN,
+um débito do total, INSERTs em lote das compras, dos itens concedidos ao jogador e dos
+lançamentos, e um COMMIT.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.item import Item
+from ..models.ledger_entry import LedgerEntry
+from ..models.player import Player
+from ..models.purchase import Purchase
+from ..models.shop_item import ShopItem
+from ..schemas.purchase import CartCheckout, PurchaseCreate
+from . import catalog_cache
+from .player_digest import bump_player_state_version
+
+logger = logging.getLogger(__name__)
+
+LEDGER_KIND_PURCHASE = "purchase"
+LEDGER_KIND_CHECKOUT = "checkout"
+# Limite de linhas (e de unidades por linha) de um carrinho
+MAX_CART_LINES = 50
+MAX_LINE_QUANTITY = 100
+
+
+def debit_statement(player_id: int, amount: float):
+    """UPDATE condicional que só debita se houver saldo; retorna o saldo resultante."""
+    return (
+        update(Player)
+        .where(Player.id == player_id, Player.balance >= amount)
+        .values(balance=Player.balance - amount)
+        .returning(Player.balance)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _price_statement(shop_item_id: int):
+    return select(ShopItem.price).where(ShopItem.id == shop_item_id)
+
+
+def _existing_purchase_statement(player_id: int, idempotency_key: str):
+    return select(Purchase).where(
+        Purchase.player_id == player_id, Purchase.idempotency_key == idempotency_key
+    )
+
+
+def _check_replay(existing: Purchase, purchase: PurchaseCreate) -> Purchase:
+    if existing.shop_item_id != purchase.shop_item_id or existing.quantity != purchase.quantity:
+        raise ValueError("Chave de idempotência já usada em outra compra")
+    logger.info("Compra %s repetida com a mesma chave de idempotência", existing.id)
+    return existing
+
+
+def _validate(purchase: PurchaseCreate) -> None:
+    if purchase.quantity is None or purchase.quantity < 1:
+        raise ValueError("Quantidade inválida")
+
+
+def _new_purchase(purchase: PurchaseCreate, total_price: float, idempotency_key: Optional[str]) -> Purchase:
+    return Purchase(
+        player_id=purchase.player_id,
+        shop_item_id=purchase.shop_item_id,
+        quantity=purchase.quantity,
+        total_price=total_price,
+        idempotency_key=idempotency_key,
+    )
+
+
+def ledger_entry(player_id: int, amount: float, balance_after: float, purchase_id: int,
+                 kind: str = LEDGER_KIND_PURCHASE) -> LedgerEntry:
+    return LedgerEntry(
+        player_id=player_id,
+        amount=amount,
+        balance_after=balance_after,
+        kind=kind,
+        reference_type="purchase",
+        reference_id=purchase_id,
+    )
+
+
+def execute_purchase(db: Session, purchase: PurchaseCreate, idempotency_key: Optional[str] = None) -> Purchase:
+    """
+    Executa uma compra em uma única transação (versão síncrona).
+
+    Raises:
+        ValueError: jogador/item inexistente, saldo insuficiente, quantidade inválida ou
+            chave de idempotência reutilizada em outra compra
+    """
+    _validate(purchase)
+    if idempotency_key:
+        existing = db.execute(_existing_purchase_statement(purchase.player_id, idempotency_key)).scalars().first()
+        if existing:
+            return _check_replay(existing, purchase)
+
+    cached = catalog_cache.shop_item(purchase.shop_item_id)
+    price = cached["price"] if cached else db.execute(_price_statement(purchase.shop_item_id)).scalar()
+    if price is None:
+        raise ValueError("Jogador ou item não encontrado")
+    total_price = price * purchase.quantity
+
+    try:
+        balance_after = db.execute(debit_statement(purchase.player_id, total_price)).scalar()
+        if balance_after is None:
+            db.rollback()
+            if db.get(Player, purchase.player_id) is None:
+                raise ValueError("Jogador ou item não encontrado")
+            raise ValueError("Saldo insuficiente")
+        db_purchase = _new_purchase(purchase, total_price, idempotency_key)
+        db.add(db_purchase)
+        db.flush()
+        db.add(ledger_entry(purchase.player_id, -total_price, balance_after, db_purchase.id))
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        # Outra requisição com a mesma chave venceu a corrida: devolve a compra dela
+        if idempotency_key:
+            existing = db.execute(_existing_purchase_statement(purchase.player_id, idempotency_key)).scalars().first()
+            if existing:
+                return _check_replay(existing, purchase)
+        raise
+
+    db.refresh(db_purchase)
+    bump_player_state_version(purchase.player_id)
+    return db_purchase
+
+
+async def execute_purchase_async(db: AsyncSession, purchase: PurchaseCreate,
+                                 idempotency_key: Optional[str] = None) -> Purchase:
+    """Executa uma compra em uma única transação (versão assíncrona). Ver `execute_purchase`."""
+    _validate(purchase)
+    if idempotency_key:
+        existing = (await db.execute(_existing_purchase_statement(purchase.player_id, idempotency_key))).scalars().first()
+        if existing:
+            return _check_replay(existing, purchase)
+
+    cached = catalog_cache.shop_item(purchase.shop_item_id)
+    price = cached["price"] if cached else (await db.execute(_price_statement(purchase.shop_item_id))).scalar()
+    if price is None:
+        raise ValueError("Jogador ou item não encontrado")
+    total_price = price * purchase.quantity
+
+    try:
+        balance_after = (await db.execute(debit_statement(purchase.player_id, total_price))).scalar()
+        if balance_after is None:
+            await db.rollback()
+            if await db.get(Player, purchase.player_id) is None:
+                raise ValueError("Jogador ou item não encontrado")
+            raise ValueError("Saldo insuficiente")
+        db_purchase = _new_purchase(purchase, total_price, idempotency_key)
+        db.add(db_purchase)
+        await db.flush()
+        db.add(ledger_entry(purchase.player_id, -total_price, balance_after, db_purchase.id))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        if idempotency_key:
+            existing = (await db.execute(_existing_purchase_statement(purchase.player_id, idempotency_key))).scalars().first()
+            if existing:
+                return _check_replay(existing, purchase)
+        raise
+
+    await db.refresh(db_purchase)
+    bump_player_state_version(purchase.player_id)
+    return db_purchase
+
+
+# --- Checkout de carrinho ---------------------------------------------------------------
+
+def _validate_cart(cart: CartCheckout) -> None:
+    if not cart.items:
+        raise ValueError("Carrinho vazio")
+    if len(cart.items) > MAX_CART_LINES:
+        raise ValueError(f"Carrinho com mais de {MAX_CART_LINES} itens")
+    for line in cart.items:
+        if line.quantity is None or not 1 <= line.quantity <= MAX_LINE_QUANTITY:
+            raise ValueError("Quantidade inválida")
+
+
+def _cart_keys(idempotency_key: str, lines: int) -> List[str]:
+    """Chave de cada linha do carrinho: a primeira usa a chave original, as demais `chave#i`."""
+    return [idempotency_key] + [f"{idempotency_key}#{i}" for i in range(1, lines)]
+
+
+def _existing_checkout_statement(player_id: int, keys: List[str]):
+    return select(Purchase).where(Purchase.player_id == player_id, Purchase.idempotency_key.in_(keys))
+
+
+def _check_checkout_replay(existing: List[Purchase], cart: CartCheckout, keys: List[str]) -> List[Purchase]:
+    by_key = {p.idempotency_key: p for p in existing}
+    ordered = [by_key.get(key) for key in keys]
+    if any(
+        p is None or p.shop_item_id != line.shop_item_id or p.quantity != line.quantity
+        for p, line in zip(ordered, cart.items)
+    ):
+        raise ValueError("Chave de idempotência já usada em outra compra")
+    return ordered
+
+
+def _cart_prices_statement(cart: CartCheckout):
+    ids = {line.shop_item_id for line in cart.items}
+    return select(ShopItem.id, ShopItem.name, ShopItem.description, ShopItem.price).where(ShopItem.id.in_(ids))
+
+
+def _price_cart(cart: CartCheckout, catalogue: Dict[int, dict]) -> Tuple[Dict[int, dict], List[float], float]:
+    missing = {line.shop_item_id for line in cart.items} - catalogue.keys()
+    if missing:
+        raise ValueError(f"Itens não encontrados: {sorted(missing)}")
+    line_totals = [catalogue[line.shop_item_id]["price"] * line.quantity for line in cart.items]
+    return catalogue, line_totals, sum(line_totals)
+
+
+def _purchase_values(cart: CartCheckout, line_totals: List[float], keys: Optional[List[str]]) -> List[dict]:
+    return [
+        {
+            "player_id": cart.player_id,
+            "shop_item_id": line.shop_item_id,
+            "quantity": line.quantity,
+            "total_price": line_total,
+            "idempotency_key": keys[i] if keys else None,
+        }
+        for i, (line, line_total) in enumerate(zip(cart.items, line_totals))
+    ]
+
+
+def _in_cart_order(purchases: List[Purchase]) -> List[Purchase]:
+    """Os IDs de um INSERT em lote crescem na ordem das linhas; RETURNING não garante a ordem."""
+    return sorted(purchases, key=lambda p: p.id)
+
+
+def _granted_item_values(cart: CartCheckout, catalogue: Dict[int, dict]) -> List[dict]:
+    """Uma linha em `items` (inventário do jogador) por unidade comprada."""
+    return [
+        {
+            "player_id": cart.player_id,
+            "name": catalogue[line.shop_item_id]["name"],
+            "description": catalogue[line.shop_item_id]["description"],
+        }
+        for line in cart.items
+        for _ in range(line.quantity)
+    ]
+
+
+def _ledger_values(player_id: int, purchases: List[Purchase], balance_after: float, total: float) -> List[dict]:
+    """Lançamentos por linha, com o saldo corrente após cada uma."""
+    running = balance_after + total
+    values = []
+    for purchase in purchases:
+        running -= purchase.total_price
+        values.append({
+            "player_id": player_id,
+            "amount": -purchase.total_price,
+            "balance_after": running,
+            "kind": LEDGER_KIND_CHECKOUT,
+            "reference_type": "purchase",
+            "reference_id": purchase.id,
+        })
+    return values
+
+
+def _checkout_result(cart: CartCheckout, purchases: List[Purchase], balance: float) -> Dict[str, Any]:
+    return {
+        "player_id": cart.player_id,
+        "total_price": sum(p.total_price for p in purchases),
+        "balance": balance,
+        "purchases": purchases,
+    }
+
+
+def _replay_result(cart: CartCheckout, purchases: List[Purchase], player: Optional[Player]) -> Dict[str, Any]:
+    # Jogador removido depois da compra original
+    if player is None:
+        raise ValueError("Jogador ou item não encontrado")
+    return _checkout_result(cart, purchases, player.balance)
+
+
+def execute_checkout(db: Session, cart: CartCheckout, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compra todos os itens do carrinho em uma única transação (versão síncrona).
+
+    Returns:
+        Dict com player_id, total_price, balance (saldo final) e purchases
+
+    Raises:
+        ValueError: carrinho inválido, jogador/itens inexistentes, saldo insuficiente ou
+            chave de idempotência reutilizada em outro carrinho
+    """
+    _validate_cart(cart)
+    keys = _cart_keys(idempotency_key, len(cart.items)) if idempotency_key else None
+    if keys:
+        existing = db.execute(_existing_checkout_statement(cart.player_id, keys)).scalars().all()
+        if existing:
+            purchases = _check_checkout_replay(existing, cart, keys)
+            return _replay_result(cart, purchases, db.get(Player, cart.player_id))
+
+    catalogue = catalog_cache.shop_items([line.shop_item_id for line in cart.items])
+    if catalogue is None:
+        catalogue = {row.id: row._asdict() for row in db.execute(_cart_prices_statement(cart))}
+    catalogue, line_totals, total = _price_cart(cart, catalogue)
+
+    try:
+        balance_after = db.execute(debit_statement(cart.player_id, total)).scalar()
+        if balance_after is None:
+            db.rollback()
+            if db.get(Player, cart.player_id) is None:
+                raise ValueError("Jogador ou item não encontrado")
+            raise ValueError("Saldo insuficiente")
+        purchases = _in_cart_order(db.scalars(
+            insert(Purchase).returning(Purchase), _purchase_values(cart, line_totals, keys)
+        ).all())
+        db.execute(insert(Item.__table__), _granted_item_values(cart, catalogue))
+        db.execute(insert(LedgerEntry.__table__), _ledger_values(cart.player_id, purchases, balance_after, total))
+        result = _checkout_result(cart, purchases, balance_after)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        if keys:
+            existing = db.execute(_existing_checkout_statement(cart.player_id, keys)).scalars().all()
+            if existing:
+                purchases = _check_checkout_replay(existing, cart, keys)
+                return _replay_result(cart, purchases, db.get(Player, cart.player_id))
+        raise
+
+    bump_player_state_version(cart.player_id)
+    return result
+
+
+async def execute_checkout_async(db: AsyncSession, cart: CartCheckout,
+                                 idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    """Compra todos os itens do carrinho em uma única transação (versão assíncrona). Ver `execute_checkout`."""
+    _validate_cart(cart)
+    keys = _cart_keys(idempotency_key, len(cart.items)) if idempotency_key else None
+    if keys:
+        existing = (await db.execute(_existing_checkout_statement(cart.player_id, keys))).scalars().all()
+        if existing:
+            purchases = _check_checkout_replay(existing, cart, keys)
+            return _replay_result(cart, purchases, await db.get(Player, cart.player_id))
+
+    catalogue = catalog_cache.shop_items([line.shop_item_id for line in cart.items])
+    if catalogue is None:
+        catalogue = {row.id: row._asdict() for row in await db.execute(_cart_prices_statement(cart))}
+    catalogue, line_totals, total = _price_cart(cart, catalogue)
+
+    try:
+        balance_after = (await db.execute(debit_statement(cart.player_id, total))).scalar()
+        if balance_after is None:
+            await db.rollback()
+            if await db.get(Player, cart.player_id) is None:
+                raise ValueError("Jogador ou item não encontrado")
+            raise ValueError("Saldo insuficiente")
+        purchases = _in_cart_order((await db.scalars(
+            insert(Purchase).returning(Purchase), _purchase_values(cart, line_totals, keys)
+        )).all())
+        await db.execute(insert(Item.__table__), _granted_item_values(cart, catalogue))
+        await db.execute(insert(LedgerEntry.__table__), _ledger_values(cart.player_id, purchases, balance_after, total))
+        result = _checkout_result(cart, purchases, balance_after)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        if keys:
+            existing = (await db.execute(_existing_checkout_statement(cart.player_id, keys))).scalars().all()
+            if existing:
+                purchases = _check_checkout_replay(existing, cart, keys)
+                return _replay_result(cart, purchases, await db.get(Player, cart.player_id))
+        raise
+
+    bump_player_state_version(cart.player_id)
+    return result
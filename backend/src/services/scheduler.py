@@ -1,29 +1,60 @@
 import logging
+import os
 from apscheduler.schedulers.background import BackgroundScheduler
 from .plant_lifecycle import tick_day
 from .soil_deterioration import apply_daily_deterioration
 from .climate_effects import process_random_climate_event
 from .seasonality import check_and_update_season
+from .player_digest import bump_global_state_version
+from .soil_series import record_snapshot, rollup
+from .history_archive import archive_history
+from .tool_effects import tool_table
 
 logger = logging.getLogger(__name__)
 
+# Intervalo de gravação do desgaste acumulado das ferramentas
+TOOL_WEAR_FLUSH_SECONDS = int(os.getenv("TOOL_WEAR_FLUSH_SECONDS", "60"))
+
 # Scheduler de tarefas em background
 scheduler = BackgroundScheduler()
+_session_factory = None
+
+
+def flush_tool_wear(SessionLocal) -> None:
+    db = SessionLocal()
+    try:
+        tool_table.flush_wear(db)
+    except Exception as e:
+        logger.error(f"Erro ao gravar desgaste das ferramentas: {e}")
+    finally:
+        db.close()
 
 
 def start_scheduler(SessionLocal):
     """
     Inicia o scheduler e agenda as tarefas periódicas, injetando SessionLocal.
     """
+    global _session_factory
     # Só inicia se o scheduler não estiver rodando
     if scheduler.state == 0:  # STATE_STOPPED = 0
+        _session_factory = SessionLocal
+
+        def snapshot_soil(db):
+            # Registra a série do solo após cada tick que altera os parâmetros
+            try:
+                record_snapshot(db)
+            except Exception as e:
+                logger.error(f"Erro ao registrar série do solo: {e}")
+
         # 1. Job para ciclo diário das plantas
         def tick_day_job():
             db = SessionLocal()
             try:
                 tick_day(db)
+                snapshot_soil(db)
             finally:
                 db.close()
+                bump_global_state_version()
         
         # 2. Job para deterioração natural do solo
         def soil_deterioration_job():
@@ -31,10 +62,12 @@ def start_scheduler(SessionLocal):
             try:
                 apply_daily_deterioration(db)
                 logger.info("Deterioração diária do solo aplicada")
+                snapshot_soil(db)
             except Exception as e:
                 logger.error(f"Erro ao aplicar deterioração do solo: {e}")
             finally:
                 db.close()
+                bump_global_state_version()
         
         # 3. Job para eventos climáticos aleatórios
         def climate_event_job():
@@ -43,10 +76,12 @@ def start_scheduler(SessionLocal):
                 event_name, counters = process_random_climate_event(db)
                 if event_name:
                     logger.info(f"Evento climático '{event_name}' processado. Atualizados: {counters['terrains_updated']} terrenos, {counters['quadrants_updated']} quadrantes")
+                    snapshot_soil(db)
             except Exception as e:
                 logger.error(f"Erro ao processar evento climático: {e}")
             finally:
                 db.close()
+                bump_global_state_version()
                 
         # 4. Job para verificar mudança de estação
         def check_season_job():
@@ -60,6 +95,26 @@ def start_scheduler(SessionLocal):
             finally:
                 db.close()
         
+        # 5. Job para consolidar a série do solo (horas -> dias -> semanas)
+        def soil_series_rollup_job():
+            db = SessionLocal()
+            try:
+                rollup(db)
+            except Exception as e:
+                logger.error(f"Erro ao consolidar série do solo: {e}")
+            finally:
+                db.close()
+
+        # 6. Job para arquivar o histórico antigo de ações e logs de estado
+        def history_archive_job():
+            db = SessionLocal()
+            try:
+                archive_history(db)
+            except Exception as e:
+                logger.error(f"Erro ao arquivar histórico: {e}")
+            finally:
+                db.close()
+
         # Adicionar jobs ao scheduler
         # 1. Ciclo de plantas - a cada 6 horas
         scheduler.add_job(
@@ -101,16 +156,47 @@ def start_scheduler(SessionLocal):
             replace_existing=True,
         )
         
+        # 5. Consolidação da série do solo - a cada hora
+        scheduler.add_job(
+            soil_series_rollup_job,
+            'cron',
+            minute=5,
+            id='soil_series_rollup',
+            replace_existing=True,
+        )
+        
+        # 6. Arquivamento do histórico - uma vez por dia às 03:30
+        scheduler.add_job(
+            history_archive_job,
+            'cron',
+            hour=3,
+            minute=30,
+            id='history_archive',
+            replace_existing=True,
+        )
+        
+        # 7. Desgaste acumulado das ferramentas - a cada TOOL_WEAR_FLUSH_SECONDS
+        scheduler.add_job(
+            flush_tool_wear,
+            'interval',
+            seconds=TOOL_WEAR_FLUSH_SECONDS,
+            args=[SessionLocal],
+            id='tool_wear_flush',
+            replace_existing=True,
+        )
+
         # Iniciar o scheduler
         scheduler.start()
-        logger.info("Scheduler iniciado com jobs: 'plant_tick', 'soil_deterioration', 'climate_events', 'season_check'")
+        logger.info("Scheduler iniciado com jobs: 'plant_tick', 'soil_deterioration', 'climate_events', 'season_check', 'soil_series_rollup', 'history_archive', 'tool_wear_flush'")
     else:
         logger.info("Scheduler já está rodando, ignorando chamada para start_scheduler")
 
 
 def shutdown_scheduler():
     """
-    Encerra o scheduler de forma graciosa.
+    Encerra o scheduler de forma graciosa, gravando o desgaste ainda pendente.
     """
     scheduler.shutdown()
+    if _session_factory is not None:
+        flush_tool_wear(_session_factory)
     logger.info("Scheduler encerrado.")
@@ -11,13 +11,21 @@ from sqlalchemy import func
 
 from ..models.season import Season, SeasonType
 from ..schemas.season import SeasonCreate
-from ..services.soil_constants import DAILY_DETERIORATION_FACTORS
+from . import current_season as season_cache
 
 logger = logging.getLogger(__name__)
 
 # Duração padrão de cada estação em dias
 SEASON_DURATION_DAYS = 28  # Aproximadamente um mês por estação
 
+# Ordem do ciclo sazonal
+SEASONS_CYCLE = [
+    SeasonType.VERAO,
+    SeasonType.OUTONO,
+    SeasonType.INVERNO,
+    SeasonType.PRIMAVERA
+]
+
 # Configuração padrão das estações
 SEASON_CONFIGS = {
     SeasonType.VERAO: {
@@ -123,6 +131,8 @@ def create_new_season(db: Session, season_type: SeasonType) -> Season:
     db.add(db_season)
     db.commit()
     db.refresh(db_season)
+    # A transição atualiza a estação em memória (e os limiares de crescimento derivados dela)
+    season_cache.set_current(db_season)
     
     logger.info(f"Nova estação criada: {season_type}")
     return db_season
@@ -137,17 +147,10 @@ def get_next_season_type(current_season_type: SeasonType) -> SeasonType:
     Returns:
         SeasonType: A próxima estação no ciclo
     """
-    seasons_cycle = [
-        SeasonType.VERAO,
-        SeasonType.OUTONO,
-        SeasonType.INVERNO,
-        SeasonType.PRIMAVERA
-    ]
-    
-    current_index = seasons_cycle.index(current_season_type)
-    next_index = (current_index + 1) % len(seasons_cycle)
+    current_index = SEASONS_CYCLE.index(current_season_type)
+    next_index = (current_index + 1) % len(SEASONS_CYCLE)
     
-    return seasons_cycle[next_index]
+    return SEASONS_CYCLE[next_index]
 
 def check_and_update_season(db: Session) -> Optional[Season]:
     """
@@ -159,7 +162,7 @@ def check_and_update_season(db: Session) -> Optional[Season]:
     Returns:
         Optional[Season]: A nova estação se houve mudança, ou None se não houve
     """
-    current_season = get_current_season(db)
+    current_season = season_cache.current_season(db)
     
     # Se não houver estação, criar verão como estação inicial
     if not current_season:
@@ -179,24 +182,15 @@ def get_season_adjusted_deterioration_factors(db: Session) -> Dict[str, float]:
     """
     Obtém os fatores de deterioração ajustados pela estação atual.
     
+    Os fatores são calculados uma vez por estação (services.current_season), sem consulta
+    a cada chamada.
+    
     Args:
         db (Session): Sessão do banco de dados
         
     Returns:
         Dict[str, float]: Fatores de deterioração ajustados
     """
-    current_season = get_current_season(db)
-    
-    # Se não houver estação, usar fatores padrão
-    if not current_season:
-        return DAILY_DETERIORATION_FACTORS.copy()
-    
-    # Aplicar os multiplicadores da estação aos fatores base
-    adjusted_factors = {}
-    
-    adjusted_factors["soil_moisture"] = DAILY_DETERIORATION_FACTORS["soil_moisture"] * current_season.soil_moisture_factor
-    adjusted_factors["organic_matter"] = DAILY_DETERIORATION_FACTORS["organic_matter"] * current_season.organic_matter_factor
-    adjusted_factors["biodiversity"] = DAILY_DETERIORATION_FACTORS["biodiversity"] * current_season.biodiversity_factor
-    
-    logger.debug(f"Fatores de deterioração ajustados pela estação {current_season.name}: {adjusted_factors}")
+    adjusted_factors = season_cache.deterioration_factors(db)
+    logger.debug(f"Fatores de deterioração ajustados pela estação atual: {adjusted_factors}")
     return adjusted_factors
@@ -0,0 +1,715 @@
+"""
+Núcleo de simulação do jogo: regras em memória, determinísticas, sem ORM.
+
+O estado fica em colunas compactas (`array`) por entidade:
+- `Soil`: parâmetros do solo de terrenos (linhas de `terrain_parameters`) e de quadrantes,
+  uma coluna por parâmetro;
+- `Plantings`: estado, dias desde o plantio, dias sem rega, espécie e jogador de cada plantio;
+- `SpeciesTable`: tolerância à seca e dias (escalados) de germinação e maturação por espécie.
+
+As regras são as mesmas dos jobs do scheduler, que passam a ser adaptadores finos
+(carregar -> aplicar o evento -> gravar a diferença, ver services.simulation_io):
+- `deteriorate`: deterioração diária do solo ajustada pela estação, com propagação para os
+  quadrantes vizinhos (services.soil_deterioration);
+- `apply_climate`: efeitos de uma condição climática (services.climate_effects);
+- `tick`: dias, rega, morte por seca e transições de estado (services.plant_lifecycle), com os
+  limiares ajustados pela estação;
+- `apply_inputs`: efeitos de insumos pela tabela compilada (services.effect_table), como no lote
+  de services.input_batch;
+- `advance_season`: transição de estação (services.seasonality).
+
+`step(days)` roda dias inteiros na ordem de `SimulationRules.day_schedule` (a mesma agenda do
+scheduler), com eventos climáticos e regas sorteados pelo `random.Random(seed)` do mundo: a
+mesma semente e o mesmo estado inicial produzem sempre o mesmo resultado. `copy()` duplica o
+mundo para previsões e experimentos sem tocar no original.
+"""
+import math
+import random
+from array import array
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+# Estados do plantio (mesma ordem do enum plant_state)
+STATES = ("SEMENTE", "MUDINHA", "MADURA", "COLHIVEL", "COLHIDA", "MORTA")
+SEMENTE, MUDINHA, MADURA, COLHIVEL, COLHIDA, MORTA = range(len(STATES))
+STATE_CODES = {name: code for code, name in enumerate(STATES)}
+FINISHED = frozenset({COLHIDA, MORTA})
+
+TERRAIN_COLUMNS = ("soil_moisture", "fertility", "coverage", "organic_matter", "compaction",
+                   "biodiversity", "soil_ph")
+QUADRANT_COLUMNS = ("soil_moisture", "fertility", "coverage", "organic_matter", "compaction",
+                    "biodiversity")
+# Colunas Integer nos modelos: arredondadas depois de cada regra que pode gerar frações
+INTEGER_COLUMNS = frozenset({"fertility", "organic_matter", "compaction", "biodiversity"})
+
+# Parâmetro do solo -> fator da estação que multiplica sua deterioração diária
+DETERIORATION_FACTORS = {
+    "soil_moisture": "soil_moisture_factor",
+    "organic_matter": "organic_matter_factor",
+    "biodiversity": "biodiversity_factor",
+}
+SEASON_FACTORS = ("soil_moisture_factor", "organic_matter_factor", "biodiversity_factor",
+                  "fertility_factor", "germination_factor", "maturation_factor")
+
+# Atributos do plantio que um insumo pode zerar (plant_resets de input_effects.yml)
+PLANTING_RESETS = ("days_sem_rega", "days_since_planting")
+
+# Agenda de um dia do scheduler: estação e deterioração à meia-noite, tick das plantas a cada
+# 6h e eventos climáticos às 6h e às 18h
+DAY_SCHEDULE = ("season", "deterioration", "tick", "climate", "tick", "tick", "climate", "tick")
+
+
+class SimulationRules:
+    """
+    Parâmetros das regras. `default_rules()` lê as constantes dos módulos do jogo; `replace`
+    gera uma cópia com alguns valores trocados (experimentos de balanceamento).
+    """
+
+    __slots__ = ("deterioration", "min_values", "seasons", "season_duration_days", "climate_conditions",
+                 "climate_event_probability", "propagation_factor", "tolerance_limits", "day_schedule")
+
+    def __init__(self, deterioration: Mapping[str, float], min_values: Mapping[str, float],
+                 seasons: Sequence[Tuple[str, Mapping[str, float]]], season_duration_days: int,
+                 climate_conditions: Mapping[str, dict], climate_event_probability: float,
+                 propagation_factor: float, tolerance_limits: Mapping[str, int],
+                 day_schedule: Sequence[str] = DAY_SCHEDULE):
+        self.deterioration = dict(deterioration)
+        self.min_values = dict(min_values)
+        self.seasons = tuple((name, dict(config)) for name, config in seasons)
+        self.season_duration_days = season_duration_days
+        self.climate_conditions = dict(climate_conditions)
+        self.climate_event_probability = climate_event_probability
+        self.propagation_factor = propagation_factor
+        self.tolerance_limits = dict(tolerance_limits)
+        self.day_schedule = tuple(day_schedule)
+
+    def replace(self, **changes) -> "SimulationRules":
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return SimulationRules(**values)
+
+    def season_index(self, name: Optional[str]) -> Optional[int]:
+        for i, (season_name, _) in enumerate(self.seasons):
+            if season_name == name:
+                return i
+        return None
+
+
+def default_rules() -> SimulationRules:
+    """Regras com as constantes atuais dos módulos do jogo."""
+    from .climate_effects import CLIMATE_CONDITIONS, CLIMATE_EVENT_PROBABILITY
+    from .plant_lifecycle import TOLERANCE_LIMITS
+    from .quadrant_neighbors import PROPAGATION_FACTOR
+    from .seasonality import SEASON_CONFIGS, SEASON_DURATION_DAYS, SEASONS_CYCLE
+    from .soil_constants import DAILY_DETERIORATION_FACTORS, MIN_VALUES
+
+    return SimulationRules(
+        deterioration=DAILY_DETERIORATION_FACTORS,
+        min_values=MIN_VALUES,
+        seasons=[(season.value, SEASON_CONFIGS[season]) for season in SEASONS_CYCLE],
+        season_duration_days=SEASON_DURATION_DAYS,
+        climate_conditions=CLIMATE_CONDITIONS,
+        climate_event_probability=CLIMATE_EVENT_PROBABILITY,
+        propagation_factor=PROPAGATION_FACTOR,
+        tolerance_limits=TOLERANCE_LIMITS,
+    )
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Percentil `q` (0-100) com interpolação linear; 0.0 para uma sequência vazia."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def draw_climate_event(rng, conditions: Mapping[str, dict], event_probability: float) -> Optional[str]:
+    """Sorteia a condição climática de um ciclo (None quando nenhum evento ocorre)."""
+    if rng.random() >= event_probability:
+        return None
+    events = list(conditions)
+    weights = [conditions[event]["probability"] for event in events]
+    return rng.choices(events, weights=weights, k=1)[0]
+
+
+def expected_climate_changes(conditions: Mapping[str, dict], event_probability: float) -> Dict[str, float]:
+    """Variação esperada de cada parâmetro em um ciclo climático (média ponderada dos eventos)."""
+    total = sum(condition["probability"] for condition in conditions.values())
+    expected: Dict[str, float] = {}
+    for condition in conditions.values():
+        weight = event_probability * condition["probability"] / total
+        for param, effect in condition["effects"].items():
+            sign = 1 if effect["type"] == "increase" else -1
+            expected[param] = expected.get(param, 0.0) + weight * sign * effect["change"]
+    return expected
+
+
+class Soil:
+    """Parâmetros do solo de N entidades, uma coluna `array('d')` por parâmetro."""
+
+    __slots__ = ("columns", "ids", "owners", "values", "index")
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = tuple(columns)
+        self.ids = array("q")
+        # Terreno dono de cada linha (terrain_id)
+        self.owners = array("q")
+        self.values: Dict[str, array] = {column: array("d") for column in self.columns}
+        self.index: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, entity_id: int, owner_id: int, row: Mapping[str, Optional[float]]) -> int:
+        i = len(self.ids)
+        self.ids.append(entity_id)
+        self.owners.append(owner_id)
+        for column in self.columns:
+            value = row.get(column)
+            self.values[column].append(float(value) if value is not None else 0.0)
+        self.index[entity_id] = i
+        return i
+
+    def row(self, i: int) -> Dict[str, float]:
+        return {column: self.values[column][i] for column in self.columns}
+
+    def round_integers(self, rows: Iterable[int]) -> None:
+        for column in INTEGER_COLUMNS.intersection(self.columns):
+            values = self.values[column]
+            for i in rows:
+                values[i] = float(round(values[i]))
+
+    def copy(self) -> "Soil":
+        other = Soil(self.columns)
+        other.ids = array("q", self.ids)
+        other.owners = array("q", self.owners)
+        other.values = {column: array("d", values) for column, values in self.values.items()}
+        other.index = dict(self.index)
+        return other
+
+
+class Plantings:
+    """Plantios em colunas compactas."""
+
+    __slots__ = ("ids", "players", "quadrants", "species", "state", "days", "dry", "index")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.players = array("q")
+        self.quadrants = array("q")
+        self.species = array("i")
+        self.state = array("b")
+        self.days = array("i")
+        self.dry = array("i")
+        self.index: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, planting_id: int, player_id: int, quadrant_id: int, species: int, state: str,
+            days_since_planting: int = 0, days_sem_rega: int = 0) -> int:
+        i = len(self.ids)
+        self.ids.append(planting_id)
+        self.players.append(player_id)
+        self.quadrants.append(quadrant_id)
+        self.species.append(species)
+        self.state.append(STATE_CODES[state])
+        self.days.append(days_since_planting or 0)
+        self.dry.append(days_sem_rega or 0)
+        self.index[planting_id] = i
+        return i
+
+    def copy(self) -> "Plantings":
+        other = Plantings()
+        for name in ("ids", "players", "quadrants", "species", "state", "days", "dry"):
+            setattr(other, name, array(getattr(self, name).typecode, getattr(self, name)))
+        other.index = dict(self.index)
+        return other
+
+
+class SpeciesTable:
+    """Espécies por índice: limite de dias sem rega e dias (escalados) até germinar e amadurecer."""
+
+    __slots__ = ("keys", "index", "tolerance", "germination", "maturation")
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.tolerance = array("i")
+        # 0 = sem transição por dias
+        self.germination = array("d")
+        self.maturation = array("d")
+
+    def add(self, key: str, params: Mapping, tolerance_limits: Mapping[str, int]) -> int:
+        if key in self.index:
+            return self.index[key]
+        gd = params.get("germinacao_dias_scaled", params.get("germinacao_dias"))
+        md = params.get("maturidade_dias_scaled", params.get("maturidade_dias"))
+        self.index[key] = len(self.keys)
+        self.keys.append(key)
+        self.tolerance.append(tolerance_limits.get(params.get("tolerancia_seca"), 0))
+        self.germination.append(float(gd or 0))
+        self.maturation.append(float(md or 0))
+        return self.index[key]
+
+    def thresholds(self, germination_factor: float, maturation_factor: float) -> Tuple[array, array]:
+        return (array("d", (gd * germination_factor for gd in self.germination)),
+                array("d", (md * maturation_factor for md in self.maturation)))
+
+
+class SeasonState:
+    """Estação vigente: nome, posição no ciclo, dias decorridos e fatores."""
+
+    __slots__ = ("name", "index", "days_elapsed", "factors")
+
+    def __init__(self, name: Optional[str], index: Optional[int], days_elapsed: int, factors: Mapping[str, float]):
+        self.name = name
+        self.index = index
+        self.days_elapsed = days_elapsed
+        self.factors = {factor: float(factors[factor]) if factors.get(factor) is not None else 1.0
+                        for factor in SEASON_FACTORS}
+
+
+class World:
+    """
+    Estado completo de uma simulação e as regras que o fazem avançar.
+
+    Args:
+        rules: Regras (None usa `default_rules()`)
+        seed: Semente do gerador de clima e regas
+        species: Parâmetros das espécies (formato de species.yml, dias já escalados)
+    """
+
+    def __init__(self, rules: Optional[SimulationRules] = None, seed: Optional[int] = None,
+                 species: Optional[Mapping[str, Mapping]] = None):
+        self.rules = rules or default_rules()
+        self.rng = random.Random(seed)
+        self.terrains = Soil(TERRAIN_COLUMNS)
+        self.quadrants = Soil(QUADRANT_COLUMNS)
+        self.quadrant_labels: List[str] = []
+        self.plantings = Plantings()
+        self.species = SpeciesTable()
+        self._species_params: Dict[str, Mapping] = dict(species or {})
+        self.season = SeasonState(None, None, 0, {})
+        self.day = 0
+        # Chance de cada jogador regar em um dia (regas sorteadas por `step`)
+        self.water_probability: Dict[int, float] = {}
+        self.transitions: List[Tuple[int, int, int]] = []
+        self.climate_log: List[Tuple[int, str]] = []
+        self._neighbors: Optional[List[Tuple[int, ...]]] = None
+        self._thresholds: Optional[Tuple[Tuple[float, float], array, array]] = None
+
+    # Construção
+
+    def add_terrain(self, row_id: int, terrain_id: int, params: Mapping[str, Optional[float]]) -> int:
+        """Adiciona uma linha de `terrain_parameters` (id da linha e terreno dono)."""
+        return self.terrains.add(row_id, terrain_id, params)
+
+    def add_quadrant(self, quadrant_id: int, terrain_id: int, label: str, params: Mapping[str, Optional[float]]) -> int:
+        self._neighbors = None
+        self.quadrant_labels.append(label)
+        return self.quadrants.add(quadrant_id, terrain_id, params)
+
+    def add_planting(self, planting_id: int, player_id: int, quadrant_id: int, species_key: str,
+                     state: str = "SEMENTE", days_since_planting: int = 0, days_sem_rega: int = 0) -> int:
+        species = self.species.add(species_key, self._species_params.get(species_key, {}), self.rules.tolerance_limits)
+        self._thresholds = None
+        return self.plantings.add(planting_id, player_id, quadrant_id, species, state,
+                                  days_since_planting, days_sem_rega)
+
+    def set_season(self, name: Optional[str], factors: Optional[Mapping[str, float]] = None,
+                   days_elapsed: int = 0) -> None:
+        """Estação vigente; sem `factors`, usa os da configuração da estação nas regras."""
+        index = self.rules.season_index(name)
+        if factors is None:
+            factors = self.rules.seasons[index][1] if index is not None else {}
+        self.season = SeasonState(name, index, days_elapsed, factors)
+        self._thresholds = None
+
+    def neighbors(self) -> List[Tuple[int, ...]]:
+        """Índices dos quadrantes vizinhos de cada quadrante (mesmo terreno), calculados uma vez."""
+        if self._neighbors is None:
+            from .quadrant_neighbors import get_neighbor_coordinates, parse_quadrant_coordinates
+
+            labels = self.quadrant_labels
+            owners = self.quadrants.owners
+            by_label = {(owners[i], label): i for i, label in enumerate(labels)}
+            neighbors = []
+            for i, label in enumerate(labels):
+                coords = parse_quadrant_coordinates(label)
+                if coords is None:
+                    neighbors.append(())
+                    continue
+                keys = ((owners[i], f"{col}{row}") for col, row in get_neighbor_coordinates(*coords))
+                neighbors.append(tuple(by_label[key] for key in keys if key in by_label))
+            self._neighbors = neighbors
+        return self._neighbors
+
+    def copy(self, seed: Optional[int] = None) -> "World":
+        """Cópia independente do estado (novo gerador com `seed`, se informado)."""
+        other = World.__new__(World)
+        other.rules = self.rules
+        other.rng = random.Random(seed) if seed is not None else random.Random()
+        if seed is None:
+            other.rng.setstate(self.rng.getstate())
+        other.terrains = self.terrains.copy()
+        other.quadrants = self.quadrants.copy()
+        other.plantings = self.plantings.copy()
+        other.species = self.species
+        other._species_params = self._species_params
+        other.season = SeasonState(self.season.name, self.season.index, self.season.days_elapsed, self.season.factors)
+        other.day = self.day
+        other.water_probability = dict(self.water_probability)
+        other.transitions = []
+        other.climate_log = []
+        other.quadrant_labels = self.quadrant_labels
+        other._neighbors = self.neighbors()
+        other._thresholds = self._thresholds
+        return other
+
+    # Regras
+
+    def deterioration_factors(self) -> Dict[str, float]:
+        """Fatores de deterioração diária (%) ajustados pela estação."""
+        factors = dict(self.rules.deterioration)
+        if self.season.name is None:
+            return factors
+        for param, factor in DETERIORATION_FACTORS.items():
+            factors[param] = self.rules.deterioration[param] * self.season.factors[factor]
+        return factors
+
+    def deteriorate(self) -> Dict[str, int]:
+        """
+        Deterioração diária de terrenos e quadrantes, na ordem de inserção.
+
+        Cada quadrante deteriorado propaga para os vizinhos (PROPAGATION_FACTOR) a última
+        redução calculada nele, aplicada a umidade, matéria orgânica e biodiversidade, como em
+        services.soil_deterioration.
+        """
+        factors = self.deterioration_factors()
+        minimum = self.rules.min_values
+        counters = {"terrains_updated": 0, "quadrants_updated": 0, "propagation_updates": 0}
+        counters["terrains_updated"] = _deteriorate_rows(self.terrains, range(len(self.terrains)), factors, minimum)[0]
+
+        soil = self.quadrants
+        moisture = soil.values["soil_moisture"]
+        organic = soil.values["organic_matter"]
+        biodiversity = soil.values["biodiversity"]
+        neighbors = self.neighbors()
+        propagation = self.rules.propagation_factor
+        touched = set()
+        for i in range(len(soil)):
+            updated, decrease = _deteriorate_rows(soil, (i,), factors, minimum)
+            if not updated:
+                continue
+            counters["quadrants_updated"] += 1
+            delta = {"soil_moisture": -decrease, "organic_matter": -int(decrease), "biodiversity": -int(decrease)}
+            delta = {param: value for param, value in delta.items() if value != 0}
+            if not delta or not neighbors[i]:
+                continue
+            for n in neighbors[i]:
+                for param, value in delta.items():
+                    column = moisture if param == "soil_moisture" else organic if param == "organic_matter" else biodiversity
+                    column[n] = max(0.0, column[n] + value * propagation)
+                touched.add(n)
+            counters["propagation_updates"] += len(neighbors[i])
+        soil.round_integers(touched)
+        return counters
+
+    def apply_climate(self, condition_name: str) -> Dict[str, int]:
+        """Efeitos de uma condição climática em todos os terrenos e quadrantes."""
+        condition = self.rules.climate_conditions.get(condition_name)
+        if condition is None:
+            return {"terrains_updated": 0, "quadrants_updated": 0}
+        changes = {param: effect["change"] if effect["type"] == "increase" else -effect["change"]
+                   for param, effect in condition["effects"].items()}
+        return self._apply_changes(changes)
+
+    def apply_expected_climate(self) -> Dict[str, int]:
+        """Variação climática esperada de um ciclo (sem sorteio), para previsões em valor esperado."""
+        return self._apply_changes(expected_climate_changes(self.rules.climate_conditions,
+                                                            self.rules.climate_event_probability))
+
+    def _apply_changes(self, changes: Mapping[str, float]) -> Dict[str, int]:
+        counters = {}
+        for name, soil in (("terrains_updated", self.terrains), ("quadrants_updated", self.quadrants)):
+            applicable = [(soil.values[param], change) for param, change in changes.items() if param in soil.values]
+            for values, change in applicable:
+                if change >= 0:
+                    for i in range(len(values)):
+                        values[i] += change
+                else:
+                    for i in range(len(values)):
+                        value = values[i] + change
+                        values[i] = value if value > 0 else 0.0
+            counters[name] = len(soil) if applicable else 0
+        return counters
+
+    def draw_climate(self) -> Optional[str]:
+        return draw_climate_event(self.rng, self.rules.climate_conditions, self.rules.climate_event_probability)
+
+    def growth_thresholds(self) -> Tuple[array, array]:
+        """Dias até germinar e amadurecer por espécie, ajustados pela estação (em cache)."""
+        key = (self.season.factors["germination_factor"], self.season.factors["maturation_factor"])
+        if self._thresholds is None or self._thresholds[0] != key or len(self._thresholds[1]) != len(self.species.keys):
+            self._thresholds = (key, *self.species.thresholds(*key))
+        return self._thresholds[1], self._thresholds[2]
+
+    def tick(self, watered: Optional[Set[int]] = None) -> List[Tuple[int, int, int]]:
+        """
+        Um tick das plantas: +1 dia, rega dos jogadores em `watered`, morte por seca e
+        transições SEMENTE -> MUDINHA -> MADURA -> COLHIVEL.
+
+        Returns:
+            List[Tuple[int, int, int]]: Transições (id do plantio, estado anterior, novo estado)
+        """
+        watered = watered or ()
+        p = self.plantings
+        state, days, dry, players, species = p.state, p.days, p.dry, p.players, p.species
+        tolerance = self.species.tolerance
+        germination, maturation = self.growth_thresholds()
+        transitions = []
+        for i in range(len(p)):
+            current = state[i]
+            if current == COLHIDA or current == MORTA:
+                continue
+            d = days[i] + 1
+            days[i] = d
+            sp = species[i]
+            if players[i] in watered:
+                dry[i] = 0
+            else:
+                dry[i] += 1
+                if dry[i] > tolerance[sp]:
+                    state[i] = MORTA
+                    transitions.append((p.ids[i], current, MORTA))
+                    continue
+            new = current
+            if current == SEMENTE:
+                gd = germination[sp]
+                if gd and d >= gd:
+                    new = MUDINHA
+            elif current == MUDINHA:
+                md = maturation[sp]
+                if md and d >= md:
+                    new = MADURA
+            if new != current:
+                transitions.append((p.ids[i], current, new))
+            if new == MADURA:
+                transitions.append((p.ids[i], MADURA, COLHIVEL))
+                new = COLHIVEL
+            state[i] = new
+        self.transitions.extend(transitions)
+        return transitions
+
+    def advance_season(self) -> bool:
+        """Verificação diária de estação: transição depois de `season_duration_days`. True se mudou."""
+        seasons = self.rules.seasons
+        if not seasons:
+            return False
+        if self.season.name is None:
+            self.set_season(seasons[0][0])
+            return True
+        if self.season.days_elapsed < self.rules.season_duration_days:
+            return False
+        index = ((self.season.index if self.season.index is not None else -1) + 1) % len(seasons)
+        self.set_season(seasons[index][0])
+        return True
+
+    def apply_inputs(self, entries: Iterable[Tuple[int, str, float]], table=None) -> int:
+        """
+        Aplica insumos (id do plantio, tipo, quantidade) como o lote de services.input_batch:
+        soma por terreno com o limite aplicado uma vez, quadrante alvo espelhando o valor final
+        do terreno, propagação agregada para os vizinhos e os atributos zerados do plantio.
+
+        Returns:
+            int: Insumos com efeito
+        """
+        if table is None:
+            from .effect_table import effect_table
+            table = effect_table()
+        terrain_rows = {}
+        for i in range(len(self.terrains)):
+            terrain_rows.setdefault(self.terrains.owners[i], i)
+        initial: Dict[int, Dict[str, float]] = {}
+        totals: Dict[int, Dict[str, float]] = {}
+        quadrant_deltas: Dict[int, Dict[str, float]] = {}
+        applied = 0
+        for planting_id, input_type, quantity in entries:
+            i = self.plantings.index.get(planting_id)
+            t = table.row(input_type)
+            if i is None or t is None:
+                continue
+            q = self.quadrants.index.get(self.plantings.quadrants[i])
+            if q is None:
+                continue
+            terrain = terrain_rows.get(self.quadrants.owners[q])
+            if terrain is None:
+                continue
+            applied += 1
+            for attr in table.resets[t]:
+                if attr in PLANTING_RESETS:
+                    (self.plantings.dry if attr == "days_sem_rega" else self.plantings.days)[i] = 0
+            start = initial.setdefault(terrain, {})
+            total = totals.setdefault(terrain, {})
+            deltas = quadrant_deltas.setdefault(q, {})
+            for col in table.mask[t]:
+                param = table.params[col]
+                if param not in self.terrains.values:
+                    continue
+                change = table.base[t][col] + table.factor[t][col] * quantity
+                base = start.setdefault(param, self.terrains.values[param][terrain])
+                before = table.clamp(col, base + total.get(param, 0.0))
+                total[param] = total.get(param, 0.0) + change
+                after = table.clamp(col, base + total[param])
+                deltas[param] = deltas.get(param, 0.0) + after - before
+
+        final: Dict[int, Dict[str, float]] = {}
+        for terrain, param_totals in totals.items():
+            final[terrain] = {param: table.clamp_param(param, initial[terrain][param] + value)
+                              for param, value in param_totals.items()}
+            for param, value in final[terrain].items():
+                self.terrains.values[param][terrain] = value
+        self.terrains.round_integers(final)
+
+        owners = self.quadrants.owners
+        received: Dict[int, Dict[str, float]] = {}
+        neighbors = self.neighbors()
+        for q, deltas in quadrant_deltas.items():
+            terrain = terrain_rows[owners[q]]
+            for param in deltas:
+                if param in self.quadrants.values:
+                    self.quadrants.values[param][q] = final[terrain][param]
+            for n in neighbors[q]:
+                bucket = received.setdefault(n, {})
+                for param, delta in deltas.items():
+                    if delta:
+                        bucket[param] = bucket.get(param, 0.0) + delta
+        for n, deltas in received.items():
+            for param, value in deltas.items():
+                if param not in self.quadrants.values:
+                    continue
+                column = self.quadrants.values[param]
+                propagated = column[n] + value * self.rules.propagation_factor
+                column[n] = propagated if value >= 0 else max(0.0, propagated)
+        self.quadrants.round_integers(set(quadrant_deltas) | set(received))
+        return applied
+
+    def _watering(self) -> Set[int]:
+        rng = self.rng
+        return {player for player, chance in self.water_probability.items() if chance and rng.random() < chance}
+
+    def step(self, days: int = 1, climate: str = "random",
+             on_day: Optional[Callable[["World", Set[int]], None]] = None) -> None:
+        """
+        Avança `days` dias seguindo `rules.day_schedule`.
+
+        Args:
+            climate: "random" sorteia os eventos; "expected" aplica a variação esperada; "none"
+                desliga o clima
+            on_day: Chamado no início de cada dia com o mundo e os jogadores que regam nesse dia
+                (ações dos jogadores: insumos, colheitas, replantio)
+        """
+        for _ in range(days):
+            watered = self._watering()
+            if on_day is not None:
+                on_day(self, watered)
+            for event in self.rules.day_schedule:
+                if event == "tick":
+                    self.tick(watered)
+                elif event == "deterioration":
+                    self.deteriorate()
+                elif event == "climate":
+                    if climate == "random":
+                        name = self.draw_climate()
+                        if name:
+                            self.apply_climate(name)
+                            self.climate_log.append((self.day, name))
+                    elif climate == "expected":
+                        self.apply_expected_climate()
+                elif event == "season":
+                    self.advance_season()
+            self.season.days_elapsed += 1
+            self.day += 1
+
+    # Resultado
+
+    def diff(self, baseline: "World") -> Dict[str, List[dict]]:
+        """
+        Linhas alteradas em relação a `baseline` (uma `copy()` anterior), no formato de UPDATE
+        em lote por chave primária: {"terrains": [...], "quadrants": [...], "plantings": [...]}.
+        """
+        changes = {
+            "terrains": _soil_diff(self.terrains, baseline.terrains),
+            "quadrants": _soil_diff(self.quadrants, baseline.quadrants),
+            "plantings": [],
+        }
+        p, b = self.plantings, baseline.plantings
+        for i in range(len(b)):
+            row = {}
+            if p.state[i] != b.state[i]:
+                row["current_state"] = STATES[p.state[i]]
+            if p.days[i] != b.days[i]:
+                row["days_since_planting"] = p.days[i]
+            if p.dry[i] != b.dry[i]:
+                row["days_sem_rega"] = p.dry[i]
+            if row:
+                row["id"] = p.ids[i]
+                changes["plantings"].append(row)
+        return changes
+
+    def state_counts(self) -> Dict[str, int]:
+        counts = {name: 0 for name in STATES}
+        for code in self.plantings.state:
+            counts[STATES[code]] += 1
+        return counts
+
+
+def _deteriorate_rows(soil: Soil, rows: Iterable[int], factors: Mapping[str, float],
+                      minimum: Mapping[str, float]) -> Tuple[int, float]:
+    """Deterioração das linhas `rows`; retorna (linhas alteradas, última redução calculada)."""
+    moisture = soil.values["soil_moisture"]
+    organic = soil.values["organic_matter"]
+    biodiversity = soil.values["biodiversity"]
+    f_moisture = factors["soil_moisture"] / 100
+    f_organic = factors["organic_matter"] / 100
+    f_biodiversity = factors["biodiversity"] / 100
+    min_moisture, min_organic, min_biodiversity = (minimum["soil_moisture"], minimum["organic_matter"],
+                                                   minimum["biodiversity"])
+    updated = 0
+    decrease = 0.0
+    for i in rows:
+        changed = False
+        value = moisture[i]
+        if value > min_moisture:
+            decrease = value * f_moisture
+            moisture[i] = max(value - decrease, min_moisture)
+            changed = True
+        value = organic[i]
+        if value > min_organic:
+            decrease = value * f_organic
+            organic[i] = float(max(int(value - decrease), min_organic))
+            changed = True
+        value = biodiversity[i]
+        if value > min_biodiversity:
+            decrease = value * f_biodiversity
+            biodiversity[i] = float(max(int(value - decrease), min_biodiversity))
+            changed = True
+        updated += changed
+    return updated, decrease
+
+
+def _soil_diff(current: Soil, baseline: Soil) -> List[dict]:
+    rows = []
+    for i in range(len(baseline)):
+        row = {}
+        for column in current.columns:
+            value = current.values[column][i]
+            if not math.isclose(value, baseline.values[column][i], rel_tol=0.0, abs_tol=1e-9):
+                row[column] = int(round(value)) if column in INTEGER_COLUMNS else value
+        if row:
+            row["id"] = current.ids[i]
+            rows.append(row)
+    return rows
@@ -0,0 +1,138 @@
+"""
+Carga e gravação do estado do núcleo de simulação (services.simulation).
+
+Os jobs do scheduler são adaptadores finos sobre o núcleo:
+
+    world = season_world(db)
+    load_soil(db, world)
+    baseline = world.copy()
+    world.deteriorate()
+    write_back(db, world.diff(baseline))
+    db.commit()
+
+As cargas leem só as colunas usadas pelas regras (sem objetos ORM na sessão) e a gravação é
+um UPDATE em lote por chave primária para cada tabela, apenas com as linhas e colunas que
+mudaram.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..models.action import Action
+from ..models.planting import Planting
+from ..models.plant_state_log import PlantStateLog
+from ..models.quadrant import Quadrant
+from ..models.species import Species
+from ..models.terrain_parameters import TerrainParameters
+from . import current_season
+from .simulation import FINISHED, QUADRANT_COLUMNS, STATES, TERRAIN_COLUMNS, SimulationRules, World
+
+_FINISHED_STATES = [STATES[code] for code in FINISHED]
+
+# Janela (dias) do histórico de regas usado como cadência de rega dos jogadores
+WATERING_HISTORY_DAYS = int(os.getenv("WATERING_HISTORY_DAYS", "14"))
+
+
+def season_days_elapsed(start_date: Optional[datetime], now: Optional[datetime] = None) -> int:
+    if start_date is None:
+        return 0
+    now = now or datetime.utcnow()
+    return max(0, (now - start_date.replace(tzinfo=None)).days)
+
+
+def season_world(db: Session, rules: Optional[SimulationRules] = None, seed: Optional[int] = None,
+                 species: Optional[Mapping[str, Mapping]] = None) -> World:
+    """Mundo vazio com a estação vigente (do cache de services.current_season)."""
+    world = World(rules, seed, species)
+    season = current_season.current_season(db)
+    if season is not None:
+        world.set_season(season.name, season.factors, season_days_elapsed(season.start_date))
+    return world
+
+
+def load_soil(db: Session, world: World, terrain_ids: Optional[Iterable[int]] = None) -> World:
+    """Parâmetros dos terrenos e quadrantes (todos, ou só dos terrenos em `terrain_ids`), em ordem de id."""
+    params = select(TerrainParameters.id, TerrainParameters.terrain_id,
+                    *(getattr(TerrainParameters, column) for column in TERRAIN_COLUMNS))
+    quadrants = select(Quadrant.id, Quadrant.terrain_id, Quadrant.label,
+                       *(getattr(Quadrant, column) for column in QUADRANT_COLUMNS))
+    if terrain_ids is not None:
+        terrain_ids = list(terrain_ids)
+        params = params.where(TerrainParameters.terrain_id.in_(terrain_ids))
+        quadrants = quadrants.where(Quadrant.terrain_id.in_(terrain_ids))
+    for row in db.execute(params.order_by(TerrainParameters.id)).mappings():
+        world.add_terrain(row["id"], row["terrain_id"], row)
+    for row in db.execute(quadrants.order_by(Quadrant.id)).mappings():
+        world.add_quadrant(row["id"], row["terrain_id"], row["label"], row)
+    return world
+
+
+def load_plantings(db: Session, world: World, terrain_ids: Optional[Iterable[int]] = None,
+                   player_id: Optional[int] = None) -> Dict[int, Tuple[int, int]]:
+    """
+    Plantios ativos (não colhidos nem mortos), com a chave da espécie, em ordem de id.
+
+    Returns:
+        Dict[int, Tuple[int, int]]: (quadrante, slot) de cada plantio carregado
+    """
+    stmt = (
+        select(Planting.id, Planting.player_id, Planting.quadrant_id, Planting.slot_index,
+               Planting.current_state, Planting.days_since_planting, Planting.days_sem_rega, Species.key)
+        .join(Species, Species.id == Planting.species_id)
+        .where(~Planting.current_state.in_(_FINISHED_STATES))
+        .order_by(Planting.id)
+    )
+    if terrain_ids is not None:
+        stmt = stmt.join(Quadrant, Quadrant.id == Planting.quadrant_id).where(Quadrant.terrain_id.in_(list(terrain_ids)))
+    if player_id is not None:
+        stmt = stmt.where(Planting.player_id == player_id)
+    slots = {}
+    for row in db.execute(stmt):
+        world.add_planting(row.id, row.player_id, row.quadrant_id, row.key, row.current_state,
+                           row.days_since_planting, row.days_sem_rega)
+        slots[row.id] = (row.quadrant_id, row.slot_index)
+    return slots
+
+
+def watering_cadence(db: Session, player_ids: Iterable[int], days: int = WATERING_HISTORY_DAYS,
+                     now: Optional[datetime] = None) -> Dict[int, float]:
+    """
+    Fração dos últimos `days` dias em que cada jogador regou (ação `water`), usada como
+    `World.water_probability`. Jogadores sem regas no período ficam com 0.
+    """
+    player_ids = list(player_ids)
+    if not player_ids:
+        return {}
+    cutoff = (now or datetime.now()) - timedelta(days=days)
+    stmt = (
+        select(Action.player_id, func.count(func.distinct(func.date(Action.timestamp))))
+        .where(Action.action_name == "water", Action.player_id.in_(player_ids), Action.timestamp >= cutoff)
+        .group_by(Action.player_id)
+    )
+    cadence = {player_id: 0.0 for player_id in player_ids}
+    for player_id, watered_days in db.execute(stmt):
+        cadence[player_id] = min(1.0, watered_days / days)
+    return cadence
+
+
+def write_back(db: Session, changes: Mapping[str, List[dict]]) -> Dict[str, int]:
+    """Grava o resultado de `World.diff` (sem COMMIT). Retorna as linhas gravadas por tabela."""
+    counts = {}
+    for name, model in (("terrains", TerrainParameters), ("quadrants", Quadrant), ("plantings", Planting)):
+        rows = changes.get(name) or []
+        if rows:
+            db.execute(update(model), rows)
+        counts[name] = len(rows)
+    return counts
+
+
+def log_transitions(db: Session, transitions: Iterable[Tuple[int, int, int]]) -> int:
+    """Insere em lote os logs de mudança de estado das transições do tick."""
+    rows = [{"planting_id": planting_id, "from_state": STATES[old], "to_state": STATES[new]}
+            for planting_id, old, new in transitions]
+    if rows:
+        db.execute(insert(PlantStateLog), rows)
+    return len(rows)
@@ -0,0 +1,267 @@
+"""
+Índice em memória da ocupação dos slots de plantio.
+
+Cada quadrante tem dois bitmaps (bit i = slot i):
+- `occupied`: slots com um plantio registrado; é o que a constraint `uix_quadrant_slot`
+  enxerga, então só um DELETE do plantio libera o slot;
+- `finished`: slots cujo plantio morreu ou foi colhido (continuam ocupados até a remoção).
+
+Cada terreno guarda a ordem dos seus quadrantes e um bitmap dos quadrantes que ainda têm
+slot livre. Assim "slots livres do quadrante Q" é O(1) e "primeiros K slots livres do
+terreno T" é O(K), sem varrer `plantings`.
+
+O índice é carregado sob demanda (um SELECT com LEFT JOIN por quadrante ou terreno) e
+mantido pelos escritores: criação (unitária e em lote), remoção, mudança de estado
+(colheita via update, morte no tick diário) e criação/remoção de quadrantes e terrenos.
+SLOT_OCCUPANCY_TTL_SECONDS limita a defasagem entre processos; a constraint continua
+sendo a garantia final, e um conflito no INSERT invalida o quadrante.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.planting import Planting
+from ..models.quadrant import Quadrant
+
+logger = logging.getLogger(__name__)
+
+# Slots por quadrante (grid 5x3 da interface: índices 0-14)
+SLOTS_PER_QUADRANT = int(os.getenv("SLOTS_PER_QUADRANT", "15"))
+SLOT_OCCUPANCY_TTL_SECONDS = float(os.getenv("SLOT_OCCUPANCY_TTL_SECONDS", "60"))
+
+FINISHED_STATES = ("COLHIDA", "MORTA")
+
+_ALL_SLOTS = (1 << SLOTS_PER_QUADRANT) - 1
+
+
+def _bits(mask: int, limit: Optional[int] = None) -> List[int]:
+    """Índices dos bits ligados, do menor para o maior."""
+    out = []
+    while mask and (limit is None or len(out) < limit):
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+def slot_in_range(slot_index: int) -> bool:
+    return 0 <= slot_index < SLOTS_PER_QUADRANT
+
+
+class QuadrantSlots:
+    __slots__ = ("quadrant_id", "terrain_id", "occupied", "finished", "loaded_at")
+
+    def __init__(self, quadrant_id: int, terrain_id: int):
+        self.quadrant_id = quadrant_id
+        self.terrain_id = terrain_id
+        self.occupied = 0
+        self.finished = 0
+        self.loaded_at = time.monotonic()
+
+    @property
+    def free(self) -> int:
+        return ~self.occupied & _ALL_SLOTS
+
+
+class TerrainSlots:
+    __slots__ = ("terrain_id", "quadrant_ids", "position", "with_free", "loaded_at")
+
+    def __init__(self, terrain_id: int, quadrant_ids: List[int]):
+        self.terrain_id = terrain_id
+        self.quadrant_ids = quadrant_ids
+        self.position = {quadrant_id: pos for pos, quadrant_id in enumerate(quadrant_ids)}
+        self.with_free = 0
+        self.loaded_at = time.monotonic()
+
+
+class SlotOccupancy:
+    """Bitmaps de ocupação por quadrante e por terreno."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._quadrants: Dict[int, QuadrantSlots] = {}
+        self._terrains: Dict[int, TerrainSlots] = {}
+
+    @staticmethod
+    def _fresh(entry) -> bool:
+        return entry is not None and time.monotonic() - entry.loaded_at < SLOT_OCCUPANCY_TTL_SECONDS
+
+    def quadrant(self, quadrant_id: int) -> Optional[QuadrantSlots]:
+        """Entrada do quadrante, ou None se ainda não carregada (ou expirada)."""
+        entry = self._quadrants.get(quadrant_id)
+        return entry if self._fresh(entry) else None
+
+    def terrain(self, terrain_id: int) -> Optional[TerrainSlots]:
+        entry = self._terrains.get(terrain_id)
+        return entry if self._fresh(entry) else None
+
+    def missing_quadrants(self, quadrant_ids: Iterable[int]) -> List[int]:
+        return [quadrant_id for quadrant_id in quadrant_ids if self.quadrant(quadrant_id) is None]
+
+    def load(self, rows: Iterable[Tuple[int, int, Optional[int], Optional[str]]],
+             terrain_id: Optional[int] = None) -> None:
+        """
+        Carrega quadrantes a partir de linhas (terrain_id, quadrant_id, slot_index, current_state).
+
+        Args:
+            terrain_id (int): Se informado, as linhas são todos os quadrantes do terreno
+                (em ordem) e o índice do terreno também é reconstruído
+        """
+        loaded: Dict[int, QuadrantSlots] = {}
+        for row_terrain_id, quadrant_id, slot_index, state in rows:
+            entry = loaded.get(quadrant_id)
+            if entry is None:
+                entry = loaded[quadrant_id] = QuadrantSlots(quadrant_id, row_terrain_id)
+            if slot_index is not None and slot_in_range(slot_index):
+                entry.occupied |= 1 << slot_index
+                if state in FINISHED_STATES:
+                    entry.finished |= 1 << slot_index
+        with self._lock:
+            self._quadrants.update(loaded)
+            if terrain_id is not None:
+                terrain = TerrainSlots(terrain_id, list(loaded))
+                self._terrains[terrain_id] = terrain
+            for entry in loaded.values():
+                self._sync_terrain(entry)
+
+    def _sync_terrain(self, entry: QuadrantSlots) -> None:
+        terrain = self._terrains.get(entry.terrain_id)
+        if terrain is None or entry.quadrant_id not in terrain.position:
+            return
+        bit = 1 << terrain.position[entry.quadrant_id]
+        if entry.free:
+            terrain.with_free |= bit
+        else:
+            terrain.with_free &= ~bit
+
+    def _update(self, quadrant_id: int, slot_index: int, occupied: bool, finished: bool = False) -> None:
+        with self._lock:
+            entry = self._quadrants.get(quadrant_id)
+            if entry is None or not slot_in_range(slot_index):
+                return
+            bit = 1 << slot_index
+            entry.occupied = entry.occupied | bit if occupied else entry.occupied & ~bit
+            entry.finished = entry.finished | bit if occupied and finished else entry.finished & ~bit
+            self._sync_terrain(entry)
+
+    def mark_planted(self, quadrant_id: int, slot_index: int) -> None:
+        self._update(quadrant_id, slot_index, occupied=True)
+
+    def mark_state(self, quadrant_id: int, slot_index: int, state: Optional[str]) -> None:
+        """Registra a mudança de estado de um plantio (morte, colheita ou reativação)."""
+        self._update(quadrant_id, slot_index, occupied=True, finished=state in FINISHED_STATES)
+
+    def release(self, quadrant_id: int, slot_index: int) -> None:
+        self._update(quadrant_id, slot_index, occupied=False)
+
+    def is_occupied(self, quadrant_id: int, slot_index: int) -> Optional[bool]:
+        """True/False pelo índice, ou None se o quadrante não estiver carregado."""
+        entry = self.quadrant(quadrant_id)
+        if entry is None:
+            return None
+        return bool(entry.occupied & (1 << slot_index))
+
+    def invalidate(self, quadrant_id: int) -> None:
+        """Descarta o quadrante (e o terreno dele); a próxima leitura recarrega do banco."""
+        with self._lock:
+            entry = self._quadrants.pop(quadrant_id, None)
+            if entry is not None:
+                self._terrains.pop(entry.terrain_id, None)
+
+    def forget_terrain(self, terrain_id: int) -> None:
+        """Descarta o terreno e seus quadrantes (quadrantes criados ou removidos)."""
+        with self._lock:
+            self._terrains.pop(terrain_id, None)
+            for quadrant_id in [q for q, entry in self._quadrants.items() if entry.terrain_id == terrain_id]:
+                del self._quadrants[quadrant_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._quadrants.clear()
+            self._terrains.clear()
+
+    def free_slots(self, quadrant_id: int) -> List[int]:
+        entry = self.quadrant(quadrant_id)
+        return _bits(entry.free) if entry else []
+
+    def first_free_in_terrain(self, terrain_id: int, limit: int) -> List[Tuple[int, int]]:
+        """Primeiros `limit` pares (quadrant_id, slot_index) livres, na ordem dos quadrantes."""
+        out: List[Tuple[int, int]] = []
+        # Varredura inteira sob o lock: ocupações concorrentes não mudam os bitmaps no meio dela
+        with self._lock:
+            terrain = self.terrain(terrain_id)
+            if terrain is None:
+                return []
+            for pos in _bits(terrain.with_free):
+                entry = self._quadrants.get(terrain.quadrant_ids[pos])
+                if entry is None:
+                    continue
+                out.extend((entry.quadrant_id, slot) for slot in _bits(entry.free, limit - len(out)))
+                if len(out) >= limit:
+                    break
+        return out
+
+
+occupancy = SlotOccupancy()
+
+
+@event.listens_for(Planting.__table__, "after_drop")
+def _clear_on_drop(target, connection, **kw):
+    # Recriação do schema (testes, reset do banco): o índice não vale mais
+    occupancy.clear()
+
+
+def _rows_statement(quadrant_ids: Optional[List[int]] = None, terrain_id: Optional[int] = None):
+    # LEFT JOIN: quadrantes sem plantio aparecem com slot None (existem, bitmap vazio)
+    stmt = (
+        select(Quadrant.terrain_id, Quadrant.id, Planting.slot_index, Planting.current_state)
+        .outerjoin(Planting, Planting.quadrant_id == Quadrant.id)
+        .order_by(Quadrant.id)
+    )
+    if terrain_id is not None:
+        return stmt.where(Quadrant.terrain_id == terrain_id)
+    return stmt.where(Quadrant.id.in_(quadrant_ids))
+
+
+def ensure_quadrants(db: Session, quadrant_ids: Iterable[int]) -> None:
+    """Carrega do banco (um SELECT) os quadrantes ainda fora do índice."""
+    missing = occupancy.missing_quadrants(set(quadrant_ids))
+    if missing:
+        occupancy.load(db.execute(_rows_statement(missing)).all())
+
+
+async def ensure_quadrants_async(db: AsyncSession, quadrant_ids: Iterable[int]) -> None:
+    missing = occupancy.missing_quadrants(set(quadrant_ids))
+    if missing:
+        occupancy.load((await db.execute(_rows_statement(missing))).all())
+
+
+def ensure_terrain(db: Session, terrain_id: int) -> None:
+    if occupancy.terrain(terrain_id) is None:
+        occupancy.load(db.execute(_rows_statement(terrain_id=terrain_id)).all(), terrain_id=terrain_id)
+
+
+async def ensure_terrain_async(db: AsyncSession, terrain_id: int) -> None:
+    if occupancy.terrain(terrain_id) is None:
+        rows = (await db.execute(_rows_statement(terrain_id=terrain_id))).all()
+        occupancy.load(rows, terrain_id=terrain_id)
+
+
+def quadrant_report(quadrant_id: int) -> Optional[dict]:
+    """Slots livres e finalizados de um quadrante já carregado; None se ele não existe."""
+    entry = occupancy.quadrant(quadrant_id)
+    if entry is None:
+        return None
+    return {
+        "quadrant_id": quadrant_id,
+        "terrain_id": entry.terrain_id,
+        "slots_per_quadrant": SLOTS_PER_QUADRANT,
+        "free_slots": _bits(entry.free),
+        "finished_slots": _bits(entry.finished),
+    }
@@ -0,0 +1,254 @@
+"""
+Série temporal dos parâmetros do solo (umidade, fertilidade, matéria orgânica e biodiversidade).
+
+Cada registro (tick do scheduler ou mudança por insumo) é um UPSERT no balde da hora
+corrente de cada série (o terreno inteiro ou um quadrante). O balde guarda a média dos
+valores e o número de amostras, então registrar com frequência não cria linhas novas.
+
+A consolidação (`rollup`) leva os baldes antigos para resoluções maiores:
+- horas mais antigas que SOIL_SERIES_HOURLY_DAYS viram dias;
+- dias mais antigos que SOIL_SERIES_DAILY_DAYS viram semanas;
+- semanas mais antigas que SOIL_SERIES_WEEKLY_DAYS são descartadas.
+Cada série fica com no máximo 24·H + D + W/7 linhas, e um terreno com Q quadrantes com
+(Q + 1) vezes isso, qualquer que seja a frequência das mudanças.
+
+A consulta por intervalo reagrupa os baldes na resolução pedida (ou escolhida pelo tamanho
+do intervalo) e reduz a série a no máximo `max_points` pontos.
+"""
+import logging
+import math
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.quadrant import Quadrant
+from ..models.soil_sample import SoilSample
+from ..models.terrain_parameters import TerrainParameters
+
+logger = logging.getLogger(__name__)
+
+PARAMS = ("soil_moisture", "fertility", "organic_matter", "biodiversity")
+
+HOUR = "hour"
+DAY = "day"
+WEEK = "week"
+RESOLUTIONS = (HOUR, DAY, WEEK)
+
+# Retenção de cada resolução (dias)
+HOURLY_DAYS = int(os.getenv("SOIL_SERIES_HOURLY_DAYS", "7"))
+DAILY_DAYS = int(os.getenv("SOIL_SERIES_DAILY_DAYS", "90"))
+WEEKLY_DAYS = int(os.getenv("SOIL_SERIES_WEEKLY_DAYS", "730"))
+# Pontos máximos por resposta da consulta
+MAX_POINTS = int(os.getenv("SOIL_SERIES_MAX_POINTS", "500"))
+
+TERRAIN_SERIES = 0  # quadrant_id da série do terreno inteiro
+
+_table = SoilSample.__table__
+_KEY = ("terrain_id", "quadrant_id", "resolution", "bucket_start")
+
+
+def bucket_start(ts: datetime, resolution: str) -> datetime:
+    """Início do balde (hora, dia ou semana iniciada na segunda-feira) que contém `ts`."""
+    if resolution == HOUR:
+        return ts.replace(minute=0, second=0, microsecond=0)
+    day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == DAY:
+        return day
+    return day - timedelta(days=day.weekday())
+
+
+def _upsert_statement(dialect_name: str):
+    """INSERT que, se o balde já existe, combina as médias ponderadas pelo número de amostras."""
+    if dialect_name == "postgresql":
+        stmt = pg_insert(_table)
+    elif dialect_name == "sqlite":
+        stmt = sqlite_insert(_table)
+    else:
+        raise ValueError(f"Série temporal sem suporte ao banco {dialect_name}")
+    samples = _table.c.samples + stmt.excluded.samples
+    set_ = {
+        param: (_table.c[param] * _table.c.samples + stmt.excluded[param] * stmt.excluded.samples) / samples
+        for param in PARAMS
+    }
+    set_["samples"] = samples
+    return stmt.on_conflict_do_update(index_elements=list(_KEY), set_=set_)
+
+
+def _row(terrain_id: int, quadrant_id: int, source, bucket: datetime) -> dict:
+    row = {"terrain_id": terrain_id, "quadrant_id": quadrant_id, "resolution": HOUR,
+           "bucket_start": bucket, "samples": 1}
+    for param in PARAMS:
+        row[param] = float(getattr(source, param, 0) or 0)
+    return row
+
+
+def snapshot_rows(terrain_params: Iterable, quadrants: Iterable, now: Optional[datetime] = None) -> List[dict]:
+    """
+    Linhas do balde horário corrente para parâmetros de terreno e quadrantes já carregados.
+
+    Uma linha por série: o Postgres não aceita duas linhas para a mesma chave no mesmo UPSERT.
+    """
+    bucket = bucket_start(now or datetime.utcnow(), HOUR)
+    rows: Dict[Tuple[int, int], dict] = {}
+    for params in terrain_params:
+        rows.setdefault((params.terrain_id, TERRAIN_SERIES), _row(params.terrain_id, TERRAIN_SERIES, params, bucket))
+    for quadrant in quadrants:
+        rows.setdefault((quadrant.terrain_id, quadrant.id), _row(quadrant.terrain_id, quadrant.id, quadrant, bucket))
+    return list(rows.values())
+
+
+def record(db: Session, terrain_params: Iterable, quadrants: Iterable, now: Optional[datetime] = None) -> int:
+    """Registra (sem COMMIT) os valores atuais dos objetos informados. Retorna o nº de séries."""
+    rows = snapshot_rows(terrain_params, quadrants, now)
+    if rows:
+        db.execute(_upsert_statement(db.get_bind().dialect.name), rows)
+    return len(rows)
+
+
+async def record_async(db: AsyncSession, terrain_params: Iterable, quadrants: Iterable,
+                       now: Optional[datetime] = None) -> int:
+    rows = snapshot_rows(terrain_params, quadrants, now)
+    if rows:
+        await db.execute(_upsert_statement(db.get_bind().dialect.name), rows)
+    return len(rows)
+
+
+def record_snapshot(db: Session, now: Optional[datetime] = None) -> int:
+    """Registra todos os terrenos e quadrantes (ticks do scheduler) e faz o COMMIT."""
+    terrain_params = db.execute(select(TerrainParameters.terrain_id, *[TerrainParameters.__table__.c[p] for p in PARAMS])).all()
+    quadrants = db.execute(select(Quadrant.id, Quadrant.terrain_id, *[Quadrant.__table__.c[p] for p in PARAMS])).all()
+    count = record(db, terrain_params, quadrants, now)
+    db.commit()
+    logger.info(f"Série do solo: {count} séries registradas")
+    return count
+
+
+def _merge(rows: Iterable, resolution: str) -> List[dict]:
+    """Reagrupa baldes na resolução informada (média ponderada pelo número de amostras)."""
+    merged: Dict[tuple, dict] = {}
+    for row in rows:
+        key = (row.terrain_id, row.quadrant_id, bucket_start(row.bucket_start, resolution))
+        acc = merged.get(key)
+        if acc is None:
+            acc = merged[key] = {"terrain_id": key[0], "quadrant_id": key[1], "resolution": resolution,
+                                 "bucket_start": key[2], "samples": 0, **{param: 0.0 for param in PARAMS}}
+        acc["samples"] += row.samples
+        for param in PARAMS:
+            acc[param] += getattr(row, param) * row.samples
+    for acc in merged.values():
+        for param in PARAMS:
+            acc[param] /= acc["samples"]
+    return list(merged.values())
+
+
+def rollup(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Consolida horas antigas em dias e dias antigos em semanas, e descarta semanas expiradas.
+
+    Returns:
+        Dict[str, int]: Linhas consolidadas por resolução de origem e semanas descartadas
+    """
+    now = now or datetime.utcnow()
+    counters = {HOUR: 0, DAY: 0, "expired": 0}
+    upsert = _upsert_statement(db.get_bind().dialect.name)
+    for source, target, keep_days in ((HOUR, DAY, HOURLY_DAYS), (DAY, WEEK, DAILY_DAYS)):
+        # Corte alinhado ao balde de destino: cada balde é consolidado de uma vez
+        cutoff = bucket_start(now - timedelta(days=keep_days), target)
+        old = (_table.c.resolution == source) & (_table.c.bucket_start < cutoff)
+        rows = db.execute(select(_table).where(old)).all()
+        if not rows:
+            continue
+        db.execute(upsert, _merge(rows, target))
+        db.execute(delete(_table).where(old))
+        counters[source] = len(rows)
+    expired = db.execute(
+        delete(_table).where(_table.c.resolution == WEEK,
+                             _table.c.bucket_start < now - timedelta(days=WEEKLY_DAYS))
+    )
+    counters["expired"] = expired.rowcount or 0
+    db.commit()
+    logger.info(f"Série do solo consolidada: {counters}")
+    return counters
+
+
+def resolution_for(start: datetime, end: datetime) -> str:
+    """Resolução adequada ao tamanho do intervalo consultado."""
+    span = end - start
+    if span <= timedelta(days=2):
+        return HOUR
+    if span <= timedelta(days=120):
+        return DAY
+    return WEEK
+
+
+def downsample(points: List[dict], max_points: int) -> List[dict]:
+    """Agrupa pontos consecutivos para não passar de `max_points` (média ponderada)."""
+    if max_points < 1 or len(points) <= max_points:
+        return points
+    size = math.ceil(len(points) / max_points)
+    out = []
+    for i in range(0, len(points), size):
+        chunk = points[i:i + size]
+        samples = sum(p["samples"] for p in chunk)
+        point = {"t": chunk[0]["t"], "samples": samples}
+        for param in PARAMS:
+            point[param] = sum(p[param] * p["samples"] for p in chunk) / samples
+        out.append(point)
+    return out
+
+
+def _series_statement(terrain_id: int, quadrant_id: int, start: datetime, end: datetime):
+    # Baldes mais grossos podem começar antes de `start`: a busca parte do início da semana
+    return (
+        select(_table)
+        .where(_table.c.terrain_id == terrain_id, _table.c.quadrant_id == quadrant_id,
+               _table.c.bucket_start >= bucket_start(start, WEEK), _table.c.bucket_start <= end)
+        .order_by(_table.c.bucket_start)
+    )
+
+
+def _validate_range(start: datetime, end: datetime, resolution: Optional[str]) -> str:
+    if start >= end:
+        raise ValueError("Intervalo inválido: início deve ser anterior ao fim")
+    if resolution is not None and resolution not in RESOLUTIONS:
+        raise ValueError(f"Resolução inválida: {resolution}")
+    return resolution or resolution_for(start, end)
+
+
+def _series(rows, terrain_id: int, quadrant_id: int, start: datetime, end: datetime,
+            resolution: str, max_points: int) -> dict:
+    first = bucket_start(start, resolution)
+    points = [
+        {"t": row["bucket_start"], "samples": row["samples"], **{param: row[param] for param in PARAMS}}
+        for row in sorted(_merge(rows, resolution), key=lambda row: row["bucket_start"])
+        if row["bucket_start"] >= first
+    ]
+    return {
+        "terrain_id": terrain_id,
+        "quadrant_id": quadrant_id or None,
+        "resolution": resolution,
+        "start": start,
+        "end": end,
+        "points": downsample(points, max_points),
+    }
+
+
+async def query_series_async(db: AsyncSession, terrain_id: int, start: datetime, end: datetime,
+                             quadrant_id: Optional[int] = None, resolution: Optional[str] = None,
+                             max_points: int = MAX_POINTS) -> dict:
+    """
+    Série de um terreno (ou quadrante) no intervalo, reamostrada.
+
+    Raises:
+        ValueError: intervalo ou resolução inválidos
+    """
+    resolution = _validate_range(start, end, resolution)
+    quadrant_id = quadrant_id or TERRAIN_SERIES
+    rows = (await db.execute(_series_statement(terrain_id, quadrant_id, start, end))).all()
+    return _series(rows, terrain_id, quadrant_id, start, end, resolution, min(max_points, MAX_POINTS))
@@ -0,0 +1,200 @@
+"""
+Probabilidade de sobrevivência dos plantios de um jogador até a maturidade (Monte Carlo).
+
+Todos os plantios ativos do jogador são estimados de uma vez: o núcleo de simulação
+(services.simulation) recebe um único mundo com N cópias dos plantios em colunas (o plantio i
+da execução r fica na linha r·P + i e a execução r é um "jogador" com a cadência histórica de
+rega do jogador real, simulation_io.watering_cadence). Cada tick percorre as N·P linhas em uma
+passada, com as regas sorteadas por execução e os limiares de germinação e maturação da
+estação vigente e das seguintes.
+
+Um plantio "sobrevive" na execução quando chega a COLHIVEL dentro do horizonte
+(SURVIVAL_HORIZON_DAYS); a linha sai da simulação nesse momento ou quando morre, e a
+simulação para quando todas as linhas terminam. Os eventos climáticos não entram no sorteio:
+nas regras atuais eles só alteram o solo, que não afeta a sobrevivência dos plantios.
+
+O resultado fica em cache por jogador e versão de estado (services.player_digest): o tick
+diário incrementa a versão global, então a estimativa é recalculada uma vez por tick (ou
+quando o jogador age).
+"""
+import math
+import os
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from . import current_season
+from .player_digest import get_state_version
+from .simulation import (COLHIDA, COLHIVEL, FINISHED, MORTA, QUADRANT_COLUMNS, STATES, TERRAIN_COLUMNS, Plantings,
+                         Soil, World)
+from .simulation_io import load_plantings, season_world, watering_cadence
+
+SURVIVAL_RUNS = int(os.getenv("SURVIVAL_RUNS", "200"))
+SURVIVAL_MAX_RUNS = int(os.getenv("SURVIVAL_MAX_RUNS", "1000"))
+SURVIVAL_HORIZON_DAYS = int(os.getenv("SURVIVAL_HORIZON_DAYS", "180"))
+
+_lock = threading.Lock()
+# player_id -> (chave, resultado)
+_cache: Dict[int, Tuple[tuple, dict]] = {}
+
+
+def batch_world(world: World, runs: int, water_probability: float, seed: int = 0) -> World:
+    """Mundo com `runs` cópias dos plantios de `world` (sem solo), uma execução por jogador."""
+    batch = world.copy(seed=seed)
+    p = world.plantings
+    n = len(p)
+    tiled = Plantings()
+    tiled.ids = array("q", range(runs * n))
+    tiled.players = array("q", (run for run in range(runs) for _ in range(n)))
+    for name in ("quadrants", "species", "state", "days", "dry"):
+        setattr(tiled, name, getattr(p, name) * runs)
+    tiled.index = {row: row for row in range(runs * n)}
+    batch.plantings = tiled
+    batch.terrains = Soil(TERRAIN_COLUMNS)
+    batch.quadrants = Soil(QUADRANT_COLUMNS)
+    batch.water_probability = {run: water_probability for run in range(runs)}
+    return batch
+
+
+def estimate_survival(world: World, water_probability: float, runs: int = SURVIVAL_RUNS,
+                      horizon_days: int = SURVIVAL_HORIZON_DAYS, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Estima, para cada plantio de `world`, a chance de chegar a COLHIVEL em `horizon_days`.
+
+    Com cadência 0 ou 1 as regas não são sorteadas e uma execução basta.
+
+    Returns:
+        List[dict]: por plantio, probabilidades de amadurecer, morrer e seguir em crescimento no
+        horizonte, erro padrão e dias médios até a maturidade
+    """
+    p = world.plantings
+    n = len(p)
+    if n == 0:
+        return []
+    if water_probability in (0.0, 1.0):
+        runs = 1
+    batch = batch_world(world, runs, water_probability, seed)
+    state = batch.plantings.state
+    matured_day: List[Optional[int]] = [None] * (runs * n)
+    died = bytearray(runs * n)
+    pending = 0
+    for row in range(runs * n):
+        if state[row] == COLHIVEL:
+            matured_day[row] = 0
+            state[row] = COLHIDA
+        elif state[row] in FINISHED:
+            died[row] = state[row] == MORTA
+        else:
+            pending += 1
+
+    while pending and batch.day < horizon_days:
+        before = len(batch.transitions)
+        batch.step(1, climate="none")
+        for row, _, new in batch.transitions[before:]:
+            if new == COLHIVEL and matured_day[row] is None:
+                matured_day[row] = batch.day
+                # Sai da simulação: a colheita não conta para a sobrevivência até a maturidade
+                state[row] = COLHIDA
+                pending -= 1
+            elif new == MORTA and matured_day[row] is None and not died[row]:
+                died[row] = 1
+                pending -= 1
+
+    estimates = []
+    for i in range(n):
+        rows = range(i, runs * n, n)
+        days = [matured_day[row] for row in rows if matured_day[row] is not None]
+        deaths = sum(died[row] for row in rows)
+        probability = len(days) / runs
+        estimates.append({
+            "planting_id": p.ids[i],
+            "species": world.species.keys[p.species[i]],
+            "current_state": STATES[p.state[i]],
+            "survival_probability": probability,
+            "death_probability": deaths / runs,
+            "growing_probability": (runs - len(days) - deaths) / runs,
+            "stderr": math.sqrt(probability * (1 - probability) / runs),
+            "expected_days_to_maturity": sum(days) / len(days) if days else None,
+        })
+    return estimates
+
+
+def _validate(runs: int, horizon_days: int) -> None:
+    if not 1 <= runs <= SURVIVAL_MAX_RUNS:
+        raise ValueError(f"runs deve estar entre 1 e {SURVIVAL_MAX_RUNS}")
+    if horizon_days < 1:
+        raise ValueError("horizon_days deve ser positivo")
+
+
+def _cached(player_id: int, key: tuple) -> Optional[Dict[str, Any]]:
+    with _lock:
+        entry = _cache.get(player_id)
+    if entry is not None and entry[0] == key:
+        return {**entry[1], "cached": True}
+    return None
+
+
+def _load(db: Session, player_id: int) -> Tuple[World, float]:
+    """Plantios ativos do jogador na estação vigente e sua cadência de rega."""
+    world = season_world(db, species=current_season.species_params())
+    load_plantings(db, world, player_id=player_id)
+    return world, watering_cadence(db, [player_id])[player_id]
+
+
+def _estimate(player_id: int, key: tuple, world: World, cadence: float, runs: int,
+              horizon_days: int) -> Dict[str, Any]:
+    result = {
+        "player_id": player_id,
+        "runs": runs,
+        "horizon_days": horizon_days,
+        "water_probability": cadence,
+        "season": world.season.name,
+        "plantings": estimate_survival(world, cadence, runs, horizon_days),
+    }
+    with _lock:
+        _cache[player_id] = (key, result)
+    return {**result, "cached": False}
+
+
+def player_survival(db: Session, player_id: int, runs: int = SURVIVAL_RUNS,
+                    horizon_days: int = SURVIVAL_HORIZON_DAYS) -> Dict[str, Any]:
+    """
+    Estimativa para os plantios ativos do jogador, em cache até a próxima versão de estado.
+
+    Raises:
+        ValueError: execuções ou horizonte fora dos limites
+    """
+    _validate(runs, horizon_days)
+    key = (get_state_version(player_id), runs, horizon_days)
+    hit = _cached(player_id, key)
+    if hit is not None:
+        return hit
+    world, cadence = _load(db, player_id)
+    return _estimate(player_id, key, world, cadence, runs, horizon_days)
+
+
+async def player_survival_async(db: AsyncSession, player_id: int, runs: int = SURVIVAL_RUNS,
+                                horizon_days: int = SURVIVAL_HORIZON_DAYS) -> Dict[str, Any]:
+    """
+    `player_survival` pela sessão assíncrona: carrega o estado com `run_sync` e simula em uma
+    thread do pool, sem bloquear o event loop.
+
+    Raises:
+        ValueError: execuções ou horizonte fora dos limites
+    """
+    _validate(runs, horizon_days)
+    key = (get_state_version(player_id), runs, horizon_days)
+    hit = _cached(player_id, key)
+    if hit is not None:
+        return hit
+    world, cadence = await db.run_sync(_load, player_id)
+    return await run_in_threadpool(_estimate, player_id, key, world, cadence, runs, horizon_days)
+
+
+def clear() -> None:
+    with _lock:
+        _cache.clear()
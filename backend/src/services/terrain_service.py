@@ -1,83 +1,93 @@
 """
 Serviços relacionados à lógica de evolução do terreno.
+
+`run_action` é uma tentativa da ação (handler do registry e efeito do clima atual);
+`update_terrain` a executa pelo `action_executor`, que reagenda as falhas sem bloquear.
 """
 
-import time
 import logging
+from typing import Optional
+
 from sqlalchemy.orm import Session
 
 from ..crud.terrain_parameters import (
     get_terrain_parameters,
     create_terrain_parameters,
-    update_terrain_parameters,
 )
-from ..crud.climate_condition import get_climate_conditions
-from ..schemas.terrain_parameters import TerrainParametersCreate, TerrainParametersUpdate
-from .action_registry import registry
+from ..schemas.terrain_parameters import TerrainParametersCreate
+from .action_executor import ActionExecutor
+from .action_registry import TerrainDelta, registry, state_of
+from .current_weather import Weather, current_weather
+from .player_digest import bump_player_state_version
 
 logger = logging.getLogger(__name__)
 
-def update_terrain(db: Session, action_name: str, terrain_id: int = 1, tool_key: str = None):
+# Parâmetros de um terreno que ainda não tem registro em terrain_parameters
+DEFAULT_PARAMETERS = dict(
+    soil_moisture=0,
+    fertility=0,
+    soil_ph=7.0,
+    organic_matter=0,
+    compaction=0,
+    coverage=0,
+    biodiversity=0,
+    regeneration_cycles=0,
+    spontaneous_species_count=0,
+)
+
+# Variação da umidade do solo pela condição climática atual, a cada ação
+CLIMATE_MOISTURE_CHANGE = {"seca": -10, "dry": -10, "chuva": 10, "rain": 10}
+
+
+def climate_delta(state: dict, weather: Optional[Weather]) -> TerrainDelta:
+    """Variação da umidade pela condição climática atual (nunca abaixo de zero)."""
+    change = CLIMATE_MOISTURE_CHANGE.get(weather.name.lower()) if weather else None
+    if change is None:
+        return TerrainDelta()
+    moisture = state.get("soil_moisture") or 0
+    return TerrainDelta(adds={"soil_moisture": max(moisture + change, 0) - moisture})
+
+
+def run_action(db: Session, action_name: str, terrain_id: int = 1, tool_key: Optional[str] = None):
     """
-    Lógica de evolução do terreno com retry e fallback.
-    Pode receber tool_key opcional para aplicar efeitos de ferramenta.
+    Uma tentativa da ação: cria os parâmetros do terreno se preciso, aplica o efeito do
+    clima atual na umidade e executa o handler (com os efeitos da ferramenta).
+    Lança a exceção original em caso de falha; quem reagenda é o executor.
+    """
+    params = get_terrain_parameters(db, terrain_id)
+    if not params:
+        params_in = TerrainParametersCreate(terrain_id=terrain_id, **DEFAULT_PARAMETERS)
+        params = create_terrain_parameters(db, params_in)
+
+    # Efeito do clima atual (cache em memória ou ORDER BY timestamp DESC LIMIT 1), gravado
+    # no mesmo COMMIT da ação: uma nova tentativa não aplica nada em dobro
+    weather = current_weather(db)
+    climate = climate_delta(state_of(params), weather)
+    if climate:
+        params.soil_moisture = climate.apply(state_of(params))["soil_moisture"]
+
+    # Handle action via registry, passando tool_key
+    registry.handle(action_name, db, terrain_id, params, tool_key)
+    db.commit()
+    if climate:
+        logger.info(f"Clima {weather.name} no terreno {terrain_id}: soil_moisture {params.soil_moisture}")
+
+    if params.terrain is not None:
+        bump_player_state_version(params.terrain.player_id)
+    return params
+
+
+action_executor = ActionExecutor(run_action)
+
+
+def update_terrain(action_name: str, terrain_id: int = 1, tool_key: Optional[str] = None) -> bool:
+    """
+    Executa a ação no terreno. Pode receber tool_key opcional para aplicar efeitos de ferramenta.
+
+    A primeira tentativa roda na thread de quem chama (tarefa em background); se falhar,
+    as próximas são agendadas com backoff e jitter e esta chamada retorna sem esperar.
+
+    Returns:
+        bool: True se a ação foi concluída na primeira tentativa
     """
-    try:
-        success = False
-        for attempt in range(3):
-            try:
-                params = get_terrain_parameters(db, terrain_id)
-                if not params:
-                    params_in = TerrainParametersCreate(
-                        terrain_id=terrain_id,
-                        soil_moisture=0,
-                        fertility=0,
-                        soil_ph=7.0,
-                        organic_matter=0,
-                        compaction=0,
-                        coverage=0,
-                        biodiversity=0,
-                        regeneration_cycles=0,
-                        spontaneous_species_count=0,
-                    )
-                    params = create_terrain_parameters(db, params_in)
-
-                # Handle action via registry, passando tool_key
-                registry.handle(action_name, db, terrain_id, params, tool_key)
-
-                success = True
-                break
-            except Exception as e:
-                logger.warning(
-                    f"Attempt {attempt+1} failed for '{action_name}' on terrain {terrain_id}: {e}"
-                )
-                time.sleep(1)
-
-        if not success:
-            logger.error(
-                f"Action '{action_name}' failed after 3 attempts on terrain {terrain_id}"
-            )
-            return
-    except Exception:
-        pass
-    finally:
-        # Efeitos de clima recentes
-        try:
-            ccs = get_climate_conditions(db, skip=0, limit=100)
-            if ccs:
-                latest = max(ccs, key=lambda c: (c.timestamp, c.id))
-                lcname = latest.name.lower()
-                if lcname in ("seca", "dry"):
-                    new_moisture = max((params.soil_moisture or 0) - 10, 0)
-                elif lcname in ("chuva", "rain"):
-                    new_moisture = (params.soil_moisture or 0) + 10
-                else:
-                    new_moisture = params.soil_moisture
-
-                update_in = TerrainParametersUpdate(soil_moisture=new_moisture)
-                update_terrain_parameters(db, terrain_id, update_in)
-                print(f"[terrain_service] clima {latest.name}: soil_moisture {new_moisture}")
-        except Exception:
-            pass
-        finally:
-            db.close()
\ No newline at end of file
+    return action_executor.execute(action_name, terrain_id, tool_key)
@@ -0,0 +1,216 @@
+"""
+Efeitos das ferramentas nas ações sobre o terreno.
+
+tools.yml e a tabela `tools` são compilados em uma tabela em memória, por chave de
+ferramenta: o vetor de efeitos já multiplicado pela eficiência (`effects × efficiency`)
+e a durabilidade. As linhas da tabela `tools` prevalecem sobre o arquivo para a mesma
+chave. A tabela é recompilada quando tools.yml muda, quando o catálogo de ferramentas é
+invalidado pelo CRUD ou depois de TOOL_TABLE_TTL_SECONDS (defasagem entre processos).
+
+O desgaste não é gravado a cada uso: `wear` acumula os usos em um contador em memória e
+`flush_wear` (job periódico do scheduler) aplica tudo com um UPDATE em lote.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import yaml
+from sqlalchemy import bindparam, case, select, update
+from sqlalchemy.orm import Session
+
+from ..models.tool import Tool
+from . import catalog_cache
+from .effect_table import effect_table
+
+logger = logging.getLogger(__name__)
+
+TOOL_TABLE_TTL_SECONDS = float(os.getenv("TOOL_TABLE_TTL_SECONDS", "300"))
+
+# Caminho para tools.yml (hot-reload)
+TOOLS_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "data", "tools.yml"))
+
+
+class CompiledTool:
+    __slots__ = ("key", "task_type", "efficiency", "durability", "effects", "persisted")
+
+    def __init__(self, key: str, task_type: str, efficiency: float, durability: int,
+                 effects: Dict[str, float], persisted: bool):
+        self.key = key
+        self.task_type = task_type
+        self.efficiency = efficiency
+        self.durability = durability
+        # Vetor (parâmetro, efeito × eficiência), sem os efeitos nulos
+        self.effects: Tuple[Tuple[str, float], ...] = tuple(
+            (param, float(value) * efficiency) for param, value in (effects or {}).items() if value
+        )
+        self.persisted = persisted
+
+
+def _compile(entries, persisted: bool) -> Dict[str, CompiledTool]:
+    return {
+        key: CompiledTool(key, entry.get("task_type"), float(entry.get("efficiency") or 1.0),
+                          int(entry.get("durability") or 0), entry.get("effects") or {}, persisted)
+        for key, entry in entries
+    }
+
+
+def load_tools_file(path: str = TOOLS_FILE) -> Dict[str, dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+class ToolTable:
+    """Ferramentas compiladas e o contador de usos ainda não gravados."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: Dict[str, CompiledTool] = {}
+        self._loaded_at = float("-inf")
+        self._file_mtime: Optional[float] = None
+        self._stale = True
+        self._pending: Dict[str, int] = {}
+        self.loads = 0
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tools = {}
+            self._stale = True
+            self._pending.clear()
+            self.loads = 0
+
+    def _fresh(self, mtime: Optional[float]) -> bool:
+        return (not self._stale and mtime == self._file_mtime
+                and time.monotonic() - self._loaded_at < TOOL_TABLE_TTL_SECONDS)
+
+    def ensure_loaded(self, db: Session, path: str = TOOLS_FILE) -> Dict[str, CompiledTool]:
+        """Tabela compilada; recompila (um SELECT em `tools`) se estiver defasada."""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        if self._fresh(mtime):
+            return self._tools
+        try:
+            from_file = _compile(load_tools_file(path).items(), persisted=False) if mtime is not None else {}
+        except Exception as e:
+            logger.error(f"Falha ao recarregar tools.yml: {e}")
+            from_file = {key: tool for key, tool in self._tools.items() if not tool.persisted}
+        rows = db.execute(select(Tool.key, Tool.task_type, Tool.efficiency, Tool.durability, Tool.effects)).all()
+        from_db = _compile(((row.key, row._asdict()) for row in rows), persisted=True)
+        with self._lock:
+            self._tools = {**from_file, **from_db}
+            self._file_mtime = mtime
+            self._loaded_at = time.monotonic()
+            self._stale = False
+            self.loads += 1
+        return self._tools
+
+    def keys(self):
+        """Chaves da última compilação, sem consultar o banco."""
+        return set(self._tools)
+
+    def get(self, db: Session, tool_key: str) -> Optional[CompiledTool]:
+        return self.ensure_loaded(db).get(tool_key)
+
+    def remaining(self, tool: CompiledTool) -> int:
+        """Durabilidade descontando os usos ainda não gravados."""
+        return tool.durability - self._pending.get(tool.key, 0)
+
+    def wear(self, tool_key: str, uses: int = 1) -> None:
+        with self._lock:
+            self._pending[tool_key] = self._pending.get(tool_key, 0) + uses
+
+    def pending(self) -> Dict[str, int]:
+        return dict(self._pending)
+
+    def flush_wear(self, db: Session) -> int:
+        """
+        Grava os usos acumulados com um único UPDATE em lote.
+
+        Returns:
+            int: Número de ferramentas atualizadas
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        new_durability = case(
+            (Tool.durability > bindparam("uses"), Tool.durability - bindparam("uses")), else_=0
+        )
+        stmt = (
+            update(Tool.__table__)
+            .where(Tool.__table__.c.key == bindparam("tool_key"))
+            .values(durability=new_durability)
+        )
+        try:
+            written = db.execute(stmt, [{"tool_key": key, "uses": uses} for key, uses in pending.items()]).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Devolve os usos ao contador para a próxima tentativa
+            for key, uses in pending.items():
+                self.wear(key, uses)
+            raise
+        # Usos de ferramentas que não estão no banco não alteram o catálogo
+        if written:
+            catalog_cache.invalidate(catalog_cache.TOOLS)
+            logger.info(f"Desgaste de ferramentas gravado: {pending}")
+        return written
+
+
+tool_table = ToolTable()
+catalog_cache.on_invalidate(catalog_cache.TOOLS, tool_table.invalidate)
+
+
+def tool_changes(db: Session, state: Dict[str, float], tool_key: Optional[str],
+                 uses_before: int = 0) -> Optional[Dict[str, float]]:
+    """
+    Variação que a ferramenta causa sobre os valores `state` (já limitada), sem alterar nada.
+
+    Args:
+        uses_before (int): Usos da mesma ferramenta ainda não contados (ex.: antes, no mesmo lote)
+
+    Returns:
+        Optional[Dict[str, float]]: Variação por parâmetro; None sem ferramenta, com ferramenta
+        desconhecida ou já sem durabilidade (não há uso a registrar)
+    """
+    if not tool_key:
+        return None
+    tool = tool_table.get(db, tool_key)
+    if tool is None:
+        logger.warning(f"Ferramenta '{tool_key}' não encontrada")
+        return None
+    if tool.persisted and tool_table.remaining(tool) - uses_before <= 0:
+        logger.info(f"Ferramenta '{tool_key}' sem durabilidade")
+        return None
+    table = effect_table()
+    changes = {}
+    for param, delta in tool.effects:
+        if param not in state:
+            continue
+        before = state[param] or 0
+        after = table.clamp_param(param, before + delta)
+        if isinstance(before, int):
+            after = int(round(after))  # colunas inteiras (fertility, compaction, ...)
+        changes[param] = after - before
+    return changes
+
+
+def apply_tool(db: Session, params, tool_key: Optional[str]) -> Optional[Dict[str, float]]:
+    """
+    Soma os efeitos da ferramenta aos parâmetros do terreno já carregados, sem COMMIT:
+    a gravação acontece junto com a da ação.
+
+    Returns:
+        Optional[Dict[str, float]]: Variação aplicada por parâmetro (ver `tool_changes`)
+    """
+    state = {column.key: getattr(params, column.key) for column in params.__table__.columns}
+    changes = tool_changes(db, state, tool_key)
+    for param, change in (changes or {}).items():
+        setattr(params, param, (state[param] or 0) + change)
+    return changes
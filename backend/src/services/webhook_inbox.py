@@ -0,0 +1,371 @@
+"""
+Caixa de entrada dos webhooks do WhatsApp.
+
+O provedor entrega em rajadas e reenvia quando a confirmação demora. O endpoint de webhook só
+grava a mensagem em `webhook_inbox` e confirma; todo o resto acontece depois, em lote:
+
+- gravação com group commit: as requisições entregam a mensagem a uma única thread de escrita
+  e esperam a confirmação. Enquanto um COMMIT está em andamento, as mensagens seguintes se
+  acumulam e vão juntas no próximo (um INSERT em lote por COMMIT, sem janela de espera). Com o
+  banco ocioso, cada mensagem é um INSERT e um COMMIT;
+- deduplicação pelo id da mensagem no provedor: `INSERT ... ON CONFLICT DO NOTHING` e, antes
+  disso, um cache LRU dos ids recentes, que responde reentregas sem ir ao banco;
+- consumo: uma thread reivindica até INBOX_BATCH_SIZE linhas pendentes (UPDATE ... RETURNING;
+  linhas `processing` com a reivindicação vencida voltam a ser elegíveis), interpreta os
+  comandos (services.command_parser), aplica o limite de ações por ciclo e executa as ações
+  aceitas com services.action_batch, tudo em uma transação. As respostas ficam em `reply`.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models.player import Player
+from ..models.terrain import Terrain
+from ..models.webhook_message import WebhookMessage
+from ..schemas.tool_use import ToolUse
+from .action_batch import run_action_batch
+from .command_parser import parse_command
+
+logger = logging.getLogger(__name__)
+
+PLAYER_ACTION_LIMIT = int(os.getenv("PLAYER_ACTION_LIMIT", "10"))
+ACTION_CYCLE = timedelta(hours=6)
+
+INBOX_MAX_GROUP = int(os.getenv("INBOX_MAX_GROUP", "500"))
+INBOX_APPEND_TIMEOUT_SECONDS = float(os.getenv("INBOX_APPEND_TIMEOUT_SECONDS", "5"))
+INBOX_SEEN_CACHE = int(os.getenv("INBOX_SEEN_CACHE", "10000"))
+INBOX_BATCH_SIZE = int(os.getenv("INBOX_BATCH_SIZE", "200"))
+INBOX_POLL_SECONDS = float(os.getenv("INBOX_POLL_SECONDS", "0.5"))
+INBOX_LEASE_SECONDS = float(os.getenv("INBOX_LEASE_SECONDS", "60"))
+INBOX_MAX_ATTEMPTS = int(os.getenv("INBOX_MAX_ATTEMPTS", "5"))
+
+QUEUED = "queued"
+DUPLICATE = "duplicate"
+
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+REJECTED = "rejected"
+FAILED = "failed"
+
+ACCEPTED_REPLY = "Ação registrada com sucesso!"
+LIMIT_REPLY = "Limite de ações deste ciclo atingido"
+
+_table = WebhookMessage.__table__
+
+
+def consume_action_quota(player: Player, now: datetime) -> bool:
+    """Conta uma ação no ciclo de 6h do jogador; False se o limite do ciclo já foi atingido."""
+    if player.cycle_start + ACTION_CYCLE <= now:
+        player.cycle_start = now
+        player.actions_count = 0
+    if player.actions_count >= PLAYER_ACTION_LIMIT:
+        return False
+    player.actions_count += 1
+    return True
+
+
+def _insert_statement(dialect_name: str):
+    if dialect_name == "postgresql":
+        stmt = pg_insert(_table)
+    elif dialect_name == "sqlite":
+        stmt = sqlite_insert(_table)
+    else:
+        raise ValueError(f"Caixa de entrada sem suporte ao banco {dialect_name}")
+    return stmt.on_conflict_do_nothing(index_elements=["provider_message_id"]).returning(_table.c.provider_message_id)
+
+
+class _Pending:
+    __slots__ = ("row", "event", "status", "error")
+
+    def __init__(self, row: dict):
+        self.row = row
+        self.event = threading.Event()
+        self.status: Optional[str] = None
+        self.error: Optional[Exception] = None
+
+
+class WebhookInbox:
+    """Gravação (group commit) e consumo em lote das mensagens de webhook."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        self.session_factory = session_factory
+        self._cond = threading.Condition()
+        self._queue: List[_Pending] = []
+        self._writer: Optional[threading.Thread] = None
+        self._consumer: Optional[threading.Thread] = None
+        self._stopping = False
+        self._wake = threading.Event()
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._seen_lock = threading.Lock()
+        self._ack_ms = deque(maxlen=1000)
+        self._grouped = 0
+        self._counters = {"queued": 0, "duplicates": 0, "groups": 0, "consumed": 0,
+                          "accepted": 0, "rejected": 0, "failed": 0}
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            from ..db import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    # Gravação
+
+    def _seen_before(self, message_id: str) -> bool:
+        with self._seen_lock:
+            if message_id in self._seen:
+                self._seen.move_to_end(message_id)
+                return True
+            return False
+
+    def _remember(self, message_id: str) -> None:
+        with self._seen_lock:
+            self._seen[message_id] = None
+            self._seen.move_to_end(message_id)
+            while len(self._seen) > INBOX_SEEN_CACHE:
+                self._seen.popitem(last=False)
+
+    def append(self, message_id: str, payload: dict, phone_number: Optional[str] = None) -> str:
+        """
+        Grava a mensagem de forma durável (retorna após o COMMIT).
+
+        Returns:
+            str: "queued" para mensagem nova, "duplicate" para reentrega
+
+        Raises:
+            RuntimeError: a gravação falhou ou não terminou em INBOX_APPEND_TIMEOUT_SECONDS
+        """
+        started = time.perf_counter()
+        if self._seen_before(message_id):
+            self._count(DUPLICATE, started)
+            return DUPLICATE
+        pending = _Pending({"provider_message_id": message_id, "phone_number": phone_number,
+                            "payload": payload, "status": PENDING, "attempts": 0})
+        with self._cond:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="inbox-writer", daemon=True)
+                self._writer.start()
+            self._queue.append(pending)
+            self._cond.notify_all()
+        if not pending.event.wait(INBOX_APPEND_TIMEOUT_SECONDS):
+            raise RuntimeError("Tempo esgotado ao gravar a mensagem")
+        if pending.error is not None:
+            raise RuntimeError(f"Falha ao gravar a mensagem: {pending.error}")
+        self._remember(message_id)
+        self._count(pending.status, started)
+        return pending.status
+
+    def _count(self, status: str, started: float) -> None:
+        with self._cond:
+            self._counters["queued" if status == QUEUED else "duplicates"] += 1
+            self._ack_ms.append((time.perf_counter() - started) * 1000)
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                group = self._queue[:INBOX_MAX_GROUP]
+                del self._queue[:INBOX_MAX_GROUP]
+            try:
+                self._write_group(group)
+            except Exception as e:
+                # A thread de escrita é única: uma falha inesperada derruba só este grupo
+                logger.error(f"Erro na thread de escrita da caixa de entrada: {e}")
+                for pending in group:
+                    if not pending.event.is_set():
+                        pending.error = e
+                        pending.event.set()
+
+    def _write_group(self, group: List[_Pending]) -> None:
+        rows: Dict[str, dict] = {}
+        for pending in group:
+            rows.setdefault(pending.row["provider_message_id"], pending.row)
+        error = None
+        inserted = set()
+        db = None
+        try:
+            db = self._session()
+            inserted = set(db.execute(_insert_statement(db.get_bind().dialect.name), list(rows.values())).scalars())
+            db.commit()
+        except Exception as e:
+            if db is not None:
+                db.rollback()
+            error = e
+            logger.error(f"Falha ao gravar {len(group)} mensagens na caixa de entrada: {e}")
+        finally:
+            if db is not None:
+                db.close()
+        with self._cond:
+            self._counters["groups"] += 1
+            self._grouped += len(group)
+        new = bool(inserted)
+        for pending in group:
+            message_id = pending.row["provider_message_id"]
+            pending.error = error
+            # A primeira ocorrência de um id no grupo é a inserida; as demais são reentregas
+            pending.status = QUEUED if message_id in inserted else DUPLICATE
+            inserted.discard(message_id)
+            pending.event.set()
+        if new:
+            self._wake.set()
+
+    # Consumo
+
+    def _claim(self, db: Session, now: datetime) -> List[dict]:
+        lease_cutoff = now - timedelta(seconds=INBOX_LEASE_SECONDS)
+        eligible = (
+            select(_table.c.id)
+            .where((_table.c.status == PENDING)
+                   | ((_table.c.status == PROCESSING) & (_table.c.claimed_at < lease_cutoff)))
+            .order_by(_table.c.id)
+            .limit(INBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        rows = db.execute(
+            update(_table)
+            .where(_table.c.id.in_(eligible.scalar_subquery()))
+            .values(status=PROCESSING, claimed_at=now, attempts=_table.c.attempts + 1)
+            .returning(_table.c.id, _table.c.payload, _table.c.attempts)
+        ).mappings().all()
+        db.commit()
+        return sorted(rows, key=lambda row: row["id"])
+
+    def process(self, db: Session, rows: List[dict], now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Interpreta e executa as mensagens reivindicadas em uma única transação.
+
+        Returns:
+            Dict[str, int]: Mensagens aceitas e rejeitadas
+        """
+        now = now or datetime.now()
+        parsed = {row["id"]: parse_command(row["payload"].get("message"), row["payload"].get("command"),
+                                           row["payload"].get("terrain_id"), row["payload"].get("tool_key"))
+                  for row in rows}
+        terrain_ids = {p.terrain_id for p in parsed.values() if p.ok}
+        owners = {}
+        if terrain_ids:
+            owners = {terrain_id: player for terrain_id, player in db.execute(
+                select(Terrain.id, Player).join(Player, Player.id == Terrain.player_id).where(Terrain.id.in_(terrain_ids))
+            ).all()}
+
+        results: Dict[int, tuple] = {}
+        actions: List[ToolUse] = []
+        for row in rows:
+            command = parsed[row["id"]]
+            if not command.ok:
+                results[row["id"]] = (REJECTED, command.error)
+            elif command.terrain_id not in owners:
+                results[row["id"]] = (REJECTED, f"Terreno {command.terrain_id} não encontrado")
+            elif not consume_action_quota(owners[command.terrain_id], now):
+                results[row["id"]] = (REJECTED, LIMIT_REPLY)
+            else:
+                results[row["id"]] = (DONE, ACCEPTED_REPLY)
+                actions.append(ToolUse(action_name=command.action, terrain_id=command.terrain_id,
+                                       tool_key=command.tool_key))
+
+        by_result: Dict[tuple, List[int]] = {}
+        for row_id, result in results.items():
+            by_result.setdefault(result, []).append(row_id)
+        for (status, reply), row_ids in by_result.items():
+            db.execute(update(_table).where(_table.c.id.in_(row_ids))
+                       .values(status=status, reply=reply, processed_at=now))
+        if actions:
+            # Executa as ações e faz o COMMIT de tudo (contadores, respostas e ações) junto
+            run_action_batch(db, actions)
+        else:
+            db.commit()
+        counters = {"accepted": len(actions), "rejected": len(rows) - len(actions)}
+        with self._cond:
+            self._counters["accepted"] += counters["accepted"]
+            self._counters["rejected"] += counters["rejected"]
+        return counters
+
+    def _release(self, db: Session, rows: List[dict], now: datetime) -> None:
+        """Devolve as mensagens à fila (ou marca como falha após INBOX_MAX_ATTEMPTS)."""
+        for row in rows:
+            status = FAILED if row["attempts"] >= INBOX_MAX_ATTEMPTS else PENDING
+            db.execute(update(_table).where(_table.c.id == row["id"])
+                       .values(status=status, processed_at=now if status == FAILED else None))
+            if status == FAILED:
+                with self._cond:
+                    self._counters["failed"] += 1
+        db.commit()
+
+    def consume_once(self, now: Optional[datetime] = None) -> int:
+        """Processa um lote de mensagens pendentes. Retorna o número de mensagens reivindicadas."""
+        now = now or datetime.now()
+        db = self._session()
+        try:
+            rows = self._claim(db, now)
+            if not rows:
+                return 0
+            try:
+                self.process(db, rows, now)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Falha ao processar lote de {len(rows)} mensagens: {e}")
+                # Isola a mensagem problemática: reprocessa uma a uma
+                for row in rows:
+                    try:
+                        self.process(db, [row], now)
+                    except Exception as row_error:
+                        db.rollback()
+                        logger.error(f"Falha ao processar a mensagem {row['id']}: {row_error}")
+                        self._release(db, [row], now)
+            with self._cond:
+                self._counters["consumed"] += len(rows)
+            return len(rows)
+        finally:
+            db.close()
+
+    def _consume_loop(self) -> None:
+        while not self._stopping:
+            try:
+                claimed = self.consume_once()
+            except Exception as e:
+                logger.error(f"Erro no consumidor da caixa de entrada: {e}")
+                claimed = 0
+            if not claimed:
+                self._wake.wait(INBOX_POLL_SECONDS)
+                self._wake.clear()
+
+    def start(self, session_factory: Optional[Callable[[], Session]] = None) -> None:
+        """Inicia a thread consumidora (startup da aplicação), opcionalmente com a fábrica de sessões do app."""
+        if session_factory is not None:
+            self.session_factory = session_factory
+        if self._consumer is None or not self._consumer.is_alive():
+            self._stopping = False
+            self._consumer = threading.Thread(target=self._consume_loop, name="inbox-consumer", daemon=True)
+            self._consumer.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping = True
+        self._wake.set()
+        if self._consumer is not None:
+            self._consumer.join(timeout)
+
+    def metrics(self) -> dict:
+        """Contadores e latência da confirmação (últimas 1000 mensagens)."""
+        with self._cond:
+            acks = sorted(self._ack_ms)
+            groups = self._counters["groups"]
+            return {
+                **self._counters,
+                "waiting": len(self._queue),
+                "avg_group_size": round(self._grouped / groups, 2) if groups else 0.0,
+                "ack_p50_ms": round(acks[len(acks) // 2], 3) if acks else 0.0,
+                "ack_p99_ms": round(acks[int(len(acks) * 0.99)], 3) if acks else 0.0,
+            }
+
+
+webhook_inbox = WebhookInbox()
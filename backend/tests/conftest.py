@@ -1,14 +1,28 @@
 # backend/tests/conftest.py
 
+import asyncio
 import sys
 import os
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
 from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from datetime import timedelta, datetime
 from src.db import Base, build_engine, build_session, get_async_db, get_db_override
+from src.engine_config import engine_options, instrument_engine, to_async_url
+# Registra todos os modelos, inclusive os que src.models não reexporta, para que os
+# relacionamentos se resolvam mesmo quando um único arquivo de teste é executado
+from src import models  # noqa: F401
+import src.models.character  # noqa: F401
+import src.models.input  # noqa: F401
+import src.models.player_profile  # noqa: F401
+import src.models.player_progress  # noqa: F401
+import src.models.player_settings  # noqa: F401
+import src.models.quadrant  # noqa: F401
+import src.models.season  # noqa: F401
+import src.models.user  # noqa: F401
 from src.main import app
 from src.crud.user import create_user
 from src.schemas.user import UserCreate, UserOut
@@ -63,6 +77,45 @@ AsyncTestingSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+@pytest.fixture
+def make_db_engine(tmp_path):
+    """
+    Cria engines síncronos sobre arquivos SQLite do teste (um por nome, em tmp_path), com todas
+    as tabelas criadas e o mesmo pool e pragmas da aplicação (src.engine_config).
+    """
+    engines = []
+
+    def make(name="test.db"):
+        url = f"sqlite:///{tmp_path / name}"
+        engine = create_engine(url, **engine_options(url, name="test"))
+        instrument_engine(engine, "test")
+        Base.metadata.create_all(bind=engine)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+@pytest.fixture
+def db_engine(make_db_engine):
+    """Engine síncrono sobre o banco SQLite exclusivo do teste."""
+    return make_db_engine()
+
+@pytest.fixture
+def session_factory(db_engine):
+    """Fábrica de sessões síncronas sobre `db_engine`."""
+    return sessionmaker(bind=db_engine)
+
+@pytest.fixture
+def async_session_factory(db_engine):
+    """Fábrica de sessões assíncronas (aiosqlite) sobre o mesmo arquivo de `db_engine`."""
+    url = to_async_url(db_engine.url.render_as_string(hide_password=False))
+    engine = create_async_engine(url, **engine_options(url, name="test-async", is_async=True))
+    instrument_engine(engine.sync_engine, "test-async")
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
 @pytest.fixture(scope="function", autouse=True)
 async def init_db():
     # Import all models to ensure they are registered with the Base metadata
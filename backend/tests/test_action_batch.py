@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src.models.action import Action
+from src.models.player import Player
+from src.models.terrain import Terrain
+from src.models.terrain_parameters import TerrainParameters
+from src.models.tool import Tool
+from src.schemas.tool_use import ToolUse
+from src.services import current_weather
+from src.services.action_batch import run_action_batch
+from src.services.action_registry import TerrainDelta, registry
+from src.services.tool_effects import tool_table
+
+ACTIONS = [
+    ToolUse(action_name="plantar", terrain_id=1, tool_key="pa"),
+    ToolUse(action_name="plantar", terrain_id=2),
+    ToolUse(action_name="regar", terrain_id=1),
+    ToolUse(action_name="colher", terrain_id=1),
+    ToolUse(action_name="plantar", terrain_id=1, tool_key="pa"),
+]
+
+
+def _seed(Session):
+    with Session() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=5.0),
+            Terrain(id=1, player_id=1, name="Sítio"),
+            Terrain(id=2, player_id=1, name="Roça"),
+            TerrainParameters(terrain_id=1, coverage=5, regeneration_cycles=0, soil_moisture=0,
+                              fertility=0, organic_matter=0, compaction=10, biodiversity=0),
+            Tool(key="pa", common_name="Pá", description="", task_type="escavar", efficiency=1.0,
+                 durability=10, compatible_with=[], effects={"coverage": 5, "compaction": -1}),
+        ])
+        db.commit()
+    return Session
+
+
+@pytest.fixture
+def Session(session_factory):
+    return _seed(session_factory)
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    tool_table.clear()
+    current_weather.clear()
+    yield
+    tool_table.clear()
+    current_weather.clear()
+
+
+def _snapshot(db):
+    params = {p.terrain_id: (p.coverage, p.regeneration_cycles, p.compaction)
+              for p in db.execute(select(TerrainParameters)).scalars()}
+    return params, db.execute(select(Player.balance)).scalar_one()
+
+
+def test_delta_composition():
+    delta = TerrainDelta(adds={"coverage": 10}).then(TerrainDelta(sets={"coverage": 0}, balance=3))
+    delta = delta.then(TerrainDelta(adds={"coverage": 4, "regeneration_cycles": 1}))
+    assert delta.sets == {"coverage": 4}
+    assert delta.adds == {"regeneration_cycles": 1}
+    assert delta.balance == 3
+    assert delta.apply({"coverage": 7, "regeneration_cycles": 2}) == {"coverage": 4, "regeneration_cycles": 3}
+
+
+def test_batch_matches_sequential_actions_in_one_transaction(db_engine, Session, make_db_engine):
+    SeqSession = _seed(sessionmaker(bind=make_db_engine("seq.db")))
+    with SeqSession() as db:
+        for action in ACTIONS:
+            params = db.execute(
+                select(TerrainParameters).where(TerrainParameters.terrain_id == action.terrain_id)
+            ).scalar_one_or_none()
+            if params is None:
+                params = TerrainParameters(terrain_id=action.terrain_id, coverage=0, regeneration_cycles=0,
+                                           soil_moisture=0, fertility=0, organic_matter=0, compaction=0)
+                db.add(params)
+                db.commit()
+            registry.handle(action.action_name, db, action.terrain_id, params, action.tool_key)
+        expected = _snapshot(db)
+    tool_table.clear()
+
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda conn, cursor, stmt, *args: statements.append(stmt))
+    commits = []
+    event.listen(db_engine, "commit", lambda conn: commits.append(1))
+    with Session() as db:
+        reports = run_action_batch(db, ACTIONS)
+        assert _snapshot(db) == expected
+        assert db.scalar(select(func.count(Action.id))) == len(ACTIONS)
+
+    assert len(commits) == 1
+    assert len([s for s in statements if s.startswith("INSERT INTO actions")]) == 1
+    assert len([s for s in statements if s.startswith("UPDATE terrain_parameters")]) == 2
+    assert len([s for s in statements if s.startswith("UPDATE players")]) == 1
+    # colher credita a cobertura acumulada até ela: 5 + 10 (plantar) + 5 (pá)
+    assert reports[3]["credited"] == 20
+    assert reports[3]["changes"] == {"coverage": 0}
+    assert tool_table.pending() == {"pa": 2}
+
+
+def test_batch_rejects_actions_without_delta(Session):
+    with Session() as db:
+        with pytest.raises(ValueError, match="aplicar_insumo"):
+            run_action_batch(db, [ToolUse(action_name="aplicar_insumo", terrain_id=1)])
+        with pytest.raises(ValueError, match="Terrenos não encontrados: 9"):
+            run_action_batch(db, [ToolUse(action_name="regar", terrain_id=9)])
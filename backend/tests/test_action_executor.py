@@ -0,0 +1,98 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.climate_condition import ClimateCondition
+from src.services import current_weather
+from src.services.action_executor import ActionExecutor
+
+
+class FakeSession:
+    def __init__(self, log):
+        self.log = log
+        log.append("open")
+
+    def close(self):
+        self.log.append("close")
+
+
+def test_failed_attempt_is_rescheduled_without_blocking_caller():
+    log = []
+    calls = []
+    done = threading.Event()
+
+    def run(db, action_name, terrain_id, tool_key):
+        calls.append(threading.current_thread().name)
+        if len(calls) < 3:
+            raise RuntimeError("database is locked")
+        done.set()
+
+    executor = ActionExecutor(run, session_factory=lambda: FakeSession(log), base_delay=0.05,
+                              max_delay=0.05, rng=lambda: 0.5)
+    try:
+        assert executor.execute("plantar", 1) is False
+        # A primeira tentativa roda na thread de quem chama e a sessão é fechada antes da espera
+        assert log == ["open", "close"]
+        assert executor.drain(timeout=5)
+        assert done.is_set()
+        assert all(name.startswith("action-worker") for name in calls[1:])
+        assert log == ["open", "close"] * 3
+        metrics = executor.metrics()
+        assert metrics["attempts"] == 3
+        assert metrics["retried"] == 2 and metrics["succeeded"] == 1 and metrics["failed"] == 0
+        assert [m["outcome"] for m in metrics["recent"]] == ["retry", "retry", "ok"]
+        assert metrics["recent"][0]["retry_in_s"] == 0.025
+        assert "database is locked" in metrics["recent"][0]["error"]
+    finally:
+        executor.shutdown(timeout=1)
+
+
+def test_gives_up_after_max_attempts():
+    def run(db, action_name, terrain_id, tool_key):
+        raise RuntimeError("boom")
+
+    executor = ActionExecutor(run, session_factory=lambda: FakeSession([]), max_attempts=2,
+                              base_delay=0.01, rng=lambda: 1.0)
+    try:
+        executor.submit("regar", 1, "regador")
+        assert executor.drain(timeout=5)
+        metrics = executor.metrics()
+        assert [m["outcome"] for m in metrics["recent"]] == ["retry", "failed"]
+        assert metrics["pending"] == 0 and metrics["scheduled"] == 0
+    finally:
+        executor.shutdown(timeout=1)
+
+
+def test_backoff_is_capped_full_jitter():
+    executor = ActionExecutor(lambda *args: None, base_delay=1.0, max_delay=5.0, rng=lambda: 1.0)
+    assert [executor.backoff(n) for n in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+
+
+@pytest.fixture
+def db(session_factory):
+    current_weather.clear()
+    with session_factory() as session:
+        yield session
+    current_weather.clear()
+
+
+def test_current_weather_reads_latest_then_uses_cache(db):
+    now = datetime(2026, 10, 19, 12, 0)
+    db.add_all([
+        ClimateCondition(name="chuva", timestamp=now),
+        ClimateCondition(name="seca", timestamp=now - timedelta(days=1)),
+    ])
+    db.commit()
+    assert current_weather.current_weather(db).name == "chuva"
+
+    # Condição registrada por outro escritor só aparece depois do TTL ou de set_current
+    newer = ClimateCondition(name="seca", timestamp=now + timedelta(hours=1))
+    db.add(newer)
+    db.commit()
+    assert current_weather.current_weather(db).name == "chuva"
+    current_weather.set_current(newer)
+    assert current_weather.current_weather(db).name == "seca"
+    # Uma condição mais antiga não substitui a atual
+    current_weather.set_current(ClimateCondition(id=99, name="chuva", timestamp=now))
+    assert current_weather.current_weather(db).name == "seca"
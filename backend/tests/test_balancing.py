@@ -0,0 +1,58 @@
+import csv
+
+import pytest
+
+from src.services.balancing import apply_overrides, run_sweep, sweep_grid, write_results
+
+SMALL = {"terrains": 3, "plantings_per_terrain": 4, "days": 20}
+
+
+def test_overrides_reach_rules_species_and_effects():
+    scenario, rules, species, effects = apply_overrides({
+        "days": 10,
+        "deterioration.soil_moisture": 4,
+        "season.inverno.germination_factor": 2,
+        "climate.seca.probability": 0.5,
+        "climate.seca.soil_moisture": 20,
+        "input.água.soil_moisture.quantity_factor": 1.5,
+        "species.Zea_mays.germinacao_dias": 3,
+        "season_duration_days": 10,
+    })
+    assert scenario["days"] == 10
+    assert rules.deterioration["soil_moisture"] == 4.0
+    assert dict(rules.seasons)["inverno"]["germination_factor"] == 2.0
+    assert rules.climate_conditions["seca"]["probability"] == 0.5
+    assert rules.climate_conditions["seca"]["effects"]["soil_moisture"]["change"] == 20.0
+    assert rules.season_duration_days == 10
+    assert effects["effects"]["água"]["soil_moisture"]["quantity_factor"] == 1.5
+    assert species["Zea_mays"]["germinacao_dias_scaled"] == 3.0
+
+    # As constantes do jogo não são alteradas
+    _, default_rules, _, _ = apply_overrides({})
+    assert default_rules.climate_conditions["seca"]["probability"] != 0.5
+
+    with pytest.raises(ValueError):
+        apply_overrides({"climate.granizo.probability": 0.1})
+    with pytest.raises(ValueError):
+        apply_overrides({"deterioration.ph": 1})
+
+
+def test_sweep_is_reproducible_and_responds_to_parameters(tmp_path):
+    combinations = sweep_grid({**{key: [value] for key, value in SMALL.items()}, "water_probability": [0.0, 1.0]})
+    runs, species = run_sweep(combinations, replicates=2, seed=5, workers=1)
+    again, _ = run_sweep(combinations, replicates=2, seed=5, workers=1)
+    assert runs == again
+    assert [(row["scenario"], row["seed"]) for row in runs] == [(0, 5), (0, 6), (1, 5), (1, 6)]
+
+    dry, watered = runs[0], runs[2]
+    assert dry["harvested"] == 0 and dry["died"] > 0 and dry["input_spend"] > 0
+    assert watered["died"] < dry["died"]
+    assert watered["input_spend"] > dry["input_spend"]
+    assert {row["species"] for row in species if row["scenario"] == 0 and row["seed"] == 5}
+
+    paths = write_results(runs, species, ["water_probability"], str(tmp_path))
+    with open(paths[2], newline="", encoding="utf-8") as f:
+        summary = list(csv.DictReader(f))
+    assert [row["water_probability"] for row in summary] == ["0.0", "1.0"]
+    assert summary[0]["replicates"] == "2"
+    assert "survival_rate_mean" in summary[0]
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src.models.planting import Planting
+from src.models.player import Player
+from src.models.quadrant import Quadrant
+from src.models.species import Species
+from src.models.terrain import Terrain
+from src.schemas.planting import BulkAutoFill, BulkPlantingCreate, BulkPlantingEntry
+from src.services import planting_engine
+from src.services.planting_engine import bulk_plant, bulk_plant_async, lowest_free_slot
+from src.services.slot_occupancy import occupancy
+
+
+def _species(id, key):
+    return Species(id=id, key=key, common_name=key, germinacao_dias=5, maturidade_dias=30,
+                   agua_diaria_min=1.0, espaco_m2=1.0, rendimento_unid=1, tolerancia_seca="media")
+
+
+@pytest.fixture
+def engine(db_engine):
+    occupancy.clear()
+    with sessionmaker(bind=db_engine)() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Terrain(id=1, player_id=1, name="Sítio"),
+            Quadrant(id=1, terrain_id=1, label="A1"),
+            Quadrant(id=2, terrain_id=1, label="A2"),
+            _species(1, "ipe"),
+            Planting(player_id=1, quadrant_id=1, slot_index=0, species_id=1),
+            Planting(player_id=1, quadrant_id=1, slot_index=2, species_id=1),
+        ])
+        db.commit()
+    yield db_engine
+    occupancy.clear()
+
+
+def test_lowest_free_slot_skips_occupied_bits():
+    assert lowest_free_slot(0b101) == 1
+    assert lowest_free_slot(0) == 0
+    assert lowest_free_slot((1 << planting_engine.SLOTS_PER_QUADRANT) - 1) is None
+
+
+def test_bulk_plant_allocates_in_one_insert_and_reports_conflicts(engine):
+    inserts = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: inserts.append(stmt) if stmt.startswith("INSERT") else None)
+    request = BulkPlantingCreate(
+        player_id=1,
+        entries=[
+            BulkPlantingEntry(quadrant_id=1, slot_index=2, species_id=1),
+            BulkPlantingEntry(quadrant_id=1, slot_index=5, species_id=1),
+            BulkPlantingEntry(quadrant_id=1, slot_index=99, species_id=1),
+            BulkPlantingEntry(quadrant_id=9, species_id=1),
+            BulkPlantingEntry(quadrant_id=1, species_id=7),
+        ],
+        auto_fill=[BulkAutoFill(quadrant_id=1, species_id=1, count=3)],
+    )
+    with sessionmaker(bind=engine)() as db:
+        out = bulk_plant(db, request)
+
+    assert [r.status for r in out.results] == [
+        "conflict", "created", "invalid", "invalid", "invalid", "created", "created", "created",
+    ]
+    assert [r.slot_index for r in out.results[5:]] == [1, 3, 4]
+    assert out.created == 4 and out.conflicts == 1
+    assert len(inserts) == 1
+    with sessionmaker(bind=engine)() as db:
+        slots = db.execute(select(Planting.slot_index).where(Planting.quadrant_id == 1)).scalars().all()
+        assert sorted(slots) == [0, 1, 2, 3, 4, 5]
+        assert {r.planting_id for r in out.results if r.status == "created"} <= set(
+            db.execute(select(Planting.id)).scalars().all()
+        )
+
+
+def test_auto_fill_stops_when_quadrant_is_full(engine):
+    request = BulkPlantingCreate(
+        player_id=1, auto_fill=[BulkAutoFill(quadrant_id=2, species_id=1, count=planting_engine.SLOTS_PER_QUADRANT + 2)]
+    )
+    with sessionmaker(bind=engine)() as db:
+        out = bulk_plant(db, request)
+        assert out.created == planting_engine.SLOTS_PER_QUADRANT
+        assert out.conflicts == 2
+        assert db.scalar(select(func.count(Planting.id)).where(Planting.quadrant_id == 2)) == out.created
+
+
+def test_unique_constraint_catches_concurrent_planting(engine, monkeypatch):
+    # Simula um plantio concorrente no slot 1 depois da leitura do bitmap
+    original = planting_engine.allocate
+
+    def allocate_then_race(*args):
+        allocated = original(*args)
+        with sessionmaker(bind=engine)() as other:
+            other.add(Planting(player_id=1, quadrant_id=1, slot_index=1, species_id=1))
+            other.commit()
+        return allocated
+
+    monkeypatch.setattr(planting_engine, "allocate", allocate_then_race)
+    request = BulkPlantingCreate(player_id=1, auto_fill=[BulkAutoFill(quadrant_id=1, species_id=1, count=2)])
+    with sessionmaker(bind=engine)() as db:
+        out = bulk_plant(db, request)
+    assert [(r.slot_index, r.status) for r in out.results] == [(1, "conflict"), (3, "created")]
+
+
+def test_bulk_plant_async_and_validation(engine, async_session_factory):
+    async def run():
+        async with async_session_factory() as db:
+            out = await bulk_plant_async(db, BulkPlantingCreate(
+                player_id=1, entries=[BulkPlantingEntry(quadrant_id=2, slot_index=4, species_id=1)]
+            ))
+            with pytest.raises(ValueError):
+                await bulk_plant_async(db, BulkPlantingCreate(player_id=1))
+            with pytest.raises(ValueError):
+                await bulk_plant_async(db, BulkPlantingCreate(
+                    player_id=42, entries=[BulkPlantingEntry(quadrant_id=2, species_id=1)]
+                ))
+        return out
+
+    out = asyncio.run(run())
+    assert out.created == 1 and out.results[0].planting_id is not None
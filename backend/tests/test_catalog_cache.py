@@ -0,0 +1,72 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from src.db import get_async_db, get_async_db_override
+from src.models import Player, ShopItem
+from src.api.shop_item import router as shop_item_router
+from src.api.species import router as species_router
+from src.schemas.purchase import PurchaseCreate
+from src.services import catalog_cache
+from src.services.purchase_engine import execute_purchase
+
+
+@pytest.fixture
+def setup(db_engine):
+    catalog_cache.clear()
+    with sessionmaker(bind=db_engine)() as db:
+        db.add_all([Player(id=1, name="Ana", balance=100.0), ShopItem(id=1, name="Semente", price=10.0)])
+        db.commit()
+    app = FastAPI()
+    app.include_router(shop_item_router)
+    app.include_router(species_router)
+    app.dependency_overrides[get_async_db] = get_async_db_override(db_engine)
+    with TestClient(app) as client:
+        yield client, db_engine
+    catalog_cache.clear()
+
+
+def test_list_served_with_etag_and_304(setup):
+    client, _ = setup
+    first = client.get("/shop-items/")
+    assert first.status_code == 200
+    assert first.json()[0]["name"] == "Semente"
+    assert "max-age" in first.headers["Cache-Control"]
+    etag = first.headers["ETag"]
+
+    again = client.get("/shop-items/", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert catalog_cache.get_catalog(catalog_cache.SHOP_ITEMS).loads == 1
+
+
+def test_writer_invalidates_catalog_and_changes_etag(setup):
+    client, _ = setup
+    etag = client.get("/shop-items/").headers["ETag"]
+    assert client.post("/shop-items/", json={"name": "Adubo", "price": 3.0}).status_code == 200
+
+    refreshed = client.get("/shop-items/", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert [item["name"] for item in refreshed.json()] == ["Semente", "Adubo"]
+    assert refreshed.headers["ETag"] != etag
+
+
+def test_purchase_prices_from_cache(setup):
+    client, engine = setup
+    client.get("/shop-items/")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with sessionmaker(bind=engine)() as db:
+        purchase = execute_purchase(db, PurchaseCreate(player_id=1, shop_item_id=1, quantity=2))
+        assert purchase.total_price == pytest.approx(20.0)
+    assert not any(stmt.lstrip().upper().startswith("SELECT SHOP_ITEMS") for stmt in statements)
+
+
+def test_species_catalog_etag(setup):
+    client, _ = setup
+    response = client.get("/species/")
+    assert response.status_code == 200
+    assert client.get("/species/", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
@@ -0,0 +1,69 @@
+import os
+
+from src.services import command_parser
+from src.services.command_parser import closest, load_csv_actions, parse_command
+from src.services.tool_effects import load_tools_file
+
+
+def setup_function():
+    command_parser.reset()
+
+
+def test_parses_verb_terrain_and_tool():
+    parsed = parse_command("Regar no terreno 2 com o Regador!")
+    assert (parsed.action, parsed.terrain_id, parsed.tool_key) == ("regar", 2, "regador")
+    assert parsed.ok and not parsed.corrected
+
+    parsed = parse_command("colher t3")
+    assert (parsed.action, parsed.terrain_id, parsed.tool_key) == ("colher", 3, None)
+
+
+def test_portuguese_synonyms_and_csv_actions():
+    assert parse_command("irrigar 4").action == "regar"
+    assert parse_command("semear 1 pá").tool_key == "pa"
+    # Ação da planilha sem handler: reconhecida, mas indisponível
+    assert parse_command("podar 1").error == "Ação 'podar' ainda não disponível pelo WhatsApp"
+    assert parse_command("aplicar_insumo 1").error == "Ação 'aplicar_insumo' ainda não disponível pelo WhatsApp"
+
+
+
+def test_actions_csv_is_packaged_with_the_backend():
+    # O CSV precisa estar dentro de backend/ (contexto da imagem Docker)
+    backend = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+    assert os.path.commonpath([backend, command_parser.ACTIONS_CSV]) == backend
+    assert os.path.isfile(command_parser.ACTIONS_CSV)
+    assert {"plantar", "podar", "queimar"} <= load_csv_actions()
+
+def test_typos_are_fuzzy_matched_and_cached():
+    parsed = parse_command("plnatar 1 facao")
+    assert (parsed.action, parsed.terrain_id, parsed.tool_key) == ("plantar", 1, "facao")
+    assert parsed.corrected
+    hits = closest.cache_info().hits
+    parse_command("plnatar 5")
+    assert closest.cache_info().hits == hits + 1
+
+
+def test_invalid_commands_get_an_instant_reply():
+    assert parse_command("invalido 3").error == "Comando 'invalido' não reconhecido"
+    assert parse_command("   ").error == "Envie um comando, por exemplo: regar 2"
+    assert parse_command("regar").error == "Informe o número do terreno, por exemplo: regar 2"
+    assert parse_command("regar 2 xyzzy").error == "Ferramenta 'xyzzy' não reconhecida"
+
+
+def test_explicit_fields_fill_missing_parts():
+    parsed = parse_command(None, command="plantar", terrain_id=7, tool_key="pa")
+    assert (parsed.action, parsed.terrain_id, parsed.tool_key) == ("plantar", 7, "pa")
+    assert parse_command("regar", terrain_id=5).terrain_id == 5
+
+
+def test_multi_word_tool_names_match_word_ngrams(monkeypatch):
+    tools = {**load_tools_file(), "enxada_manual": {"common_name": "Enxada manual"}, "enxada": {"common_name": "Enxada"}}
+    monkeypatch.setattr(command_parser, "load_tools_file", lambda: tools)
+
+    assert parse_command("plantar 1 com a enxada manual").tool_key == "enxada_manual"
+    assert parse_command("plantar 1 com a enxada").tool_key == "enxada"
+    parsed = parse_command("plantar com enxada manual no terreno 4")
+    assert (parsed.terrain_id, parsed.tool_key, parsed.corrected) == (4, "enxada_manual", False)
+    parsed = parse_command("plantar 1 enxda manual")
+    assert parsed.tool_key == "enxada_manual" and parsed.corrected
+    assert parse_command(None, command="plantar", terrain_id=2, tool_key="Enxada Manual").tool_key == "enxada_manual"
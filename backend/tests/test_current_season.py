@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from src.models.planting import Planting
+from src.models.player import Player
+from src.models.season import Season, SeasonType
+from src.models.species import Species
+from src.services import current_season
+from src.services.plant_lifecycle import tick_day
+from src.services.seasonality import (
+    SEASON_CONFIGS,
+    check_and_update_season,
+    create_new_season,
+    get_season_adjusted_deterioration_factors,
+)
+from src.services.soil_constants import DAILY_DETERIORATION_FACTORS
+
+
+@pytest.fixture
+def session(db_engine, session_factory, monkeypatch):
+    monkeypatch.setenv("TIME_SCALE_FACTOR", "1")
+    statements = []
+    event.listen(db_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    current_season.clear()
+    yield session_factory, statements
+    current_season.clear()
+
+
+def _season_queries(statements):
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT") and "FROM seasons" in s]
+
+
+def test_season_is_cached_until_transition(session):
+    Session, statements = session
+    with Session() as db:
+        assert check_and_update_season(db).name == SeasonType.VERAO
+        statements.clear()
+        assert check_and_update_season(db) is None
+        factors = get_season_adjusted_deterioration_factors(db)
+        assert _season_queries(statements) == []
+
+    verao = SEASON_CONFIGS[SeasonType.VERAO]
+    assert factors["soil_moisture"] == pytest.approx(DAILY_DETERIORATION_FACTORS["soil_moisture"] * verao["soil_moisture_factor"])
+
+    with Session() as db:
+        # Estação vencida: a transição cria o outono e atualiza o cache
+        db.query(Season).update({Season.start_date: datetime.utcnow() - timedelta(days=40)})
+        db.commit()
+        current_season.clear()
+        assert check_and_update_season(db).name == SeasonType.OUTONO
+        statements.clear()
+        assert current_season.current_season(db).name == SeasonType.OUTONO
+        assert _season_queries(statements) == []
+
+
+def test_growth_thresholds_follow_the_season(session):
+    Session, _ = session
+    with Session() as db:
+        base = current_season.growth_thresholds(db)["Zea_mays"]
+        create_new_season(db, SeasonType.INVERNO)
+        winter = current_season.growth_thresholds(db)["Zea_mays"]
+
+    inverno = SEASON_CONFIGS[SeasonType.INVERNO]
+    assert winter[0] == pytest.approx(base[0] * inverno["germination_factor"])
+    assert winter[1] == pytest.approx(base[1] * inverno["maturation_factor"])
+
+
+def test_tick_applies_seasonal_germination_without_season_queries(session):
+    Session, statements = session
+    with Session() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Species(id=1, key="Cajanus_cajan", common_name="Feijão guandu", germinacao_dias=12,
+                    maturidade_dias=120, agua_diaria_min=1, espaco_m2=1, rendimento_unid=20,
+                    tolerancia_seca="alta"),
+            # Germinaria no 12º dia; no inverno o limiar passa a 15,6 dias
+            Planting(id=1, species_id=1, player_id=1, quadrant_id=1, slot_index=0,
+                     current_state="SEMENTE", days_since_planting=11, days_sem_rega=0),
+        ])
+        db.commit()
+        create_new_season(db, SeasonType.INVERNO)
+
+    statements.clear()
+    tick_day(Session())
+    assert _season_queries(statements) == []
+    with Session() as db:
+        assert db.get(Planting, 1).current_state == "SEMENTE"
+
+    for _ in range(3):
+        tick_day(Session())
+    with Session() as db:
+        planting = db.get(Planting, 1)
+        assert planting.days_since_planting == 15
+        assert planting.current_state == "SEMENTE"
+    tick_day(Session())
+    with Session() as db:
+        assert db.get(Planting, 1).current_state == "MUDINHA"
@@ -0,0 +1,66 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from src.db import get_async_db, get_async_db_override
+from src.models import Player
+from src import db_replicas
+from src.db_replicas import ReplicaRouter, read_your_writes_middleware
+from src.api_async.player import router as player_router
+
+
+def make_db(make_db_engine, name, player_name):
+    engine = make_db_engine(name)
+    with sessionmaker(bind=engine)() as session:
+        session.add(Player(name=player_name, balance=10.0))
+        session.commit()
+    return engine
+
+
+@pytest.fixture
+def routed_client(make_db_engine, monkeypatch):
+    primary = make_db(make_db_engine, "primary.db", "Ana (primário)")
+    replica = make_db(make_db_engine, "replica.db", "Ana (réplica)")
+
+    router = ReplicaRouter([replica.url.render_as_string(hide_password=False)], max_lag=1.0,
+                           check_interval=0.0, sticky_seconds=60)
+    monkeypatch.setattr(db_replicas, "replica_router", router)
+
+    app = FastAPI()
+    app.include_router(player_router)
+    app.middleware("http")(read_your_writes_middleware)
+    app.dependency_overrides[get_async_db] = get_async_db_override(primary)
+    with TestClient(app) as client:
+        yield client, router
+
+
+def test_reads_go_to_replica(routed_client):
+    client, router = routed_client
+    response = client.get("/async/players/1")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Ana (réplica)"
+    assert router.replicas[0].reads == 1
+
+
+def test_read_your_writes_after_player_write(routed_client):
+    client, router = routed_client
+    response = client.put("/async/players/1", json={"name": "Ana Maria"})
+    assert response.status_code == 200
+
+    # Quem escreveu (player_id no path) lê do primário; os demais continuam na réplica
+    assert client.get("/async/players/1").json()["name"] == "Ana Maria"
+    assert client.get("/async/players/", headers={"X-Player-Id": "8"}).json()[0]["name"] == "Ana (réplica)"
+    assert router.sticky_reads == 1
+
+
+def test_lagging_replica_falls_back_to_primary(routed_client, monkeypatch):
+    client, router = routed_client
+
+    async def lagging():
+        return 30.0
+
+    monkeypatch.setattr(router.replicas[0], "measure_lag", lagging)
+    assert client.get("/async/players/1").json()["name"] == "Ana (primário)"
+    assert router.primary_reads == 1
+    assert router.status()["replicas"][0]["lag_s"] == 30.0
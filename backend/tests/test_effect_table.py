@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from src.services import effect_table as effect_table_module
+from src.services.effect_table import EffectTable, effect_table
+
+
+@pytest.fixture(autouse=True)
+def fresh_table():
+    effect_table_module.reset()
+    yield
+    effect_table_module.reset()
+
+
+def test_compiled_table_matches_data_file():
+    table = effect_table()
+    water, compost = table.row("água"), table.row("composto")
+    assert [table.params[p] for p in table.mask[compost]] == ["organic_matter", "fertility"]
+    assert table.resets[water] == ("days_sem_rega",)
+    assert table.effects_of("composto", 5) == {"organic_matter": pytest.approx(4.5), "fertility": pytest.approx(1.0)}
+    assert table.row("desconhecido") is None
+
+
+def test_batch_evaluation_and_clamp_vectors():
+    table = effect_table()
+    changes = table.changes([("água", 10), ("desconhecido", 1), ("fertilizante", 2)])
+    assert changes[1] is None
+    assert changes[0][table.index["soil_moisture"]] == pytest.approx(8.0)
+    totals = table.totals([("água", 10), ("fertilizante", 2), ("cobertura vegetal", 10)])
+    assert totals[table.index["soil_moisture"]] == pytest.approx(11.0)
+    assert totals[table.index["fertility"]] == pytest.approx(2.0)
+    clamped = table.clamp_vector([150.0] * len(table.params))
+    assert clamped[table.index["soil_ph"]] == 9.0 and clamped[table.index["fertility"]] == 100.0
+
+
+def test_hot_reload_on_file_change(tmp_path):
+    path = tmp_path / "effects.yml"
+    path.write_text("effects:\n  água:\n    soil_moisture: {base_effect: 0, quantity_factor: 1}\n", encoding="utf-8")
+    first = effect_table(str(path))
+    assert first.effects_of("água", 2) == {"soil_moisture": 2.0}
+    assert effect_table(str(path)) is first
+
+    path.write_text("effects:\n  água:\n    soil_moisture: {base_effect: 1, quantity_factor: 1}\n", encoding="utf-8")
+    os.utime(path, (first.source_mtime + 5, first.source_mtime + 5))
+    second = effect_table(str(path))
+    assert second.version == first.version + 1
+    assert second.effects_of("água", 2) == {"soil_moisture": 3.0}
+
+    # Arquivo inválido: mantém a última tabela válida
+    path.write_text("effects: [", encoding="utf-8")
+    os.utime(path, (first.source_mtime + 10, first.source_mtime + 10))
+    assert effect_table(str(path)) is second
+
+
+def test_parameters_without_limits_are_unbounded():
+    table = EffectTable({"effects": {"x": {"coverage": {"base_effect": 2}}}})
+    assert table.clamp_param("coverage", 500.0) == 500.0
@@ -1,9 +1,12 @@
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 import httpx
 import redis.asyncio as redis
 import src.api.eko as eko_module
 from src.main import app
+from src.models.player import Player
+from src.services.player_digest import clear_digest_cache
 
 class FakeResponse:
     def __init__(self, data):
@@ -48,6 +51,20 @@ def mock_httpx(monkeypatch):
 def client():
     return TestClient(app)
 
+@pytest.fixture
+def eko_client(session_factory, monkeypatch):
+    # Só o roteador do Eko, no prefixo usado pelo app (/api/v1/eko)
+    eko_app = FastAPI()
+    eko_app.include_router(eko_module.router, prefix="/api/v1")
+    opened = []
+    def counting_factory():
+        opened.append(1)
+        return session_factory()
+    monkeypatch.setattr(eko_module, "session_factory", counting_factory)
+    clear_digest_cache()
+    yield TestClient(eko_app), opened
+    clear_digest_cache()
+
 def test_eko_chat(client):
     payload = {
         "model": "test",
@@ -98,3 +115,35 @@ def test_eko_timeout(client, monkeypatch):
     response = client.post("/eko/", json=payload)
     assert response.status_code == 200
     assert response.json() == {"choices": [{"message": {"role": "eko", "content": "Serviço LLM indisponível. Tente novamente mais tarde."}}]}
+
+def test_player_digest_injected_as_system_message(eko_client, monkeypatch):
+    client, _ = eko_client
+    monkeypatch.setattr(eko_module, "cached_player_digest", lambda player_id, default=None: "Contexto do jogador Ana.")
+    payload = {"model": "test", "messages": [{"role": "player", "content": "Oi"}], "stream": False, "player_id": 1}
+    response = client.post("/api/v1/eko/", json=payload)
+    assert response.status_code == 200
+    sent = captured["jsons"][0]
+    assert sent["messages"][0] == {"role": "system", "content": "Contexto do jogador Ana."}
+    assert sent["messages"][1:] == payload["messages"]
+    assert "player_id" not in sent
+
+def test_digest_session_opened_only_on_cache_miss(eko_client, session_factory):
+    client, opened = eko_client
+    with session_factory() as db:
+        db.add(Player(id=1, name="Ana", balance=0.0))
+        db.commit()
+    payload = {"model": "test", "messages": [{"role": "player", "content": "Oi"}], "stream": False}
+
+    assert client.post("/api/v1/eko/", json=payload).status_code == 200
+    assert opened == []
+
+    for _ in range(2):
+        assert client.post("/api/v1/eko/", json={**payload, "player_id": 1}).status_code == 200
+    assert len(opened) == 1
+    assert "Ana" in captured["jsons"][-1]["messages"][0]["content"]
+
+    # Jogador inexistente: o resultado (sem digest) também fica em cache
+    for _ in range(2):
+        assert client.post("/api/v1/eko/", json={**payload, "player_id": 999}).status_code == 200
+    assert len(opened) == 2
+    assert captured["jsons"][-1]["messages"] == payload["messages"]
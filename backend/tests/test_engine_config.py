@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src import engine_config
+from src.config import settings
+from src.engine_config import (
+    InstrumentedQueuePool,
+    engine_options,
+    get_metrics,
+    instrument_engine,
+    pool_status,
+    resolve_database_url,
+    to_async_url,
+)
+
+
+def test_sqlite_file_engine_applies_pragmas_and_pool(tmp_path):
+    url = f"sqlite:///{tmp_path / 'pragmas.db'}"
+    options = engine_options(url, name="test-pragmas")
+    assert issubclass(options["poolclass"], InstrumentedQueuePool)
+    assert options["poolclass"].metrics_name == "test-pragmas"
+    assert options["pool_size"] == 5
+
+    engine = create_engine(url, **options)
+    instrument_engine(engine, "test-pragmas")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+        # NORMAL == 1
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+
+        status = pool_status(engine, "test-pragmas")
+        assert status["checked_out"] == 1
+        assert status["checkouts"] >= 1
+        assert status["connects"] == 1
+    engine.dispose()
+
+
+def test_checkouts_are_attributed_to_the_explicit_name(tmp_path):
+    url = f"sqlite:///{tmp_path / 'named.db'}"
+    options = engine_options(url, name="test-named")
+    options["pool_logging_name"] = "outro-nome"
+    engine = create_engine(url, **options)
+    before = get_metrics("test-named").snapshot()["checkouts"]
+    with engine.connect():
+        pass
+    # dispose() recria o pool com a mesma classe: o nome das métricas continua valendo
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert get_metrics("test-named").snapshot()["checkouts"] == before + 2
+    assert get_metrics("outro-nome").snapshot()["checkouts"] == 0
+    engine.dispose()
+
+
+def test_concurrent_increments_are_not_lost():
+    metrics = get_metrics("test-incr")
+
+    def bump():
+        for _ in range(10000):
+            metrics.incr("connects")
+            metrics.incr("invalidations")
+
+    threads = [threading.Thread(target=bump) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    snapshot = metrics.snapshot()
+    assert snapshot["connects"] == snapshot["invalidations"] == 80000
+
+
+def test_postgres_defaults_and_asyncpg_statement_cache():
+    options = engine_options("postgresql+asyncpg://u:p@db/novo_rio", name="test-pg", is_async=True)
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == 1800
+    assert options["connect_args"]["statement_cache_size"] == settings.ASYNCPG_STATEMENT_CACHE_SIZE
+
+
+def test_env_overrides_pool_defaults(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", False)
+    options = engine_options("postgresql://u:p@db/novo_rio", name="test-override")
+    assert options["pool_size"] == 3
+    assert options["pool_pre_ping"] is False
+
+
+def test_memory_sqlite_keeps_default_pool():
+    assert "poolclass" not in engine_options("sqlite:///:memory:", name="mem")
+    assert engine_options("sqlite+aiosqlite:///:memory:", name="mem", is_async=True) == {}
+
+
+def test_database_url_required_in_production(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", None)
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    with pytest.raises(RuntimeError):
+        resolve_database_url()
+    monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+    assert resolve_database_url() == settings.DEFAULT_DATABASE_URL
+
+
+def test_to_async_url():
+    assert to_async_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+    assert to_async_url("postgresql://u@h/db") == "postgresql+asyncpg://u@h/db"
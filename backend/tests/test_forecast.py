@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.action import Action
+from src.models.planting import Planting
+from src.models.player import Player
+from src.models.quadrant import Quadrant
+from src.models.species import Species
+from src.models.terrain import Terrain
+from src.models.terrain_parameters import TerrainParameters
+from src.schemas.forecast import ForecastOut, ForecastRequest
+from src.services import current_season, forecast
+from src.services.forecast import forecast_terrain_async, load_world, run_forecast
+from src.services.player_digest import bump_player_state_version
+
+
+@pytest.fixture
+def Session(session_factory, monkeypatch):
+    monkeypatch.setenv("TIME_SCALE_FACTOR", "1")
+    now = datetime.now()
+    with session_factory() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Species(id=1, key="Zea_mays", common_name="Milho", germinacao_dias=7, maturidade_dias=90,
+                    agua_diaria_min=2, espaco_m2=1, rendimento_unid=2, tolerancia_seca="baixa"),
+            Terrain(id=1, player_id=1, name="Sítio"),
+            TerrainParameters(terrain_id=1, soil_moisture=50.0, fertility=40, organic_matter=40,
+                              biodiversity=40, compaction=0, coverage=0, soil_ph=6.5),
+            Quadrant(id=1, terrain_id=1, label="A1", soil_moisture=50.0, organic_matter=40, biodiversity=40),
+            Quadrant(id=2, terrain_id=1, label="B1", soil_moisture=50.0, organic_matter=40, biodiversity=40),
+            Planting(id=1, player_id=1, quadrant_id=1, slot_index=0, species_id=1, days_since_planting=5),
+            # Regou em 7 dos últimos 14 dias
+            *[Action(player_id=1, terrain_id=1, action_name="water", timestamp=now - timedelta(days=2 * d, hours=1))
+              for d in range(7)],
+        ])
+        db.commit()
+    current_season.clear()
+    forecast.clear()
+    yield session_factory
+    forecast.clear()
+    current_season.clear()
+
+
+@pytest.fixture
+def forecast_terrain(Session, async_session_factory):
+    def run(request: ForecastRequest) -> dict:
+        async def main():
+            async with async_session_factory() as db:
+                return await forecast_terrain_async(db, 1, 1, request)
+        return asyncio.run(main())
+    return run
+
+
+def test_expected_forecast_applies_inputs_and_is_cached(Session, forecast_terrain):
+    request = ForecastRequest(days=10, inputs=[{"planting_id": 1, "type": "água", "quantity": 10}])
+    raw = forecast_terrain(request)
+    result = ForecastOut(**raw)
+    assert not result.cached and not result.truncated
+    assert result.water_probability == pytest.approx(0.5)
+    assert result.days == 10 and len(result.soil) == 11
+    # Dia 0 já inclui o insumo hipotético (+0.8 por unidade de água)
+    assert result.soil[0].values["soil_moisture"] == pytest.approx(58.0)
+    assert result.soil[10].values["soil_moisture"] < result.soil[0].values["soil_moisture"]
+    planting = result.plantings[0]
+    assert planting.current_state == "SEMENTE" and sum(planting.probabilities.values()) == pytest.approx(1.0)
+
+    again = forecast_terrain(request)
+    assert again["cached"] and again["soil"] == raw["soil"]
+    assert forecast.stats()["hits"] == 1
+
+    # Nova versão de estado do dono: recalcula
+    bump_player_state_version(1)
+    assert not forecast_terrain(request)["cached"]
+    with Session() as db:
+        assert db.get(TerrainParameters, 1).soil_moisture == 50.0
+
+
+def test_monte_carlo_percentiles_and_probabilities(forecast_terrain):
+    request = ForecastRequest(days=10, mode="monte_carlo", runs=30, seed=3, water_probability=0.9)
+    result = forecast_terrain(request)
+    assert result["runs"] == 30
+    for point in result["soil"]:
+        assert point["p10"]["soil_moisture"] <= point["values"]["soil_moisture"] <= point["p90"]["soil_moisture"]
+    probabilities = result["plantings"][0]["probabilities"]
+    assert sum(probabilities.values()) == pytest.approx(1.0)
+    # Tolerância baixa: um dia sem rega mata o plantio, o que acontece só em parte das execuções
+    assert 0 < probabilities.get("MORTA", 0) < 1
+    assert forecast_terrain(request) == {**result, "cached": True}
+
+
+def test_cpu_budget_truncates_and_inputs_are_validated(Session):
+    with Session() as db:
+        world = load_world(db, 1)
+    result = run_forecast(world, ForecastRequest(days=30, mode="monte_carlo", runs=10), owner_id=1, budget_ms=0)
+    assert result["truncated"]
+    assert result["runs"] == 1 and result["days"] == 1
+
+    # A chance de rega da requisição vale só para a previsão: o mundo (que pode estar em cache) não muda
+    result = run_forecast(world, ForecastRequest(days=1, water_probability=1.0), owner_id=1)
+    assert result["water_probability"] == 1.0
+    assert world.water_probability == {1: pytest.approx(0.5)}
+
+    with pytest.raises(ValueError):
+        run_forecast(world, ForecastRequest(inputs=[{"planting_id": 99, "type": "água", "quantity": 1}]), owner_id=1)
+    with pytest.raises(ValueError):
+        run_forecast(world, ForecastRequest(days=forecast.FORECAST_MAX_DAYS + 1), owner_id=1)
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import sessionmaker
+
+from src.models.action import Action
+from src.models.history_archive import HistoryArchive
+from src.models.plant_state_log import PlantStateLog
+from src.models.planting import Planting
+from src.models.player import Player
+from src.models.quadrant import Quadrant
+from src.models.terrain import Terrain
+from src.services import history_archive
+from src.services.history_archive import archive_history, iter_archived, prune_archive
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+@pytest.fixture
+def engine(db_engine, monkeypatch):
+    monkeypatch.setattr(history_archive, "HOT_DAYS", 30)
+    monkeypatch.setattr(history_archive, "ARCHIVE_BATCH", 7)
+    with sessionmaker(bind=db_engine)() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Terrain(id=1, player_id=1, name="Sítio"),
+            Quadrant(id=1, terrain_id=1, label="A1"),
+            Planting(id=1, player_id=1, quadrant_id=1, slot_index=0, species_id=1),
+        ])
+        for day in range(0, 100, 4):
+            ts = NOW - timedelta(days=day)
+            db.add(Action(player_id=1, terrain_id=1, action_name="water", timestamp=ts))
+            db.add(PlantStateLog(planting_id=1, from_state="SEMENTE", to_state="MUDINHA", timestamp=ts))
+        db.commit()
+    return db_engine
+
+
+def test_hot_lookup_has_composite_index(engine):
+    indexes = {ix["name"]: ix["column_names"] for ix in inspect(engine).get_indexes("actions")}
+    assert indexes["ix_actions_name_player_timestamp"] == ["action_name", "player_id", "timestamp"]
+
+
+def test_archiver_moves_old_rows_to_compressed_blocks(engine):
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        counters = archive_history(db, NOW)
+        cutoff = NOW - timedelta(days=30)
+        assert counters == {"actions": 17, "plant_state_logs": 17}
+        assert db.scalar(select(func.count(Action.id))) == 8
+        assert db.scalar(select(func.min(Action.timestamp))) >= cutoff
+        blocks = db.execute(select(HistoryArchive).where(HistoryArchive.source == "actions")).scalars().all()
+        # Lotes de 7 linhas, divididos por mês
+        assert sum(b.row_count for b in blocks) == 17
+        assert all(b.min_timestamp.month == b.max_timestamp.month == b.period_start.month for b in blocks)
+
+        rows = list(iter_archived(db, "actions", NOW - timedelta(days=60), cutoff))
+        assert len(rows) == 8 and all(row["action_name"] == "water" for row in rows)
+
+        # Nada mais a arquivar
+        assert archive_history(db, NOW) == {"actions": 0, "plant_state_logs": 0}
+
+
+def test_prune_archive_drops_whole_months(engine):
+    with sessionmaker(bind=engine)() as db:
+        archive_history(db, NOW)
+        before = db.scalar(select(func.count(HistoryArchive.id)))
+        assert prune_archive(db, datetime(2026, 8, 15)) > 0
+        remaining = db.execute(select(HistoryArchive.period_start)).scalars().all()
+        assert len(remaining) < before
+        assert all(period >= datetime(2026, 8, 1) for period in remaining)
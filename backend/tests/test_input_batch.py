@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src.models.input import Input
+from src.models.planting import Planting
+from src.models.player import Player
+from src.models.quadrant import Quadrant
+from src.models.terrain import Terrain
+from src.models.terrain_parameters import TerrainParameters
+from src.schemas.input import InputCreate, InputWithEffectsOut
+from src.services.input_batch import apply_inputs_batch, apply_inputs_batch_async
+
+
+@pytest.fixture
+def engine(db_engine):
+    with sessionmaker(bind=db_engine)() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Terrain(id=1, player_id=1, name="Sítio"),
+            TerrainParameters(terrain_id=1, soil_moisture=90.0, fertility=10),
+            Quadrant(id=1, terrain_id=1, label="A1", soil_moisture=90.0),
+            Quadrant(id=2, terrain_id=1, label="A2", soil_moisture=90.0),
+            Quadrant(id=3, terrain_id=1, label="B1", soil_moisture=20.0),
+            Planting(id=1, player_id=1, quadrant_id=1, slot_index=0, species_id=1, days_sem_rega=3),
+            Planting(id=2, player_id=1, quadrant_id=1, slot_index=1, species_id=1, days_sem_rega=1),
+            Planting(id=3, player_id=1, quadrant_id=2, slot_index=0, species_id=1),
+        ])
+        db.commit()
+    return db_engine
+
+
+def test_batch_sums_effects_clamps_once_and_propagates(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt.split()[0]))
+    inputs = [InputCreate(planting_id=pid, type="água", quantity=10) for pid in (1, 2, 3)]
+    inputs.append(InputCreate(planting_id=1, type="fertilizante", quantity=2))
+
+    with sessionmaker(bind=engine)() as db:
+        reports = apply_inputs_batch(db, inputs)
+
+    assert statements.count("SELECT") == 2
+    # Insumos e série do solo: um INSERT em lote cada
+    assert statements.count("INSERT") == 2
+    out = [InputWithEffectsOut(**report) for report in reports]
+    assert [o.planting_id for o in out] == [1, 2, 3, 1]
+    moisture = [(e.before, e.after, e.change) for o in out[:3] for e in o.effects]
+    assert moisture == [(90, 98, 8), (98, 100, 8), (100, 100, 8)]
+    assert out[0].plant_effects == {"days_sem_rega": {"before": 3, "after": 0, "change": -3}}
+    assert out[3].effects[0].after == pytest.approx(12.0)
+
+    with sessionmaker(bind=engine)() as db:
+        params = db.scalars(select(TerrainParameters)).one()
+        assert params.soil_moisture == pytest.approx(100.0)
+        assert db.get(Planting, 1).days_sem_rega == 0
+        assert db.scalar(select(func.count(Input.id))) == 4
+        # A1 subiu 10 (90 -> 100): B1 recebe 15% uma única vez
+        assert db.get(Quadrant, 3).soil_moisture == pytest.approx(21.5)
+
+
+def test_batch_rejects_unknown_planting_atomically(engine):
+    with sessionmaker(bind=engine)() as db:
+        with pytest.raises(ValueError, match="99"):
+            apply_inputs_batch(db, [InputCreate(planting_id=1, type="água", quantity=1),
+                                    InputCreate(planting_id=99, type="água", quantity=1)])
+        with pytest.raises(ValueError):
+            apply_inputs_batch(db, [])
+        assert db.scalar(select(func.count(Input.id))) == 0
+
+
+def test_batch_async(engine, async_session_factory):
+    async def run():
+        async with async_session_factory() as db:
+            reports = await apply_inputs_batch_async(db, [InputCreate(planting_id=3, type="composto", quantity=5)])
+        return reports
+
+    (report,) = asyncio.run(run())
+    assert report["quadrant_id"] == 2 and report["applied_at"] is not None
+    assert {e["parameter"] for e in report["effects"]} == {"organic_matter", "fertility"}
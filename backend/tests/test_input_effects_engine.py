@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import sessionmaker
+
+from src.crud.input import create_input, create_input_with_effects
+from src.crud_async.input import create_input_with_effects as create_input_with_effects_async
+from src.models.input import Input
+from src.models.planting import Planting
+from src.models.player import Player
+from src.models.quadrant import Quadrant
+from src.models.terrain import Terrain
+from src.models.terrain_parameters import TerrainParameters
+from src.schemas.input import InputCreate, InputWithEffectsOut
+from src.services.input_batch import apply_inputs_batch
+from src.services.input_effects import apply_input_effects, apply_input_effects_async
+
+
+@pytest.fixture
+def engine(db_engine):
+    with sessionmaker(bind=db_engine)() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Terrain(id=1, player_id=1, name="Sítio"),
+            TerrainParameters(terrain_id=1, soil_moisture=50.0, fertility=10),
+            Quadrant(id=1, terrain_id=1, label="A1", soil_moisture=50.0),
+            Quadrant(id=2, terrain_id=1, label="B1", soil_moisture=20.0),
+            Planting(id=1, player_id=1, quadrant_id=1, slot_index=0, species_id=1, days_sem_rega=4),
+        ])
+        db.commit()
+    return db_engine
+
+
+def _water():
+    return InputCreate(planting_id=1, type="água", quantity=10)
+
+
+def test_create_loads_context_once_and_returns_report(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt.split()[0]))
+
+    with sessionmaker(bind=engine)() as db:
+        out = InputWithEffectsOut(**create_input_with_effects(db, _water()))
+
+    assert statements.count("SELECT") == 1
+    assert out.planting_id == 1 and out.applied_at is not None
+    assert [(e.parameter, e.before, e.after, e.change) for e in out.effects] == [("soil_moisture", 50, 58, 8)]
+    assert out.plant_effects == {"days_sem_rega": {"before": 4, "after": 0, "change": -4}}
+    with sessionmaker(bind=engine)() as db:
+        assert db.scalars(select(TerrainParameters)).one().soil_moisture == pytest.approx(58.0)
+        assert db.get(Quadrant, 1).soil_moisture == pytest.approx(58.0)
+        assert db.get(Quadrant, 2).soil_moisture == pytest.approx(21.2)
+        assert db.get(Input, out.id).effects_applied_at is not None
+
+
+def test_effects_are_applied_exactly_once(engine):
+    with sessionmaker(bind=engine)() as db:
+        record = create_input(db, _water())
+        assert apply_input_effects(db, record) == {}
+        (batch,) = apply_inputs_batch(db, [_water()])
+        assert apply_input_effects(db, db.get(Input, batch["id"])) == {}
+
+        # Insumo gravado sem efeitos (ex.: carga antiga): a primeira chamada aplica, a segunda não
+        pending = Input(planting_id=1, type="fertilizante", quantity=2)
+        db.add(pending)
+        db.commit()
+        assert apply_input_effects(db, pending)["updates"] == {"fertility": pytest.approx(12.0)}
+        assert apply_input_effects(db, pending) == {}
+
+    with sessionmaker(bind=engine)() as db:
+        params = db.scalars(select(TerrainParameters)).one()
+        assert params.soil_moisture == pytest.approx(66.0)
+        assert params.fertility == pytest.approx(12.0)
+
+
+def test_create_with_effects_async(engine, async_session_factory):
+    async def run():
+        async with async_session_factory() as db:
+            result = await create_input_with_effects_async(db, _water())
+            again = await apply_input_effects_async(db, await db.get(Input, result["id"]))
+            moisture = (await db.execute(select(TerrainParameters.soil_moisture))).scalar_one()
+        return result, again, moisture
+
+    result, again, moisture = asyncio.run(run())
+    assert result["effects"][0]["after"] == pytest.approx(58.0)
+    assert again == {}
+    assert moisture == pytest.approx(58.0)
+
+    with sessionmaker(bind=engine)() as db:
+        with pytest.raises(ValueError, match="99"):
+            create_input(db, InputCreate(planting_id=99, type="água", quantity=1))
@@ -87,7 +87,7 @@ def test_water_effect_on_soil_moisture(client, test_data):
     
     # 8. Verificar se a umidade do solo aumentou conforme esperado
     final_soil_moisture = params_after.get("soil_moisture", 0)
-    expected_increase = water_quantity * 0.8  # Conforme definido em INPUT_EFFECTS
+    expected_increase = water_quantity * 0.8  # Conforme definido em input_effects.yml
     
     # Devido a possíveis arredondamentos, verificamos se está próximo do esperado
     assert final_soil_moisture > initial_soil_moisture, "A umidade do solo deveria ter aumentado"
@@ -133,7 +133,7 @@ def test_fertilizer_effect_on_fertility(client, test_data):
     
     # 4. Verificar se a fertilidade aumentou conforme esperado
     final_fertility = params_after.get("fertility", 0)
-    expected_increase = 1 + (fertilizer_quantity * 0.5)  # Conforme definido em INPUT_EFFECTS
+    expected_increase = 1 + (fertilizer_quantity * 0.5)  # Conforme definido em input_effects.yml
     
     assert final_fertility > initial_fertility, "A fertilidade do solo deveria ter aumentado"
     assert abs(final_fertility - (initial_fertility + expected_increase)) < 0.1, \
@@ -174,7 +174,7 @@ def test_compost_effect_on_organic_matter(client, test_data):
     
     # 4. Verificar se a matéria orgânica aumentou conforme esperado
     final_organic_matter = params_after.get("organic_matter", 0)
-    expected_organic_increase = 1 + (compost_quantity * 0.7)  # Conforme definido em INPUT_EFFECTS
+    expected_organic_increase = 1 + (compost_quantity * 0.7)  # Conforme definido em input_effects.yml
     
     assert final_organic_matter > initial_organic_matter, "A matéria orgânica do solo deveria ter aumentado"
     assert abs(final_organic_matter - (initial_organic_matter + expected_organic_increase)) < 0.1, \
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from src.services.llm_gate import LLMAdmissionController, LLMOverloadedError
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_limits_in_flight_calls():
+    gate = LLMAdmissionController(max_in_flight=2, timeout=5.0, initial_service_time=0.01)
+    peak = {"current": 0, "max": 0}
+
+    async def call(key):
+        async with gate.slot(key):
+            peak["current"] += 1
+            peak["max"] = max(peak["max"], peak["current"])
+            await asyncio.sleep(0.01)
+            peak["current"] -= 1
+
+    async def main():
+        await asyncio.gather(*(call(f"p{i % 3}") for i in range(10)))
+
+    run(main())
+    assert peak["max"] == 2
+    metrics = gate.metrics()
+    assert metrics["completed"] == 10
+    assert metrics["in_flight"] == 0
+    assert metrics["queued"] == 0
+
+
+def test_round_robin_between_players():
+    gate = LLMAdmissionController(max_in_flight=1, timeout=5.0, initial_service_time=0.01)
+    order = []
+
+    async def call(key, tag):
+        async with gate.slot(key):
+            order.append(tag)
+            await asyncio.sleep(0)
+
+    async def main():
+        await gate.acquire("busy")
+        # O jogador "a" enfileira três pedidos antes do jogador "b"
+        tasks = [asyncio.create_task(call("a", f"a{i}")) for i in range(3)]
+        tasks.append(asyncio.create_task(call("b", "b0")))
+        await asyncio.sleep(0)
+        gate.release()
+        await asyncio.gather(*tasks)
+
+    run(main())
+    assert order.index("b0") == 1
+
+
+def test_early_rejection_when_estimated_wait_exceeds_timeout():
+    gate = LLMAdmissionController(max_in_flight=1, timeout=1.0, initial_service_time=2.0)
+
+    async def main():
+        await gate.acquire("a")
+        with pytest.raises(LLMOverloadedError):
+            await gate.acquire("b")
+
+    run(main())
+    assert gate.metrics()["rejected"] == 1
+    assert gate.queued == 0
+
+
+def test_queue_deadline_expires():
+    gate = LLMAdmissionController(max_in_flight=1, timeout=0.05, initial_service_time=0.0)
+
+    async def main():
+        await gate.acquire("a")
+        with pytest.raises(LLMOverloadedError):
+            await gate.acquire("b")
+        # A vaga liberada não é entregue a quem já desistiu
+        gate.release()
+        assert gate.in_flight == 0
+
+    run(main())
+    assert gate.metrics()["expired"] == 1
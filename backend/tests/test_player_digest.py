@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import event
+
+from src.models.quadrant import Quadrant
+from src.models import Action, Planting, Player, Species, Terrain, TerrainParameters
+from src.services import player_digest
+from src.services.player_digest import (
+    bump_global_state_version,
+    bump_player_state_version,
+    cached_player_digest,
+    get_player_digest,
+)
+
+
+@pytest.fixture
+def db(session_factory):
+    player_digest.clear_digest_cache()
+    with session_factory() as session:
+        yield session
+
+
+def seed(db):
+    player = Player(name="Ana", balance=42.0)
+    db.add(player)
+    db.flush()
+    terrain = Terrain(player_id=player.id, name="Floresta")
+    db.add(terrain)
+    db.flush()
+    db.add(TerrainParameters(terrain_id=terrain.id, soil_moisture=10, fertility=50, organic_matter=40))
+    quadrant = Quadrant(terrain_id=terrain.id, label="A1")
+    species = Species(
+        key="Zea_mays", common_name="Milho", germinacao_dias=7, maturidade_dias=90,
+        agua_diaria_min=2, espaco_m2=1, rendimento_unid=2, tolerancia_seca="media",
+    )
+    db.add_all([quadrant, species])
+    db.flush()
+    db.add(Planting(species_id=species.id, player_id=player.id, quadrant_id=quadrant.id,
+                    slot_index=0, current_state="MUDINHA"))
+    db.add(Action(player_id=player.id, terrain_id=terrain.id, action_name="regar"))
+    db.commit()
+    return player
+
+
+def count_queries(db):
+    counter = {"n": 0}
+
+    def _count(*args):
+        counter["n"] += 1
+
+    event.listen(db.get_bind(), "before_cursor_execute", _count)
+    return counter
+
+
+def test_digest_contains_game_context(db):
+    player = seed(db)
+    digest = get_player_digest(db, player.id)
+    assert "Ana" in digest
+    assert "Floresta" in digest
+    assert "Umidade do Solo" in digest  # alerta de umidade baixa
+    assert "1 MUDINHA" in digest
+    assert "regar" in digest
+    assert len(digest) <= player_digest.DIGEST_MAX_CHARS
+
+
+def test_digest_is_cached_until_state_version_changes(db):
+    player = seed(db)
+    first = get_player_digest(db, player.id)
+    counter = count_queries(db)
+
+    assert get_player_digest(db, player.id) == first
+    assert cached_player_digest(player.id) == first
+    assert counter["n"] == 0
+
+    bump_player_state_version(player.id)
+    assert cached_player_digest(player.id) is None
+    get_player_digest(db, player.id)
+    assert counter["n"] > 0
+
+    bump_global_state_version()
+    assert cached_player_digest(player.id) is None
+
+
+def test_digest_unknown_player(db):
+    assert get_player_digest(db, 999) is None
@@ -0,0 +1,136 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import delete, event, func, select
+
+from src.models import Item, LedgerEntry, Player, Purchase, ShopItem
+from src.schemas.purchase import CartCheckout, CartItem, PurchaseCreate
+from src.services.purchase_engine import (
+    execute_checkout,
+    execute_checkout_async,
+    execute_purchase,
+    execute_purchase_async,
+)
+
+
+@pytest.fixture
+def Session(session_factory):
+    with session_factory() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=100.0),
+            ShopItem(id=1, name="Semente", price=30.0),
+            ShopItem(id=2, name="Adubo", description="Composto orgânico", price=5.0),
+        ])
+        db.commit()
+    return session_factory
+
+
+def test_parallel_purchases_never_overdraw(Session):
+
+    def buy(_):
+        with Session() as db:
+            try:
+                execute_purchase(db, PurchaseCreate(player_id=1, shop_item_id=1, quantity=1))
+                return True
+            except ValueError:
+                return False
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(buy, range(10)))
+
+    assert results.count(True) == 3
+    with Session() as db:
+        assert db.get(Player, 1).balance == pytest.approx(10.0)
+        assert db.scalar(select(func.count(Purchase.id))) == 3
+        assert db.scalar(select(func.sum(LedgerEntry.amount))) == pytest.approx(-90.0)
+        assert sorted(db.scalars(select(LedgerEntry.balance_after))) == pytest.approx([10.0, 40.0, 70.0])
+
+
+def test_idempotency_key_replays_the_same_purchase(Session):
+    purchase = PurchaseCreate(player_id=1, shop_item_id=1, quantity=2)
+
+    with Session() as db:
+        first = execute_purchase(db, purchase, idempotency_key="abc")
+        second = execute_purchase(db, purchase, idempotency_key="abc")
+        assert first.id == second.id
+        assert db.get(Player, 1).balance == pytest.approx(40.0)
+        with pytest.raises(ValueError):
+            execute_purchase(db, PurchaseCreate(player_id=1, shop_item_id=1, quantity=1), idempotency_key="abc")
+
+
+def test_async_purchase_and_append_only_ledger(Session, async_session_factory):
+    async def main():
+        async with async_session_factory() as db:
+            purchase = await execute_purchase_async(db, PurchaseCreate(player_id=1, shop_item_id=1, quantity=3))
+            total_price = purchase.total_price
+            with pytest.raises(ValueError, match="Saldo insuficiente"):
+                await execute_purchase_async(db, PurchaseCreate(player_id=1, shop_item_id=1, quantity=1))
+            entry = (await db.execute(select(LedgerEntry))).scalars().one()
+            entry.amount = 0
+            with pytest.raises(ValueError):
+                await db.flush()
+        return total_price
+
+    assert asyncio.run(main()) == pytest.approx(90.0)
+
+
+def count_statements(engine):
+    counter = {"n": 0}
+
+    def _count(*args):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    return counter
+
+
+def test_checkout_is_a_single_transaction(db_engine, Session):
+    cart = CartCheckout(player_id=1, items=[CartItem(shop_item_id=1, quantity=2), CartItem(shop_item_id=2, quantity=3)])
+
+    with Session() as db:
+        counter = count_statements(db_engine)
+        result = execute_checkout(db, cart)
+        # preços, débito, compras, itens concedidos e lançamentos
+        assert counter["n"] == 5
+        assert result["total_price"] == pytest.approx(75.0)
+        assert result["balance"] == pytest.approx(25.0)
+        assert [p.quantity for p in result["purchases"]] == [2, 3]
+        assert db.scalar(select(func.count(Item.id))) == 5
+        assert sorted(db.scalars(select(LedgerEntry.balance_after))) == pytest.approx([25.0, 40.0])
+
+
+def test_checkout_rejects_unaffordable_or_unknown_items(Session):
+    with Session() as db:
+        with pytest.raises(ValueError, match="Saldo insuficiente"):
+            execute_checkout(db, CartCheckout(player_id=1, items=[CartItem(shop_item_id=1, quantity=4)]))
+        with pytest.raises(ValueError, match="não encontrados"):
+            execute_checkout(db, CartCheckout(player_id=1, items=[CartItem(shop_item_id=99)]))
+        assert db.get(Player, 1).balance == pytest.approx(100.0)
+        assert db.scalar(select(func.count(Purchase.id))) == 0
+
+
+def test_async_checkout_idempotent_replay(Session, async_session_factory):
+    cart = CartCheckout(player_id=1, items=[CartItem(shop_item_id=2, quantity=1), CartItem(shop_item_id=1, quantity=1)])
+
+    async def main():
+        async with async_session_factory() as db:
+            first = await execute_checkout_async(db, cart, idempotency_key="cart-1")
+            second = await execute_checkout_async(db, cart, idempotency_key="cart-1")
+            ids = ([p.id for p in first["purchases"]], [p.id for p in second["purchases"]])
+            balance = (await db.get(Player, 1)).balance
+        return ids, balance
+
+    (first_ids, second_ids), balance = asyncio.run(main())
+    assert first_ids == second_ids
+    assert balance == pytest.approx(65.0)
+
+
+def test_checkout_replay_for_removed_player(Session):
+    cart = CartCheckout(player_id=1, items=[CartItem(shop_item_id=2, quantity=1)])
+    with Session() as db:
+        execute_checkout(db, cart, idempotency_key="cart-1")
+        db.execute(delete(Player).where(Player.id == 1))
+        db.commit()
+        with pytest.raises(ValueError, match="Jogador ou item não encontrado"):
+            execute_checkout(db, cart, idempotency_key="cart-1")
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.db import get_async_db, get_async_db_override, get_db
+from src.api.action import router as action_router
+from src.api.inputs import router as inputs_router
+from src.api.player import router as player_router
+from src.api.player_profile import router as profile_router
+from src.api.plantings import router as plantings_router
+from src.api.terrain import router as terrain_router
+from src.api_async.player import router as player_async_router
+from src.api_async.player_profile import router as profile_async_router
+from src.models.quadrant import Quadrant
+from src.models.species import Species
+from src.models.terrain_parameters import TerrainParameters
+from src.repositories import quadrants
+from src.services import survival
+from src.services.slot_occupancy import occupancy
+
+
+@pytest.fixture
+def client(db_engine):
+    app = FastAPI()
+    for router in (player_router, terrain_router, player_async_router):
+        app.include_router(router)
+    app.dependency_overrides[get_async_db] = get_async_db_override(db_engine)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _no_sync_session():
+    raise AssertionError("rota usou o pool síncrono (get_db)")
+
+
+@pytest.fixture
+def game_client(db_engine, session_factory):
+    with session_factory() as db:
+        db.add(Species(id=1, key="Zea_mays", common_name="Milho", germinacao_dias=7, maturidade_dias=90,
+                       agua_diaria_min=2, espaco_m2=1, rendimento_unid=2, tolerancia_seca="alta"))
+        db.commit()
+    app = FastAPI()
+    for router in (player_router, terrain_router, plantings_router, action_router, profile_router):
+        app.include_router(router)
+    app.include_router(inputs_router, prefix="/inputs")
+    app.include_router(profile_async_router, prefix="/async")
+    app.dependency_overrides[get_async_db] = get_async_db_override(db_engine)
+    app.dependency_overrides[get_db] = _no_sync_session
+    occupancy.clear()
+    survival.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+    occupancy.clear()
+    survival.clear()
+
+
+def test_sync_routes_share_the_async_repository(client):
+    player = client.post("/players/", json={"name": "Ana", "balance": 5.0}).json()
+    # Escrita pela rota "sync", leitura pela rota async: mesmo banco, mesma camada
+    assert client.get(f"/async/players/{player['id']}").json()["name"] == "Ana"
+    assert client.put(f"/players/{player['id']}", json={"name": "Ana Maria"}).status_code == 200
+    assert client.get(f"/async/players/{player['id']}").json()["name"] == "Ana Maria"
+
+
+def test_terrain_creation_generates_quadrants_and_player_loads_terrains(client):
+    player = client.post("/players/", json={"name": "Bia"}).json()
+    terrain = client.post("/terrains/", json={"player_id": player["id"], "name": "Floresta"})
+    assert terrain.status_code == 200
+
+    for path in (f"/players/{player['id']}/with-terrains", f"/async/players/{player['id']}/with-terrains"):
+        body = client.get(path).json()
+        assert [t["name"] for t in body["terrains"]] == ["Floresta"]
+    assert len(client.get(f"/players/{player['id']}/terrains").json()) == 1
+
+
+def test_generate_quadrants_in_single_transaction(async_session_factory):
+    async def main():
+        async with async_session_factory() as db:
+            created = await quadrants.generate_quadrants_for_terrain(db, terrain_id=1)
+            listed = await quadrants.list_quadrants(db, terrain_id=1)
+            return created, listed
+
+    created, listed = asyncio.run(main())
+    assert len(created) == 15
+    assert [q.label for q in listed][:5] == ["A1", "A2", "A3", "A4", "A5"]
+
+
+def test_game_routes_run_on_the_async_repositories(game_client, session_factory):
+    player = game_client.post("/players/", json={"name": "Ana"}).json()
+    terrain = game_client.post("/terrains/", json={"player_id": player["id"], "name": "Sítio"}).json()
+    with session_factory() as db:
+        db.add(TerrainParameters(terrain_id=terrain["id"], soil_moisture=10.0, fertility=10, organic_matter=10,
+                                 biodiversity=10, compaction=0, coverage=0, soil_ph=6.5))
+        db.commit()
+        quadrant_id = db.query(Quadrant.id).filter(Quadrant.terrain_id == terrain["id"]).order_by(Quadrant.id).first()[0]
+
+    planting = game_client.post("/plantings/", json={"player_id": player["id"], "quadrant_id": quadrant_id,
+                                                     "slot_index": 0, "species_id": 1})
+    assert planting.status_code == 200
+    planting_id = planting.json()["id"]
+    assert [p["id"] for p in game_client.get(f"/plantings/?player_id={player['id']}").json()] == [planting_id]
+    assert game_client.post("/plantings/", json={"player_id": player["id"], "quadrant_id": quadrant_id,
+                                                 "slot_index": 0, "species_id": 1}).status_code == 400
+    free = game_client.get(f"/plantings/free-slots/terrain/{terrain['id']}?limit=1").json()
+    assert free["slots"] == [{"quadrant_id": quadrant_id, "slot_index": 1}]
+
+    applied = game_client.post("/inputs/", json={"planting_id": planting_id, "type": "água", "quantity": 1})
+    assert applied.status_code == 200
+    assert len(game_client.get(f"/inputs/?planting_id={planting_id}").json()) == 1
+
+    estimate = game_client.get(f"/plantings/survival/player/{player['id']}?runs=5").json()
+    assert [p["planting_id"] for p in estimate["plantings"]] == [planting_id]
+
+    batch = game_client.post("/actions/batch", json={"actions": [{"action_name": "regar", "terrain_id": terrain["id"]}]})
+    assert batch.status_code == 200
+    assert game_client.post("/actions/batch", json={"actions": []}).status_code == 400
+
+    assert game_client.delete(f"/plantings/{planting_id}").status_code == 204
+    assert game_client.get(f"/plantings/{planting_id}").status_code == 404
+
+
+def test_profile_routes_share_the_async_repository(game_client):
+    created = game_client.post("/players/u1/profile", json={"user_id": "u1", "username": "ana"})
+    assert created.status_code == 201
+    assert game_client.post("/players/u1/profile", json={"user_id": "u1", "username": "ana"}).status_code == 409
+    assert game_client.put("/async/players/u1/profile", json={"username": "ana.maria"}).status_code == 200
+    assert game_client.get("/players/u1/profile").json()["username"] == "ana.maria"
+    assert game_client.get("/players/u2/profile").status_code == 404
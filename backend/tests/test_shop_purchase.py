@@ -4,7 +4,8 @@ from src.crud.player import create_player, update_player_balance, get_player
 from src.schemas.player import PlayerCreate
 from src.crud.shop_item import create_shop_item, get_shop_item, get_shop_items
 from src.schemas.shop_item import ShopItemCreate
-from src.crud.purchase import create_purchase, get_purchase, get_purchases
+from src.models.purchase import Purchase
+from src.services.purchase_engine import execute_purchase
 from src.schemas.purchase import PurchaseCreate
 
 @pytest.fixture(scope="module", autouse=True)
@@ -42,7 +43,7 @@ def test_purchase_flow():
     # create shop item
     item = create_shop_item(db, ShopItemCreate(name="Tool", price=25.0))
     # successful purchase
-    purchase = create_purchase(
+    purchase = execute_purchase(
         db,
         PurchaseCreate(player_id=player.id, shop_item_id=item.id, quantity=2)
     )
@@ -51,13 +52,13 @@ def test_purchase_flow():
     assert player.balance == pytest.approx(50.0)
     # insufficient funds
     with pytest.raises(ValueError):
-        create_purchase(
+        execute_purchase(
             db,
             PurchaseCreate(player_id=player.id, shop_item_id=item.id, quantity=10)
         )
     # list purchases
-    purchases = get_purchases(db)
+    purchases = db.query(Purchase).all()
     assert len(purchases) == 1
-    fetched = get_purchase(db, purchase.id)
+    fetched = db.get(Purchase, purchase.id)
     assert fetched.id == purchase.id
     db.close()
@@ -0,0 +1,123 @@
+import pytest
+from sqlalchemy import select
+
+from src.models.planting import Planting
+from src.models.player import Player
+from src.models.quadrant import Quadrant
+from src.models.species import Species
+from src.models.terrain import Terrain
+from src.models.terrain_parameters import TerrainParameters
+from src.schemas.input import InputCreate
+from src.services import current_season
+from src.services.climate_effects import apply_climate_effects
+from src.services.input_batch import apply_inputs_batch
+from src.services.simulation import INTEGER_COLUMNS, World
+from src.services.simulation_io import load_plantings, load_soil
+from src.services.soil_deterioration import apply_daily_deterioration
+
+SPECIES = {
+    "guandu": {"germinacao_dias_scaled": 2, "maturidade_dias_scaled": 6, "tolerancia_seca": "baixa"},
+}
+
+
+@pytest.fixture
+def Session(session_factory):
+    with session_factory() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Species(id=1, key="guandu", common_name="Feijão guandu", germinacao_dias=2, maturidade_dias=6,
+                    agua_diaria_min=1, espaco_m2=1, rendimento_unid=20, tolerancia_seca="baixa"),
+            Terrain(id=1, player_id=1, name="Sítio"),
+            TerrainParameters(id=1, terrain_id=1, soil_moisture=40.0, fertility=10, organic_matter=50,
+                              biodiversity=40, compaction=0, coverage=0),
+            Quadrant(id=1, terrain_id=1, label="A1", soil_moisture=40.0, organic_matter=50, biodiversity=40),
+            Quadrant(id=2, terrain_id=1, label="B1", soil_moisture=20.0, organic_matter=10, biodiversity=10),
+            Planting(id=1, player_id=1, quadrant_id=1, slot_index=0, species_id=1, days_sem_rega=3),
+        ])
+        db.commit()
+    current_season.clear()
+    yield session_factory
+    current_season.clear()
+
+
+def _soil(db):
+    params = db.get(TerrainParameters, 1)
+    quadrants = {q.label: (q.soil_moisture, q.organic_matter, q.biodiversity)
+                 for q in db.execute(select(Quadrant)).scalars()}
+    return (params.soil_moisture, params.organic_matter, params.biodiversity), quadrants
+
+
+def test_deterioration_job_propagates_in_quadrant_order(Session):
+    with Session() as db:
+        counters = apply_daily_deterioration(db)
+    assert counters == {"terrains_updated": 1, "quadrants_updated": 2, "propagation_updates": 2}
+
+    with Session() as db:
+        terrain, quadrants = _soil(db)
+    assert terrain == (pytest.approx(39.0), 49, 39)
+    # A1 propaga 15% da última redução (biodiversidade, 0.2) para B1 antes de B1 deteriorar;
+    # B1 devolve 15% da sua (0.05) para A1
+    assert quadrants["B1"] == (pytest.approx((20 - 0.03) * 0.975), 9, 9)
+    assert quadrants["A1"] == (pytest.approx(39.0 - 0.0075), 49, 39)
+
+
+def test_climate_job_writes_only_changed_rows(Session):
+    with Session() as db:
+        counters = apply_climate_effects(db, "seca")
+    assert counters == {"terrains_updated": 1, "quadrants_updated": 2}
+    with Session() as db:
+        terrain, quadrants = _soil(db)
+    assert terrain == (pytest.approx(30.0), 50, 38)
+    assert quadrants["B1"] == (pytest.approx(10.0), 10, 8)
+
+
+def test_inputs_match_the_batch_service(Session):
+    inputs = [("água", 10), ("composto", 5), ("fertilizante", 3)]
+    with Session() as db:
+        world = load_soil(db, World(species=SPECIES))
+        world.add_planting(1, 1, 1, "guandu", "SEMENTE", 0, 3)
+        world.apply_inputs([(1, input_type, quantity) for input_type, quantity in inputs])
+        apply_inputs_batch(db, [InputCreate(planting_id=1, type=t, quantity=q) for t, q in inputs])
+
+    with Session() as db:
+        stored = load_soil(db, World())
+        assert db.get(Planting, 1).days_sem_rega == world.plantings.dry[0] == 0
+    # O núcleo arredonda as colunas Integer; o SQLite guarda a fração gravada pelo lote
+    for soil, expected in ((world.terrains, stored.terrains), (world.quadrants, stored.quadrants)):
+        for i in range(len(soil)):
+            row = {column: round(value) if column in INTEGER_COLUMNS else value
+                   for column, value in expected.row(i).items()}
+            assert soil.row(i) == pytest.approx(row)
+
+
+def test_step_is_deterministic_and_copies_are_independent():
+    world = World(seed=7, species=SPECIES)
+    world.add_terrain(1, 1, {"soil_moisture": 50, "organic_matter": 40, "biodiversity": 30})
+    for i, label in enumerate(("A1", "B1", "A2", "B2")):
+        world.add_quadrant(i + 1, 1, label, {"soil_moisture": 50, "organic_matter": 40, "biodiversity": 30})
+    for i in range(20):
+        world.add_planting(i + 1, player_id=i % 2, quadrant_id=1 + i % 4, species_key="guandu")
+    world.water_probability = {0: 1.0, 1: 0.0}
+
+    first = world.copy(seed=3)
+    second = world.copy(seed=3)
+    first.step(60)
+    second.step(60)
+    assert first.diff(world) == second.diff(world)
+    assert first.climate_log == second.climate_log and first.climate_log
+    assert world.state_counts()["SEMENTE"] == 20
+    # Jogador 1 nunca rega: seus plantios morrem; os do jogador 0 chegam a COLHIVEL
+    assert first.state_counts() == {"SEMENTE": 0, "MUDINHA": 0, "MADURA": 0, "COLHIVEL": 10,
+                                    "COLHIDA": 0, "MORTA": 10}
+    # 60 dias = duas transições de estação depois do verão inicial
+    assert first.season.name == "inverno"
+
+
+def test_load_plantings_skips_finished_and_keeps_slots(Session):
+    with Session() as db:
+        db.add(Planting(id=2, player_id=1, quadrant_id=2, slot_index=0, species_id=1, current_state="MORTA"))
+        db.commit()
+        world = World(species=SPECIES)
+        slots = load_plantings(db, world)
+    assert slots == {1: (1, 0)}
+    assert list(world.plantings.dry) == [3]
@@ -0,0 +1,109 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from src.db import get_db, get_async_db, get_async_db_override, get_db_override
+from src.models.planting import Planting
+from src.models.player import Player
+from src.models.quadrant import Quadrant
+from src.models.species import Species
+from src.models.terrain import Terrain
+from src.api.plantings import router as plantings_router
+from src.api_async.plantings import router as async_plantings_router
+from src.services.slot_occupancy import SLOTS_PER_QUADRANT, occupancy
+
+
+@pytest.fixture
+def setup(db_engine, session_factory):
+    occupancy.clear()
+    with session_factory() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Terrain(id=1, player_id=1, name="Sítio"),
+            Quadrant(id=1, terrain_id=1, label="A1"),
+            Quadrant(id=2, terrain_id=1, label="A2"),
+            Species(id=1, key="ipe", common_name="Ipê", germinacao_dias=5, maturidade_dias=30,
+                    agua_diaria_min=1.0, espaco_m2=1.0, rendimento_unid=1, tolerancia_seca="media"),
+        ])
+        db.add_all([Planting(player_id=1, quadrant_id=1, slot_index=i, species_id=1)
+                    for i in range(SLOTS_PER_QUADRANT - 1)])
+        db.commit()
+    app = FastAPI()
+    app.include_router(plantings_router)
+    app.include_router(async_plantings_router)
+    app.dependency_overrides[get_db] = get_db_override(session_factory)
+    app.dependency_overrides[get_async_db] = get_async_db_override(db_engine)
+    with TestClient(app) as client:
+        yield client, db_engine
+    occupancy.clear()
+
+
+def _planting_selects(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt))
+    return lambda: [s for s in statements if "FROM plantings" in s or "JOIN plantings" in s]
+
+
+def test_free_slots_answered_from_index(setup):
+    client, engine = setup
+    last = SLOTS_PER_QUADRANT - 1
+    report = client.get("/plantings/free-slots/quadrant/1").json()
+    assert report["free_slots"] == [last]
+
+    selects = _planting_selects(engine)
+    assert client.get("/plantings/free-slots/quadrant/1").json()["free_slots"] == [last]
+    terrain = client.get("/plantings/free-slots/terrain/1?limit=3").json()
+    assert terrain["slots"] == [
+        {"quadrant_id": 1, "slot_index": last},
+        {"quadrant_id": 2, "slot_index": 0},
+        {"quadrant_id": 2, "slot_index": 1},
+    ]
+    # O terreno é carregado uma vez; as leituras seguintes não tocam em plantings
+    loads = len(selects())
+    client.get("/async/plantings/free-slots/terrain/1?limit=5")
+    client.get("/async/plantings/free-slots/quadrant/2")
+    assert len(selects()) == loads
+    assert client.get("/plantings/free-slots/quadrant/99").status_code == 404
+
+
+def test_index_follows_create_state_and_delete(setup):
+    client, _ = setup
+    last = SLOTS_PER_QUADRANT - 1
+    client.get("/plantings/free-slots/terrain/1?limit=1")
+
+    created = client.post("/plantings/", json={"player_id": 1, "species_id": 1, "quadrant_id": 1, "slot_index": last})
+    assert created.status_code == 200
+    assert client.get("/plantings/free-slots/quadrant/1").json()["free_slots"] == []
+    assert client.get("/plantings/free-slots/terrain/1?limit=1").json()["slots"] == [{"quadrant_id": 2, "slot_index": 0}]
+
+    duplicate = client.post("/async/plantings/", json={"player_id": 1, "species_id": 1, "quadrant_id": 1, "slot_index": last})
+    assert duplicate.status_code == 400
+    out_of_range = client.post("/plantings/", json={"player_id": 1, "species_id": 1, "quadrant_id": 2, "slot_index": SLOTS_PER_QUADRANT})
+    assert out_of_range.status_code == 400
+
+    planting_id = created.json()["id"]
+    client.put(f"/plantings/{planting_id}", json={"current_state": "COLHIDA"})
+    report = client.get("/plantings/free-slots/quadrant/1").json()
+    assert report["finished_slots"] == [last] and report["free_slots"] == []
+
+    assert client.delete(f"/plantings/{planting_id}").status_code == 204
+    report = client.get("/plantings/free-slots/quadrant/1").json()
+    assert report["free_slots"] == [last] and report["finished_slots"] == []
+    assert client.get("/plantings/free-slots/terrain/1?limit=1").json()["slots"] == [{"quadrant_id": 1, "slot_index": last}]
+
+
+def test_stale_index_is_invalidated_by_constraint(setup):
+    client, engine = setup
+    last = SLOTS_PER_QUADRANT - 1
+    client.get("/plantings/free-slots/quadrant/1")
+    # Outro processo ocupa o slot sem passar por este índice
+    with sessionmaker(bind=engine)() as db:
+        db.add(Planting(player_id=1, quadrant_id=1, slot_index=last, species_id=1))
+        db.commit()
+
+    response = client.post("/plantings/", json={"player_id": 1, "species_id": 1, "quadrant_id": 1, "slot_index": last})
+    assert response.status_code == 400
+    assert client.get("/plantings/free-slots/quadrant/1").json()["free_slots"] == []
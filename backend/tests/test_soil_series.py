@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from src.models.player import Player
+from src.models.quadrant import Quadrant
+from src.models.soil_sample import SoilSample
+from src.models.terrain import Terrain
+from src.models.terrain_parameters import TerrainParameters
+from src.schemas.soil_series import SoilSeriesOut
+from src.services import soil_series
+from src.services.soil_series import DAY, HOUR, WEEK, query_series_async, record_snapshot, rollup
+
+NOW = datetime(2026, 10, 19, 12, 30)
+
+
+@pytest.fixture
+def Session(session_factory):
+    with session_factory() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Terrain(id=1, player_id=1, name="Sítio"),
+            TerrainParameters(terrain_id=1, soil_moisture=40.0, fertility=10, organic_matter=5, biodiversity=2),
+            Quadrant(id=1, terrain_id=1, label="A1", soil_moisture=30.0),
+            Quadrant(id=2, terrain_id=1, label="A2", soil_moisture=20.0),
+        ])
+        db.commit()
+    return session_factory
+
+
+def _set_moisture(db, value):
+    db.scalars(select(TerrainParameters)).one().soil_moisture = value
+    db.commit()
+
+
+def test_records_in_the_same_hour_share_one_row(Session):
+    with Session() as db:
+        assert record_snapshot(db, NOW) == 3
+        _set_moisture(db, 60.0)
+        record_snapshot(db, NOW + timedelta(minutes=20))
+        record_snapshot(db, NOW + timedelta(hours=1))
+
+        terrain_rows = db.execute(
+            select(SoilSample).where(SoilSample.quadrant_id == 0).order_by(SoilSample.bucket_start)
+        ).scalars().all()
+        assert [(r.resolution, r.samples) for r in terrain_rows] == [(HOUR, 2), (HOUR, 1)]
+        assert terrain_rows[0].soil_moisture == pytest.approx(50.0)
+        assert db.scalar(select(func.count(SoilSample.id))) == 6
+
+
+def test_rollup_bounds_storage_per_series(Session, monkeypatch):
+    monkeypatch.setattr(soil_series, "HOURLY_DAYS", 2)
+    monkeypatch.setattr(soil_series, "DAILY_DAYS", 14)
+    monkeypatch.setattr(soil_series, "WEEKLY_DAYS", 60)
+    start = NOW - timedelta(days=120)
+    with Session() as db:
+        for hour in range(0, 120 * 24, 6):
+            record_snapshot(db, start + timedelta(hours=hour))
+        rollup(db, NOW)
+
+        counts = dict(db.execute(
+            select(SoilSample.resolution, func.count(SoilSample.id))
+            .where(SoilSample.quadrant_id == 0).group_by(SoilSample.resolution)
+        ).all())
+        assert counts[HOUR] <= 3 * 4
+        assert counts[DAY] <= 14 + 7
+        assert counts[WEEK] <= 60 // 7 + 3
+        assert db.scalar(select(func.sum(SoilSample.samples)).where(
+            SoilSample.quadrant_id == 0, SoilSample.bucket_start >= NOW - timedelta(days=50))) > 0
+
+        # Rodar de novo não altera nada
+        assert rollup(db, NOW) == {HOUR: 0, DAY: 0, "expired": 0}
+
+
+def test_range_query_downsamples(Session, async_session_factory):
+    with Session() as db:
+        for hour in range(48):
+            _set_moisture(db, float(hour))
+            record_snapshot(db, NOW - timedelta(hours=hour))
+
+    async def run():
+        async with async_session_factory() as db:
+            hourly = await query_series_async(db, 1, NOW - timedelta(hours=47), NOW + timedelta(minutes=1))
+            daily = await query_series_async(db, 1, NOW - timedelta(days=3), NOW, resolution=DAY)
+            quadrant = await query_series_async(db, 1, NOW - timedelta(hours=47), NOW, quadrant_id=2, max_points=12)
+            with pytest.raises(ValueError):
+                await query_series_async(db, 1, NOW, NOW - timedelta(days=1))
+        return hourly, daily, quadrant
+
+    hourly, daily, quadrant = asyncio.run(run())
+    assert hourly["resolution"] == HOUR and len(hourly["points"]) == 48
+    assert hourly["points"][-1]["soil_moisture"] == 0.0
+    assert [p["samples"] for p in daily["points"]] == [11, 24, 13]
+    assert len(quadrant["points"]) == 12 and quadrant["quadrant_id"] == 2
+    assert SoilSeriesOut(**quadrant).points[0].soil_moisture == pytest.approx(20.0)
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.action import Action
+from src.models.planting import Planting
+from src.models.player import Player
+from src.models.species import Species
+from src.services import current_season, survival
+from src.services.player_digest import bump_global_state_version
+from src.services.simulation import World
+from src.services.survival import estimate_survival, player_survival
+
+# Germina com 2 dias e amadurece com 6 (cada dia do scheduler tem 4 ticks; o verão, estação
+# inicial do mundo, multiplica a maturação por 0.8)
+SPECIES = {
+    "guandu": {"germinacao_dias_scaled": 2, "maturidade_dias_scaled": 6, "tolerancia_seca": "baixa"},
+    "banana": {"germinacao_dias_scaled": 30, "maturidade_dias_scaled": 270, "tolerancia_seca": "baixa"},
+}
+
+
+def _world():
+    world = World(species=SPECIES)
+    world.add_planting(10, 1, 1, "guandu")
+    world.add_planting(11, 1, 1, "banana", "MUDINHA", 150, 0)
+    world.add_planting(12, 1, 1, "guandu", "COLHIVEL", 6, 0)
+    return world
+
+
+def test_estimates_all_plantings_in_one_batch():
+    world = _world()
+    always = estimate_survival(world, 1.0, runs=500, horizon_days=30)
+    assert [e["survival_probability"] for e in always] == [1.0, 1.0, 1.0]
+    assert always[0]["expected_days_to_maturity"] == 2
+    assert always[1]["expected_days_to_maturity"] == 17  # 216 - 150 = 66 ticks restantes
+    assert always[2]["expected_days_to_maturity"] == 0
+
+    never = estimate_survival(world, 0.0, runs=500, horizon_days=30)
+    assert [e["death_probability"] for e in never] == [1.0, 1.0, 0.0]
+
+    # O guandu amadurece no 2º dia mesmo sem rega nele: sobrevive se regar no 1º dia
+    half = estimate_survival(world, 0.5, runs=4000, horizon_days=30, seed=1)
+    assert half[0]["survival_probability"] == pytest.approx(0.5, abs=0.04)
+    assert half[0]["stderr"] == pytest.approx(0.0079, abs=0.001)
+    # A banana precisa de 17 dias seguidos de rega
+    assert half[1]["survival_probability"] < 0.01
+    assert half[0]["survival_probability"] + half[0]["death_probability"] == pytest.approx(1.0)
+    assert half == estimate_survival(world, 0.5, runs=4000, horizon_days=30, seed=1)
+    # O mundo original não é alterado
+    assert list(world.plantings.state) == [0, 1, 3]
+
+
+def test_short_horizon_leaves_plantings_growing():
+    estimate = estimate_survival(_world(), 1.0, runs=10, horizon_days=5)
+    assert estimate[1]["growing_probability"] == 1.0
+    assert estimate[1]["expected_days_to_maturity"] is None
+
+
+def test_player_estimate_is_cached_per_tick(session_factory, monkeypatch):
+    monkeypatch.setenv("TIME_SCALE_FACTOR", "1")
+    Session = session_factory
+    now = datetime.now()
+    with Session() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Species(id=1, key="Cajanus_cajan", common_name="Feijão guandu", germinacao_dias=12, maturidade_dias=120,
+                    agua_diaria_min=1, espaco_m2=1, rendimento_unid=20, tolerancia_seca="alta"),
+            Planting(id=1, player_id=1, quadrant_id=1, slot_index=0, species_id=1),
+            *[Action(player_id=1, terrain_id=1, action_name="water", timestamp=now - timedelta(days=d, hours=1))
+              for d in range(14)],
+        ])
+        db.commit()
+    current_season.clear()
+    survival.clear()
+    try:
+        with Session() as db:
+            first = player_survival(db, 1, runs=20, horizon_days=60)
+            assert not first["cached"] and first["water_probability"] == 1.0
+            assert first["plantings"][0]["survival_probability"] == 1.0
+            assert player_survival(db, 1, runs=20, horizon_days=60)["cached"]
+            bump_global_state_version()
+            assert not player_survival(db, 1, runs=20, horizon_days=60)["cached"]
+            with pytest.raises(ValueError):
+                player_survival(db, 1, runs=survival.SURVIVAL_MAX_RUNS + 1)
+    finally:
+        survival.clear()
+        current_season.clear()
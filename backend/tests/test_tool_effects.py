@@ -0,0 +1,105 @@
+import pytest
+from sqlalchemy import event, select
+
+from src.models.player import Player
+from src.models.terrain import Terrain
+from src.models.terrain_parameters import TerrainParameters
+from src.models.tool import Tool
+from src.services import catalog_cache
+from src.services.action_registry import registry
+from src.services.tool_effects import tool_table
+
+
+@pytest.fixture
+def Session(session_factory):
+    with session_factory() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0),
+            Terrain(id=1, player_id=1, name="Sítio"),
+            TerrainParameters(terrain_id=1, coverage=0, regeneration_cycles=0, soil_moisture=20,
+                              fertility=10, organic_matter=10, compaction=10, biodiversity=0),
+            Tool(key="pa", common_name="Pá", description="", task_type="escavar", efficiency=2.0,
+                 durability=3, compatible_with=[], effects={"coverage": 5, "compaction": -2}),
+        ])
+        db.commit()
+    tool_table.clear()
+    yield session_factory
+    tool_table.clear()
+
+
+def test_table_merges_yml_and_db_rows(Session):
+    with Session() as db:
+        tools = tool_table.ensure_loaded(db)
+        # Linha do banco prevalece sobre tools.yml (eficiência 1.2 no arquivo)
+        assert dict(tools["pa"].effects) == {"coverage": 10.0, "compaction": -4.0}
+        assert tools["regador"].persisted is False
+        tool_table.ensure_loaded(db)
+        assert tool_table.loads == 1
+        catalog_cache.invalidate(catalog_cache.TOOLS)
+        tool_table.ensure_loaded(db)
+        assert tool_table.loads == 2
+
+
+def test_tool_delta_committed_with_action(Session):
+    with Session() as db:
+        params = db.execute(select(TerrainParameters)).scalar_one()
+        registry.handle("plantar", db, 1, params, "pa")
+    with Session() as db:
+        params = db.execute(select(TerrainParameters)).scalar_one()
+        # plantar (+10 de cobertura) e a pá (+10 de cobertura, -4 de compactação)
+        assert params.coverage == 20
+        assert params.compaction == 6
+        assert params.regeneration_cycles == 1
+    assert tool_table.pending() == {"pa": 1}
+
+
+def test_failed_action_rolls_back_tool_delta(Session):
+    def boom(db, terrain_id, params):
+        raise RuntimeError("falhou")
+
+    registry.register("quebrar")(boom)
+    with Session() as db:
+        params = db.execute(select(TerrainParameters)).scalar_one()
+        with pytest.raises(RuntimeError):
+            registry.handle("quebrar", db, 1, params, "pa")
+        params = db.execute(select(TerrainParameters)).scalar_one()
+        assert params.compaction == 10
+    assert tool_table.pending() == {}
+
+
+def test_wear_is_flushed_in_one_batch(Session):
+    with Session() as db:
+        params = db.execute(select(TerrainParameters)).scalar_one()
+        for _ in range(4):
+            registry.handle("regar", db, 1, params, "pa")
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, stmt, *args: statements.append(stmt))
+        assert tool_table.flush_wear(db) == 1
+        assert len([s for s in statements if s.startswith("UPDATE tools")]) == 1
+        # Durabilidade 3: o quarto uso já não tem efeito e não conta desgaste
+        assert db.execute(select(Tool.durability)).scalar_one() == 0
+        params = db.execute(select(TerrainParameters)).scalar_one()
+        assert params.compaction == 0
+        assert params.coverage == 30
+
+
+def test_flush_without_written_rows_keeps_catalog(Session):
+    with Session() as db:
+        tool_table.ensure_loaded(db)
+        # Ferramenta só do tools.yml: não há linha para atualizar
+        tool_table.wear("regador")
+        assert tool_table.flush_wear(db) == 0
+        tool_table.ensure_loaded(db)
+        assert tool_table.loads == 1
+
+
+def test_failed_input_application_does_not_wear_tool(Session):
+    with Session() as db:
+        params = db.execute(select(TerrainParameters)).scalar_one()
+        # Parâmetros do terreno não têm plantio nem insumo: create_input falha
+        with pytest.raises(AttributeError):
+            registry.handle("aplicar_insumo", db, 1, params, "pa")
+        params = db.execute(select(TerrainParameters)).scalar_one()
+        assert params.coverage == 0
+    assert tool_table.pending() == {}
@@ -0,0 +1,120 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from src.models.action import Action
+from src.models.player import Player
+from src.models.terrain import Terrain
+from src.models.webhook_message import WebhookMessage
+from src.services import command_parser, current_weather, webhook_inbox as inbox_module
+from src.services.tool_effects import tool_table
+from src.services.webhook_inbox import WebhookInbox
+
+
+@pytest.fixture
+def inbox(session_factory):
+    with session_factory() as db:
+        db.add_all([
+            Player(id=1, name="Ana", balance=0.0, actions_count=0, cycle_start=datetime.now()),
+            Terrain(id=1, player_id=1, name="Sítio"),
+        ])
+        db.commit()
+    tool_table.clear()
+    current_weather.clear()
+    command_parser.reset()
+    yield WebhookInbox(session_factory), session_factory
+    tool_table.clear()
+    current_weather.clear()
+
+
+def test_concurrent_appends_are_deduplicated(inbox):
+    inbox, Session = inbox
+    ids = [f"wamid-{i % 50}" for i in range(200)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(lambda mid: inbox.append(mid, {"message": "regar 1"}, "+5521"), ids))
+
+    assert statuses.count("queued") == 50
+    assert statuses.count("duplicate") == 150
+    with Session() as db:
+        assert db.execute(select(func.count()).select_from(WebhookMessage)).scalar_one() == 50
+    metrics = inbox.metrics()
+    assert metrics["queued"] == 50 and metrics["duplicates"] == 150
+    assert metrics["groups"] >= 1
+
+
+
+def test_writer_survives_a_failed_session(inbox, monkeypatch):
+    inbox, Session = inbox
+    failures = iter([OSError("pool esgotado")])
+
+    def flaky_factory():
+        for error in failures:
+            raise error
+        return Session()
+
+    inbox.session_factory = flaky_factory
+    with pytest.raises(RuntimeError, match="pool esgotado"):
+        inbox.append("m0", {"message": "regar 1"})
+    writer = inbox._writer
+    # A mesma thread de escrita segue gravando os grupos seguintes
+    assert inbox.append("m0", {"message": "regar 1"}) == "queued"
+    assert inbox._writer is writer and writer.is_alive()
+
+    # Falha fora do bloco de gravação: o grupo falha, a thread continua
+    monkeypatch.setattr(inbox, "_write_group", lambda group: (_ for _ in ()).throw(ValueError("bug")))
+    with pytest.raises(RuntimeError, match="bug"):
+        inbox.append("m1", {"message": "regar 1"})
+    monkeypatch.undo()
+    assert inbox.append("m1", {"message": "regar 1"}) == "queued"
+    assert inbox._writer is writer
+
+def test_consume_runs_actions_and_stores_replies(inbox):
+    inbox, Session = inbox
+    inbox.append("m1", {"message": "regar 1"})
+    inbox.append("m2", {"message": "invalido 3"})
+    inbox.append("m3", {"command": "plantar", "terrain_id": 9})
+
+    assert inbox.consume_once() == 3
+    assert inbox.consume_once() == 0
+
+    with Session() as db:
+        rows = {row.provider_message_id: row for row in db.execute(select(WebhookMessage)).scalars()}
+        assert (rows["m1"].status, rows["m1"].reply) == ("done", "Ação registrada com sucesso!")
+        assert rows["m2"].status == "rejected" and "não reconhecido" in rows["m2"].reply
+        assert rows["m3"].reply == "Terreno 9 não encontrado"
+        assert all(row.processed_at is not None for row in rows.values())
+        assert db.execute(select(Action.action_name)).scalars().all() == ["regar"]
+        assert db.get(Player, 1).actions_count == 1
+
+
+def test_consume_applies_player_action_limit(inbox, monkeypatch):
+    inbox, Session = inbox
+    monkeypatch.setattr(inbox_module, "PLAYER_ACTION_LIMIT", 2)
+    for i in range(3):
+        inbox.append(f"m{i}", {"message": "regar 1"})
+
+    inbox.consume_once()
+
+    with Session() as db:
+        replies = db.execute(select(WebhookMessage.reply).order_by(WebhookMessage.id)).scalars().all()
+        assert replies[-1] == "Limite de ações deste ciclo atingido"
+        assert db.execute(select(func.count()).select_from(Action)).scalar_one() == 2
+
+
+def test_start_consumes_with_the_given_session_factory(inbox):
+    _, Session = inbox
+    started = WebhookInbox()
+    started.start(Session)
+    try:
+        started.append("m1", {"message": "regar 1"})
+        deadline = time.monotonic() + 5
+        while started.metrics()["consumed"] < 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        started.stop()
+
+    with Session() as db:
+        assert db.execute(select(WebhookMessage.status)).scalars().all() == ["done"]